@@ -8,6 +8,7 @@ This software is proprietary and confidential. Unauthorized use is prohibited.
 
 import json
 import os
+import sys
 from typing import Iterable, Optional
 
 import typer
@@ -25,7 +26,7 @@ from src.vast.catalog_pg import (
 )
 from src.vast.db import get_engine
 from src.vast.identifier_guard import IdentifierValidationError, format_identifier_error, load_schema_cache
-from src.vast.perms import bootstrap_perms
+from src.vast.perms import bootstrap_perms, install_ddl_trigger
 
 app = typer.Typer(help="Vast1 — AI DB operator (MVP)")
 perms_app = typer.Typer(name="perms", help="Manage Vast database permissions")
@@ -130,6 +131,11 @@ def perms_bootstrap(
         help="Read/write role to grant permissions to",
         show_envvar=True,
     ),
+    ddl_trigger: bool = typer.Option(
+        False,
+        "--ddl-trigger",
+        help="Also install the DDL event trigger (into VAST_DDL_LOG_SCHEMA) that NOTIFYs schema changes (requires superuser)",
+    ),
 ):
     schema = schema.strip()
     if not schema:
@@ -155,6 +161,13 @@ def perms_bootstrap(
     owner_engine = _owner_engine(resolved_owner_url)
     try:
         result = bootstrap_perms(owner_engine, schema, resolved_ro, resolved_rw)
+        trigger_result = (
+            install_ddl_trigger(
+                owner_engine, settings.VAST_DDL_LOG_SCHEMA, resolved_ro, settings.VAST_SCHEMA_CHANNEL
+            )
+            if ddl_trigger
+            else None
+        )
     except Exception as exc:
         print(f"[red]Failed to bootstrap permissions:[/] {exc}")
         raise typer.Exit(code=1) from exc
@@ -167,6 +180,10 @@ def perms_bootstrap(
     )
     for stmt in result["statements"]:
         print(f" - {stmt}")
+    if trigger_result:
+        print(
+            f"[green]DDL trigger installed:[/] log={trigger_result['log_table']} channel={trigger_result['channel']}"
+        )
 
 
 @app.command()
@@ -191,8 +208,14 @@ def columns(schema: str, table: str):
 
 
 @catalog_app.command("build")
-def catalog_build():
-    catalog = load_schema_cards_pg(refresh=True)
+def catalog_build(
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Rebuild only cards whose table changed since the last build",
+    ),
+):
+    catalog = load_schema_cards_pg(refresh=True, incremental=incremental)
     cards = catalog.get("cards", {})
     fingerprint = catalog.get("fingerprint") or catalog_schema_fingerprint(cards)
     table_count = len(cards)
@@ -322,6 +345,14 @@ def health(
             ok = False
             typer.echo(f"Smoke read failed: {exc}")
 
+    typer.echo("== Pools ==")
+    for name, pool in service.pool_stats().items():
+        typer.echo(
+            f"{name:<18} in_use={pool['in_use']}/{pool['size']}+{pool['max_overflow']}"
+            f" checkouts={pool['checkouts']} overflow={pool['overflow_checkouts']}"
+            f" timeouts={pool['timeouts']} wait_ms avg={pool['wait_ms_avg']} max={pool['wait_ms_max']}"
+        )
+
     raise typer.Exit(code=0 if ok else 1)
 
 
@@ -335,14 +366,83 @@ def run(
     params: str = typer.Option(None, "--params", help='JSON dict of named params, e.g. \'{"name":"TEST"}\''),
     write: bool = typer.Option(False, "--write", help="Permit INSERT/UPDATE"),
     force_write: bool = typer.Option(False, "--force-write", help="Actually execute write (otherwise DRY RUN)"),
+    stream: bool = typer.Option(False, "--stream", help="Stream rows as NDJSON instead of buffering the result"),
+    max_rows: Optional[int] = typer.Option(None, "--max-rows", help="Stop streaming after this many rows"),
+    fmt: str = typer.Option("json", "--format", help="Result format: json, columnar or arrow"),
+    out: Optional[str] = typer.Option(None, "--out", help="Write the Arrow IPC stream to this file (default: stdout)"),
 ):
     p = _parse_params(params)
+    if stream and (write or force_write):
+        print("[red]--stream only supports read queries[/]")
+        raise typer.Exit(code=1)
+    if fmt not in {"json", "columnar", "arrow"}:
+        print(f"[red]Unknown --format {fmt!r}; expected json, columnar or arrow[/]")
+        raise typer.Exit(code=1)
+    columnar = fmt != "json"
     try:
-        result = service.execute_sql(sql, params=p, allow_writes=write, force_write=force_write)
+        if stream:
+            result = service.stream_sql(sql, params=p, max_rows=max_rows)
+        elif columnar:
+            result = service.execute_sql(
+                sql, params=p, allow_writes=write, force_write=force_write, columnar=True
+            )
+        else:
+            result = service.execute_sql(sql, params=p, allow_writes=write, force_write=force_write)
     except IdentifierValidationError as err:
         print(f"[red]{format_identifier_error(err.details)}[/]")
         raise typer.Exit(code=1)
 
+    if stream:
+        for line in result.iter_ndjson():
+            sys.stdout.write(line)
+        sys.stdout.flush()
+        return
+    if fmt == "arrow":
+        payload = result["result"].to_arrow_ipc()
+        if out:
+            with open(out, "wb") as fh:
+                fh.write(payload)
+            print(f"Wrote {result['row_count']} rows to {out}")
+        else:
+            sys.stdout.buffer.write(payload)
+            sys.stdout.flush()
+        return
+    if columnar:
+        sys.stdout.write(json.dumps(service.render_result(result, columnar=True), default=str) + "\n")
+        return
+    print(result)
+
+@app.command()
+def load(
+    sql: str,
+    path: str = typer.Argument(..., help="Rows to load: a JSON-lines or CSV file, or - for stdin"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="jsonl or csv (default: from the file extension)"),
+    write: bool = typer.Option(False, "--write", help="Permit INSERT/UPDATE"),
+    force_write: bool = typer.Option(False, "--force-write", help="Actually execute write (otherwise DRY RUN)"),
+    chunk_size: Optional[int] = typer.Option(None, "--chunk-size", help="Rows per COPY/executemany batch"),
+):
+    """Bulk-load rows with one parameterized INSERT/UPSERT, e.g. VALUES (:id, :title)."""
+    from src.vast.bulk import read_rows
+
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        result = service.bulk_load(
+            sql,
+            read_rows(handle, fmt),
+            allow_writes=write,
+            force_write=force_write,
+            chunk_size=chunk_size,
+        )
+    except IdentifierValidationError as err:
+        print(f"[red]{format_identifier_error(err.details)}[/]")
+        raise typer.Exit(code=1)
+    except ValueError as err:
+        print(f"[red]{err}[/]")
+        raise typer.Exit(code=1)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
     print(result)
 
 @app.command()
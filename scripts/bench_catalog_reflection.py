@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark per-table vs bulk schema card reflection.
+
+Creates a throwaway schema with N synthetic tables (columns, PK, FK, index,
+comment), reflects it both ways, checks the results are identical and prints
+the timings. Needs a role that can CREATE SCHEMA:
+
+    DATABASE_URL_OWNER=postgresql+psycopg://postgres:pw@localhost/pagila \\
+        python scripts/bench_catalog_reflection.py --tables 100 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.vast.catalog_pg import _reflect_schema, _reflect_table  # noqa: E402
+
+SCHEMA = "vast_bench_reflect"
+
+
+def _create_tables(engine, count: int) -> list:
+    names = [f"t{i:05d}" for i in range(count)]
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+        for idx, name in enumerate(names):
+            parent = f', parent_id int REFERENCES "{SCHEMA}".{names[idx - 1]}(id)' if idx else ""
+            conn.execute(
+                text(
+                    f'CREATE TABLE "{SCHEMA}".{name} ('
+                    "id int PRIMARY KEY, name text NOT NULL, email varchar(200), "
+                    "created_at timestamptz DEFAULT now(), amount numeric(12,2), "
+                    f"flags jsonb{parent})"
+                )
+            )
+            conn.execute(text(f'CREATE INDEX {name}_email_idx ON "{SCHEMA}".{name} (email)'))
+            conn.execute(text(f"COMMENT ON TABLE \"{SCHEMA}\".{name} IS 'bench table {idx}'"))
+    return names
+
+
+def _canonical(reflected: dict) -> str:
+    # Reflected types are TypeEngine instances; compare their rendered form.
+    return json.dumps(reflected, default=str, sort_keys=True)
+
+
+def _time(func) -> tuple:
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--url", default=os.getenv("DATABASE_URL_OWNER"))
+    parser.add_argument("--skip-per-table-above", type=int, default=None,
+                        help="Only run the bulk path for larger sizes")
+    args = parser.parse_args()
+
+    if not args.url:
+        print("Set DATABASE_URL_OWNER or pass --url", file=sys.stderr)
+        return 1
+
+    engine = create_engine(args.url, pool_size=3, max_overflow=0)
+    print(f"{'tables':>8} {'per-table s':>12} {'bulk s':>10} {'speedup':>8}")
+    try:
+        for count in args.tables:
+            names = _create_tables(engine, count)
+            bulk_s, bulk = _time(lambda: _reflect_schema(engine, SCHEMA, names))
+            if args.skip_per_table_above and count > args.skip_per_table_above:
+                print(f"{count:>8} {'-':>12} {bulk_s:>10.2f} {'-':>8}")
+                continue
+            insp = inspect(engine)
+            single_s, single = _time(lambda: {n: _reflect_table(insp, SCHEMA, n) for n in names})
+            if _canonical(single) != _canonical(bulk):
+                print(f"MISMATCH at {count} tables", file=sys.stderr)
+                return 2
+            print(f"{count:>8} {single_s:>12.2f} {bulk_s:>10.2f} {single_s / bulk_s:>7.1f}x")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import hashlib
 import json
 import logging
 import time
@@ -13,8 +12,10 @@ from rich.console import Console
 from sqlalchemy import text
 
 from .config import settings
-from .introspect import list_tables, table_columns
+from .cancellation import RequestCancelled, call_cancellable
+from .catalog_snapshot import get_catalog_snapshot
 from .db import safe_execute, get_engine, get_ro_engine, analyse_sql, is_select, add_limit
+from .statement import parse_statement
 from .knowledge import get_knowledge_store
 from .catalog_pg import load_schema_index_slim, load_card
 from .resolver import (
@@ -38,6 +39,7 @@ _SCHEMA_STATE: Dict[str, Any] = {
     "schema_summary": None,
     "schema_fingerprint": None,
 }
+_SCHEMA_STALE = False
 
 _TEXTUAL_TYPE_HINTS = {"char", "varchar", "text", "citext", "name", "uuid", "character varying"}
 _LATEST_TEMPLATE_PATH = "product_url→style→brand"
@@ -434,43 +436,18 @@ def resolver_shortcut(
 
 def schema_summary(max_tables: int = 18, max_cols_per_table: int = 12) -> str:
     # keep context leaner to avoid model choking
-    tables = list_tables()[:max_tables]
+    snapshot = get_catalog_snapshot()
+    tables = snapshot.list_tables()[:max_tables]
     lines: List[str] = []
     for t in tables:
-        cols = table_columns(t["table_schema"], t["table_name"])[:max_cols_per_table]
+        cols = snapshot.table_columns(t["table_schema"], t["table_name"])[:max_cols_per_table]
         colnames = ", ".join(c["column_name"] for c in cols)
         lines.append(f"{t['table_schema']}.{t['table_name']}({colnames})")
     return "\n".join(lines)
 
-def _normalize_columns_for_fingerprint(cols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    normalized: List[Dict[str, Any]] = []
-    for col in cols:
-        normalized.append(
-            {
-                "name": col.get("column_name"),
-                "type": col.get("data_type"),
-                "nullable": col.get("is_nullable"),
-                "default": col.get("column_default"),
-            }
-        )
-    return sorted(normalized, key=lambda item: (item["name"] or ""))
-
 
 def _compute_schema_fingerprint() -> str:
-    snapshot: List[Dict[str, Any]] = []
-    for tbl in list_tables():
-        schema_name = tbl["table_schema"]
-        table_name = tbl["table_name"]
-        cols = table_columns(schema_name, table_name)
-        snapshot.append(
-            {
-                "relation": f"{schema_name}.{table_name}",
-                "columns": _normalize_columns_for_fingerprint(cols),
-            }
-        )
-    snapshot.sort(key=lambda item: item["relation"])
-    payload = json.dumps(snapshot, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return get_catalog_snapshot().detailed_fingerprint
 
 
 def refresh_schema_summary() -> Dict[str, Any]:
@@ -525,9 +502,20 @@ def _load_cached_schema_state() -> Dict[str, Any] | None:
     return None
 
 
+def invalidate_schema_state() -> None:
+    """Mark the schema summary stale; the next reader rebuilds it from the catalog."""
+
+    global _SCHEMA_STALE
+    _SCHEMA_STATE.update({"schema_summary": None, "schema_fingerprint": None})
+    _SCHEMA_STALE = True
+
+
 def _ensure_schema_state(force_refresh: bool = False) -> Dict[str, Any]:
-    if force_refresh:
-        return refresh_schema_summary()
+    global _SCHEMA_STALE
+    if force_refresh or _SCHEMA_STALE:
+        state = refresh_schema_summary()
+        _SCHEMA_STALE = False
+        return state
 
     if _SCHEMA_STATE.get("schema_summary") and _SCHEMA_STATE.get("schema_fingerprint"):
         return dict(_SCHEMA_STATE)
@@ -552,6 +540,21 @@ def get_schema_fingerprint(force_refresh: bool = False) -> str:
 def get_schema_state(force_refresh: bool = False) -> Dict[str, Any]:
     return dict(_ensure_schema_state(force_refresh=force_refresh))
 
+def _create_completion(client, **kwargs):
+    # The sync SDK cannot interrupt a request in flight: a cancelled request
+    # abandons the call and closes the client instead of waiting for it.
+    try:
+        return call_cancellable(
+            client.chat.completions.create,
+            on_cancel=getattr(client, "close", None),
+            **kwargs,
+        )
+    except RequestCancelled:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"LLM call failed: {e}") from e
+
+
 def _strip_fences(s: str) -> str:
     s = s.strip()
     if s.startswith("```"):
@@ -727,15 +730,13 @@ def plan_sql(
         {"role": "user", "content": "\n\n".join(user_blocks)},
     ]
 
-    try:
-        resp = client.chat.completions.create(
-            model=settings.openai_model,
-            messages=messages,
-            temperature=0,
-            max_tokens=400,
-        )
-    except Exception as e:
-        raise RuntimeError(f"LLM call failed: {e}") from e
+    resp = _create_completion(
+        client,
+        model=settings.openai_model,
+        messages=messages,
+        temperature=0,
+        max_tokens=400,
+    )
 
     # Defensive handling of odd SDK returns
     choice = resp.choices[0] if resp.choices else None
@@ -774,7 +775,7 @@ def plan_sql(
                 return True
             return False
 
-        analysis = analyse_sql(sql)
+        analysis = analyse_sql(parse_statement(sql))
         bad_tables = [entry for entry in analysis.tables if not _table_allowed(entry)]
         bad_columns = [entry for entry in analysis.columns if not _column_allowed(entry)]
 
@@ -797,15 +798,13 @@ def plan_sql(
                 {"role": "user", "content": "\n\n".join(strict_blocks)},
             ]
 
-            try:
-                resp2 = client.chat.completions.create(
-                    model=settings.openai_model,
-                    messages=strict_messages,
-                    temperature=0,
-                    max_tokens=400,
-                )
-            except Exception as e:
-                raise RuntimeError(f"LLM call failed: {e}") from e
+            resp2 = _create_completion(
+                client,
+                model=settings.openai_model,
+                messages=strict_messages,
+                temperature=0,
+                max_tokens=400,
+            )
 
             choice2 = resp2.choices[0] if resp2.choices else None
             content2 = getattr(choice2.message, "content", None) if choice2 else None
@@ -817,7 +816,7 @@ def plan_sql(
             if not sql2:
                 raise RuntimeError("Empty SQL after strict regeneration.")
 
-            analysis2 = analyse_sql(sql2)
+            analysis2 = analyse_sql(parse_statement(sql2))
             bad_tables2 = [entry for entry in analysis2.tables if not _table_allowed(entry)]
             bad_columns2 = [entry for entry in analysis2.columns if not _column_allowed(entry)]
             if bad_tables2 or bad_columns2:
@@ -833,10 +832,11 @@ def plan_sql(
             analysis = analysis2
             regenerated = True
 
-    if is_select(sql):
+    selecting = is_select(parse_statement(sql))
+    if selecting:
         sql = add_limit(sql, 100)
     sql = sql.rstrip()
-    if is_select(sql) and not sql.endswith(";"):
+    if selecting and not sql.endswith(";"):
         sql += ";"
 
     if not allow_writes:
@@ -900,10 +900,11 @@ def plan_sql_with_retry(
         else:
             normalized_sql = _validate_with_guard(normalized_sql, raw_params, allow_writes)
 
-        if is_select(normalized_sql):
+        selecting = is_select(parse_statement(normalized_sql))
+        if selecting:
             normalized_sql = add_limit(normalized_sql, 100)
         normalized_sql = normalized_sql.rstrip()
-        if is_select(normalized_sql) and not normalized_sql.endswith(";"):
+        if selecting and not normalized_sql.endswith(";"):
             normalized_sql += ";"
 
         plan_result.sql = normalized_sql
@@ -7,16 +7,39 @@ This software is proprietary and confidential. Unauthorized use is prohibited.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Dict, Literal, Optional
+import io
 import json
+import tempfile
 
-from fastapi import FastAPI, HTTPException, Query
+import anyio
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from . import service
+from .bulk import read_rows
+from .cancellation import (
+    RequestCancelled,
+    RequestTimedOut,
+    active_requests,
+    cancel_request,
+    close_request,
+    open_request,
+    run_cancellable,
+    use_request,
+)
+from .coerce import coerce_value
+from .config import settings
+from .columnar import ARROW_MEDIA_TYPE
+from .audit import query_events, shutdown_audit
+from .db import dispose_async_engines
 from .identifier_guard import IdentifierValidationError, format_identifier_error
+from .session_registry import SessionRegistry
+from .statement import shutdown_parse_pool
 from api.routers import health as health_router
 from collections.abc import Mapping
 from datetime import datetime, date
@@ -31,12 +54,6 @@ def _json_safe(value):
     if value is None or isinstance(value, (str, int, float, bool)):
         return value
 
-    # Datetime / Path
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, Path):
-        return str(value)
-
     # SQLAlchemy rows expose _mapping for dict-like access
     if hasattr(value, "_asdict"):
         try:
@@ -55,11 +72,7 @@ def _json_safe(value):
     if isinstance(value, (list, tuple, set)):
         return [_json_safe(v) for v in list(value)]
 
-    # Fallback
-    try:
-        return json.loads(json.dumps(value))
-    except Exception:
-        return str(value)
+    return coerce_value(value, exact_decimals=True, default=str)
 
 
 CUSTOM_ENCODERS = {
@@ -76,6 +89,16 @@ class RunSQLRequest(BaseModel):
     params: Dict[str, Any] = Field(default_factory=dict)
     allow_writes: bool = False
     force_write: bool = False
+    format: Literal["json", "columnar", "arrow"] = "json"
+    page_size: Optional[int] = Field(default=None, ge=1, le=10_000)
+    cursor: Optional[str] = None
+
+
+class StreamSQLRequest(BaseModel):
+    sql: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    max_rows: Optional[int] = Field(default=None, ge=1)
+    max_bytes: Optional[int] = Field(default=None, ge=1)
 
 
 class AskRequest(BaseModel):
@@ -128,11 +151,91 @@ class RepoWriteRequest(BaseModel):
     overwrite: bool = False
 
 
+# Non-standard (nginx) status for a request abandoned before it completed.
+CLIENT_CLOSED_REQUEST = 499
+
+
+def _cancelled_status(exc: RequestCancelled) -> int:
+    return 504 if isinstance(exc, RequestTimedOut) else CLIENT_CLOSED_REQUEST
+
+
+async def _run_request(request: Request, label: str, call):
+    """Run ``call`` as a cancellable request, keyed by the ``X-Request-ID`` header when sent."""
+
+    return await run_cancellable(
+        call,
+        request_id=request.headers.get("x-request-id"),
+        label=label,
+        receive=request.receive,
+        timeout_s=settings.VAST_REQUEST_TIMEOUT_S,
+    )
+
+
+async def _stream_lines(ctx, result):
+    """Yield ``result``'s NDJSON lines, pulling each from a worker thread."""
+
+    lines = result.iter_ndjson()
+    fetching = False
+    try:
+        while True:
+            fetching = True
+            line = await anyio.to_thread.run_sync(next, lines, None, abandon_on_cancel=True)
+            fetching = False
+            if line is None:
+                return
+            yield line
+    finally:
+        if fetching:
+            # The abandoned worker is blocked in a fetch: interrupting it makes it close the result.
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(ctx.cancel)
+        else:
+            lines.close()
+            result.close()
+        close_request(ctx)
+
+
+async def _spool_body(request: Request):
+    """The request body in a temporary file, held in memory only while it is small."""
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.VAST_BULK_SPOOL_BYTES)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _load_conversation(session: str) -> Any:
+    # Import here to avoid heavy module import during app startup
+    from .conversation import VastConversation
+
+    return VastConversation(session)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # No-op unless VAST_SCHEMA_LISTEN is enabled
+    service.start_schema_listener()
+    try:
+        yield
+    finally:
+        service.stop_schema_listener()
+        shutdown_parse_pool()
+        await dispose_async_engines()
+        sessions = getattr(app.state, "sessions", None)
+        if sessions is not None:
+            sessions.close()
+        shutdown_audit()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Vast1 API", version="0.1.0")
+    app = FastAPI(title="Vast1 API", version="0.1.0", lifespan=_lifespan)
     app.include_router(health_router.router)
-    # Lazy import VastConversation to speed up API startup/healthcheck
-    conversations: Dict[str, Any] = {}
+    sessions = app.state.sessions = SessionRegistry(_load_conversation)
 
     # Central JSON encoders for all responses
     CUSTOM_ENCODERS = {
@@ -148,8 +251,13 @@ def create_app() -> FastAPI:
         return {
             "status": "ok",
             "environment": service.environment_status(),
+            "pools": service.pool_stats(),
         }
 
+    @app.get("/pools")
+    def pools() -> Dict[str, Any]:
+        return {"pools": service.pool_stats()}
+
     @app.get("/schema/tables")
     def get_tables() -> Dict[str, Any]:
         return {"tables": service.tables()}
@@ -159,38 +267,145 @@ def create_app() -> FastAPI:
         return {"schema": schema, "table": table, "columns": service.columns(schema, table)}
 
     @app.post("/sql/run")
-    def run_sql(payload: RunSQLRequest) -> Dict[str, Any]:
+    async def run_sql(payload: RunSQLRequest, request: Request) -> Response:
+        """Run SQL; ``format`` picks row JSON, columnar JSON or an Arrow IPC stream.
+
+        ``page_size`` or ``cursor`` fetches one page of a read query; the
+        response's ``next_cursor`` continues from the last row. The query is
+        cancelled if the client disconnects first.
+        """
         try:
-            result = service.execute_sql(
-                payload.sql,
-                params=payload.params,
-                allow_writes=payload.allow_writes,
-                force_write=payload.force_write,
-            )
-            return {"sql": payload.sql, "result": result}
+            if payload.page_size or payload.cursor:
+                call = partial(
+                    service.execute_page_async,
+                    payload.sql,
+                    params=payload.params,
+                    page_size=payload.page_size,
+                    cursor=payload.cursor,
+                )
+            else:
+                call = partial(
+                    service.execute_sql_async,
+                    payload.sql,
+                    params=payload.params,
+                    allow_writes=payload.allow_writes,
+                    force_write=payload.force_write,
+                    columnar=True,
+                )
+            result = await _run_request(request, "sql.run", call)
+            if payload.format == "arrow":
+                return Response(content=result["result"].to_arrow_ipc(), media_type=ARROW_MEDIA_TYPE)
+            body = service.render_result(result, columnar=payload.format == "columnar")
+            content = json.dumps({"sql": payload.sql, "result": body}, default=str)
+            return Response(content=content, media_type="application/json")
+        except RequestCancelled as exc:
+            raise HTTPException(status_code=_cancelled_status(exc), detail=str(exc)) from exc
+        except IdentifierValidationError as exc:
+            raise HTTPException(status_code=400, detail=format_identifier_error(exc.details)) from exc
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    @app.post("/sql/stream")
+    async def stream_sql(payload: StreamSQLRequest, request: Request):
+        """Stream a read query as NDJSON: a columns header, one array per row, a trailer.
+
+        The request stays cancellable until the last row is sent; a client
+        disconnect interrupts the fetch in progress.
+        """
+        try:
+            ctx = open_request(request.headers.get("x-request-id"), "sql.stream")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        try:
+            with use_request(ctx):
+                result = await anyio.to_thread.run_sync(
+                    partial(
+                        service.stream_sql,
+                        payload.sql,
+                        params=payload.params,
+                        max_rows=payload.max_rows,
+                        max_bytes=payload.max_bytes,
+                    )
+                )
+        except RequestCancelled as exc:
+            close_request(ctx)
+            raise HTTPException(status_code=_cancelled_status(exc), detail=str(exc)) from exc
+        except IdentifierValidationError as exc:
+            close_request(ctx)
+            raise HTTPException(status_code=400, detail=format_identifier_error(exc.details)) from exc
+        except Exception as exc:
+            close_request(ctx)
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return StreamingResponse(_stream_lines(ctx, result), media_type="application/x-ndjson")
+
+    @app.post("/sql/bulk")
+    async def bulk_sql(
+        request: Request,
+        sql: str = Query(..., description="Parameterized INSERT/UPSERT, e.g. VALUES (:id, :title)"),
+        format: Literal["jsonl", "csv"] = "jsonl",
+        allow_writes: bool = False,
+        force_write: bool = False,
+        chunk_size: Optional[int] = Query(None, ge=1),
+    ) -> Dict[str, Any]:
+        """Load the request body (JSON lines or CSV rows) with one statement, in one transaction."""
+        try:
+            # Rows are parsed from the spooled upload as they load, not held in memory.
+            with io.TextIOWrapper(await _spool_body(request), encoding="utf-8", newline="") as body:
+                call = partial(
+                    anyio.to_thread.run_sync,
+                    partial(
+                        service.bulk_load,
+                        sql,
+                        read_rows(body, format),
+                        allow_writes=allow_writes,
+                        force_write=force_write,
+                        chunk_size=chunk_size,
+                    ),
+                )
+                return await _run_request(request, "sql.bulk", call)
+        except RequestCancelled as exc:
+            raise HTTPException(status_code=_cancelled_status(exc), detail=str(exc)) from exc
         except IdentifierValidationError as exc:
             raise HTTPException(status_code=400, detail=format_identifier_error(exc.details)) from exc
         except Exception as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     @app.post("/agent/ask")
-    def ask_agent(payload: AskRequest) -> Dict[str, Any]:
+    async def ask_agent(payload: AskRequest, request: Request) -> Dict[str, Any]:
         try:
-            outcome = service.plan_and_execute(
-                payload.question,
-                params=payload.params,
-                allow_writes=payload.allow_writes,
-                force_write=payload.force_write,
-                refresh_schema=payload.refresh_schema,
-                retry=payload.retry,
-                max_retries=payload.max_retries,
+            outcome = await _run_request(
+                request,
+                "agent.ask",
+                partial(
+                    service.plan_and_execute_async,
+                    payload.question,
+                    params=payload.params,
+                    allow_writes=payload.allow_writes,
+                    force_write=payload.force_write,
+                    refresh_schema=payload.refresh_schema,
+                    retry=payload.retry,
+                    max_retries=payload.max_retries,
+                ),
             )
             return outcome
+        except RequestCancelled as exc:
+            raise HTTPException(status_code=_cancelled_status(exc), detail=str(exc)) from exc
         except IdentifierValidationError as exc:
             raise HTTPException(status_code=400, detail=format_identifier_error(exc.details)) from exc
         except Exception as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+    @app.get("/requests")
+    def list_requests() -> Dict[str, Any]:
+        return {"requests": active_requests()}
+
+    @app.post("/requests/{request_id}/cancel")
+    async def cancel(request_id: str) -> Dict[str, Any]:
+        """Cancel a running request: its LLM call is abandoned and its statement cancelled."""
+        if not await anyio.to_thread.run_sync(cancel_request, request_id):
+            raise HTTPException(status_code=404, detail="Request not found")
+        return {"request_id": request_id, "cancelled": True}
+
     @app.get("/artifacts")
     def artifacts() -> Dict[str, Any]:
         return {"artifacts": service.list_artifacts()}
@@ -217,38 +432,46 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=404, detail="Conversation not found")
         return convo
 
+    @app.get("/conversations/stats")
+    def conversation_stats() -> Dict[str, Any]:
+        return sessions.stats()
+
     @app.post("/conversations/process")
-    def process_conversation(payload: ConversationProcessRequest):
-        # Reuse or create a conversation instance for the session
-        # Import here to avoid heavy module import during app startup
-        from .conversation import VastConversation
+    async def process_conversation(payload: ConversationProcessRequest, request: Request):
+        # Turns for one session run one at a time; see SessionRegistry.
         sess = payload.session or "desktop"
-        if sess not in conversations:
-            conversations[sess] = VastConversation(sess)
-        conv = conversations[sess]
+
+        def _process() -> Dict[str, Any]:
+            with sessions.session(sess) as conv:
+                resp_text = conv.process(payload.message, auto_execute=payload.auto_execute)
+                resp_meta = getattr(conv, "last_response_meta", None) or {}
+                return {
+                    "session": conv.session_name,
+                    "response": resp_text,
+                    "actions": conv.last_actions,
+                    "intent": resp_meta.get("intent"),
+                    "sql": resp_meta.get("sql"),
+                    "meta": resp_meta.get("meta"),
+                    "execution": resp_meta.get("execution"),
+                    "breadcrumbs": resp_meta.get("breadcrumbs"),
+                    "result": resp_meta.get("result"),
+                    "metrics": resp_meta.get("metrics"),
+                    "linkable_columns": resp_meta.get("linkable_columns"),
+                    "notes": resp_meta.get("notes"),
+                    "ui_force_plan": bool(resp_meta.get("ui_force_plan")) if isinstance(resp_meta, dict) else False,
+                    "error": resp_meta.get("error"),
+                }
+
         try:
-            resp_text = conv.process(payload.message, auto_execute=payload.auto_execute)
-            resp_meta = getattr(conv, "last_response_meta", None) or {}
-            response_payload: Dict[str, Any] = {
-                "session": conv.session_name,
-                "response": resp_text,
-                "actions": conv.last_actions,
-                "intent": resp_meta.get("intent"),
-                "sql": resp_meta.get("sql"),
-                "meta": resp_meta.get("meta"),
-                "execution": resp_meta.get("execution"),
-                "breadcrumbs": resp_meta.get("breadcrumbs"),
-                "result": resp_meta.get("result"),
-                "metrics": resp_meta.get("metrics"),
-                "linkable_columns": resp_meta.get("linkable_columns"),
-                "notes": resp_meta.get("notes"),
-                "ui_force_plan": bool(resp_meta.get("ui_force_plan")) if isinstance(resp_meta, dict) else False,
-                "error": resp_meta.get("error"),
-            }
-            safe = jsonable_encoder(response_payload, custom_encoder=CUSTOM_ENCODERS)
-            return JSONResponse(content=safe)
+            response_payload = await _run_request(
+                request, "conversations.process", partial(anyio.to_thread.run_sync, _process)
+            )
+        except RequestCancelled as exc:
+            raise HTTPException(status_code=_cancelled_status(exc), detail=str(exc)) from exc
         except Exception as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
+        safe = jsonable_encoder(response_payload, custom_encoder=CUSTOM_ENCODERS)
+        return JSONResponse(content=safe)
 
     @app.post("/knowledge/refresh")
     def refresh_knowledge(payload: KnowledgeRefreshRequest) -> Dict[str, Any]:
@@ -301,12 +524,28 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     @app.get("/audit/events")
-    def audit_events(limit: int = Query(200, ge=1, le=2000)) -> Dict[str, Any]:
-        from .audit import AUDIT_FILE
-        if not AUDIT_FILE.exists():
-            return {"events": []}
-        lines = AUDIT_FILE.read_text(encoding="utf-8").splitlines()[-limit:]
-        return {"events": [json.loads(x) for x in lines]}
+    def audit_events(
+        limit: int = Query(200, ge=1, le=2000),
+        since: Optional[str] = Query(None, description="ISO 8601, inclusive"),
+        until: Optional[str] = Query(None, description="ISO 8601, exclusive"),
+        phase: Optional[Literal["pre", "post", "dry_run"]] = None,
+        stmt_type: Optional[str] = None,
+        errors: bool = Query(False, description="Only failed statements"),
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Newest matching events (oldest first in the page); ``next_cursor`` pages back."""
+        try:
+            return query_events(
+                limit=limit,
+                since=since,
+                until=until,
+                phase=phase,
+                stmt_type=stmt_type,
+                success=False if errors else None,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     return app
 
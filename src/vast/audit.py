@@ -1,13 +1,431 @@
+"""Audit trail for executed statements.
+
+``audit_event`` stamps the event and hands one JSON line to an
+``AuditWriter``. In the default ``async`` mode a background thread drains a
+bounded queue and appends in batches (on batch size, every
+``VAST_AUDIT_FLUSH_MS``, on ``flush_audit`` and at exit), keeping a single
+file handle open. ``sync`` writes on the caller's thread; ``fsync`` also
+fsyncs each write, for environments that must not lose an event.
+
+The file rotates by size and/or age; rotated files can be gzipped and only
+the newest ``VAST_AUDIT_BACKUPS`` are kept. Several processes may share the
+file: appends and rotation take an flock on ``<file>.lock``, and a writer
+whose file was rotated away by another process reopens it.
+
+Each written batch is also passed to the writer's sinks; with
+``VAST_AUDIT_INDEX`` on, that feeds the SQLite ``AuditIndex`` behind
+``query_events``. Without it ``query_events`` seeks back from the end of the
+file, so a page costs O(limit) either way.
+"""
+
 from __future__ import annotations
-import json, os, time
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .audit_index import AuditFilter, AuditIndex, decode_cursor, encode_cursor, normalize_ts, tail_events
+from .config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: only this process is serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
 
 AUDIT_DIR = Path(".vast") / "audit"
 AUDIT_DIR.mkdir(parents=True, exist_ok=True)
 AUDIT_FILE = AUDIT_DIR / "events.jsonl"
+AUDIT_INDEX_FILE = AUDIT_DIR / "index.sqlite3"
+
+AUDIT_MODES = ("async", "sync", "fsync")
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Appends JSON lines to ``path``, rotating it as configured."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        mode: str = "async",
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_ms: int = 200,
+        rotate_bytes: int = 0,
+        rotate_interval_s: Optional[float] = None,
+        gzip_rotated: bool = False,
+        backups: int = 10,
+    ) -> None:
+        if mode not in AUDIT_MODES:
+            raise ValueError(f"Unknown audit mode '{mode}'. Expected one of: {', '.join(AUDIT_MODES)}.")
+        self.path = Path(path)
+        self.mode = mode
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_s = max(int(flush_ms), 1) / 1000
+        self.rotate_bytes = max(int(rotate_bytes or 0), 0)
+        self.rotate_interval_s = rotate_interval_s
+        self.gzip_rotated = gzip_rotated
+        self.backups = max(int(backups), 0)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(int(queue_size), 1))
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._fh = None
+        self._lock_fh = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._closed = False
+        self._dropped = 0
+        self._sinks: List[Callable[[List[str]], Any]] = []
+        self._stats = {"written": 0, "batches": 0, "rotations": 0, "errors": 0, "sink_errors": 0}
+
+    def add_sink(self, sink: Callable[[List[str]], Any]) -> None:
+        """Call ``sink(lines)`` after each batch is written, on the writing thread."""
+
+        with self._lock:
+            self._sinks.append(sink)
+
+    # -- producer side -------------------------------------------------
+
+    def submit(self, line: str) -> None:
+        if self.mode != "async" or self._closed:
+            with self._lock:
+                self._write([line])
+            return
+        self._ensure_thread()
+        try:
+            # Auditing must never stall the statement it records.
+            self._queue.put_nowait(line)
+        except queue.Full:
+            # Never wait on ``_lock`` here: the writer holds it during disk I/O.
+            with self._start_lock:
+                self._dropped += 1
+            logger.warning("Audit queue full; dropped an event")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far is on disk."""
+
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return True
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        with self._lock:
+            self._close_file()
+            if self._lock_fh is not None:
+                self._lock_fh.close()
+                self._lock_fh = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": str(self.path),
+                "queued": self._queue.qsize(),
+                "bytes": self._size,
+                "dropped": self._dropped,
+                **self._stats,
+            }
+
+    # -- writer thread -------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="vast-audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            lines: List[str] = []
+            markers: List[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_s
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    lines.append(item)
+                if stop or markers or len(lines) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            with self._lock:
+                if lines:
+                    self._write(lines)
+                if stop:
+                    self._close_file()
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    # -- file handling (caller holds ``_lock``) ------------------------
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        # Serialises appends and rotation with other processes sharing the file.
+        if fcntl is None:
+            yield
+            return
+        if self._lock_fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock_fh = open(self.path.with_name(self.path.name + ".lock"), "a+b")
+        fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_UN)
+
+    def _open(self) -> None:
+        # (Re)open ``path`` when it is not open yet or another writer rotated
+        # it away, the way ``logging.handlers.WatchedFileHandler`` does.
+        if self._fh is not None:
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(self._fh.fileno())
+            if current is not None and (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+                self._size = opened.st_size  # other processes append too
+                return
+            self._close_file()
+            self._opened_at = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+        st = os.fstat(self._fh.fileno())
+        self._size = st.st_size
+        if not self._opened_at:
+            self._opened_at = st.st_mtime if st.st_size else time.time()
+
+    def _write(self, lines: List[str]) -> None:
+        data = "".join(lines)
+        try:
+            with self._file_lock():
+                self._open()
+                if self._due_for_rotation():
+                    self._rotate()
+                    self._open()
+                self._fh.write(data)
+                self._fh.flush()
+                if self.mode == "fsync":
+                    os.fsync(self._fh.fileno())
+            self._size += len(data.encode("utf-8"))
+            self._stats["written"] += len(lines)
+            self._stats["batches"] += 1
+        except OSError as exc:
+            self._stats["errors"] += 1
+            logger.warning("Audit write failed: %s", exc)
+            return
+        for sink in self._sinks:
+            try:
+                sink(lines)
+            except Exception as exc:  # a broken sink must not lose the file record
+                self._stats["sink_errors"] += 1
+                logger.warning("Audit sink failed: %s", exc)
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
+    def _due_for_rotation(self) -> bool:
+        if self._size == 0:
+            return False
+        if self.rotate_bytes and self._size >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_interval_s) and time.time() - self._opened_at >= self.rotate_interval_s
+
+    def _rotate(self) -> None:
+        # Caller holds the file lock, so no other process is appending.
+        self._close_file()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        target = self.path.with_name(f"{self.path.stem}-{stamp}{self.path.suffix}")
+        counter = 1
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            target = self.path.with_name(f"{self.path.stem}-{stamp}-{counter}{self.path.suffix}")
+            counter += 1
+        self.path.rename(target)
+        if self.gzip_rotated:
+            with target.open("rb") as src, gzip.open(target.with_name(target.name + ".gz"), "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            target.unlink()
+        self._size = 0
+        self._opened_at = 0.0
+        self._stats["rotations"] += 1
+        self._prune()
+
+    def rotated_files(self) -> List[Path]:
+        """Rotated audit files, oldest first."""
+
+        pattern = f"{self.path.stem}-*{self.path.suffix}*"
+        return sorted(self.path.parent.glob(pattern), key=lambda p: p.stat().st_mtime_ns)
+
+    def _prune(self) -> None:
+        rotated = self.rotated_files()
+        for old in rotated[: max(len(rotated) - self.backups, 0)]:
+            old.unlink(missing_ok=True)
+
+
+_WRITER: Optional[AuditWriter] = None
+_INDEX: Optional[AuditIndex] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    global _WRITER, _INDEX
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                writer = AuditWriter(
+                    AUDIT_FILE,
+                    mode=settings.VAST_AUDIT_MODE,
+                    queue_size=settings.VAST_AUDIT_QUEUE_SIZE,
+                    batch_size=settings.VAST_AUDIT_BATCH_SIZE,
+                    flush_ms=settings.VAST_AUDIT_FLUSH_MS,
+                    rotate_bytes=settings.VAST_AUDIT_ROTATE_BYTES,
+                    rotate_interval_s=settings.VAST_AUDIT_ROTATE_INTERVAL_S,
+                    gzip_rotated=settings.VAST_AUDIT_GZIP,
+                    backups=settings.VAST_AUDIT_BACKUPS,
+                )
+                if settings.VAST_AUDIT_INDEX:
+                    _INDEX = AuditIndex(AUDIT_INDEX_FILE, max_rows=settings.VAST_AUDIT_INDEX_MAX_ROWS)
+                    try:
+                        _INDEX.backfill(AUDIT_FILE)
+                        writer.add_sink(_INDEX.add)
+                    except Exception as exc:
+                        logger.warning("Audit index unavailable; reading the log file instead: %s", exc)
+                        _INDEX = None
+                _WRITER = writer
+    return _WRITER
+
+
+def get_audit_index() -> Optional[AuditIndex]:
+    get_audit_writer()
+    return _INDEX
+
 
 def audit_event(event: Dict[str, Any]) -> None:
     event["ts"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    with AUDIT_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    # Serialised now: the caller may mutate ``params`` after we return.
+    get_audit_writer().submit(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+
+def flush_audit(timeout: float = 5.0) -> bool:
+    return _WRITER.flush(timeout) if _WRITER is not None else True
+
+
+def query_events(
+    *,
+    limit: int = 200,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    phase: Optional[str] = None,
+    stmt_type: Optional[str] = None,
+    success: Optional[bool] = None,
+    breadcrumbs: bool = False,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """One page of matching audit events, oldest first within the page.
+
+    Pages run backwards from the newest event; ``next_cursor`` (None on the
+    last page) continues with older events. ``since``/``until`` are ISO 8601
+    timestamps, inclusive and exclusive.
+    """
+    flt = AuditFilter(
+        since=normalize_ts(since),
+        until=normalize_ts(until),
+        phase=phase or None,
+        stmt_type=stmt_type.upper() if stmt_type else None,
+        success=success,
+        breadcrumbs=breadcrumbs,
+    )
+    row_id, offset = decode_cursor(cursor) if cursor else (None, None)
+    flush_audit()
+    index = get_audit_index()
+    if index is not None and offset is None:
+        events, next_id = index.query(flt, limit=limit, before_id=row_id)
+        token = encode_cursor(row_id=next_id) if next_id is not None else None
+        source = "index"
+    elif row_id is not None:
+        raise ValueError("Audit cursor was issued by the index, which is not enabled.")
+    else:
+        events, next_offset = tail_events(AUDIT_FILE, flt, limit=limit, before=offset)
+        token = encode_cursor(offset=next_offset) if next_offset is not None else None
+        source = "file"
+    events.reverse()
+    return {"events": events, "next_cursor": token, "source": source}
+
+
+def audit_stats() -> Dict[str, Any]:
+    return get_audit_writer().stats()
+
+
+def shutdown_audit() -> None:
+    global _WRITER, _INDEX
+    with _WRITER_LOCK:
+        writer, index, _WRITER, _INDEX = _WRITER, _INDEX, None, None
+    if writer is not None:
+        writer.close()
+    if index is not None:
+        index.close()
+
+
+atexit.register(shutdown_audit)
+
+
+__all__ = [
+    "AUDIT_DIR",
+    "AUDIT_FILE",
+    "AUDIT_INDEX_FILE",
+    "AUDIT_MODES",
+    "AuditWriter",
+    "audit_event",
+    "audit_stats",
+    "flush_audit",
+    "get_audit_index",
+    "get_audit_writer",
+    "query_events",
+    "shutdown_audit",
+]
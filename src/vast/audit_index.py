@@ -0,0 +1,328 @@
+"""Indexed and tail-seek reads over the audit trail.
+
+``AuditIndex`` keeps every audit event in one SQLite table with indexes on
+``ts``, ``phase``, ``stmt_type`` and ``success``. The ``AuditWriter`` feeds it
+each batch right after the batch reaches the JSONL file, so the file stays the
+record of truth: deleting the index rebuilds it from the current file on next
+start.
+
+``tail_jsonl`` walks a JSONL file backwards in blocks from its end (or from a
+byte offset), for when the index is off. Either way a page of ``limit``
+events costs O(limit) rather than O(history). Pages are newest first and
+continue with an opaque cursor token: an index row id, or a byte offset into
+the current (unrotated) file.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+TAIL_BLOCK_BYTES = 64 * 1024
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT,
+    phase TEXT,
+    stmt_type TEXT,
+    success INTEGER,
+    breadcrumbs INTEGER NOT NULL DEFAULT 0,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS events_phase ON events(phase);
+CREATE INDEX IF NOT EXISTS events_stmt_type ON events(stmt_type);
+CREATE INDEX IF NOT EXISTS events_success ON events(success);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def normalize_ts(value: Optional[str]) -> Optional[str]:
+    """``value`` (ISO 8601) in the audit log's UTC second format; naive means UTC."""
+
+    if value is None or value == "":
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid timestamp '{value}'; expected ISO 8601, e.g. 2024-05-01T12:00:00Z.") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime(TS_FORMAT)
+
+
+@dataclass(frozen=True)
+class AuditFilter:
+    """``since`` is inclusive, ``until`` exclusive; both in ``TS_FORMAT``."""
+
+    since: Optional[str] = None
+    until: Optional[str] = None
+    phase: Optional[str] = None
+    stmt_type: Optional[str] = None
+    success: Optional[bool] = None
+    breadcrumbs: bool = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        ts = event.get("ts")
+        if self.since is not None and (ts is None or ts < self.since):
+            return False
+        if self.until is not None and (ts is None or ts >= self.until):
+            return False
+        if self.phase is not None and event.get("phase") != self.phase:
+            return False
+        if self.stmt_type is not None and event.get("stmt_type") != self.stmt_type:
+            return False
+        if self.success is not None and event.get("success") is not self.success:
+            return False
+        return not self.breadcrumbs or bool(event.get("breadcrumbs"))
+
+    def where(self) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for clause, value in (
+            ("ts >= ?", self.since),
+            ("ts < ?", self.until),
+            ("phase = ?", self.phase),
+            ("stmt_type = ?", self.stmt_type),
+            ("success = ?", None if self.success is None else int(self.success)),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if self.breadcrumbs:
+            clauses.append("breadcrumbs = 1")
+        return clauses, params
+
+
+def encode_cursor(*, row_id: Optional[int] = None, offset: Optional[int] = None) -> str:
+    body: Dict[str, Any] = {"v": 1}
+    if row_id is not None:
+        body["i"] = row_id
+    else:
+        body["o"] = offset
+    raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[int], Optional[int]]:
+    """``(row_id, offset)`` from a cursor token; exactly one is set."""
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        body = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        row_id = int(body["i"]) if "i" in body else None
+        offset = int(body["o"]) if "o" in body else None
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError, AttributeError) as exc:
+        raise ValueError("Invalid audit cursor.") from exc
+    if body.get("v") != 1 or (row_id is None) == (offset is None) or (row_id or offset or 0) < 0:
+        raise ValueError("Invalid audit cursor.")
+    return row_id, offset
+
+
+def tail_jsonl(path: Path, before: Optional[int] = None, block_size: int = TAIL_BLOCK_BYTES) -> Iterator[Tuple[int, str]]:
+    """Yield ``(offset, line)`` for the non-blank lines of ``path``, last first.
+
+    Reading starts at byte ``before`` (default: end of file) and moves back
+    one block at a time, so the cost follows the lines consumed.
+    """
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with fh:
+        size = fh.seek(0, os.SEEK_END)
+        pos = size if before is None else min(before, size)
+        carry = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            fh.seek(pos)
+            parts = (fh.read(step) + carry).split(b"\n")
+            carry = parts[0]
+            start = pos + len(carry) + 1
+            lines: List[Tuple[int, bytes]] = []
+            for part in parts[1:]:
+                lines.append((start, part))
+                start += len(part) + 1
+            for offset, line in reversed(lines):
+                if line.strip():
+                    yield offset, line.decode("utf-8", "replace")
+        if carry.strip():
+            yield 0, carry.decode("utf-8", "replace")
+
+
+def tail_events(
+    path: Path,
+    flt: AuditFilter,
+    *,
+    limit: int,
+    before: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Up to ``limit`` matching events from ``path``, newest first, and the offset to continue from."""
+
+    events: List[Dict[str, Any]] = []
+    consumed = before
+    for offset, line in tail_jsonl(path, before):
+        if len(events) >= limit:
+            return events, consumed
+        consumed = offset
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(event, dict) and flt.matches(event):
+            events.append(event)
+    return events, None
+
+
+class AuditIndex:
+    """Audit events in SQLite, queried newest first by row id."""
+
+    def __init__(self, path: Path, *, max_rows: int = 0, prune_every: int = 1_000) -> None:
+        self.path = Path(path)
+        self.max_rows = max(int(max_rows or 0), 0)
+        self.prune_every = max(int(prune_every), 1)
+        self._lock = threading.Lock()
+        self._since_prune = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds ``_lock``. One connection for the index's lifetime;
+        # the schema and WAL mode are set up when it is opened.
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA_SQL)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _row(line: str) -> Optional[Tuple[Any, ...]]:
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(event, dict):
+            return None
+        success = event.get("success")
+        return (
+            event.get("ts"),
+            event.get("phase"),
+            event.get("stmt_type"),
+            None if success is None else int(bool(success)),
+            int(bool(event.get("breadcrumbs"))),
+            line.strip(),
+        )
+
+    def add(self, lines: Iterable[str]) -> int:
+        """Index JSON lines as written to the audit file; returns the rows added."""
+
+        rows = [row for row in map(self._row, lines) if row is not None]
+        if not rows:
+            return 0
+        with self._lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO events(ts, phase, stmt_type, success, breadcrumbs, body) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._since_prune += len(rows)
+            if self.max_rows and self._since_prune >= self.prune_every:
+                self._since_prune = 0
+                conn.execute(
+                    "DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?",
+                    (self.max_rows,),
+                )
+        return len(rows)
+
+    def backfill(self, path: Path) -> int:
+        """Index ``path`` once, the first time this index is used; later calls do nothing."""
+
+        with self._lock:
+            done = self._connection().execute("SELECT value FROM meta WHERE key = 'backfilled'").fetchone()
+        if done:
+            return 0
+        added = 0
+        if Path(path).exists():
+            with open(path, encoding="utf-8", errors="replace") as fh:
+                batch: List[str] = []
+                for line in fh:
+                    batch.append(line)
+                    if len(batch) >= 5_000:
+                        added += self.add(batch)
+                        batch = []
+                added += self.add(batch)
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT INTO meta(key, value) VALUES ('backfilled', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(Path(path)),),
+            )
+        return added
+
+    def query(
+        self,
+        flt: AuditFilter,
+        *,
+        limit: int,
+        before_id: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Up to ``limit`` matching events, newest first, and the row id to continue before."""
+
+        clauses, params = flt.where()
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT id, body FROM events {where}ORDER BY id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        events = [json.loads(body) for _, body in rows[:limit]]
+        next_id = rows[limit - 1][0] if len(rows) > limit else None
+        return events, next_id
+
+    def count(self) -> int:
+        with self._lock:
+            if self._conn is None and not self.exists():
+                return 0
+            return self._connection().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+__all__ = [
+    "AuditFilter",
+    "AuditIndex",
+    "TS_FORMAT",
+    "decode_cursor",
+    "encode_cursor",
+    "normalize_ts",
+    "tail_events",
+    "tail_jsonl",
+]
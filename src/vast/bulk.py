@@ -0,0 +1,244 @@
+"""Bulk ingest: one parameterized INSERT/UPSERT applied to a stream of rows.
+
+The statement is checked once, the rows run in a single write transaction
+in chunks of ``VAST_BULK_CHUNK_ROWS``, and the whole batch is held to
+``max_write_rows``. A plain ``INSERT INTO t (cols) VALUES (:a, :b)`` on a
+psycopg 3 connection is loaded with ``COPY FROM STDIN``; anything else
+(``ON CONFLICT``, expressions around the binds, other drivers) goes through
+``executemany``.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlglot import exp
+
+from . import db
+from .audit import audit_event
+from .cancellation import check_cancelled, raise_if_cancelled
+from .config import settings
+from .statement import BIND_DIALECT, StatementType, parse_statement
+from .trace import stage
+
+ROW_FORMATS = ("jsonl", "csv")
+PREVIEW_ROWS = 5
+
+
+@dataclass(frozen=True)
+class BulkStatement:
+    sql: str
+    table: str
+    tables: frozenset
+    binds: Tuple[str, ...]
+    # Set when every VALUES entry is a bare bind: COPY column -> bind name.
+    copy_columns: Optional[Tuple[Tuple[str, str], ...]]
+
+    @property
+    def copy_sql(self) -> Optional[str]:
+        if not self.copy_columns:
+            return None
+        cols = ", ".join(column for column, _ in self.copy_columns)
+        return f"COPY {self.table} ({cols}) FROM STDIN"
+
+
+def parse_bulk_statement(sql: str) -> BulkStatement:
+    """Check that ``sql`` is a single-row parameterized INSERT (optionally ON CONFLICT)."""
+
+    statement = parse_statement(sql)
+    if not statement.ok:
+        raise ValueError(statement.error)
+    root = statement.ast
+    if statement.statement_type is not StatementType.WRITE or not isinstance(root, exp.Insert):
+        raise ValueError("Bulk loads take a single INSERT ... VALUES statement.")
+    values = root.expression
+    if not isinstance(values, exp.Values) or len(values.expressions) != 1:
+        raise ValueError("Bulk loads need exactly one VALUES row of named parameters, e.g. VALUES (:id, :title).")
+    if root.args.get("returning") is not None:
+        raise ValueError("RETURNING is not supported for bulk loads.")
+    if not statement.binds:
+        raise ValueError("Bulk statement has no named parameters to fill from the rows.")
+
+    target = root.this
+    table_expr = target.this if isinstance(target, exp.Schema) else target
+    row = values.expressions[0].expressions
+    copy_columns = None
+    if (
+        isinstance(target, exp.Schema)
+        and root.args.get("conflict") is None
+        and root.args.get("with") is None
+        and len(target.expressions) == len(row)
+        and all(isinstance(value, exp.Placeholder) and value.name for value in row)
+    ):
+        copy_columns = tuple(
+            (column.sql(dialect=BIND_DIALECT), value.name) for column, value in zip(target.expressions, row)
+        )
+    binds = tuple(p.name for p in root.find_all(exp.Placeholder) if p.name)
+    return BulkStatement(
+        sql=statement.normalized_sql,
+        table=table_expr.sql(dialect=BIND_DIALECT),
+        tables=frozenset(statement.tables),
+        binds=tuple(dict.fromkeys(binds)),
+        copy_columns=copy_columns,
+    )
+
+
+def read_rows(lines: Iterable[str], fmt: str = "jsonl") -> Iterator[Dict[str, Any]]:
+    """Rows from JSON lines (one object per line) or CSV with a header row.
+
+    Empty CSV fields load as NULL, as they do for ``COPY ... CSV``.
+    """
+    if fmt == "jsonl":
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Line {number}: invalid JSON ({exc.msg}).") from exc
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {number}: expected a JSON object.")
+            yield row
+    elif fmt == "csv":
+        for row in csv.DictReader(lines):
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+    else:
+        raise ValueError(f"Unknown row format '{fmt}'. Expected one of: {', '.join(ROW_FORMATS)}.")
+
+
+def _bound(statement: BulkStatement, row: Dict[str, Any], number: int) -> Dict[str, Any]:
+    missing = [name for name in statement.binds if name not in row]
+    if missing:
+        raise ValueError(f"Row {number} is missing parameter(s): {', '.join(missing)}.")
+    return {name: row[name] for name in statement.binds}
+
+
+def _chunks(statement: BulkStatement, rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    seen = 0
+    while True:
+        chunk = [_bound(statement, row, seen + i + 1) for i, row in enumerate(islice(iterator, size))]
+        if not chunk:
+            return
+        seen += len(chunk)
+        if seen > settings.max_write_rows:
+            raise ValueError(
+                f"Bulk load blocked: more than {settings.max_write_rows} rows (max_write_rows); rolled back."
+            )
+        yield chunk
+
+
+def _copy_chunk(conn, statement: BulkStatement, chunk: List[Dict[str, Any]]) -> None:
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        with cursor.copy(statement.copy_sql) as copy:
+            for params in chunk:
+                copy.write_row(tuple(params[bind] for _, bind in statement.copy_columns))
+    finally:
+        cursor.close()
+
+
+def _method(conn, statement: BulkStatement) -> str:
+    return "copy" if statement.copy_columns and conn.dialect.driver == "psycopg" else "executemany"
+
+
+def _throughput(row_count: int, chunks: int, started: float, method: str) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    return {
+        "method": method,
+        "row_count": row_count,
+        "chunks": chunks,
+        "exec_ms": int(elapsed * 1000),
+        "rows_per_s": round(row_count / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def bulk_execute(
+    sql: str | BulkStatement,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    allow_writes: bool = False,
+    force_write: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Apply ``sql`` to every row in one transaction; a DRY RUN unless ``force_write``.
+
+    The dry run reads the whole stream to count it against ``max_write_rows``
+    and previews the first rows without touching the database.
+    """
+    if not allow_writes:
+        raise ValueError("Write queries are disabled. Use --write to permit writes.")
+    statement = sql if isinstance(sql, BulkStatement) else parse_bulk_statement(sql)
+    size = max(int(chunk_size or settings.VAST_BULK_CHUNK_ROWS), 1)
+    audit_event({
+        "phase": "pre",
+        "stmt_type": StatementType.WRITE.name,
+        "sql": statement.sql,
+        "bulk": True,
+        "allow_writes": allow_writes,
+        "force_write": force_write,
+    })
+    started = time.perf_counter()
+    row_count = chunks = 0
+    try:
+        if not force_write:
+            preview: List[Dict[str, Any]] = []
+            for chunk in _chunks(statement, rows, size):
+                preview.extend(chunk[: PREVIEW_ROWS - len(preview)])
+                row_count += len(chunk)
+                chunks += 1
+            audit_event({"phase": "dry_run", "stmt_type": StatementType.WRITE.name, "bulk": True, "rows": row_count})
+            return {
+                "dry_run": True,
+                "sql": statement.sql,
+                "preview": preview,
+                **_throughput(row_count, chunks, started, "copy" if statement.copy_columns else "executemany"),
+            }
+
+        check_cancelled()
+        with db.get_engine(readonly=False).connect() as conn, db._cancellable(conn), conn.begin():
+            method = _method(conn, statement)
+            for chunk in _chunks(statement, rows, size):
+                check_cancelled()
+                with stage("bulk_chunk", rows=len(chunk), method=method):
+                    if method == "copy":
+                        _copy_chunk(conn, statement, chunk)
+                    else:
+                        conn.execute(text(statement.sql), chunk)
+                row_count += len(chunk)
+                chunks += 1
+        db.invalidate_result_cache(statement.tables)
+    except Exception as exc:
+        audit_event({
+            "phase": "post",
+            "stmt_type": StatementType.WRITE.name,
+            "success": False,
+            "bulk": True,
+            "error": str(exc),
+        })
+        raise_if_cancelled(exc)
+        raise
+    payload = {"dry_run": False, "sql": statement.sql, **_throughput(row_count, chunks, started, method)}
+    audit_event({
+        "phase": "post",
+        "stmt_type": StatementType.WRITE.name,
+        "success": True,
+        "bulk": True,
+        "rows": row_count,
+    })
+    return payload
+
+
+__all__ = [
+    "BulkStatement",
+    "ROW_FORMATS",
+    "bulk_execute",
+    "parse_bulk_statement",
+    "read_rows",
+]
@@ -0,0 +1,316 @@
+"""Request-scoped cancellation.
+
+Work done for one API or MCP request runs inside ``request_scope``. Code
+that blocks on something external registers an abort for it with
+``cancel_hook`` (the database layer cancels the running statement, the
+planner abandons its LLM call), and ``cancel_request`` runs those hooks from
+any thread. Cancelled work raises ``RequestCancelled``, or its subclass
+``RequestTimedOut`` when the request ran out of time.
+
+Outside a request scope every helper here is a no-op, so the CLI and tests
+behave as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+
+class RequestCancelled(RuntimeError):
+    """The request this work belongs to was cancelled."""
+
+    def __init__(self, request_id: str) -> None:
+        super().__init__(f"Request {request_id} was cancelled.")
+        self.request_id = request_id
+
+
+class RequestTimedOut(RequestCancelled):
+    """The request was cancelled because it exceeded its time limit."""
+
+    def __init__(self, request_id: str) -> None:
+        RuntimeError.__init__(self, f"Request {request_id} timed out.")
+        self.request_id = request_id
+
+
+class RequestContext:
+    def __init__(self, request_id: str, label: Optional[str] = None) -> None:
+        self.id = request_id
+        self.label = label
+        self.started = time.time()
+        self.timed_out = False
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._hooks: Dict[int, Callable[[], Any]] = {}
+        self._next = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def add_hook(self, hook: Callable[[], Any]) -> Optional[int]:
+        """Register ``hook``; runs it at once (returning None) if already cancelled."""
+
+        with self._lock:
+            if not self._event.is_set():
+                self._next += 1
+                self._hooks[self._next] = hook
+                return self._next
+        _run_hook(hook)
+        return None
+
+    def remove_hook(self, handle: Optional[int]) -> None:
+        if handle is not None:
+            with self._lock:
+                self._hooks.pop(handle, None)
+
+    def cancel(self, timed_out: bool = False) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.timed_out = timed_out
+            self._event.set()
+            hooks = list(self._hooks.values())
+            self._hooks.clear()
+        for hook in hooks:
+            _run_hook(hook)
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise self.error()
+
+    def error(self) -> RequestCancelled:
+        """The exception cancelled work raises: ``RequestTimedOut`` after a timeout."""
+
+        return RequestTimedOut(self.id) if self.timed_out else RequestCancelled(self.id)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.id,
+            "label": self.label,
+            "age_ms": int((time.time() - self.started) * 1000),
+            "cancelled": self.cancelled,
+            "timed_out": self.timed_out,
+        }
+
+
+def _run_hook(hook: Callable[[], Any]) -> None:
+    try:
+        hook()
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.debug("cancel hook %r failed: %s", hook, exc)
+
+
+_CURRENT: ContextVar[Optional[RequestContext]] = ContextVar("vast_request", default=None)
+_ACTIVE: Dict[str, RequestContext] = {}
+_ACTIVE_LOCK = threading.Lock()
+
+
+def current_request() -> Optional[RequestContext]:
+    return _CURRENT.get()
+
+
+def open_request(request_id: Optional[str] = None, label: Optional[str] = None) -> RequestContext:
+    """Register a cancellable request without making it current; end it with ``close_request``.
+
+    For work that outlives the call that started it, such as a response body
+    streamed after the endpoint returned. ``use_request`` makes it current.
+    """
+
+    ctx = RequestContext(request_id or uuid.uuid4().hex, label)
+    with _ACTIVE_LOCK:
+        if ctx.id in _ACTIVE:
+            raise ValueError(f"Request id '{ctx.id}' is already in use.")
+        _ACTIVE[ctx.id] = ctx
+    return ctx
+
+
+def close_request(ctx: RequestContext) -> None:
+    with _ACTIVE_LOCK:
+        if _ACTIVE.get(ctx.id) is ctx:
+            del _ACTIVE[ctx.id]
+
+
+@contextmanager
+def use_request(ctx: RequestContext) -> Iterator[RequestContext]:
+    """Make ``ctx`` the current request for the duration of the block."""
+
+    token = _CURRENT.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def request_scope(request_id: Optional[str] = None, label: Optional[str] = None) -> Iterator[RequestContext]:
+    """Register a cancellable request for the duration of the block."""
+
+    ctx = open_request(request_id, label)
+    try:
+        with use_request(ctx):
+            yield ctx
+    finally:
+        close_request(ctx)
+
+
+def cancel_request(request_id: str) -> bool:
+    """Cancel an active request; False if no such request is running."""
+
+    with _ACTIVE_LOCK:
+        ctx = _ACTIVE.get(request_id)
+    if ctx is None:
+        return False
+    ctx.cancel()
+    return True
+
+
+def active_requests() -> List[Dict[str, Any]]:
+    with _ACTIVE_LOCK:
+        contexts = list(_ACTIVE.values())
+    return [ctx.describe() for ctx in sorted(contexts, key=lambda c: c.started)]
+
+
+def check_cancelled() -> None:
+    ctx = _CURRENT.get()
+    if ctx is not None:
+        ctx.check()
+
+
+def raise_if_cancelled(exc: BaseException) -> None:
+    """Re-raise ``exc`` as ``RequestCancelled`` when it was caused by a cancellation."""
+
+    ctx = _CURRENT.get()
+    if ctx is not None and ctx.cancelled and not isinstance(exc, RequestCancelled):
+        raise ctx.error() from exc
+
+
+@contextmanager
+def cancel_hook(hook: Optional[Callable[[], Any]]) -> Iterator[None]:
+    """Run ``hook`` if the current request is cancelled while the block runs."""
+
+    ctx = _CURRENT.get()
+    if ctx is None or hook is None:
+        yield
+        return
+    handle = ctx.add_hook(hook)
+    try:
+        yield
+    finally:
+        ctx.remove_hook(handle)
+
+
+def call_cancellable(func: Callable[..., Any], *args: Any, on_cancel: Optional[Callable[[], Any]] = None, **kwargs: Any) -> Any:
+    """Call ``func``, returning early with ``RequestCancelled`` if the request is cancelled.
+
+    For blocking calls with no way to interrupt them (a sync HTTP request):
+    the call runs in a daemon thread and is abandoned on cancellation, after
+    ``on_cancel`` (e.g. closing the client) runs. Runs inline outside a
+    request scope.
+    """
+    ctx = _CURRENT.get()
+    if ctx is None:
+        return func(*args, **kwargs)
+    ctx.check()
+    done = threading.Event()
+    outcome: Dict[str, Any] = {}
+
+    def _target() -> None:
+        try:
+            outcome["value"] = func(*args, **kwargs)
+        except BaseException as exc:  # handed to the waiting thread
+            outcome["error"] = exc
+        finally:
+            done.set()
+
+    worker = threading.Thread(target=_target, name=f"vast-request-{ctx.id[:8]}", daemon=True)
+    with cancel_hook(done.set):
+        worker.start()
+        done.wait()
+    if "error" in outcome:
+        raise outcome["error"]
+    if "value" not in outcome:
+        if on_cancel is not None:
+            _run_hook(on_cancel)
+        raise ctx.error()
+    return outcome["value"]
+
+
+async def run_cancellable(
+    call: Callable[[], Awaitable[Any]],
+    *,
+    request_id: Optional[str] = None,
+    label: Optional[str] = None,
+    receive: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+    timeout_s: Optional[float] = None,
+) -> Any:
+    """Await ``call()`` inside a request scope, cancelling it when the client goes away.
+
+    ``receive`` is the ASGI receive channel: an ``http.disconnect`` message
+    cancels the request. ``timeout_s`` cancels it after that many seconds
+    (raising ``RequestTimedOut``), and so does cancelling the awaiting task (e.g. an MCP client aborting a tool
+    call). Cancel hooks may block, so they run in a worker thread.
+    """
+    with request_scope(request_id, label) as ctx:
+        outcome: Dict[str, Any] = {}
+
+        async def _cancel(timed_out: bool = False) -> None:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(ctx.cancel, timed_out)
+
+        async def _watch_disconnect() -> None:
+            while True:
+                message = await receive()
+                if message.get("type") == "http.disconnect":
+                    await _cancel()
+                    return
+
+        async def _watch_timeout() -> None:
+            await anyio.sleep(timeout_s)
+            await _cancel(timed_out=True)
+
+        async with anyio.create_task_group() as tg:
+            if receive is not None:
+                tg.start_soon(_watch_disconnect)
+            if timeout_s:
+                tg.start_soon(_watch_timeout)
+            try:
+                outcome["value"] = await call()
+            except anyio.get_cancelled_exc_class():
+                await _cancel()
+                raise
+            except Exception as exc:
+                outcome["error"] = exc
+            finally:
+                tg.cancel_scope.cancel()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
+
+
+__all__ = [
+    "RequestCancelled",
+    "RequestContext",
+    "RequestTimedOut",
+    "active_requests",
+    "call_cancellable",
+    "cancel_hook",
+    "cancel_request",
+    "check_cancelled",
+    "close_request",
+    "current_request",
+    "open_request",
+    "raise_if_cancelled",
+    "request_scope",
+    "run_cancellable",
+    "use_request",
+]
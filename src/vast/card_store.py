@@ -0,0 +1,334 @@
+"""Single-file SQLite store for schema cards.
+
+All cards live in one database with a small key index (schema, table, hash,
+aliases) next to the compact JSON body. Reading the index never decodes a
+card; bodies are decoded on first access and kept in an in-process LRU keyed
+by ``(schema, table, fingerprint)``. The LRU is dropped whenever the file's
+mtime changes, so another process rebuilding the catalog is picked up on the
+next access.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+CARD_CACHE_SIZE = 512
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS cards (
+    key TEXT PRIMARY KEY,
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    hash TEXT,
+    aliases TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def card_key(schema: str, table: str) -> str:
+    return f"{schema}.{table}"
+
+
+class CardStore:
+    """Schema cards, their index and the slim index in one SQLite file."""
+
+    def __init__(self, path: Path, cache_size: int = CARD_CACHE_SIZE) -> None:
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        # Re-entrant: ``fingerprint()`` reads meta while holding it.
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_id: Optional[Tuple[int, int]] = None
+        self._cache: "OrderedDict[Tuple[str, str, Optional[str]], Dict[str, Any]]" = OrderedDict()
+        self._cache_mtime: Optional[int] = None
+        self._fingerprint: Optional[str] = None
+        self._slim: Optional[Dict[str, Any]] = None
+
+    # -- low level -----------------------------------------------------
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def mtime_ns(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds ``_lock``. One connection per store, reopened only if
+        # the file was deleted or replaced underneath it.
+        if self._conn is not None and self._file_id() != self._conn_id:
+            self._close_connection()
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                conn.executescript(_SCHEMA_SQL)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn, self._conn_id = conn, self._file_id()
+        return self._conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            finally:
+                self._conn, self._conn_id = None, None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_connection()
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, _encode(value)),
+        )
+
+    def _upsert(
+        self,
+        conn: sqlite3.Connection,
+        cards: Mapping[str, Dict[str, Any]],
+        table_hashes: Optional[Mapping[str, str]],
+    ) -> None:
+        rows = []
+        for card in cards.values():
+            schema = card.get("schema")
+            table = card.get("table")
+            if not schema or not table:
+                continue
+            key = card_key(schema, table)
+            rows.append(
+                (
+                    key,
+                    schema,
+                    table,
+                    (table_hashes or {}).get(key),
+                    _encode(card.get("aliases", [])),
+                    _encode(card),
+                )
+            )
+        conn.executemany(
+            "INSERT INTO cards(key, schema_name, table_name, hash, aliases, body) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET hash = excluded.hash, "
+            "aliases = excluded.aliases, body = excluded.body",
+            rows,
+        )
+
+    # -- writes --------------------------------------------------------
+
+    def replace_all(
+        self,
+        cards: Mapping[str, Dict[str, Any]],
+        fingerprint: str,
+        table_hashes: Optional[Mapping[str, str]],
+        slim: Dict[str, Any],
+    ) -> None:
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM cards")
+            self._upsert(conn, cards, table_hashes)
+            self._set_meta(conn, "fingerprint", fingerprint)
+            self._set_meta(conn, "slim", slim)
+        self.invalidate()
+
+    def apply_changes(
+        self,
+        upserts: Mapping[str, Dict[str, Any]],
+        deletes: Iterable[str],
+        fingerprint: str,
+        table_hashes: Mapping[str, str],
+        slim: Dict[str, Any],
+    ) -> None:
+        with self._lock, self._connection() as conn:
+            conn.executemany("DELETE FROM cards WHERE key = ?", [(key,) for key in deletes])
+            self._upsert(conn, upserts, table_hashes)
+            # Hashes of untouched tables stay valid; rewrite them all so the
+            # index always mirrors the snapshot it was patched against.
+            conn.executemany(
+                "UPDATE cards SET hash = ? WHERE key = ?",
+                [(value, key) for key, value in table_hashes.items()],
+            )
+            self._set_meta(conn, "fingerprint", fingerprint)
+            self._set_meta(conn, "slim", slim)
+        self.invalidate()
+
+    # -- reads ---------------------------------------------------------
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_mtime = None
+            self._fingerprint = None
+            self._slim = None
+
+    def _validate(self) -> None:
+        # Caller holds the lock. Any write, from this or another process,
+        # moves the mtime and drops everything decoded so far.
+        mtime = self.mtime_ns()
+        if mtime != self._cache_mtime:
+            self._cache.clear()
+            self._fingerprint = None
+            self._slim = None
+            self._cache_mtime = mtime
+
+    def _read_meta(self, key: str) -> Any:
+        if not self.exists():
+            return None
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def fingerprint(self) -> Optional[str]:
+        with self._lock:
+            self._validate()
+            if self._fingerprint is None:
+                self._fingerprint = self._read_meta("fingerprint")
+            return self._fingerprint
+
+    def read_slim(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._validate()
+            if self._slim is None:
+                self._slim = self._read_meta("slim")
+            return self._slim
+
+    def read_index(self) -> Optional[Dict[str, Any]]:
+        """Return ``{"fingerprint", "tables"}`` without decoding any card body."""
+
+        if not self.exists():
+            return None
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT schema_name, table_name, hash, aliases FROM cards "
+                "ORDER BY schema_name, table_name"
+            ).fetchall()
+        fingerprint = self.fingerprint()
+        if fingerprint is None:
+            return None
+        return {
+            "fingerprint": fingerprint,
+            "tables": [
+                {"schema": schema, "table": table, "hash": hash_, "aliases": json.loads(aliases)}
+                for schema, table, hash_, aliases in rows
+            ],
+        }
+
+    def get(self, schema: str, table: str) -> Optional[Dict[str, Any]]:
+        """Decoded card for ``schema.table`` (shared; treat as read-only)."""
+
+        fingerprint = self.fingerprint()
+        cache_key = (schema, table, fingerprint)
+        with self._lock:
+            self._validate()
+            card = self._cache.get(cache_key)
+            if card is not None:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return card
+
+        if not self.exists():
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT body FROM cards WHERE key = ?", (card_key(schema, table),)
+            ).fetchone()
+        if row is None:
+            return None
+        card = json.loads(row[0])
+
+        with self._lock:
+            self.misses += 1
+            self._cache[cache_key] = card
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return card
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache)}
+
+
+class LazyCards(Mapping[str, Dict[str, Any]]):
+    """Read-only ``{"schema.table": card}`` view that decodes cards on access."""
+
+    def __init__(self, store: CardStore, entries: Iterable[Mapping[str, Any]]) -> None:
+        self._store = store
+        self._keys: Dict[str, Tuple[str, str]] = {}
+        for entry in entries:
+            schema = entry.get("schema")
+            table = entry.get("table")
+            if schema and table:
+                self._keys[card_key(schema, table)] = (schema, table)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        try:
+            schema, table = self._keys[key]
+        except KeyError:
+            raise KeyError(key) from None
+        card = self._store.get(schema, table)
+        if card is None:
+            raise KeyError(key)
+        return card
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+
+_STORES: Dict[Path, CardStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_card_store(path: Path) -> CardStore:
+    """Shared store per path so every caller benefits from the same LRU."""
+
+    resolved = Path(path).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(resolved)
+        if store is None:
+            store = CardStore(resolved)
+            _STORES[resolved] = store
+        return store
+
+
+__all__ = [
+    "CARD_CACHE_SIZE",
+    "CardStore",
+    "LazyCards",
+    "card_key",
+    "get_card_store",
+]
@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import re
+import sqlite3
+import time
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from sqlalchemy import String, bindparam, inspect, text
 from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine.reflection import ObjectKind, ObjectScope
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 
-from .db import get_ro_engine
-from .introspect import fingerprint_from_columns, list_tables
+from .card_store import CardStore, LazyCards, get_card_store
+from .catalog_snapshot import CatalogSnapshot, get_catalog_snapshot
+from .db import get_pool_engine
+from .introspect import fingerprint_from_columns
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +29,14 @@ SELECT
   pg_size_pretty(pg_database_size(current_database())) AS size_pretty
 """.strip()
 
-CARDS_DIR = Path(".vast/schema_cards")
-INDEX_PATH = Path(".vast/schema_index.json")
-SLIM_INDEX_PATH = Path(".vast/schema_index.slim.json")
+CARD_STORE_PATH = Path(".vast/schema_cards.db")
 EXAMPLE_LIMIT = 5
-EXAMPLE_TIMEOUT = "750ms"
+EXAMPLE_TIMEOUT_MS = 750
+EXAMPLE_SAMPLE_ROWS = 1_000
+EXAMPLE_WORKERS = 2
+EXAMPLE_BUDGET_SECONDS = 15.0
+# Schemas reflected in parallel; kept below the read-only pool size.
+REFLECT_WORKERS = 2
 
 _TEXT_SAMPLE_TYPES = {
     "char",
@@ -51,7 +60,7 @@ _ALIAS_SEEDS = {
     "companies": ["company", "organization", "org"],
 }
 
-_CARDS_CACHE: Dict[str, Dict[str, Any]] | None = None
+_CARDS_CACHE: Mapping[str, Dict[str, Any]] | None = None
 _CARDS_FP: Optional[str] = None
 
 _USER_ALIAS_VALUES = ["user", "users", "account", "member"]
@@ -77,8 +86,8 @@ _PRODUCT_STRONG_COLS = {"price", "currency", "sku", "upc", "product_id"}
 
 
 def _fetch_all(sql: str, params: dict | None = None) -> List[Dict[str, object]]:
-    """Execute the SQL against the read-only engine and return plain dict rows."""
-    with get_ro_engine().begin() as conn:
+    """Execute the SQL on the catalog pool and return plain dict rows."""
+    with get_pool_engine("catalog").begin() as conn:
         result = conn.execute(text(sql), params or {})
         return [dict(row) for row in result.mappings()]
 
@@ -202,53 +211,155 @@ def _is_stringish(col_type: Any) -> bool:
     return any(token in text_name for token in _TEXT_SAMPLE_TYPES)
 
 
-def _collect_examples(engine, schema: str, table: str, columns: List[Dict[str, Any]]) -> Dict[str, List[str]]:
-    if not columns:
+def _examples_from_stats(rows: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+    out: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+    for row in rows:
+        values = [str(v) for v in (row.get("mcv") or []) if v is not None][:EXAMPLE_LIMIT]
+        if not values:
+            continue
+        per_table = out.setdefault((row["schemaname"], row["tablename"]), {})
+        # Rows are ordered non-inherited first; keep the first set seen.
+        per_table.setdefault(row["attname"], values)
+    return out
+
+
+def _stats_examples(engine, schemas: Sequence[str]) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+    """Example values from ``pg_stats.most_common_vals``; no table access."""
+
+    if not schemas:
+        return {}
+    stmt = text(
+        """
+        SELECT schemaname, tablename, attname,
+               most_common_vals::text::text[] AS mcv
+        FROM pg_stats
+        WHERE schemaname = ANY(:schemas)
+          AND most_common_vals IS NOT NULL
+        ORDER BY schemaname, tablename, attname, inherited
+        """
+    ).bindparams(bindparam("schemas", type_=ARRAY(String)))
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(stmt, {"schemas": list(schemas)}).mappings().all()
+    except SQLAlchemyError as exc:
+        logger.debug("Failed to read pg_stats examples for %s: %s", list(schemas), exc)
+        return {}
+    return _examples_from_stats(rows)
+
+
+def _sample_percent(row_estimate: Optional[int]) -> Optional[float]:
+    if not row_estimate or row_estimate <= EXAMPLE_SAMPLE_ROWS:
+        return None
+    return max(0.01, min(100.0, 100.0 * EXAMPLE_SAMPLE_ROWS / row_estimate))
+
+
+def _sample_examples(
+    engine,
+    schema: str,
+    table: str,
+    column_names: Sequence[str],
+    row_estimate: Optional[int],
+    deadline: float,
+) -> Dict[str, List[str]]:
+    """Sample all ``column_names`` of one table with a single TABLESAMPLE query."""
+
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if not column_names or remaining_ms <= 0:
         return {}
+    timeout_ms = min(EXAMPLE_TIMEOUT_MS, remaining_ms)
 
-    examples: Dict[str, List[str]] = {}
     preparer = engine.dialect.identifier_preparer
     qualified = f"{preparer.quote_schema(schema)}.{preparer.quote(table)}"
+    select_list = ", ".join(preparer.quote(name) for name in column_names)
+    percent = _sample_percent(row_estimate)
+    sample = f" TABLESAMPLE SYSTEM ({percent:.4f})" if percent is not None else ""
+    query = text(f"SELECT {select_list} FROM {qualified}{sample} LIMIT :limit")
 
-    for col in columns:
-        col_name = col.get("name")
-        if not col_name:
-            continue
-        if not _is_stringish(col.get("type")):
-            continue
+    seen: Dict[str, List[str]] = {name: [] for name in column_names}
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL statement_timeout = '{timeout_ms}ms'"))
+            for row in conn.execute(query, {"limit": EXAMPLE_SAMPLE_ROWS}):
+                for name, value in zip(column_names, row):
+                    bucket = seen[name]
+                    if value is None or len(bucket) >= EXAMPLE_LIMIT:
+                        continue
+                    value = str(value)
+                    if value not in bucket:
+                        bucket.append(value)
+                if all(len(bucket) >= EXAMPLE_LIMIT for bucket in seen.values()):
+                    break
+    except SQLAlchemyError as exc:
+        logger.debug("Failed to sample examples for %s.%s: %s", schema, table, exc)
+        return {}
 
-        quoted_col = preparer.quote(col_name)
-        query = text(
-            f"SELECT DISTINCT {quoted_col} AS value "
-            f"FROM {qualified} "
-            f"WHERE {quoted_col} IS NOT NULL "
-            "LIMIT :limit"
-        )
+    return {name: values for name, values in seen.items() if values}
+
+
+def _collect_catalog_examples(
+    engine,
+    columns_by_table: Dict[Tuple[str, str], List[Dict[str, Any]]],
+    estimate_lookup: Dict[Tuple[str, str], Optional[int]],
+) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+    """Collect example values for text-like columns of every table.
+
+    ``pg_stats`` answers most columns without touching the tables; the rest
+    are sampled with one query per table on a bounded worker pool. The whole
+    pass stops at ``EXAMPLE_BUDGET_SECONDS``; tables not reached by then keep
+    their statistics-only examples.
+    """
+
+    deadline = time.monotonic() + EXAMPLE_BUDGET_SECONDS
+    schemas = sorted({schema for schema, _ in columns_by_table})
+    stats = _stats_examples(engine, schemas)
+
+    examples: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+    pending: Dict[Tuple[str, str], List[str]] = {}
+    for key, columns in columns_by_table.items():
+        from_stats = stats.get(key, {})
+        chosen: Dict[str, List[str]] = {}
+        missing: List[str] = []
+        for col in columns:
+            name = col.get("name")
+            if not name or not _is_stringish(col.get("type")):
+                continue
+            if name in from_stats:
+                chosen[name] = from_stats[name]
+            else:
+                missing.append(name)
+        examples[key] = chosen
+        if missing:
+            pending[key] = missing
 
-        try:
-            with engine.begin() as conn:
-                conn.execute(text(f"SET LOCAL statement_timeout = '{EXAMPLE_TIMEOUT}'"))
-                result = conn.execute(query, {"limit": EXAMPLE_LIMIT}).mappings()
-                values: List[str] = []
-                for row in result:
-                    value = row.get("value")
-                    if value is None:
-                        continue
-                    values.append(str(value))
-                    if len(values) >= EXAMPLE_LIMIT:
-                        break
-        except SQLAlchemyError as exc:
-            logger.debug(
-                "Failed to sample examples for %s.%s.%s: %s",
-                schema,
-                table,
-                col_name,
-                exc,
-            )
-            continue
+    if not pending:
+        return examples
 
-        if values:
-            examples[col_name] = values
+    pool = ThreadPoolExecutor(max_workers=EXAMPLE_WORKERS, thread_name_prefix="vast-examples")
+    try:
+        futures = {
+            pool.submit(
+                _sample_examples,
+                engine,
+                key[0],
+                key[1],
+                names,
+                estimate_lookup.get(key),
+                deadline,
+            ): key
+            for key, names in pending.items()
+        }
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                key = futures[future]
+                try:
+                    examples[key].update(future.result())
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.debug("Failed to collect examples for %s.%s: %s", key[0], key[1], exc)
+        except FuturesTimeout:
+            logger.debug("Example collection budget of %ss exhausted", EXAMPLE_BUDGET_SECONDS)
+    finally:
+        # Queued tables are dropped; in-flight queries end on their own timeout.
+        pool.shutdown(wait=False, cancel_futures=True)
 
     return examples
 
@@ -304,34 +415,157 @@ def _collect_aliases(table_name: str, columns: List[Dict[str, Any]], comment: Op
     return sorted(aliases)
 
 
-def build_schema_cards() -> Dict[str, Dict[str, Any]]:
-    engine = get_ro_engine()
-    insp = inspect(engine)
+def _reflect_table(insp, schema: str, table: str) -> Dict[str, Any]:
+    """Reflect one table property by property, tolerating privilege errors."""
+
+    key = f"{schema}.{table}"
+
+    try:
+        cols = insp.get_columns(table_name=table, schema=schema)
+    except (ProgrammingError, SQLAlchemyError) as exc:
+        if _is_privilege_error(exc):
+            logger.debug("Column reflection blocked for %s: %s", key, exc)
+            cols = []
+        else:
+            raise
+
+    try:
+        pk_info = insp.get_pk_constraint(table_name=table, schema=schema) or {}
+    except SQLAlchemyError as exc:
+        if _is_privilege_error(exc):
+            logger.debug("PK reflection blocked for %s: %s", key, exc)
+            pk_info = {}
+        else:
+            raise
+
+    try:
+        foreign_keys = insp.get_foreign_keys(table_name=table, schema=schema)
+    except SQLAlchemyError as exc:
+        if _is_privilege_error(exc):
+            logger.debug("FK reflection blocked for %s: %s", key, exc)
+            foreign_keys = []
+        else:
+            raise
+
+    try:
+        indexes = insp.get_indexes(table_name=table, schema=schema)
+    except SQLAlchemyError as exc:
+        if _is_privilege_error(exc):
+            logger.debug("Index reflection blocked for %s: %s", key, exc)
+            indexes = []
+        else:
+            raise
+
+    try:
+        comment_info = insp.get_table_comment(table_name=table, schema=schema) or {}
+    except SQLAlchemyError as exc:
+        if _is_privilege_error(exc):
+            logger.debug("Comment reflection blocked for %s: %s", key, exc)
+            comment_info = {}
+        else:
+            raise
+
+    return {
+        "columns": cols,
+        "pk": pk_info,
+        "fks": foreign_keys,
+        "indexes": indexes,
+        "comment": comment_info,
+    }
+
+
+def _reflect_schema(engine, schema: str, tables: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Reflect every table of ``schema`` with one catalog query per property."""
+
+    # scope/kind match what the per-table inspector calls use internally, so
+    # the reflected structures are identical.
+    options = {
+        "schema": schema,
+        "filter_names": list(tables),
+        "scope": ObjectScope.ANY,
+        "kind": ObjectKind.ANY,
+    }
+    try:
+        with engine.connect() as conn:
+            insp = inspect(conn)
+            columns = insp.get_multi_columns(**options)
+            pks = insp.get_multi_pk_constraint(**options)
+            fks = insp.get_multi_foreign_keys(**options)
+            indexes = insp.get_multi_indexes(**options)
+            comments = insp.get_multi_table_comment(**options)
+    except SQLAlchemyError as exc:
+        if not _is_privilege_error(exc):
+            raise
+        logger.debug("Bulk reflection blocked for schema %s; reflecting per table: %s", schema, exc)
+        insp = inspect(engine)
+        return {table: _reflect_table(insp, schema, table) for table in tables}
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for table in tables:
+        key = (schema, table)
+        out[table] = {
+            "columns": columns.get(key) or [],
+            "pk": pks.get(key) or {},
+            "fks": fks.get(key) or [],
+            "indexes": indexes.get(key) or [],
+            "comment": comments.get(key) or {},
+        }
+    return out
+
+
+def _reflect_tables(engine, tables: Sequence[Dict[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    by_schema: Dict[str, List[str]] = {}
+    for entry in tables:
+        by_schema.setdefault(entry["table_schema"], []).append(entry["table_name"])
+
+    reflected: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    workers = min(REFLECT_WORKERS, len(by_schema))
+    if workers <= 1:
+        results = {schema: _reflect_schema(engine, schema, names) for schema, names in by_schema.items()}
+    else:
+        # Independent schemas reflect concurrently, one pooled connection each.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vast-reflect") as pool:
+            futures = {
+                schema: pool.submit(_reflect_schema, engine, schema, names)
+                for schema, names in by_schema.items()
+            }
+            results = {schema: future.result() for schema, future in futures.items()}
+
+    for schema, per_table in results.items():
+        for table, info in per_table.items():
+            reflected[(schema, table)] = info
+    return reflected
+
+
+def build_schema_cards(
+    snapshot: Optional[CatalogSnapshot] = None,
+    only: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Build cards for the snapshot's tables, or just the ``schema.table`` keys in ``only``."""
+
+    engine = get_pool_engine("catalog")
     cards: Dict[str, Dict[str, Any]] = {}
 
-    tables = list_tables()
+    snapshot = snapshot or get_catalog_snapshot()
+    tables = snapshot.list_tables()
+    if only is not None:
+        wanted = set(only)
+        tables = [t for t in tables if f"{t['table_schema']}.{t['table_name']}" in wanted]
     if not tables:
         return cards
 
     schemas = sorted({row["table_schema"] for row in tables})
     estimate_lookup = _row_estimates(engine, schemas)
+    reflected = _reflect_tables(engine, tables)
 
     for entry in tables:
         schema = entry["table_schema"]
         table = entry["table_name"]
         key = f"{schema}.{table}"
-
-        try:
-            cols = insp.get_columns(table_name=table, schema=schema)
-        except (ProgrammingError, SQLAlchemyError) as exc:
-            if _is_privilege_error(exc):
-                logger.debug("Column reflection blocked for %s: %s", key, exc)
-                cols = []
-            else:
-                raise
+        info = reflected[(schema, table)]
 
         column_payload: List[Dict[str, Any]] = []
-        for col in cols:
+        for col in info["columns"]:
             column_payload.append(
                 {
                     "name": col.get("name"),
@@ -341,26 +575,10 @@ def build_schema_cards() -> Dict[str, Dict[str, Any]]:
                 }
             )
 
-        try:
-            pk_info = insp.get_pk_constraint(table_name=table, schema=schema) or {}
-        except SQLAlchemyError as exc:
-            if _is_privilege_error(exc):
-                logger.debug("PK reflection blocked for %s: %s", key, exc)
-                pk_info = {}
-            else:
-                raise
-        pk_columns = pk_info.get("constrained_columns") or []
+        pk_columns = info["pk"].get("constrained_columns") or []
 
         fk_payload: List[Dict[str, Any]] = []
-        try:
-            foreign_keys = insp.get_foreign_keys(table_name=table, schema=schema)
-        except SQLAlchemyError as exc:
-            if _is_privilege_error(exc):
-                logger.debug("FK reflection blocked for %s: %s", key, exc)
-                foreign_keys = []
-            else:
-                raise
-        for fk in foreign_keys:
+        for fk in info["fks"]:
             constrained = fk.get("constrained_columns") or []
             referred_columns = fk.get("referred_columns") or []
             ref_schema = fk.get("referred_schema") or schema
@@ -376,15 +594,7 @@ def build_schema_cards() -> Dict[str, Dict[str, Any]]:
                 )
 
         index_payload: List[Dict[str, Any]] = []
-        try:
-            indexes = insp.get_indexes(table_name=table, schema=schema)
-        except SQLAlchemyError as exc:
-            if _is_privilege_error(exc):
-                logger.debug("Index reflection blocked for %s: %s", key, exc)
-                indexes = []
-            else:
-                raise
-        for idx in indexes:
+        for idx in info["indexes"]:
             index_payload.append(
                 {
                     "name": idx.get("name"),
@@ -393,21 +603,7 @@ def build_schema_cards() -> Dict[str, Dict[str, Any]]:
                 }
             )
 
-        try:
-            comment_info = insp.get_table_comment(table_name=table, schema=schema) or {}
-        except SQLAlchemyError as exc:
-            if _is_privilege_error(exc):
-                logger.debug("Comment reflection blocked for %s: %s", key, exc)
-                comment_info = {}
-            else:
-                raise
-        table_comment = comment_info.get("text")
-
-        try:
-            examples = _collect_examples(engine, schema, table, column_payload)
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.debug("Failed to collect examples for %s: %s", key, exc)
-            examples = {}
+        table_comment = info["comment"].get("text")
 
         aliases = _collect_aliases(table, column_payload, table_comment)
 
@@ -419,7 +615,7 @@ def build_schema_cards() -> Dict[str, Dict[str, Any]]:
             "fks": fk_payload,
             "indexes": index_payload,
             "row_estimate": estimate_lookup.get((schema, table)),
-            "examples": examples,
+            "examples": {},
             "comments": {
                 "table": table_comment,
                 "columns": {
@@ -477,6 +673,17 @@ def build_schema_cards() -> Dict[str, Dict[str, Any]]:
 
         card["aliases"] = sorted(alias for alias in alias_set if alias)
 
+    columns_by_table = {
+        (card["schema"], card["table"]): card["columns"] for card in cards.values()
+    }
+    try:
+        examples = _collect_catalog_examples(engine, columns_by_table, estimate_lookup)
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.debug("Failed to collect schema card examples: %s", exc)
+        examples = {}
+    for card in cards.values():
+        card["examples"] = examples.get((card["schema"], card["table"]), {})
+
     return cards
 
 
@@ -494,58 +701,19 @@ def schema_fingerprint(cards: Dict[str, Dict[str, Any]]) -> str:
     return fingerprint_from_columns(specs)
 
 
-def _card_path(schema: str, table: str) -> Path:
-    return CARDS_DIR / f"{schema}.{table}.json"
-
+def _store() -> CardStore:
+    return get_card_store(CARD_STORE_PATH)
 
-def save_schema_cards(cards: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
-    CARDS_DIR.mkdir(parents=True, exist_ok=True)
-
-    for card in cards.values():
-        schema = card.get("schema")
-        table = card.get("table")
-        if not schema or not table:
-            continue
-        path = _card_path(schema, table)
-        path.write_text(json.dumps(card, indent=2, sort_keys=True))
-
-    fp = schema_fingerprint(cards)
-    tables_index = []
-    for card in sorted(cards.values(), key=lambda c: (c.get("schema"), c.get("table"))):
-        tables_index.append(
-            {
-                "schema": card.get("schema"),
-                "table": card.get("table"),
-                "aliases": card.get("aliases", []),
-            }
-        )
-
-    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
-    index_payload = {"fingerprint": fp, "tables": tables_index}
-    INDEX_PATH.write_text(json.dumps(index_payload, indent=2, sort_keys=True))
 
+def save_schema_cards(
+    cards: Mapping[str, Dict[str, Any]],
+    fingerprint: Optional[str] = None,
+    table_hashes: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    fp = fingerprint or schema_fingerprint(cards)
     slim_payload = build_schema_index_slim(cards, fingerprint=fp)
-    save_schema_index_slim(slim_payload)
-
-    return index_payload
-
-
-def _load_cards_from_disk(table_entries: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Dict[str, Any]]]:
-    cards: Dict[str, Dict[str, Any]] = {}
-    for entry in table_entries:
-        schema = entry.get("schema")
-        table = entry.get("table")
-        if not schema or not table:
-            continue
-        path = _card_path(schema, table)
-        if not path.exists():
-            return None
-        try:
-            cards[f"{schema}.{table}"] = json.loads(path.read_text())
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse schema card %s", path)
-            return None
-    return cards
+    _store().replace_all(cards, fp, table_hashes, slim_payload)
+    return _store().read_index() or {"fingerprint": fp, "tables": []}
 
 
 def build_schema_index_slim(
@@ -583,98 +751,162 @@ def build_schema_index_slim(
 
 
 def save_schema_index_slim(index_data: Dict[str, Any]) -> None:
-    SLIM_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
-    SLIM_INDEX_PATH.write_text(json.dumps(index_data, indent=2, sort_keys=True))
+    store = _store()
+    index = store.read_index()
+    if index is None:
+        return
+    store.apply_changes({}, [], index["fingerprint"], {}, index_data)
 
 
 def load_schema_index_slim() -> Dict[str, Any]:
-    if SLIM_INDEX_PATH.exists():
-        try:
-            return json.loads(SLIM_INDEX_PATH.read_text())
-        except json.JSONDecodeError:
-            logger.warning("Slim schema index corrupted; rebuilding")
+    try:
+        slim = _store().read_slim()
+    except sqlite3.DatabaseError:
+        logger.warning("Schema card store corrupted; rebuilding")
+        slim = None
+    if slim is not None:
+        return slim
 
     payload = load_schema_cards(refresh=False)
-    cards = payload.get("cards") or {}
-    fingerprint = payload.get("fingerprint")
-    slim_payload = build_schema_index_slim(cards, fingerprint=fingerprint)
-    save_schema_index_slim(slim_payload)
-    return slim_payload
+    return _store().read_slim() or build_schema_index_slim(
+        payload.get("cards") or {}, fingerprint=payload.get("fingerprint")
+    )
 
 
 def load_card(schema: str, table: str) -> Dict[str, Any]:
-    path = _card_path(schema, table)
-    data = json.loads(path.read_text())
-    return data
+    """Return one card, decoded once per (schema, table, fingerprint); treat as read-only."""
+
+    card = _store().get(schema, table)
+    if card is None:
+        raise FileNotFoundError(f"No schema card for {schema}.{table}")
+    return card
+
+
+def _rebuild_schema_cards(snapshot: Optional[CatalogSnapshot] = None) -> Tuple[Mapping[str, Dict[str, Any]], Dict[str, Any]]:
+    snapshot = snapshot or get_catalog_snapshot(force_refresh=True)
+    cards = build_schema_cards(snapshot)
+    meta = save_schema_cards(cards, fingerprint=snapshot.fingerprint, table_hashes=snapshot.table_hashes())
+    return cards, meta
+
+
+def _patched_slim_index(
+    cards: Mapping[str, Dict[str, Any]],
+    rebuilt: Dict[str, Dict[str, Any]],
+    dropped: Iterable[str],
+    fingerprint: str,
+) -> Dict[str, Any]:
+    slim = _store().read_slim()
+    if slim is None:
+        return build_schema_index_slim(cards, fingerprint=fingerprint)
+
+    entries = {entry.get("key"): entry for entry in slim.get("tables") or []}
+    for key in dropped:
+        entries.pop(key, None)
+    for entry in build_schema_index_slim(rebuilt, fingerprint=fingerprint)["tables"]:
+        entries[entry["key"]] = entry
+    return {
+        "fingerprint": fingerprint,
+        "tables": sorted(entries.values(), key=lambda item: (item.get("schema"), item.get("table"))),
+    }
+
+
+def _refresh_changed_cards(
+    snapshot: CatalogSnapshot,
+    index_data: Dict[str, Any],
+) -> Optional[Tuple[Mapping[str, Dict[str, Any]], Dict[str, Any]]]:
+    """Rebuild only cards whose table hash changed, was added or was dropped.
+
+    Returns ``None`` when the stored index cannot be patched (it predates
+    per-table hashes) and a full rebuild is needed.
+    """
+
+    entries = [e for e in index_data.get("tables") or [] if e.get("schema") and e.get("table")]
+    stored = {f"{e['schema']}.{e['table']}": e.get("hash") for e in entries}
+    if any(value is None for value in stored.values()):
+        return None
+
+    current = snapshot.table_hashes()
+    changed = {key for key, value in current.items() if stored.get(key) != value}
+    dropped = set(stored) - set(current)
+
+    store = _store()
+    rebuilt = build_schema_cards(snapshot, only=changed) if changed else {}
+    kept = LazyCards(store, [e for e in entries if f"{e['schema']}.{e['table']}" in current.keys() - changed])
+    slim_payload = _patched_slim_index(ChainMap(rebuilt, kept), rebuilt, dropped, snapshot.fingerprint)
+    store.apply_changes(rebuilt, dropped, snapshot.fingerprint, current, slim_payload)
+    logger.debug(
+        "Incremental catalog refresh: %d rebuilt, %d dropped, %d kept",
+        len(rebuilt),
+        len(dropped),
+        len(current) - len(rebuilt),
+    )
+    meta = store.read_index() or {"fingerprint": snapshot.fingerprint, "tables": []}
+    return LazyCards(store, meta["tables"]), meta
 
 
-def load_schema_cards(refresh: bool = False) -> Dict[str, Any]:
-    def _package(cards: Dict[str, Dict[str, Any]], meta: Dict[str, Any]) -> Dict[str, Any]:
+def load_schema_cards(refresh: bool = False, incremental: bool = False) -> Dict[str, Any]:
+    """Load schema cards, rebuilding them when the live schema has changed.
+
+    ``refresh`` forces a rebuild; with ``incremental`` only tables whose hash
+    changed are rebuilt. A fingerprint mismatch always refreshes incrementally.
+    The returned ``cards`` mapping decodes each card on first access.
+    """
+
+    def _package(cards: Mapping[str, Dict[str, Any]], meta: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "cards": cards,
             "fingerprint": meta.get("fingerprint"),
             "tables": meta.get("tables", []),
         }
 
-    if refresh or not INDEX_PATH.exists():
-        cards = build_schema_cards()
-        meta = save_schema_cards(cards)
-        return _package(cards, meta)
-
+    store = _store()
     try:
-        index_data = json.loads(INDEX_PATH.read_text())
-    except json.JSONDecodeError:
-        logger.warning("Schema index corrupted; rebuilding catalog")
-        cards = build_schema_cards()
-        meta = save_schema_cards(cards)
-        return _package(cards, meta)
-
-    tables_entry = index_data.get("tables") or []
-    cards = _load_cards_from_disk(tables_entry)
-    if cards is None:
-        cards = build_schema_cards()
-        meta = save_schema_cards(cards)
+        index_data = store.read_index()
+    except sqlite3.DatabaseError:
+        logger.warning("Schema card store corrupted; rebuilding catalog")
+        store.close()
+        store.path.unlink(missing_ok=True)
+        store.invalidate()
+        index_data = None
+
+    if index_data is None or (refresh and not incremental):
+        cards, meta = _rebuild_schema_cards()
         return _package(cards, meta)
 
     stored_fp = index_data.get("fingerprint")
     current_fp: Optional[str] = None
+    snapshot: Optional[CatalogSnapshot] = None
     try:
-        from .introspect import schema_fingerprint as live_schema_fingerprint
-
-        current_fp = live_schema_fingerprint()
+        snapshot = get_catalog_snapshot(force_refresh=refresh)
+        current_fp = snapshot.fingerprint
     except Exception as exc:  # pragma: no cover - defensive
         logger.debug("Failed to compute live schema fingerprint: %s", exc)
 
-    if stored_fp and current_fp and stored_fp != current_fp:
-        cards = build_schema_cards()
-        meta = save_schema_cards(cards)
-        return _package(cards, meta)
+    if snapshot is not None and (refresh or (stored_fp and stored_fp != current_fp)):
+        patched = _refresh_changed_cards(snapshot, index_data)
+        if patched is None:
+            patched = _rebuild_schema_cards(snapshot)
+        return _package(*patched)
 
-    result = {
-        "cards": cards,
+    tables_entry = index_data.get("tables") or []
+    return {
+        "cards": LazyCards(store, tables_entry),
         "fingerprint": stored_fp or current_fp,
         "tables": tables_entry,
     }
 
-    if not SLIM_INDEX_PATH.exists():
-        slim_payload = build_schema_index_slim(cards, fingerprint=result.get("fingerprint"))
-        save_schema_index_slim(slim_payload)
-
-    return result
 
-
-def get_cached_cards() -> Dict[str, Dict[str, Any]]:
+def get_cached_cards() -> Mapping[str, Dict[str, Any]]:
     global _CARDS_CACHE, _CARDS_FP
     if _CARDS_CACHE is not None:
         try:
-            index_data = json.loads(INDEX_PATH.read_text())
-            fingerprint = index_data.get("fingerprint")
+            fingerprint = _store().fingerprint()
             if not fingerprint or fingerprint == _CARDS_FP:
                 return _CARDS_CACHE
         except Exception:  # pragma: no cover - defensive
             pass
 
-    payload = load_schema_cards(refresh=_CARDS_CACHE is None)
+    payload = load_schema_cards(refresh=_CARDS_CACHE is None, incremental=True)
     cards = payload.get("cards") or {}
     fingerprint = payload.get("fingerprint")
     _CARDS_CACHE = cards
@@ -682,6 +914,12 @@ def get_cached_cards() -> Dict[str, Dict[str, Any]]:
     return _CARDS_CACHE or {}
 
 
+def invalidate_cards_cache() -> None:
+    global _CARDS_CACHE, _CARDS_FP
+    _CARDS_CACHE = None
+    _CARDS_FP = None
+
+
 def table_aliases(cards: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
     out: Dict[str, List[str]] = {}
     for key, card in cards.items():
@@ -693,6 +931,7 @@ def table_aliases(cards: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
 __all__ = [
     "load_schema_cards",
     "get_cached_cards",
+    "invalidate_cards_cache",
     "load_schema_index_slim",
     "build_schema_index_slim",
     "save_schema_index_slim",
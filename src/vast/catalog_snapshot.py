@@ -0,0 +1,292 @@
+"""Set-based catalog snapshot shared by every schema fingerprint consumer.
+
+A snapshot reads all eligible tables and their columns from ``pg_catalog``
+in a single query (plus one batched privilege check) instead of reflecting
+table by table. ``introspect``, ``identifier_guard``, ``knowledge``,
+``agent`` and ``catalog_pg`` all derive their schema views and fingerprints
+from the same snapshot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from .config import settings
+from .db import get_pool_engine
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_USAGE_SQL = """
+SELECT s.schema_name,
+       COALESCE(has_schema_privilege(n.oid, 'USAGE'), FALSE) AS has_usage
+FROM unnest(CAST(:schemas AS text[])) AS s(schema_name)
+LEFT JOIN pg_catalog.pg_namespace n ON n.nspname = s.schema_name
+""".strip()
+
+# Mirrors information_schema.tables (BASE TABLE, visible to the current role)
+# joined with the attribute catalog so tables and columns arrive together.
+CATALOG_SNAPSHOT_SQL = """
+WITH rels AS (
+  SELECT c.oid, n.nspname, c.relname
+  FROM pg_catalog.pg_class c
+  JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+  WHERE n.nspname = ANY(:schemas)
+    AND c.relkind IN ('r', 'p')
+    AND c.relpersistence <> 't'
+    AND NOT (n.nspname = :ddl_schema AND c.relname = 'vast_ddl_log')
+    AND (
+      pg_has_role(c.relowner, 'USAGE')
+      OR has_table_privilege(c.oid, 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+      OR has_any_column_privilege(c.oid, 'SELECT, INSERT, UPDATE, REFERENCES')
+    )
+)
+SELECT
+  r.nspname                                AS table_schema,
+  r.relname                                AS table_name,
+  a.attname                                AS column_name,
+  pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
+  a.attnotnull                             AS not_null,
+  pg_catalog.pg_get_expr(d.adbin, d.adrelid) AS column_default
+FROM rels r
+LEFT JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = r.oid AND a.attnum > 0 AND NOT a.attisdropped
+LEFT JOIN pg_catalog.pg_attrdef d
+  ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+ORDER BY r.nspname, r.relname, a.attnum
+""".strip()
+
+
+TableKey = Tuple[str, str]
+
+
+@dataclass
+class CatalogSnapshot:
+    """Tables and columns of the eligible schemas at one point in time."""
+
+    tables: List[TableKey]
+    columns: Dict[TableKey, List[Dict[str, Any]]]
+    captured_at: float = field(default_factory=time.time)
+    # False when the catalog could not be read; such a snapshot is never cached.
+    complete: bool = True
+    _fingerprint: Optional[str] = field(default=None, init=False, repr=False)
+    _detailed_fingerprint: Optional[str] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "CatalogSnapshot":
+        """Build a snapshot from ``CATALOG_SNAPSHOT_SQL``-shaped rows."""
+
+        tables: List[TableKey] = []
+        columns: Dict[TableKey, List[Dict[str, Any]]] = {}
+        for row in rows:
+            key = (str(row["table_schema"]), str(row["table_name"]))
+            if key not in columns:
+                tables.append(key)
+                columns[key] = []
+            name = row.get("column_name")
+            if name is None:
+                continue
+            columns[key].append(
+                {
+                    "column_name": name,
+                    "data_type": row.get("data_type"),
+                    "is_nullable": "NO" if row.get("not_null") else "YES",
+                    "column_default": row.get("column_default"),
+                }
+            )
+        tables.sort()
+        return cls(tables=tables, columns=columns)
+
+    def list_tables(self) -> List[Dict[str, str]]:
+        return [{"table_schema": schema, "table_name": table} for schema, table in self.tables]
+
+    def table_columns(self, schema: str, table: str) -> List[Dict[str, Any]]:
+        return [dict(col) for col in self.columns.get((schema, table), [])]
+
+    def schema_map(self) -> Dict[str, Dict[str, Set[str]]]:
+        """Return ``schema -> table -> {columns}`` for identifier validation."""
+
+        out: Dict[str, Dict[str, Set[str]]] = {}
+        for schema, table in self.tables:
+            out.setdefault(schema, {})[table] = {
+                col["column_name"] for col in self.columns.get((schema, table), [])
+            }
+        return out
+
+    def column_specs(self) -> List[Tuple[str, str, Sequence[Tuple[str | None, str | None]]]]:
+        return [
+            (
+                schema,
+                table,
+                [(col.get("column_name"), col.get("data_type")) for col in self.columns.get((schema, table), [])],
+            )
+            for schema, table in self.tables
+        ]
+
+    @property
+    def fingerprint(self) -> str:
+        """Deterministic fingerprint of (schema, table, column, type)."""
+
+        if self._fingerprint is None:
+            from .introspect import fingerprint_from_columns
+
+            self._fingerprint = fingerprint_from_columns(self.column_specs())
+        return self._fingerprint
+
+    def table_hashes(self) -> Dict[str, str]:
+        """Per-table fingerprints keyed by ``schema.table``, same inputs as ``fingerprint``."""
+
+        from .introspect import fingerprint_from_columns
+
+        return {
+            f"{schema}.{table}": fingerprint_from_columns([(schema, table, columns)])
+            for schema, table, columns in self.column_specs()
+        }
+
+    @property
+    def detailed_fingerprint(self) -> str:
+        """Order-independent fingerprint that also covers nullability and defaults."""
+
+        if self._detailed_fingerprint is None:
+            payload: List[Dict[str, Any]] = []
+            for schema, table in self.tables:
+                cols = [
+                    {
+                        "name": col.get("column_name"),
+                        "type": col.get("data_type"),
+                        "nullable": col.get("is_nullable"),
+                        "default": col.get("column_default"),
+                    }
+                    for col in self.columns.get((schema, table), [])
+                ]
+                cols.sort(key=lambda item: item["name"] or "")
+                payload.append({"relation": f"{schema}.{table}", "columns": cols})
+            payload.sort(key=lambda item: item["relation"])
+            encoded = json.dumps(payload, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
+            self._detailed_fingerprint = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        return self._detailed_fingerprint
+
+
+def eligible_schemas(engine, schemas: Sequence[str]) -> List[str]:
+    """Return the subset of ``schemas`` the current role has USAGE on, in one query."""
+
+    if not schemas:
+        return []
+    stmt = text(SCHEMA_USAGE_SQL).bindparams(bindparam("schemas", type_=ARRAY(String)))
+    with engine.connect() as conn:
+        rows = conn.execute(stmt, {"schemas": list(schemas)}).mappings().all()
+
+    usage = {row["schema_name"]: bool(row["has_usage"]) for row in rows}
+    allowed: List[str] = []
+    for schema in schemas:
+        if usage.get(schema):
+            allowed.append(schema)
+        else:
+            logger.debug("Skipping schema %s due to missing USAGE privilege", schema)
+    return allowed
+
+
+def capture_catalog_snapshot(engine=None, schemas: Sequence[str] | None = None) -> CatalogSnapshot:
+    """Read tables and columns for the included schemas from ``pg_catalog``."""
+
+    from .introspect import INCLUDE_SCHEMAS
+
+    engine = engine or get_pool_engine("catalog")
+    try:
+        allowed = eligible_schemas(engine, list(schemas if schemas is not None else INCLUDE_SCHEMAS))
+    except Exception as exc:
+        logger.warning("Could not check schema privileges; the catalog reads as empty: %s", exc)
+        return CatalogSnapshot(tables=[], columns={}, complete=False)
+    if not allowed:
+        return CatalogSnapshot(tables=[], columns={})
+
+    stmt = text(CATALOG_SNAPSHOT_SQL).bindparams(bindparam("schemas", type_=ARRAY(String)))
+    with engine.connect() as conn:
+        rows = conn.execute(
+            stmt, {"schemas": allowed, "ddl_schema": settings.VAST_DDL_LOG_SCHEMA}
+        ).mappings().all()
+    return CatalogSnapshot.from_rows(rows)
+
+
+_SNAPSHOT_LOCK = threading.Lock()
+_SNAPSHOT: CatalogSnapshot | None = None
+_SNAPSHOT_AT: float = 0.0
+# Snapshots read through a caller-supplied engine, dropped with the engine.
+_ENGINE_SNAPSHOTS: "weakref.WeakKeyDictionary[Any, Tuple[CatalogSnapshot, float]]" = weakref.WeakKeyDictionary()
+# Set while a schema change listener is connected; snapshots then live until
+# a DDL notification invalidates them instead of expiring on the TTL.
+_PUSH_INVALIDATION = False
+
+
+def set_push_invalidation(enabled: bool) -> None:
+    global _PUSH_INVALIDATION
+    _PUSH_INVALIDATION = bool(enabled)
+
+
+def _snapshot_ttl_seconds() -> float:
+    value = getattr(settings, "VAST_CATALOG_SNAPSHOT_TTL_MS", 1000)
+    try:
+        return max(0.0, float(value) / 1000.0)
+    except (TypeError, ValueError):  # pragma: no cover - defensive
+        return 1.0
+
+
+def get_catalog_snapshot(force_refresh: bool = False, engine=None) -> CatalogSnapshot:
+    """Return the shared snapshot, re-reading the catalog once it is older than the TTL.
+
+    ``engine`` reads the catalog through that engine instead of the shared
+    catalog pool; its snapshot is cached separately under the same TTL.
+    """
+
+    global _SNAPSHOT, _SNAPSHOT_AT
+
+    with _SNAPSHOT_LOCK:
+        now = time.monotonic()
+        cached, cached_at = (_SNAPSHOT, _SNAPSHOT_AT) if engine is None else _ENGINE_SNAPSHOTS.get(engine, (None, 0.0))
+        if (
+            not force_refresh
+            and cached is not None
+            and (_PUSH_INVALIDATION or (now - cached_at) < _snapshot_ttl_seconds())
+        ):
+            return cached
+
+        snapshot = capture_catalog_snapshot(engine)
+        if not snapshot.complete:
+            return snapshot
+        if engine is None:
+            _SNAPSHOT = snapshot
+            _SNAPSHOT_AT = time.monotonic()
+        else:
+            _ENGINE_SNAPSHOTS[engine] = (snapshot, time.monotonic())
+        return snapshot
+
+
+def invalidate_catalog_snapshot() -> None:
+    """Drop the shared snapshot so the next reader re-queries the catalog."""
+
+    global _SNAPSHOT, _SNAPSHOT_AT
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT = None
+        _SNAPSHOT_AT = 0.0
+        _ENGINE_SNAPSHOTS.clear()
+
+
+__all__ = [
+    "CatalogSnapshot",
+    "CATALOG_SNAPSHOT_SQL",
+    "SCHEMA_USAGE_SQL",
+    "capture_catalog_snapshot",
+    "eligible_schemas",
+    "get_catalog_snapshot",
+    "invalidate_catalog_snapshot",
+    "set_push_invalidation",
+]
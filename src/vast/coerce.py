@@ -0,0 +1,226 @@
+"""Type-dispatched coercion of database values to JSON-friendly ones.
+
+Result sets are coerced a column at a time: each column's type is read once
+(the driver's type OID from ``cursor.description``, else the first non-null
+value), mapped to one converter, and the converter runs over the column in a
+tight loop. Int, float, bool and text columns are left untouched.
+``coerce_value`` is the per-value fallback for values of unknown type; it
+dispatches on ``type(value)`` before falling back to ``isinstance`` checks.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import PurePath
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+
+Converter = Callable[[Any], Any]
+
+# PostgreSQL type OIDs (pg_type.oid) as reported in cursor.description.
+PG_TYPE_OIDS = {
+    16: "boolean",
+    20: "integer",
+    21: "integer",
+    23: "integer",
+    26: "integer",
+    700: "float",
+    701: "float",
+    1700: "numeric",
+    18: "text",
+    19: "text",
+    25: "text",
+    1042: "text",
+    1043: "text",
+    17: "bytes",
+    1082: "date",
+    1083: "time",
+    1266: "time",
+    1114: "timestamp",
+    1184: "timestamp",
+    1186: "interval",
+    2950: "uuid",
+    114: "json",
+    3802: "json",
+}
+
+# Types whose values are already JSON-native. ``json`` only comes from the
+# cursor description: the driver decodes it, so it cannot hold dates or
+# decimals. Containers typed from their values are ``object``/``array``.
+NATIVE_TYPES = frozenset({"integer", "float", "boolean", "text", "null", "json"})
+
+_IDENTITY = frozenset({str, int, float, bool, type(None)})
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat()
+
+
+def _bytea_hex(value: Any) -> str:
+    # PostgreSQL's own text form for bytea (bytea_output = hex).
+    return "\\x" + bytes(value).hex()
+
+
+def _decimal_exact(value: Decimal) -> Any:
+    try:
+        as_int = int(value)
+    except (ValueError, OverflowError):
+        return float(value)
+    return as_int if as_int == value else float(value)
+
+
+_SCALAR_CONVERTERS = {
+    datetime: _iso,
+    date: _iso,
+    time: _iso,
+    timedelta: str,
+    UUID: str,
+    bytes: _bytea_hex,
+    bytearray: _bytea_hex,
+    memoryview: _bytea_hex,
+}
+
+
+def coerce_value(value: Any, *, exact_decimals: bool = False, default: Optional[Converter] = None) -> Any:
+    """Coerce one value; containers are coerced recursively.
+
+    ``exact_decimals`` renders integral decimals as ints (floats otherwise);
+    ``default`` handles values of any other type, which are returned as-is
+    when it is not given.
+    """
+    kind = type(value)
+    if kind in _IDENTITY:
+        return value
+    if kind is Decimal:
+        return _decimal_exact(value) if exact_decimals else float(value)
+    converter = _SCALAR_CONVERTERS.get(kind)
+    if converter is not None:
+        return converter(value)
+    if isinstance(value, dict):
+        return {k: coerce_value(v, exact_decimals=exact_decimals, default=default) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [coerce_value(v, exact_decimals=exact_decimals, default=default) for v in value]
+    # Subclasses (pendulum datetimes, IntEnum, PosixPath, ...).
+    if isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return _decimal_exact(value) if exact_decimals else float(value)
+    if isinstance(value, (UUID, PurePath, timedelta)):
+        return str(value)
+    return value if default is None else default(value)
+
+
+def logical_type(values: Iterable[Any]) -> str:
+    """Name the type of a column from its first non-null value."""
+
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return "boolean"
+        if isinstance(value, int):
+            return "integer"
+        if isinstance(value, float):
+            return "float"
+        if isinstance(value, Decimal):
+            return "numeric"
+        if isinstance(value, datetime):
+            return "timestamp"
+        if isinstance(value, date):
+            return "date"
+        if isinstance(value, time):
+            return "time"
+        if isinstance(value, timedelta):
+            return "interval"
+        if isinstance(value, UUID):
+            return "uuid"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "bytes"
+        if isinstance(value, dict):
+            return "object"
+        if isinstance(value, (list, tuple, set)):
+            return "array"
+        if isinstance(value, str):
+            return "text"
+        return "other"
+    return "null"
+
+
+def description_types(description: Optional[Sequence[Any]]) -> List[Optional[str]]:
+    """Logical types from a DB-API ``cursor.description`` (None where unknown)."""
+
+    out: List[Optional[str]] = []
+    for column in description or ():
+        try:
+            type_code = column[1]
+        except (IndexError, TypeError):
+            type_code = None
+        out.append(PG_TYPE_OIDS.get(type_code) if isinstance(type_code, int) else None)
+    return out
+
+
+def converter_for(kind: str, *, exact_decimals: bool = False) -> Optional[Converter]:
+    """The converter for a logical type; None means values pass through."""
+
+    if kind in NATIVE_TYPES:
+        return None
+    if kind == "numeric":
+        return _decimal_exact if exact_decimals else float
+    if kind in {"timestamp", "date", "time"}:
+        return _iso
+    if kind in {"uuid", "interval"}:
+        return str
+    if kind == "bytes":
+        return _bytea_hex
+    return lambda value: coerce_value(value, exact_decimals=exact_decimals)
+
+
+def coerce_column(values: List[Any], kind: str, *, exact_decimals: bool = False) -> List[Any]:
+    """Apply the column's converter to every non-null value.
+
+    If a value does not fit the converter (SQLite's dynamic typing), the
+    whole column falls back to ``coerce_value``. Native columns are trusted.
+    """
+    converter = converter_for(kind, exact_decimals=exact_decimals)
+    if converter is None:
+        return values
+    try:
+        return [value if value is None else converter(value) for value in values]
+    except (AttributeError, TypeError, ValueError):
+        return [coerce_value(value, exact_decimals=exact_decimals) for value in values]
+
+
+def row_converters(kinds: Sequence[str], *, exact_decimals: bool = False) -> List[Optional[Converter]]:
+    """Per-column converters for row-at-a-time consumers such as streaming."""
+
+    return [converter_for(kind, exact_decimals=exact_decimals) for kind in kinds]
+
+
+def coerce_row(values: Sequence[Any], converters: Sequence[Optional[Converter]]) -> List[Any]:
+    out = list(values)
+    for index, converter in enumerate(converters):
+        value = out[index]
+        if converter is None or value is None:
+            continue
+        try:
+            out[index] = converter(value)
+        except (AttributeError, TypeError, ValueError):
+            out[index] = coerce_value(value)
+    return out
+
+
+__all__ = [
+    "NATIVE_TYPES",
+    "PG_TYPE_OIDS",
+    "coerce_column",
+    "coerce_row",
+    "coerce_value",
+    "converter_for",
+    "description_types",
+    "logical_type",
+    "row_converters",
+]
@@ -0,0 +1,126 @@
+"""Columnar query results.
+
+``ColumnarResult`` holds a result set as column names, one logical type per
+column and one list of values per column. It is built once from the cursor
+and every output renders from it: row dicts for the legacy payload shape,
+``{"columns", "types", "data"}`` JSON for columnar clients, and Arrow IPC
+when ``pyarrow`` is installed.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from .coerce import coerce_column, description_types, logical_type
+
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError("Arrow output requires pyarrow (pip install pyarrow).") from exc
+    return pyarrow
+
+
+class ColumnarResult:
+    """Column names, logical types and per-column value lists."""
+
+    __slots__ = ("columns", "types", "data", "row_count")
+
+    def __init__(self, columns: Sequence[str], types: Sequence[str], data: Sequence[List[Any]]):
+        self.columns = list(columns)
+        self.types = list(types)
+        self.data = list(data)
+        self.row_count = len(self.data[0]) if self.data else 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        types: Optional[Sequence[Optional[str]]] = None,
+    ) -> "ColumnarResult":
+        """Transpose ``rows`` and coerce each column with one converter.
+
+        ``types`` are known logical types (e.g. from the cursor description);
+        columns without one are typed from their first non-null value.
+        """
+        columns = list(columns)
+        if rows:
+            raw = [list(values) for values in zip(*rows)]
+        else:
+            raw = [[] for _ in columns]
+        known = list(types or ())
+        kinds = [
+            (known[index] if index < len(known) else None) or logical_type(values)
+            for index, values in enumerate(raw)
+        ]
+        return cls(columns, kinds, [coerce_column(values, kind) for kind, values in zip(kinds, raw)])
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "ColumnarResult":
+        columns = list(records[0].keys()) if records else []
+        return cls.from_rows(columns, [[row.get(col) for col in columns] for row in records])
+
+    @classmethod
+    def from_result(cls, res) -> "ColumnarResult":
+        """Drain a SQLAlchemy result straight into columns."""
+
+        cursor = getattr(res, "cursor", None)
+        types = description_types(getattr(cursor, "description", None))
+        return cls.from_rows(list(res.keys()), res.fetchall(), types)
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def head(self, limit: int) -> "ColumnarResult":
+        return ColumnarResult(self.columns, self.types, [values[:limit] for values in self.data])
+
+    def records(self) -> List[Dict[str, Any]]:
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in zip(*self.data)]
+
+    def table(self, limit: Optional[int] = None) -> List[List[Any]]:
+        data = self.data if limit is None else [values[:limit] for values in self.data]
+        return [list(row) for row in zip(*data)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "columns": self.columns,
+            "types": self.types,
+            "data": self.data,
+            "row_count": self.row_count,
+        }
+
+    def to_arrow(self):
+        pa = _require_pyarrow()
+        arrow_types = {
+            "integer": pa.int64(),
+            "float": pa.float64(),
+            "numeric": pa.float64(),
+            "boolean": pa.bool_(),
+            "null": pa.null(),
+        }
+        arrays = []
+        for kind, values in zip(self.types, self.data):
+            if kind in {"json", "object", "array"}:
+                values = [None if v is None else json.dumps(v, default=str) for v in values]
+            arrays.append(pa.array(values, type=arrow_types.get(kind, pa.string())))
+        return pa.Table.from_arrays(arrays, names=self.columns)
+
+    def to_arrow_ipc(self) -> bytes:
+        """Serialise to the Arrow IPC stream format."""
+
+        pa = _require_pyarrow()
+        table = self.to_arrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+__all__ = ["ARROW_MEDIA_TYPE", "ColumnarResult"]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +21,75 @@ class Settings(BaseSettings):
     VAST_DIAGNOSTICS: int | bool = 0
     VAST_SCHEMA_INCLUDE: str = "public"
     VAST_DEFAULT_LIMIT: int = 10
+    VAST_CATALOG_SNAPSHOT_TTL_MS: int = 1_000
+    VAST_SCHEMA_LISTEN: bool = False
+    VAST_SCHEMA_CHANNEL: str = "vast_schema"
+    VAST_DDL_LOG_SCHEMA: str = "public"
+    VAST_PARSE_CACHE_SIZE: int = 512
+    VAST_PARSE_WORKERS: int = 0
+    VAST_PARSE_POOL_MIN_CHARS: int = 4_000
+    VAST_STREAM_CHUNK_ROWS: int = 1_000
+    VAST_STREAM_MAX_ROWS: int = 1_000_000
+    VAST_STREAM_MAX_BYTES: int = 256 * 1024 * 1024
+    VAST_PAGE_SIZE: int = 50
+    VAST_RESULT_CACHE: bool = False
+    VAST_RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    VAST_RESULT_CACHE_TTL_MS: int = 60_000
+    VAST_RESULT_CACHE_STAT_CHECK: bool = False
+    VAST_ASYNC_POOL_SIZE: int = 10
+    # Cancel API/MCP requests still running after this long; None waits indefinitely.
+    VAST_REQUEST_TIMEOUT_S: float | None = None
+    # Gate forced writes on their executed row count (rolled back if over max_write_rows).
+    VAST_WRITE_EXACT_COUNT: bool = False
+    VAST_BULK_CHUNK_ROWS: int = 1_000
+    # /sql/bulk uploads larger than this are spooled to a temporary file while they load.
+    VAST_BULK_SPOOL_BYTES: int = 8 * 1024 * 1024
+    # Audit trail (see vast.audit): async | sync | fsync; 0 bytes / None interval disables rotation.
+    VAST_AUDIT_MODE: Literal["async", "sync", "fsync"] = "async"
+    VAST_AUDIT_QUEUE_SIZE: int = 10_000
+    VAST_AUDIT_BATCH_SIZE: int = 256
+    VAST_AUDIT_FLUSH_MS: int = 200
+    VAST_AUDIT_ROTATE_BYTES: int = 64 * 1024 * 1024
+    VAST_AUDIT_ROTATE_INTERVAL_S: int | None = None
+    VAST_AUDIT_GZIP: bool = False
+    VAST_AUDIT_BACKUPS: int = 10
+    # SQLite index behind /audit/events filters; 0 keeps every row.
+    VAST_AUDIT_INDEX: bool = True
+    VAST_AUDIT_INDEX_MAX_ROWS: int = 1_000_000
+    # Conversation journal records between snapshot rewrites (see vast.session_store).
+    VAST_SESSION_COMPACT_EVERY: int = 200
+    # Where sessions live (see vast.session_store): file | sqlite | postgres.
+    VAST_SESSION_BACKEND: Literal["file", "sqlite", "postgres"] = "file"
+    VAST_SESSION_SQLITE_PATH: str = ".vast/sessions.sqlite3"
+    # Postgres backend: defaults to the write database.
+    VAST_SESSION_DATABASE_URL: str | None = None
+    VAST_SESSION_PG_SCHEMA: str = "vast"
+    # Resident API conversations (see vast.session_registry); 0 disables the idle/memory limits.
+    VAST_SESSION_MAX_RESIDENT: int = 32
+    VAST_SESSION_IDLE_S: float = 1800.0
+    VAST_SESSION_MEMORY_BUDGET_MB: int = 256
+    # Named connection pools (see vast.pools); a None timeout uses default_statement_timeout_ms.
+    VAST_POOL_TIMEOUT_S: float = 30.0
+    VAST_POOL_INTERACTIVE_SIZE: int = 5
+    VAST_POOL_INTERACTIVE_MAX_OVERFLOW: int = 5
+    VAST_POOL_INTERACTIVE_STATEMENT_TIMEOUT_MS: int | None = None
+    VAST_POOL_INTERACTIVE_PRE_PING: bool = True
+    VAST_POOL_INTERACTIVE_RECYCLE_S: int = 1_800
+    VAST_POOL_CATALOG_SIZE: int = 2
+    VAST_POOL_CATALOG_MAX_OVERFLOW: int = 0
+    VAST_POOL_CATALOG_STATEMENT_TIMEOUT_MS: int | None = None
+    VAST_POOL_CATALOG_PRE_PING: bool = True
+    VAST_POOL_CATALOG_RECYCLE_S: int = 1_800
+    VAST_POOL_MAINTENANCE_SIZE: int = 1
+    VAST_POOL_MAINTENANCE_MAX_OVERFLOW: int = 1
+    VAST_POOL_MAINTENANCE_STATEMENT_TIMEOUT_MS: int | None = None
+    VAST_POOL_MAINTENANCE_PRE_PING: bool = True
+    VAST_POOL_MAINTENANCE_RECYCLE_S: int = 1_800
+    VAST_POOL_WRITE_SIZE: int = 2
+    VAST_POOL_WRITE_MAX_OVERFLOW: int = 3
+    VAST_POOL_WRITE_STATEMENT_TIMEOUT_MS: int | None = None
+    VAST_POOL_WRITE_PRE_PING: bool = True
+    VAST_POOL_WRITE_RECYCLE_S: int = 1_800
 
     # Legacy fields kept for backward compatibility
     default_statement_timeout_ms: int = 8_000
@@ -33,6 +33,7 @@ from .system_ops import SystemOperations
 from . import service
 from .knowledge import get_knowledge_store
 from .facts import FactsRuntime, try_answer_with_facts
+from .session_store import SessionConflict, SessionJournal
 import src.vast.catalog_pg as catalog_pg
 from .identifier_guard import (
     IdentifierValidationError,
@@ -53,10 +54,13 @@ except Exception:
 console = Console()
 logger = logging.getLogger(__name__)
 
-# Conversation storage path
+# Conversation storage path (file session backend)
 CONVERSATION_DIR = Path(".vast/conversations")
 CONVERSATION_DIR.mkdir(parents=True, exist_ok=True)
 
+# Saves retried after rebasing onto another worker's appends.
+SAVE_ATTEMPTS = 5
+
 class MessageRole(Enum):
     USER = "user"
     ASSISTANT = "assistant"
@@ -120,6 +124,7 @@ class VastConversation:
     def __init__(self, session_name: str = None):
         self.session_name = session_name or f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.session_file = CONVERSATION_DIR / f"{self.session_name}.json"
+        self._journal = SessionJournal(self.session_name)
         
         self.messages: List[Message] = []
         self.context: ConversationContext = None
@@ -131,7 +136,7 @@ class VastConversation:
         self.system_ops = SystemOperations()  # Add system operations capability
         
         # Load or initialize
-        if self.session_file.exists():
+        if self._journal.exists():
             self._load_session()
         else:
             self._initialize_session()
@@ -212,31 +217,22 @@ Tone: precise, confident, and free of pleasantries or invitations (no "let me kn
         
         console.print("[green]✓ VAST initialized with current database context[/]")
     
-    def _atomic_write(self, path: Path, text: str) -> None:
-        """Write a file atomically to avoid partial/corrupt JSON on crashes."""
-        tmp = path.with_suffix(path.suffix + ".tmp")
-        path.parent.mkdir(parents=True, exist_ok=True)
-        tmp.write_text(text, encoding="utf-8")
-        tmp.replace(path)
-
     def _load_session(self):
-        """Load an existing conversation from disk; recover from corruption."""
+        """Load an existing conversation (snapshot + journal); recover from corruption."""
         try:
-            with open(self.session_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            messages, context = self._journal.load()
         except Exception as exc:
             # Backup corrupt file and start fresh
             try:
-                backup = self.session_file.with_suffix(self.session_file.suffix + ".corrupt")
-                self.session_file.rename(backup)
+                backup = self._journal.quarantine()
                 console.print(f"[yellow]Corrupt session file detected; backed up to {backup} and reinitializing.[/]")
             except Exception:
                 console.print("[yellow]Corrupt session file detected; reinitializing session.[/]")
             self._initialize_session()
             return
 
-        self.messages = [Message.from_dict(m) for m in data["messages"]]
-        self.context = ConversationContext.from_dict(data["context"])
+        self.messages = [Message.from_dict(m) for m in messages]
+        self.context = ConversationContext.from_dict(context)
         
         # Check if schema has changed
         current_fingerprint = schema_fingerprint()
@@ -245,25 +241,20 @@ Tone: precise, confident, and free of pleasantries or invitations (no "let me kn
             self._refresh_schema_context()
     
     def _save_session(self):
-        """Persist conversation to disk"""
-        data = {
-            "session_name": self.session_name,
-            "messages": [m.to_dict() for m in self.messages],
-            "context": self.context.to_dict(),
-            "last_updated": datetime.now().isoformat()
-        }
-        # Normalize entire payload to JSON-safe structure
-        CUSTOM_ENCODERS = {
-            datetime: lambda x: x.isoformat(),
-            date: lambda x: x.isoformat(),
-            Decimal: float,
-            uuid.UUID: str,
-            Path: str,
-        }
-        safe = jsonable_encoder(data, custom_encoder=CUSTOM_ENCODERS)
-
-        # Write atomically to prevent partial writes
-        self._atomic_write(self.session_file, json.dumps(safe, indent=2))
+        """Persist new messages; if another worker saved first, rebase onto it and retry."""
+        for _ in range(SAVE_ATTEMPTS - 1):
+            try:
+                self._journal.save(self.messages, self.context)
+                return
+            except SessionConflict:
+                self.sync_session()
+        self._journal.save(self.messages, self.context)
+
+    def sync_session(self):
+        """Pick up messages (and context) other workers saved to this session."""
+        context = self._journal.rebase(self.messages, self.context, Message.from_dict)
+        if context is not None:
+            self.context = ConversationContext.from_dict(context)
     
     def _refresh_schema_context(self):
         """Update context when database schema changes"""
@@ -1,33 +1,35 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
 from dataclasses import dataclass
-from datetime import date, datetime
-from decimal import Decimal
-from enum import Enum, auto
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Set
-from uuid import UUID
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import make_url, text
 from sqlalchemy.engine import Engine
-from sqlglot import parse, parse_one
-from sqlglot import exp
-from sqlglot.errors import ParseError
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from .config import settings, write_url, read_url
 from .sql_params import stmt_kind
 from .audit import audit_event
-
-
-class StatementType(Enum):
-    READ = auto()
-    WRITE = auto()
-    DDL = auto()
+# StatementType and SET_OPERATION_TYPES moved to .statement; re-exported here.
+from .statement import SET_OPERATION_TYPES, ParsedStatement, StatementType, parse_statement, render_sql  # noqa: F401
+from .trace import stage
+from .coerce import coerce_row, coerce_value as _coerce_value, description_types, logical_type, row_converters
+from .columnar import ColumnarResult
+from . import result_cache
+from .cancellation import cancel_hook, check_cancelled, current_request, raise_if_cancelled
+from .pools import ASYNC_SUFFIX, create_async_pool_engine, create_pool_engine, forget_engine, pool_stats  # noqa: F401
 
 
 _engine_ro: Engine | None = None
 _engine_rw: Engine | None = None
+_async_engine_ro: AsyncEngine | None = None
+_async_engine_rw: AsyncEngine | None = None
+_pool_engines: Dict[str, Engine] = {}
+_POOL_LOCK = threading.Lock()
 
 
 @dataclass
@@ -39,53 +41,16 @@ class SQLAnalysis:
     is_select: bool
 
 
-# Compatibility tuple for sqlglot set operations across versions
-# Some versions expose a common SetOperation base; others only provide
-# concrete nodes like Union/Except/Intersect.
-SET_OPERATION_TYPES = tuple(
-    t
-    for t in (
-        getattr(exp, "Union", None),
-        getattr(exp, "Except", None),
-        getattr(exp, "Intersect", None),
-        getattr(exp, "SetOperation", None),
-    )
-    if t is not None
-)
-
-
 def _mk_engine(url: str) -> Engine:
-    return create_engine(
-        url,
-        pool_pre_ping=True,
-        connect_args={
-            "options": (
-                f"-c statement_timeout={settings.default_statement_timeout_ms}"
-                f" -c idle_in_transaction_session_timeout={settings.idle_in_tx_timeout_ms}"
-            )
-        },
-    )
+    return create_pool_engine("write", url)
 
 
 def get_ro_engine() -> Engine:
+    """Engine of the ``interactive`` pool: user queries and their validation."""
+
     global _engine_ro
     if _engine_ro is None:
-        url = read_url()
-        connect_args = {
-            "application_name": "vast_ro",
-            "options": (
-                f"-c statement_timeout={settings.default_statement_timeout_ms}"
-                f" -c idle_in_transaction_session_timeout={settings.idle_in_tx_timeout_ms}"
-            ),
-        }
-        _engine_ro = create_engine(
-            url,
-            pool_size=3,
-            max_overflow=0,
-            pool_pre_ping=True,
-            pool_recycle=1800,
-            connect_args=connect_args,
-        )
+        _engine_ro = create_pool_engine("interactive")
     return _engine_ro
 
 
@@ -99,220 +64,140 @@ def get_engine(readonly: bool = True) -> Engine:
         return _engine_rw
 
 
-def _unwrap_with(node: exp.Expression) -> exp.Expression:
-    while isinstance(node, exp.With):
-        node = node.this
-    return node
+def get_pool_engine(name: str) -> Engine:
+    """Engine of a named workload pool (see ``vast.pools``)."""
 
+    if name == "interactive":
+        return get_ro_engine()
+    if name == "write":
+        return get_engine(readonly=False)
+    with _POOL_LOCK:
+        engine = _pool_engines.get(name)
+        if engine is None:
+            engine = _pool_engines[name] = create_pool_engine(name)
+    return engine
+
+
+def _async_url(url: str) -> str:
+    # psycopg 3 serves both sync and asyncio; other Postgres drivers are swapped for it.
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql" and parsed.get_driver_name() != "psycopg":
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed.render_as_string(hide_password=False)
+
+
+def get_async_ro_engine() -> AsyncEngine:
+    """Read-only asyncio engine; waits park on the event loop instead of a thread."""
+
+    global _async_engine_ro
+    if _async_engine_ro is None:
+        _async_engine_ro = create_async_pool_engine(
+            "interactive", _async_url(read_url()), size=settings.VAST_ASYNC_POOL_SIZE
+        )
+    return _async_engine_ro
 
-def _command_name(command: exp.Command) -> str:
-    name = command.name or ""
-    return name.upper()
 
+def get_async_engine(readonly: bool = True) -> AsyncEngine:
+    global _async_engine_rw
+    if readonly:
+        return get_async_ro_engine()
+    if _async_engine_rw is None:
+        _async_engine_rw = create_async_pool_engine("write", _async_url(write_url()))
+    return _async_engine_rw
 
-def _classify_statement(expr: exp.Expression) -> StatementType:
-    expr = _unwrap_with(expr)
 
-    # DDL nodes across sqlglot versions (AlterTable -> Alter; TruncateTable -> Truncate)
-    ddl_create = getattr(exp, "Create", None)
-    ddl_alter = getattr(exp, "AlterTable", None) or getattr(exp, "Alter", None)
-    ddl_drop = getattr(exp, "Drop", None)
-    ddl_truncate = getattr(exp, "TruncateTable", None) or getattr(exp, "Truncate", None)
-    ddl_nodes = tuple(t for t in (ddl_create, ddl_alter, ddl_drop, ddl_truncate) if t is not None)
-    if isinstance(expr, ddl_nodes) or any(expr.find(node) for node in ddl_nodes):
-        return StatementType.DDL
+async def dispose_async_engines() -> None:
+    """Close pooled asyncio connections; call before the event loop ends."""
 
-    if isinstance(expr, exp.Command):
-        command = _command_name(expr)
-        if command in {"EXPLAIN", "SHOW"}:
-            return StatementType.READ
-        if command in {"ANALYZE", "VACUUM"}:
-            return StatementType.WRITE
-        return StatementType.DDL
+    global _async_engine_ro, _async_engine_rw
+    for engine in (_async_engine_ro, _async_engine_rw):
+        if engine is not None:
+            await engine.dispose()
+    _async_engine_ro = _async_engine_rw = None
+    for name in ("interactive", "write"):
+        forget_engine(name + ASYNC_SUFFIX)
 
-    if isinstance(expr, (exp.Insert, exp.Update, exp.Delete, exp.Merge, exp.LoadData)):
-        return StatementType.WRITE
 
-    if isinstance(expr, exp.Select):
-        return StatementType.READ
+def analyze_sql(sql: str | ParsedStatement) -> SQLAnalysis:
+    statement = sql if isinstance(sql, ParsedStatement) else parse_statement(sql)
+    if not statement.ok:
+        raise ValueError(statement.error)
+    return SQLAnalysis(
+        statement_type=statement.statement_type,
+        normalized_sql=statement.normalized_sql,
+        tables=set(statement.tables),
+        columns=set(statement.columns),
+        is_select=statement.is_select,
+    )
 
-    # Fall back to scanning children
-    if expr.find(exp.Insert) or expr.find(exp.Update) or expr.find(exp.Delete) or expr.find(exp.Merge):
-        return StatementType.WRITE
 
-    if (
-        (ddl_create and expr.find(ddl_create))
-        or (ddl_drop and expr.find(ddl_drop))
-        or (ddl_alter and expr.find(ddl_alter))
-        or (ddl_truncate and expr.find(ddl_truncate))
-    ):
-        return StatementType.DDL
+def analyse_sql(sql: str) -> SQLAnalysis:  # noqa: D401
+    """British alias for analyze_sql."""
+    return analyze_sql(sql)
 
-    # Fail closed for unknown statements.
-    return StatementType.DDL
 
+def explain_plan(payload: Any) -> Optional[Dict[str, Any]]:
+    """Top-level ``Plan`` node of an ``EXPLAIN (FORMAT JSON)`` payload."""
 
-def analyze_sql(sql: str) -> SQLAnalysis:
     try:
-        expressions = parse(sql, read="postgres")
-    except ParseError as exc:
-        raise ValueError(f"Unable to parse SQL: {exc}") from exc
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        # Postgres returns a JSON array with a single object
+        plan = payload[0]["Plan"] if isinstance(payload, list) else payload["Plan"]
+        return plan if isinstance(plan, dict) else None
+    except Exception:
+        return None
 
-    if not expressions:
-        raise ValueError("No SQL statements provided")
-    if len(expressions) != 1:
-        raise ValueError("Only single statements are allowed")
 
-    expr = expressions[0]
-    classification = _classify_statement(expr)
-    normalized = expr.sql(dialect="postgres")
+def plan_row_estimate(payload: Any) -> Optional[int]:
+    """Top-level ``Plan Rows`` of an ``EXPLAIN (FORMAT JSON)`` payload."""
 
+    plan = explain_plan(payload)
+    if plan is None:
+        return None
     try:
-        root = parse_one(sql, read="postgres")
-    except ParseError:
-        root = expr
-
-    alias_map: dict[str, Tuple[Optional[str], str]] = {}
-    tables: Set[Tuple[Optional[str], str]] = set()
-    columns: Set[Tuple[Optional[str], Optional[str], str]] = set()
-
-    for table_expr in root.find_all(exp.Table):
-        table_name = table_expr.name
-        if not table_name:
-            continue
-        schema_name = table_expr.db or None
-        tables.add((schema_name, table_name))
-        tables.add((None, table_name))
-        # Alias compatibility across sqlglot versions: may be a string or an expression
-        alias_value = getattr(table_expr, "alias", None)
-        alias_name = None
-        if isinstance(alias_value, str):
-            alias_name = alias_value
-        elif alias_value is not None:
-            # Prefer direct .name if present; otherwise try .this.name
-            name_attr = getattr(alias_value, "name", None)
-            if isinstance(name_attr, str) and name_attr:
-                alias_name = name_attr
-            else:
-                alias_this = getattr(alias_value, "this", None)
-                alias_name = getattr(alias_this, "name", None)
-        if alias_name:
-            alias_map[alias_name] = (schema_name, table_name)
-
-    for column_expr in root.find_all(exp.Column):
-        column_name = column_expr.name
-        if not column_name:
-            continue
-        table_ref = column_expr.table
-        schema_ref: Optional[str] = None
-        table_resolved: Optional[str] = None
-        if table_ref:
-            mapping = alias_map.get(table_ref)
-            if mapping:
-                schema_ref, table_resolved = mapping
-            else:
-                table_resolved = table_ref
-        columns.add((schema_ref, table_resolved, column_name))
-        if table_resolved:
-            columns.add((None, table_resolved, column_name))
-        else:
-            columns.add((None, None, column_name))
+        return int(plan.get("Plan Rows") or plan.get("Rows") or 0)
+    except Exception:
+        return None
 
-    target = expr
-    while isinstance(target, exp.With):
-        target = target.this
-    is_select_stmt = isinstance(target, (exp.Select, *SET_OPERATION_TYPES))
-
-    return SQLAnalysis(
-        statement_type=classification,
-        normalized_sql=normalized,
-        tables=tables,
-        columns=columns,
-        is_select=is_select_stmt,
-    )
 
+def _explain_sql(sql: str) -> str:
+    return f"EXPLAIN (FORMAT JSON) {sql}"
 
-def analyse_sql(sql: str) -> SQLAnalysis:  # noqa: D401
-    """British alias for analyze_sql."""
-    return analyze_sql(sql)
 
-
-def _estimate_write_rows(sql: str, params: dict | None) -> Optional[int]:
+def _explain_write(conn, sql: str, params: dict | None) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
     """
-    For UPDATE/DELETE/MERGE: try EXPLAIN (FORMAT JSON) to estimate affected rows.
-    Returns None if estimate unavailable.
+    For UPDATE/DELETE/MERGE: EXPLAIN (FORMAT JSON) on the write transaction's
+    own connection, so the estimate sees the snapshot the write will run on.
+    Returns (estimated rows, plan); either is None when unavailable.
     """
-    explain_sql = f"EXPLAIN (FORMAT JSON) {sql}"
-    with get_ro_engine().begin() as conn:  # EXPLAIN is read-only
-        res = conn.execute(text(explain_sql), params or {})
-        row = res.fetchone()
-        if not row:
-            return None
-        try:
-            payload = row[0]  # JSON column
-            # Postgres returns a JSON array with a single object
-            plan = payload[0]["Plan"]
-            return int(plan.get("Plan Rows") or plan.get("Rows") or 0)
-        except Exception:
-            return None
-
-
-def _coerce_value(value: Any) -> Any:
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, date):
-        return value.isoformat()
-    if isinstance(value, Decimal):
-        return float(value)
-    if isinstance(value, UUID):
-        return str(value)
-    if isinstance(value, dict):
-        return {k: _coerce_value(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple, set)):
-        return [_coerce_value(v) for v in value]
-    return value
+    with stage("write_estimate"):
+        row = conn.execute(text(_explain_sql(sql)), params or {}).fetchone()
+    if not row:
+        return None, None
+    return plan_row_estimate(row[0]), explain_plan(row[0])
 
 
-def _consume_result(res) -> Tuple[List[Dict[str, Any]], List[str], int]:
-    """Materialise a SQLAlchemy result into plain rows/columns."""
-
-    rows: List[Dict[str, Any]] = []
-    columns: List[str] = []
-    row_count = 0
+def _consume_columnar(res) -> Tuple[Optional[ColumnarResult], int]:
+    """Drain a SQLAlchemy result into a ``ColumnarResult`` (None for non-row results)."""
 
-    if getattr(res, "returns_rows", False):
-        try:
-            mappings = res.mappings().all()
-            rows = [{k: _coerce_value(v) for k, v in row.items()} for row in mappings]
-        except Exception:
-            fetched = res.fetchall()
-            rows = []
-            for row in fetched:
-                mapping = getattr(row, "_mapping", None)
-                if mapping is not None:
-                    rows.append({k: _coerce_value(v) for k, v in mapping.items()})
-                elif isinstance(row, dict):
-                    rows.append({k: _coerce_value(v) for k, v in row.items()})
-                else:
-                    try:
-                        rows.append({k: _coerce_value(v) for k, v in dict(row).items()})
-                    except Exception:
-                        rows.append({"value": _coerce_value(row)})
-        try:
-            columns = list(res.keys())
-        except Exception:
-            if rows:
-                columns = list(rows[0].keys())
-        row_count = len(rows)
-    else:
+    if not getattr(res, "returns_rows", False):
         try:
             row_count = int(res.rowcount)
         except Exception:
             row_count = 0
-        if row_count < 0:
-            row_count = 0
+        return None, max(row_count, 0)
+    columnar = ColumnarResult.from_result(res)
+    return columnar, columnar.row_count
+
+
+def _consume_result(res) -> Tuple[List[Dict[str, Any]], List[str], int]:
+    """Materialise a SQLAlchemy result into plain rows/columns."""
 
-    return rows, columns, row_count
+    columnar, row_count = _consume_columnar(res)
+    if columnar is None:
+        return [], [], row_count
+    return columnar.records(), columnar.columns, row_count
 
 
 def _normalize_explain_rows(
@@ -339,154 +224,563 @@ def _normalize_explain_rows(
     return normalized, ["plan"]
 
 
+def read_cache_key(sql: str, params: dict | None) -> Tuple[Optional[result_cache.CacheKey], frozenset]:
+    """Result-cache key and table tags for a read, or ``(None, ...)`` if it is not cached."""
+
+    if not result_cache.enabled():
+        return None, frozenset()
+    statement = parse_statement(sql)
+    if not result_cache.cacheable(statement):
+        return None, frozenset()
+    fingerprint = result_cache.schema_fingerprint()
+    if fingerprint is None:
+        return None, frozenset()
+    return result_cache.cache_key(statement.normalized_sql, params, fingerprint), result_cache.table_tags(statement)
+
+
+def invalidate_result_cache(tables) -> None:
+    """Drop cached reads of ``tables`` after a write; no tables means anything may have changed."""
+
+    names = {name for _, name in tables or ()}
+    if names:
+        result_cache.invalidate_tables(names)
+    else:
+        result_cache.clear_entries()
+
+
+def _cancel_statement(conn) -> None:
+    """Interrupt the statement running on ``conn`` (sync or asyncio ``Connection``)."""
+
+    conn = getattr(conn, "sync_connection", None) or conn
+    dbapi = conn.connection.dbapi_connection
+    # The asyncio adapters wrap the driver's own connection.
+    driver = getattr(dbapi, "_connection", dbapi)
+    for name in ("cancel", "interrupt"):
+        method = getattr(driver, name, None)
+        if callable(method):
+            method()
+            return
+
+
+def _cancellable(conn):
+    return cancel_hook(partial(_cancel_statement, conn))
+
+
+class _Execution:
+    """One ``safe_execute`` call: analysis, gates and payload building.
+
+    Shared by ``safe_execute`` and ``safe_execute_async``, which only differ
+    in how they reach the database.
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        params: dict | None,
+        allow_writes: bool,
+        force_write: bool,
+        estimated_rows: Optional[int],
+        columnar: bool,
+    ) -> None:
+        sql_stripped = sql.strip() if sql else ""
+        if sql_stripped.upper().startswith("EXPLAIN"):
+            analysis = SQLAnalysis(
+                statement_type=StatementType.READ,
+                normalized_sql=sql_stripped,
+                tables=set(),
+                columns=set(),
+                is_select=False,
+            )
+        else:
+            analysis = analyze_sql(sql)
+        if analysis.statement_type is StatementType.DDL:
+            raise ValueError("DDL statements are blocked. Use a migration workflow.")
+
+        self.analysis = analysis
+        self.normalized_sql = analysis.normalized_sql
+        self.params = params or {}
+        self.allow_writes = allow_writes
+        self.force_write = force_write
+        self.estimated_rows = estimated_rows
+        self.columnar = columnar
+        self.sql_kind = stmt_kind(self.normalized_sql)
+        self.is_write = analysis.statement_type is StatementType.WRITE
+        self.cache_key: Optional[result_cache.CacheKey] = None
+        self.cache_tags: frozenset = frozenset()
+        self.cache_status: Optional[str] = None
+        self.versions: Optional[Dict[str, int]] = None
+
+    def audit_pre(self) -> None:
+        audit_event({
+            "phase": "pre",
+            "stmt_type": self.analysis.statement_type.name,
+            "sql": self.normalized_sql,
+            "params": self.params,
+            "allow_writes": self.allow_writes,
+            "force_write": self.force_write,
+        })
+
+    def audit_post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        audit_event({
+            "phase": "post",
+            "stmt_type": self.analysis.statement_type.name,
+            "success": True,
+            "rows": payload.get("row_count"),
+        })
+        return payload
+
+    def audit_failure(self, exc: BaseException) -> None:
+        audit_event({
+            "phase": "post",
+            "stmt_type": self.analysis.statement_type.name,
+            "success": False,
+            "error": str(exc),
+        })
+
+    def build_payload(self) -> Dict[str, Any]:
+        return {
+            "rows": [],
+            "columns": [],
+            "row_count": 0,
+            "stmt_kind": self.sql_kind,
+            "write": self.sql_kind not in {"SELECT", "EXPLAIN"},
+            "dry_run": False,
+            "exec_ms": 0,
+            "engine_ms": 0,
+            "meta": {"engine_ms": 0, "exec_ms": 0},
+        }
+
+    def set_rows(self, payload: Dict[str, Any], result: ColumnarResult) -> None:
+        payload["columns"] = result.columns
+        if self.columnar:
+            payload.pop("rows", None)
+            payload["result"] = result
+        else:
+            payload["rows"] = result.records()
+
+    def needs_estimate(self) -> bool:
+        # In exact-count mode a forced write is gated on its real row count instead.
+        return self.estimated_rows is None and not (self.force_write and settings.VAST_WRITE_EXACT_COUNT)
+
+    def write_gate(self, est: Optional[int], plan: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Block oversized writes; the dry-run payload unless ``force_write``."""
+
+        if est is not None and est > settings.max_write_rows:
+            raise ValueError(
+                f"Write blocked: estimated affected rows {est} exceeds limit {settings.max_write_rows}."
+            )
+        if self.force_write:
+            return None
+        audit_event({"phase": "dry_run", "stmt_type": self.analysis.statement_type.name, "estimated_rows": est})
+        notice = {
+            "_notice": "DRY RUN — not executed",
+            "_sql": self.normalized_sql,
+            "_params": self.params,
+            "_estimated_rows": est,
+        }
+        if plan is not None:
+            notice["_plan"] = plan
+        payload = self.build_payload()
+        self.set_rows(payload, ColumnarResult.from_records([notice]))
+        payload["dry_run"] = True
+        return payload
+
+    def check_write_count(self, payload: Dict[str, Any]) -> None:
+        """Exact-count mode: refuse (and so roll back) a write that touched too many rows."""
+
+        row_count = payload.get("row_count") or 0
+        if settings.VAST_WRITE_EXACT_COUNT and row_count > settings.max_write_rows:
+            raise ValueError(
+                f"Write blocked: {row_count} affected rows exceeds limit {settings.max_write_rows}; rolled back."
+            )
+
+    def check_writes_allowed(self) -> None:
+        if not self.allow_writes:
+            raise ValueError("Write queries are disabled. Use --write to permit writes.")
+
+    def cache_lookup_key(self) -> bool:
+        self.cache_key, self.cache_tags = read_cache_key(self.normalized_sql, self.params)
+        return self.cache_key is not None
+
+    def cached_payload(self, entry: Optional[result_cache.CacheEntry], status: str) -> Optional[Dict[str, Any]]:
+        self.cache_status = status
+        if entry is None:
+            return None
+        payload = self.build_payload()
+        payload["row_count"] = entry.row_count
+        self.set_rows(payload, entry.result)
+        payload["meta"]["cache"] = {"status": status, **result_cache.result_cache_stats()}
+        audit_event({
+            "phase": "post",
+            "stmt_type": self.analysis.statement_type.name,
+            "success": True,
+            "rows": entry.row_count,
+            "cache": status,
+        })
+        return payload
+
+    def executed(self, res, started: float) -> Dict[str, Any]:
+        """Payload for a finished statement; ``res`` must already be buffered."""
+
+        payload = self.build_payload()
+        result, row_count = _consume_columnar(res)
+        if result is not None and self.sql_kind == "EXPLAIN":
+            rows, _ = _normalize_explain_rows(result.records(), result.columns)
+            result, row_count = ColumnarResult.from_records(rows), len(rows)
+        result = result if result is not None else ColumnarResult([], [], [])
+        payload["row_count"] = row_count
+        self.set_rows(payload, result)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        payload["engine_ms"] = duration_ms
+        payload["exec_ms"] = duration_ms
+        payload["meta"] = {"engine_ms": duration_ms, "exec_ms": duration_ms}
+        if self.cache_key is not None:
+            result_cache.store(self.cache_key, result, row_count, self.cache_tags, self.versions)
+            payload["meta"]["cache"] = {"status": self.cache_status, **result_cache.result_cache_stats()}
+        return payload
+
+
 def safe_execute(
     sql: str,
     params: dict | None = None,
     allow_writes: bool = False,
     force_write: bool = False,
+    estimated_rows: Optional[int] = None,
+    columnar: bool = False,
 ):
     """
     - DDL is blocked (use migration workflow).
     - Writes require allow_writes; if !force_write => DRY RUN (returns preview).
     - For writes, run EXPLAIN gate and block if estimate exceeds max_write_rows.
+      The EXPLAIN runs on the RW connection, in the transaction that then
+      executes the write; a dry run rolls it back and previews the plan.
+      ``estimated_rows`` reuses an estimate from an earlier EXPLAIN (e.g. the
+      identifier guard's) instead of planning the statement again.
+    - With VAST_WRITE_EXACT_COUNT a forced write skips the estimate, runs,
+      and is rolled back if its row count exceeds max_write_rows.
+    - ``columnar`` returns the rows as a ``ColumnarResult`` under ``result``
+      instead of a list of row dicts under ``rows``.
     - Reads use RO engine; actual write execution uses RW engine.
     """
-    sql_stripped = sql.strip() if sql else ""
-    if sql_stripped.upper().startswith("EXPLAIN"):
-        analysis = SQLAnalysis(
-            statement_type=StatementType.READ,
-            normalized_sql=sql_stripped,
-            tables=set(),
-            columns=set(),
-            is_select=False,
-        )
-    else:
-        analysis = analyze_sql(sql)
-    stmt_type = analysis.statement_type
-    normalized_sql = analysis.normalized_sql
+    run = _Execution(sql, params, allow_writes, force_write, estimated_rows, columnar)
+    try:
+        run.audit_pre()
+        if run.is_write:
+            run.check_writes_allowed()
+            if not run.needs_estimate():
+                dry_run = run.write_gate(estimated_rows)
+                if dry_run is not None:
+                    return dry_run
+            # Estimate, gate and write share one RW connection and transaction.
+            check_cancelled()
+            with get_engine(readonly=False).connect() as conn, _cancellable(conn), conn.begin() as tx:
+                if run.needs_estimate():
+                    dry_run = run.write_gate(*_explain_write(conn, run.normalized_sql, run.params))
+                    if dry_run is not None:
+                        tx.rollback()
+                        return dry_run
+                with stage("execute", write=True):
+                    start = time.perf_counter()
+                    res = conn.execute(text(run.normalized_sql), run.params)
+                    payload = run.executed(res, start)
+                run.check_write_count(payload)
+            invalidate_result_cache(run.analysis.tables)
+        else:
+            # READ path — strictly RO engine
+            if run.cache_lookup_key():
+                stat_engine = get_pool_engine("maintenance") if settings.VAST_RESULT_CACHE_STAT_CHECK else None
+                cached = run.cached_payload(*result_cache.lookup(run.cache_key, stat_engine))
+                if cached is not None:
+                    return cached
+                if stat_engine is not None:
+                    # Counters read before the query: a concurrent write makes the entry stale, never fresh.
+                    run.versions = result_cache.table_versions(stat_engine, run.cache_tags)
+            check_cancelled()
+            with stage("execute", write=False), get_ro_engine().begin() as conn, _cancellable(conn):
+                start = time.perf_counter()
+                res = conn.execute(text(run.normalized_sql), run.params)
+                payload = run.executed(res, start)
+        return run.audit_post(payload)
+    except Exception as exc:
+        run.audit_failure(exc)
+        raise_if_cancelled(exc)
+        raise
 
-    if stmt_type is StatementType.DDL:
-        raise ValueError("DDL statements are blocked. Use a migration workflow.")
 
-    sql_kind = stmt_kind(normalized_sql)
+async def _explain_write_async(conn, sql: str, params: dict | None) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    with stage("write_estimate"):
+        res = await conn.execute(text(_explain_sql(sql)), params or {})
+        row = res.fetchone()
+    if not row:
+        return None, None
+    return plan_row_estimate(row[0]), explain_plan(row[0])
+
+
+async def safe_execute_async(
+    sql: str,
+    params: dict | None = None,
+    allow_writes: bool = False,
+    force_write: bool = False,
+    estimated_rows: Optional[int] = None,
+    columnar: bool = False,
+):
+    """``safe_execute`` on the asyncio engines; same gates, same payload."""
 
+    run = _Execution(sql, params, allow_writes, force_write, estimated_rows, columnar)
     try:
-        # before
-        audit_event({
-            "phase": "pre",
-            "stmt_type": stmt_type.name,
-            "sql": normalized_sql,
-            "params": params or {},
-            "allow_writes": allow_writes,
-            "force_write": force_write,
-        })
+        run.audit_pre()
+        if run.is_write:
+            run.check_writes_allowed()
+            if not run.needs_estimate():
+                dry_run = run.write_gate(estimated_rows)
+                if dry_run is not None:
+                    return dry_run
+            check_cancelled()
+            async with get_async_engine(readonly=False).connect() as conn:
+                with _cancellable(conn):
+                    async with conn.begin() as tx:
+                        if run.needs_estimate():
+                            est, plan = await _explain_write_async(conn, run.normalized_sql, run.params)
+                            dry_run = run.write_gate(est, plan)
+                            if dry_run is not None:
+                                await tx.rollback()
+                                return dry_run
+                        with stage("execute", write=True):
+                            start = time.perf_counter()
+                            res = await conn.execute(text(run.normalized_sql), run.params)
+                            payload = run.executed(res, start)
+                        run.check_write_count(payload)
+            invalidate_result_cache(run.analysis.tables)
+        else:
+            if run.cache_lookup_key():
+                stat_engine = get_async_ro_engine() if settings.VAST_RESULT_CACHE_STAT_CHECK else None
+                cached = run.cached_payload(*await result_cache.lookup_async(run.cache_key, stat_engine))
+                if cached is not None:
+                    return cached
+                if stat_engine is not None:
+                    run.versions = await result_cache.table_versions_async(stat_engine, run.cache_tags)
+            check_cancelled()
+            with stage("execute", write=False):
+                async with get_async_ro_engine().begin() as conn:
+                    with _cancellable(conn):
+                        start = time.perf_counter()
+                        res = await conn.execute(text(run.normalized_sql), run.params)
+                        payload = run.executed(res, start)
+        return run.audit_post(payload)
+    except Exception as exc:
+        run.audit_failure(exc)
+        raise_if_cancelled(exc)
+        raise
+
+
+def _json_line(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str) + "\n"
 
-        def _build_payload() -> Dict[str, Any]:
-            return {
-                "rows": [],
-                "columns": [],
-                "row_count": 0,
-                "stmt_kind": sql_kind,
-                "write": sql_kind not in {"SELECT", "EXPLAIN"},
-                "dry_run": False,
-                "exec_ms": 0,
-                "engine_ms": 0,
-                "meta": {"engine_ms": 0, "exec_ms": 0},
+
+class StreamingResult:
+    """Rows of a read query fetched through a server-side cursor.
+
+    Iterating yields coerced row dicts; ``iter_ndjson`` yields encoded lines
+    (a ``{"columns": [...]}`` header, one JSON array per row and a trailer with
+    ``row_count`` / ``truncated``). Only one chunk of rows is held in memory at
+    a time. Iteration stops at ``max_rows`` rows or ``max_bytes`` of encoded
+    row data, whichever comes first, and the connection is released when the
+    iterator is exhausted, closed or garbage collected.
+    """
+
+    def __init__(
+        self,
+        conn,
+        result,
+        columns: List[str],
+        max_rows: int,
+        max_bytes: int,
+        types: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        self.columns = columns
+        self.types = list(types or [None] * len(columns))
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.row_count = 0
+        self.bytes_sent = 0
+        self.truncated = False
+        self.truncated_reason: Optional[str] = None
+        self._conn = conn
+        self._result = result
+        self._started = False
+        self._closed = False
+        self._error: Optional[str] = None
+        # Rows are fetched while the caller iterates, so cancelling the request
+        # must interrupt the connection until the result is closed.
+        self._request = current_request()
+        self._hook = self._request.add_hook(partial(_cancel_statement, conn)) if self._request else None
+
+    def __enter__(self) -> "StreamingResult":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _cap(self, reason: str) -> None:
+        self.truncated = True
+        self.truncated_reason = reason
+
+    def _lines(self):
+        if self._started:
+            raise RuntimeError("StreamingResult can only be iterated once")
+        self._started = True
+        converters = None
+        try:
+            for raw in self._result:
+                if self.row_count >= self.max_rows:
+                    self._cap("max_rows")
+                    break
+                if converters is None:
+                    # Columns the driver did not type are typed from the first row.
+                    self.types = [
+                        kind or ("other" if value is None else logical_type([value]))
+                        for kind, value in zip(self.types, raw)
+                    ]
+                    converters = row_converters(self.types)
+                values = coerce_row(raw, converters)
+                # The byte cap is measured on the encoded row, so encode once here.
+                line = _json_line(values)
+                size = len(line.encode("utf-8"))
+                if self.bytes_sent + size > self.max_bytes:
+                    self._cap("max_bytes")
+                    break
+                self.bytes_sent += size
+                self.row_count += 1
+                yield values, line
+        except GeneratorExit:
+            # The consumer went away mid-stream (client disconnect, cancelled task).
+            if not self.truncated:
+                self._error = "stream closed before the result was exhausted"
+            raise
+        except BaseException as exc:
+            self._error = str(exc) or type(exc).__name__
+            raise
+        finally:
+            self.close()
+
+    def __iter__(self):
+        for values, _ in self._lines():
+            yield dict(zip(self.columns, values))
+
+    def iter_ndjson(self):
+        yield _json_line({"columns": self.columns})
+        try:
+            for _, line in self._lines():
+                yield line
+        except Exception as exc:
+            yield _json_line({"error": str(exc), "row_count": self.row_count})
+            return
+        yield _json_line(
+            {
+                "row_count": self.row_count,
+                "truncated": self.truncated,
+                "truncated_reason": self.truncated_reason,
             }
+        )
 
-        if stmt_type is StatementType.WRITE:
-            if not allow_writes:
-                raise ValueError("Write queries are disabled. Use --write to permit writes.")
-
-            # Estimate rows and gate
-            est = _estimate_write_rows(normalized_sql, params)
-            if est is not None and est > settings.max_write_rows:
-                raise ValueError(
-                    f"Write blocked: estimated affected rows {est} exceeds limit {settings.max_write_rows}."
-                )
-
-            if not force_write:
-                audit_event({"phase": "dry_run", "estimated_rows": est})
-                notice = {
-                    "_notice": "DRY RUN — not executed",
-                    "_sql": normalized_sql,
-                    "_params": params or {},
-                    "_estimated_rows": est,
-                }
-                payload = _build_payload()
-                payload["rows"] = [notice]
-                payload["columns"] = list(notice.keys())
-                payload["dry_run"] = True
-                return payload
-
-            # Execute with RW engine only when truly writing
-            with get_engine(readonly=False).begin() as conn:
-                start = time.perf_counter()
-                res = conn.execute(text(normalized_sql), params or {})
-                rows, columns, row_count = _consume_result(res)
-                if sql_kind == "EXPLAIN":
-                    rows, columns = _normalize_explain_rows(rows, columns)
-                    row_count = len(rows)
-                payload = _build_payload()
-                payload.update({
-                    "rows": rows,
-                    "columns": columns,
-                    "row_count": row_count,
-                })
-                duration_ms = int((time.perf_counter() - start) * 1000)
-                payload["engine_ms"] = duration_ms
-                payload["exec_ms"] = duration_ms
-                payload["meta"] = {"engine_ms": duration_ms, "exec_ms": duration_ms}
-        else:
-            # READ path — strictly RO engine
-            with get_ro_engine().begin() as conn:
-                start = time.perf_counter()
-                res = conn.execute(text(normalized_sql), params or {})
-                rows, columns, row_count = _consume_result(res)
-                if sql_kind == "EXPLAIN":
-                    rows, columns = _normalize_explain_rows(rows, columns)
-                    row_count = len(rows)
-                duration_ms = int((time.perf_counter() - start) * 1000)
-                payload = _build_payload()
-                payload.update({
-                    "rows": rows,
-                    "columns": columns,
-                    "row_count": row_count,
-                })
-                payload["engine_ms"] = duration_ms
-                payload["exec_ms"] = duration_ms
-                payload["meta"] = {"engine_ms": duration_ms, "exec_ms": duration_ms}
-
-        # after success
-        audit_event({
-            "phase": "post",
-            "success": True,
-            "rows": payload.get("row_count"),
-        })
-        return payload
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._request is not None:
+            self._request.remove_hook(self._hook)
+        try:
+            self._result.close()
+        finally:
+            self._conn.close()
+            event = {
+                "phase": "post",
+                "stmt_type": StatementType.READ.name,
+                "success": self._error is None,
+                "stream": True,
+                "rows": self.row_count,
+                "truncated": self.truncated,
+            }
+            if self._error is not None:
+                event["error"] = self._error
+            audit_event(event)
+
+    def __del__(self) -> None:  # pragma: no cover - depends on GC timing
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def stream_execute(
+    sql: str,
+    params: dict | None = None,
+    *,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> StreamingResult:
+    """Run a read-only statement and return its rows as a ``StreamingResult``.
+
+    Unlike ``safe_execute`` nothing is materialised: rows are pulled from a
+    server-side cursor ``chunk_size`` at a time while the caller iterates.
+    """
+
+    statement = parse_statement(sql)
+    if not statement.ok:
+        raise ValueError(statement.error)
+    if statement.statement_type is not StatementType.READ:
+        raise ValueError("Streaming is only available for read-only statements.")
+
+    chunk = int(chunk_size or settings.VAST_STREAM_CHUNK_ROWS)
+    audit_event({
+        "phase": "pre",
+        "stmt_type": statement.statement_type.name,
+        "sql": sql,
+        "params": params or {},
+        "stream": True,
+    })
+    conn = get_ro_engine().connect().execution_options(stream_results=True, yield_per=chunk)
+    try:
+        conn.begin()
+        with stage("execute", write=False, stream=True), _cancellable(conn):
+            result = conn.execute(text(sql), params or {})
+        columns = list(result.keys())
+        types = description_types(getattr(result.cursor, "description", None))
     except Exception as exc:
+        conn.close()
         audit_event({
             "phase": "post",
+            "stmt_type": statement.statement_type.name,
             "success": False,
+            "stream": True,
             "error": str(exc),
         })
+        raise_if_cancelled(exc)
         raise
+    return StreamingResult(
+        conn,
+        result,
+        columns,
+        max_rows=int(max_rows or settings.VAST_STREAM_MAX_ROWS),
+        max_bytes=int(max_bytes or settings.VAST_STREAM_MAX_BYTES),
+        types=types or None,
+    )
 
 
-def is_select(sql: str) -> bool:
-    analysis = analyze_sql(sql)
-    return analysis.is_select
+def is_select(sql: str | ParsedStatement) -> bool:
+    return analyze_sql(sql).is_select
 
 
 def add_limit(sql: str, limit: int) -> str:
-    """Append a LIMIT clause when one is not present.
-
-    The previous implementation attempted to mutate the sqlglot AST by setting a
-    Limit node directly. In some environments/versions this produced malformed SQL
-    where the numeric literal was concatenated to the preceding identifier (e.g.
-    "public.brand100 LIMIT;"), causing table names like "brand100". To keep
-    behaviour robust across sqlglot versions, fall back to a simple and safe
-    string-based append when a LIMIT token isn't already present.
+    """Append a LIMIT clause when the top-level query has none.
+
+    Only the outermost SELECT/set operation counts: a LIMIT inside a subquery
+    or CTE no longer suppresses the pushdown. The clause is appended to the
+    original text rather than set on the sqlglot AST, which some sqlglot
+    versions rendered as malformed SQL (e.g. "public.brand100 LIMIT;"); the
+    AST is only re-rendered when the statement ends in a line comment.
+    Unparseable SQL keeps the old token check.
     """
 
     original = sql or ""
@@ -494,13 +788,19 @@ def add_limit(sql: str, limit: int) -> str:
     if not stripped:
         return original
 
-    # If any LIMIT appears, leave the statement unchanged
-    lower = stripped.lower()
-    if " limit " in f" {lower} ":
-        return original
-
     # Preserve trailing semicolon if present
     has_semicolon = stripped.endswith(";")
-    body = stripped[:-1] if has_semicolon else stripped
+    body = stripped[:-1].rstrip() if has_semicolon else stripped
+
+    statement = parse_statement(body)
+    if not statement.ok:
+        if " limit " in f" {stripped.lower()} ":
+            return original
+    elif statement.has_limit or not statement.is_select:
+        return original
+    elif "--" in body.splitlines()[-1]:
+        body = render_sql(statement.ast.limit(int(limit)))
+        return body + (";" if has_semicolon else "")
+
     augmented = f"{body} LIMIT {int(limit)}"
     return augmented + (";" if has_semicolon else "")
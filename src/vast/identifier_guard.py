@@ -1,17 +1,30 @@
-"""SQL identifier validation helpers using PostgreSQL EXPLAIN output."""
+"""SQL identifier validation helpers.
+
+Read queries are resolved from the sqlglot AST against the cached schema map;
+``EXPLAIN (VERBOSE)`` output is only consulted when that analysis cannot
+decide (writes, set-returning functions, unknown or ambiguous identifiers).
+"""
 
 from __future__ import annotations
 
+import copy
 import json
 import difflib
 import re
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Iterable, Set, Tuple
 
 from sqlalchemy import text
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+from sqlglot.optimizer.scope import Scope, traverse_scope
 
-from .db import get_engine
-from .introspect import list_tables, table_columns, schema_fingerprint
+from .catalog_snapshot import get_catalog_snapshot
+from .db import get_engine, plan_row_estimate
 from .sql_params import hydrate_readonly_params, stmt_kind
+from .statement import SET_OPERATION_TYPES, parse_statement
+from .trace import stage
 
 
 SYSTEM_SCHEMAS: Set[str] = {"pg_catalog", "information_schema", "pg_toast"}
@@ -37,29 +50,107 @@ _SCHEMA_FINGERPRINT: str | None = None
 
 
 def load_schema_cache(engine=None, force_refresh: bool = False) -> Tuple[Dict[str, Dict[str, Set[str]]], str]:
-    """Load a cached map of schema -> table -> set(columns)."""
+    """Load a cached map of schema -> table -> set(columns), read through ``engine`` if given."""
 
     global _SCHEMA_CACHE, _SCHEMA_FINGERPRINT
 
-    if engine is None:
-        engine = get_engine(readonly=True)
-
-    current_fp = schema_fingerprint()
+    snapshot = get_catalog_snapshot(force_refresh=force_refresh, engine=engine)
+    current_fp = snapshot.fingerprint
 
     if force_refresh or _SCHEMA_CACHE is None or _SCHEMA_FINGERPRINT != current_fp:
-        schema_map: Dict[str, Dict[str, Set[str]]] = {}
-        for tbl in list_tables():
-            schema = tbl["table_schema"]
-            table = tbl["table_name"]
-            cols = {col["column_name"] for col in table_columns(schema, table)}
-            schema_map.setdefault(schema, {})[table] = cols
-
-        _SCHEMA_CACHE = schema_map
+        if _SCHEMA_FINGERPRINT is not None and _SCHEMA_FINGERPRINT != current_fp:
+            invalidate_validation_cache()
+        _SCHEMA_CACHE = snapshot.schema_map()
         _SCHEMA_FINGERPRINT = current_fp
 
     return _SCHEMA_CACHE, _SCHEMA_FINGERPRINT
 
 
+def invalidate_schema_cache() -> None:
+    """Forget the cached schema map so the next validation reloads it."""
+
+    global _SCHEMA_CACHE, _SCHEMA_FINGERPRINT
+    _SCHEMA_CACHE = None
+    _SCHEMA_FINGERPRINT = None
+    invalidate_validation_cache()
+
+
+VALIDATION_CACHE_SIZE = 1024
+
+_VALIDATION_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[bool, Dict[str, Any]]]" = OrderedDict()
+_VALIDATION_LOCK = threading.Lock()
+_VALIDATION_STATS = {"hits": 0, "misses": 0}
+
+
+def sql_shape(sql: str, tree: exp.Expression | None = None) -> str:
+    """Normalized SQL with literals replaced by placeholders.
+
+    Statements that differ only in constants share a shape and therefore a
+    validation outcome. Unparseable SQL falls back to collapsed whitespace.
+    """
+
+    if tree is None:
+        tree = parse_statement(sql).ast
+    if tree is None:
+        return " ".join((sql or "").split())
+
+    def _mask(node: exp.Expression) -> exp.Expression:
+        return exp.Placeholder() if isinstance(node, exp.Literal) else node
+
+    return tree.transform(_mask).sql(dialect="postgres", normalize=True)
+
+
+def _requested_key(requested: Dict[str, Any] | None) -> Tuple[Any, ...] | None:
+    # Caller-supplied identifiers change which unknowns are fatal, so they are
+    # part of the cache key; ``None`` means "derive them from the SQL".
+    if requested is None:
+        return None
+    relations = tuple(sorted(requested.get("relations", ()) or ()))
+    columns = tuple(
+        sorted((key, tuple(sorted(cols))) for key, cols in (requested.get("columns", {}) or {}).items())
+    )
+    return relations, columns
+
+
+def invalidate_validation_cache() -> None:
+    """Forget every cached validation outcome."""
+
+    with _VALIDATION_LOCK:
+        _VALIDATION_CACHE.clear()
+
+
+def validation_cache_stats() -> Dict[str, int]:
+    with _VALIDATION_LOCK:
+        return {**_VALIDATION_STATS, "size": len(_VALIDATION_CACHE)}
+
+
+def _cached_validation(key: Tuple[Any, ...]) -> Tuple[bool, Dict[str, Any]] | None:
+    with _VALIDATION_LOCK:
+        entry = _VALIDATION_CACHE.get(key)
+        if entry is None:
+            _VALIDATION_STATS["misses"] += 1
+            return None
+        _VALIDATION_CACHE.move_to_end(key)
+        _VALIDATION_STATS["hits"] += 1
+    ok, details = entry
+    return ok, copy.deepcopy(details)
+
+
+def _remember_validation(key: Tuple[Any, ...], ok: bool, details: Dict[str, Any]) -> None:
+    # A bare planner error (no unknown identifiers) may be transient or depend
+    # on the literal values, so it is never cached.
+    if not ok and not (details.get("unknown_relations") or details.get("unknown_columns")):
+        return
+    stored = copy.deepcopy(details)
+    # Row estimates depend on the literal values, which the shape masks.
+    stored.pop("plan_rows", None)
+    with _VALIDATION_LOCK:
+        _VALIDATION_CACHE[key] = (ok, stored)
+        _VALIDATION_CACHE.move_to_end(key)
+        while len(_VALIDATION_CACHE) > VALIDATION_CACHE_SIZE:
+            _VALIDATION_CACHE.popitem(last=False)
+
+
 def _strip_quotes(name: str | None) -> str | None:
     if name is None:
         return None
@@ -408,7 +499,7 @@ def extract_identifiers(sql: str, engine=None, params: Dict[str, object] | None
     prepared_params = hydrate_readonly_params(sql, params)
 
     try:
-        with engine.begin() as conn:
+        with stage("guard_explain"), engine.begin() as conn:
             stmt = text(f"EXPLAIN (VERBOSE, FORMAT JSON) {sql}")
             if prepared_params:
                 result = conn.execute(stmt, prepared_params)
@@ -449,6 +540,7 @@ def extract_identifiers(sql: str, engine=None, params: Dict[str, object] | None
             "error_text": error_text,
         }
 
+    plan_rows = plan_row_estimate(payload)
     try:
         if isinstance(payload, str):
             payload = json.loads(payload)
@@ -543,6 +635,7 @@ def extract_identifiers(sql: str, engine=None, params: Dict[str, object] | None
         "cte_columns": cte_columns,
         "explain_failed": explain_failed,
         "error_text": error_text,
+        "plan_rows": plan_rows,
     }
 
 
@@ -575,6 +668,189 @@ def extract_requested_identifiers(sql: str) -> Dict[str, Set[str]]:
     }
 
 
+class _Undecided(Exception):
+    """The AST alone cannot prove the statement's identifiers exist."""
+
+
+_ANY_COLUMN = None  # column set of a system relation: anything goes for reads
+
+
+def _ident_name(node: Any) -> str:
+    # Unquoted identifiers fold to lower case, exactly as Postgres does.
+    if isinstance(node, exp.Identifier):
+        return node.this if node.quoted else node.this.lower()
+    if node is None:
+        return ""
+    return str(node.name if isinstance(node, exp.Expression) else node).lower()
+
+
+class _AstResolver:
+    def __init__(self, schema_cache: Dict[str, Dict[str, Set[str]]]) -> None:
+        self.schema_cache = schema_cache
+        self.relations: Set[str] = set()
+        self._outputs: Dict[int, Set[str]] = {}
+
+    def table_columns(self, table: exp.Table) -> Set[str] | None:
+        if not isinstance(table.this, exp.Identifier):
+            raise _Undecided("function or expression used as a relation")
+        name = _ident_name(table.this)
+        schema = _ident_name(table.args["db"]) if table.args.get("db") else None
+        if schema is None:
+            if name in self.schema_cache.get("public", {}):
+                schema = "public"
+            elif name.startswith("pg_"):
+                schema = "pg_catalog"
+            else:
+                raise _Undecided(f"unknown relation {name}")
+        if schema in SYSTEM_SCHEMAS:
+            return _ANY_COLUMN
+        columns = self.schema_cache.get(schema, {}).get(name)
+        if columns is None:
+            raise _Undecided(f"unknown relation {schema}.{name}")
+        self.relations.add(f"{schema}.{name}")
+        return columns
+
+    def source_columns(self, source: Any) -> Set[str] | None:
+        if isinstance(source, exp.Table):
+            return self.table_columns(source)
+        if isinstance(source, Scope):
+            return self.scope_outputs(source)
+        raise _Undecided(f"unsupported source {type(source).__name__}")
+
+    def scope_outputs(self, scope: Scope) -> Set[str]:
+        cached = self._outputs.get(id(scope))
+        if cached is not None:
+            return cached
+        expression = scope.expression
+        alias = expression.parent.args.get("alias") if isinstance(expression.parent, (exp.CTE, exp.Subquery)) else None
+        if alias is not None and alias.columns:
+            outputs = {_ident_name(col) for col in alias.columns}
+        elif isinstance(expression, SET_OPERATION_TYPES):
+            if not scope.union_scopes:
+                raise _Undecided("set operation without branches")
+            outputs = self.scope_outputs(scope.union_scopes[0])
+        elif isinstance(expression, exp.Select):
+            outputs = set()
+            for projection in expression.expressions:
+                if isinstance(projection, exp.Star):
+                    sources = list(scope.sources.values())
+                elif isinstance(projection, exp.Column) and isinstance(projection.this, exp.Star):
+                    qualifier = _ident_name(projection.args.get("table"))
+                    if qualifier not in scope.sources:
+                        raise _Undecided(f"unknown qualifier {qualifier}")
+                    sources = [scope.sources[qualifier]]
+                else:
+                    if isinstance(projection, exp.Alias):
+                        outputs.add(_ident_name(projection.args["alias"]))
+                    elif isinstance(projection, exp.Column):
+                        outputs.add(_ident_name(projection.this))
+                    else:
+                        # Postgres derives names like "count" or "?column?";
+                        # nothing outside can reference them reliably.
+                        outputs.add(projection.output_name.lower())
+                    continue
+                for source in sources:
+                    columns = self.source_columns(source)
+                    if columns is _ANY_COLUMN:
+                        raise _Undecided("star over a system relation")
+                    outputs.update(columns)
+        else:
+            raise _Undecided(f"unsupported scope {type(expression).__name__}")
+        self._outputs[id(scope)] = outputs
+        return outputs
+
+    def resolve(self, scope: Scope, column: exp.Column) -> None:
+        qualifier = _ident_name(column.args.get("table")) if column.args.get("table") else None
+        if column.args.get("db"):
+            raise _Undecided("schema-qualified column reference")
+        name = "*" if isinstance(column.this, exp.Star) else _ident_name(column.this)
+
+        current: Scope | None = scope
+        while current is not None:
+            if qualifier is not None:
+                if qualifier in current.sources:
+                    columns = self.source_columns(current.sources[qualifier])
+                    if name != "*" and columns is not _ANY_COLUMN and name not in columns:
+                        raise _Undecided(f"unknown column {qualifier}.{name}")
+                    return
+            else:
+                matches = 0
+                open_sources = 0
+                for source in current.sources.values():
+                    columns = self.source_columns(source)
+                    if columns is _ANY_COLUMN:
+                        open_sources += 1
+                    elif name in columns:
+                        matches += 1
+                if matches == 1 and not open_sources:
+                    return
+                if matches == 0 and open_sources == 1:
+                    return
+                if matches or open_sources:
+                    raise _Undecided(f"ambiguous column {name}")
+                if isinstance(current.expression, exp.Select) and name in {
+                    _ident_name(sel.args["alias"]) for sel in current.expression.expressions if sel.args.get("alias")
+                }:
+                    # GROUP BY / HAVING may refer to output aliases.
+                    return
+            current = current.parent
+        raise _Undecided(f"unresolved column {qualifier + '.' if qualifier else ''}{name}")
+
+
+def _validate_with_ast(
+    sql: str,
+    schema_cache: Dict[str, Dict[str, Set[str]]],
+    tree: exp.Expression | None = None,
+) -> Dict[str, Any] | None:
+    """Resolve a read query against ``schema_cache`` without touching the database.
+
+    Returns the validation details when every relation and column resolves, or
+    ``None`` when the caller has to fall back to EXPLAIN.
+    """
+
+    if tree is None:
+        tree = parse_statement(sql).ast
+    if not isinstance(tree, (exp.Select, *SET_OPERATION_TYPES)):
+        return None
+
+    resolver = _AstResolver(schema_cache)
+    try:
+        scopes = traverse_scope(tree)
+        by_expression = {id(scope.expression): scope for scope in scopes}
+        seen: Set[int] = set()
+        for scope in scopes:
+            for source in scope.sources.values():
+                resolver.source_columns(source)
+            for join in scope.expression.args.get("joins") or []:
+                joined = scope.sources.get(join.alias_or_name)
+                for ident in join.args.get("using") or []:
+                    columns = resolver.source_columns(joined) if joined is not None else set()
+                    if columns is not _ANY_COLUMN and _ident_name(ident) not in columns:
+                        raise _Undecided(f"unknown USING column {_ident_name(ident)}")
+            for column in scope.columns:
+                if id(column) in seen:
+                    continue
+                seen.add(id(column))
+                # ``scope.columns`` can include columns of nested IN/EXISTS
+                # subqueries; resolve each against its innermost scope.
+                owner = column.parent
+                while owner is not None and id(owner) not in by_expression:
+                    owner = owner.parent
+                resolver.resolve(by_expression[id(owner)] if owner is not None else scope, column)
+    except (_Undecided, SqlglotError):
+        return None
+
+    return {
+        "unknown_relations": [],
+        "unknown_columns": {},
+        "explain_failed": False,
+        "error_text": "",
+        "strict_violation": False,
+        "validator": "ast",
+        "relations": sorted(resolver.relations),
+    }
+
+
 def validate_identifiers(
     sql: str,
     engine=None,
@@ -582,12 +858,54 @@ def validate_identifiers(
     params: Dict[str, object] | None = None,
     requested: Dict[str, Set[str]] | None = None,
 ) -> Tuple[bool, Dict[str, any]]:
-    """Validate identifiers against schema cache."""
+    """Validate identifiers against schema cache.
 
-    engine = engine or get_engine(readonly=True)
+    Reads are resolved from the AST first; EXPLAIN runs only when that is
+    inconclusive. Outcomes are cached per SQL shape, schema fingerprint and
+    ``requested`` identifiers whenever ``schema_cache`` is the shared cache.
+    """
+
+    fingerprint = None
     if schema_cache is None:
-        schema_cache, _ = load_schema_cache(engine)
+        schema_cache, fingerprint = load_schema_cache(engine)
+    elif schema_cache is _SCHEMA_CACHE:
+        fingerprint = _SCHEMA_FINGERPRINT
+
+    tree = parse_statement(sql).ast
+
+    # Parameter values are masked like literals; only which ones are bound
+    # decides whether EXPLAIN can run.
+    cache_key = (
+        (sql_shape(sql, tree), fingerprint, _requested_key(requested), tuple(sorted(params or ())))
+        if fingerprint
+        else None
+    )
+    if cache_key is not None:
+        cached = _cached_validation(cache_key)
+        if cached is not None:
+            cached[1]["cached"] = True
+            return cached
+
+    ok, details = _validate_uncached(sql, engine, schema_cache, tree, params, requested)
+    if cache_key is not None:
+        _remember_validation(cache_key, ok, details)
+    return ok, details
+
 
+def _validate_uncached(
+    sql: str,
+    engine,
+    schema_cache: Dict[str, Dict[str, Set[str]]],
+    tree: exp.Expression | None,
+    params: Dict[str, object] | None,
+    requested: Dict[str, Set[str]] | None,
+) -> Tuple[bool, Dict[str, any]]:
+    if tree is not None:
+        ast_details = _validate_with_ast(sql, schema_cache, tree)
+        if ast_details is not None:
+            return True, ast_details
+
+    engine = engine or get_engine(readonly=True)
     identifiers = extract_identifiers(sql, engine, params=params)
     relations = set(identifiers.get("relations", set()))
     columns_map = identifiers.get("columns", {})
@@ -727,6 +1045,12 @@ def validate_identifiers(
         "explain_failed": explain_failed,
         "error_text": error_text,
         "strict_violation": strict_violation,
+        "validator": "explain",
+        "relations": sorted(base_relations),
+        "aliases": dict(alias_map),
+        "cte_columns": {name: sorted(cols) for name, cols in cte_columns_map.items()},
+        # Row estimate from the guard's plan; lets the write gate skip its own EXPLAIN.
+        "plan_rows": identifiers.get("plan_rows"),
     }
 
     ok = not details["unknown_relations"] and not details["unknown_columns"] and not explain_failed
@@ -805,8 +1129,13 @@ def ensure_valid_identifiers(
     schema_summary: str | None = None,
     params: Dict[str, object] | None = None,
     requested: Dict[str, Set[str]] | None = None,
+    outcome: Dict[str, Any] | None = None,
 ) -> Dict[str, Dict[str, Set[str]]]:
-    """Validate SQL identifiers and raise IdentifierValidationError on failure."""
+    """Validate SQL identifiers and raise IdentifierValidationError on failure.
+
+    When ``outcome`` is given it receives the final validation details, e.g.
+    ``plan_rows`` for reuse by the write gate.
+    """
 
     engine = engine or get_engine(readonly=True)
     if schema_map is not None:
@@ -815,16 +1144,7 @@ def ensure_valid_identifiers(
         schema_cache, _ = load_schema_cache(engine)
     if requested is None:
         requested = extract_requested_identifiers(sql)
-    ok, details = validate_identifiers(
-        sql,
-        engine,
-        schema_cache,
-        params=params,
-        requested=requested,
-    )
-
-    if not ok and schema_map is None:
-        schema_cache, _ = load_schema_cache(engine, force_refresh=True)
+    with stage("validate") as info:
         ok, details = validate_identifiers(
             sql,
             engine,
@@ -832,6 +1152,22 @@ def ensure_valid_identifiers(
             params=params,
             requested=requested,
         )
+        info.update(validator=details.get("validator"), cached=details.get("cached"), ok=ok)
+
+    if not ok and schema_map is None:
+        schema_cache, _ = load_schema_cache(engine, force_refresh=True)
+        with stage("validate", retry=True) as info:
+            ok, details = validate_identifiers(
+                sql,
+                engine,
+                schema_cache,
+                params=params,
+                requested=requested,
+            )
+            info.update(validator=details.get("validator"), cached=details.get("cached"), ok=ok)
+
+    if outcome is not None:
+        outcome.update(details)
 
     if not ok:
         if schema_summary is None:
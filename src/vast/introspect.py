@@ -4,8 +4,7 @@ import logging
 from hashlib import sha1
 from typing import Iterable, List, Sequence, Tuple
 
-from sqlalchemy import String, bindparam, inspect, text
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import inspect, text
 from sqlalchemy.exc import ProgrammingError
 
 try:  # psycopg2 is optional at runtime (e.g., under async drivers)
@@ -13,8 +12,9 @@ try:  # psycopg2 is optional at runtime (e.g., under async drivers)
 except Exception:  # pragma: no cover - psycopg2 not installed
     psycopg2_errors = None  # type: ignore[assignment]
 
+from .catalog_snapshot import eligible_schemas, get_catalog_snapshot
 from .config import settings
-from .db import get_engine
+from .db import get_pool_engine
 
 logger = logging.getLogger(__name__)
 
@@ -37,38 +37,11 @@ def has_schema_usage(engine, schema: str) -> bool:
 
 
 def _eligible_schemas(engine) -> List[str]:
-    allowed: List[str] = []
-    for schema in INCLUDE_SCHEMAS:
-        if has_schema_usage(engine, schema):
-            allowed.append(schema)
-        else:
-            logger.debug("Skipping schema %s due to missing USAGE privilege", schema)
-    return allowed
+    return eligible_schemas(engine, INCLUDE_SCHEMAS)
 
 
 def list_tables() -> list[dict]:
-    engine = get_engine(readonly=True)
-    schemas = _eligible_schemas(engine)
-    if not schemas:
-        return []
-
-    stmt = text(
-        """
-        SELECT table_schema, table_name
-        FROM information_schema.tables
-        WHERE table_schema = ANY(:schemas)
-          AND table_type = 'BASE TABLE'
-        ORDER BY table_schema, table_name
-        """
-    ).bindparams(bindparam("schemas", type_=ARRAY(String)))
-
-    with engine.connect() as conn:
-        rows = conn.execute(stmt, {"schemas": schemas}).mappings().all()
-
-    return [
-        {"table_schema": row["table_schema"], "table_name": row["table_name"]}
-        for row in rows
-    ]
+    return get_catalog_snapshot().list_tables()
 
 
 def _is_privilege_error(exc: Exception) -> bool:
@@ -83,7 +56,11 @@ def _is_privilege_error(exc: Exception) -> bool:
 
 
 def table_columns(schema: str, table: str) -> list[dict]:
-    engine = get_engine(readonly=True)
+    snapshot = get_catalog_snapshot()
+    if (schema, table) in snapshot.columns:
+        return snapshot.table_columns(schema, table)
+
+    engine = get_pool_engine("catalog")
     insp = inspect(engine)
     try:
         cols = insp.get_columns(table_name=table, schema=schema)
@@ -139,16 +116,4 @@ def fingerprint_from_columns(
 def schema_fingerprint() -> str:
     """Deterministic fingerprint of (schema, table, column, type)."""
 
-    tables = list_tables()
-    specs: List[Tuple[str, str, Sequence[Tuple[str | None, str | None]]]] = []
-    for entry in tables:
-        schema = entry["table_schema"]
-        table = entry["table_name"]
-        cols = table_columns(schema, table)
-        column_specs = [
-            (str(col.get("column_name")) if col.get("column_name") is not None else None, str(col.get("data_type")))
-            for col in cols
-        ]
-        specs.append((schema, table, column_specs))
-
-    return fingerprint_from_columns(specs)
+    return get_catalog_snapshot().fingerprint
@@ -15,7 +15,7 @@ from uuid import uuid4
 from openai import OpenAI
 
 from .config import settings
-from .introspect import list_tables, table_columns, schema_fingerprint
+from .catalog_snapshot import get_catalog_snapshot
 
 KNOWLEDGE_DIR = Path(".vast/knowledge")
 DB_PATH = KNOWLEDGE_DIR / "knowledge.db"
@@ -177,16 +177,17 @@ class KnowledgeStore:
         return [Snapshot.from_row(r) for r in rows]
 
     def capture_schema_snapshot(self, force: bool = False) -> Snapshot:
-        fp = schema_fingerprint()
+        catalog = get_catalog_snapshot(force_refresh=force)
+        fp = catalog.fingerprint
         latest = self.latest_snapshot()
         if latest and latest.fingerprint == fp and not force:
             return latest
 
         tables = []
-        for tbl in list_tables():
+        for tbl in catalog.list_tables():
             schema = tbl["table_schema"]
             name = tbl["table_name"]
-            columns = table_columns(schema, name)
+            columns = catalog.table_columns(schema, name)
             tables.append({
                 "schema": schema,
                 "name": name,
@@ -0,0 +1,258 @@
+"""Paged reads with LIMIT pushdown and opaque cursor tokens.
+
+``plan_page`` looks at the top-level query once and picks how later pages
+are fetched:
+
+``keyset``
+    A plain SELECT ordered by projected columns. The next page adds a
+    predicate "at or after the last row's key" and skips only the rows that
+    tie with that key, so it starts where the last page ended instead of
+    re-reading everything before it.
+``offset``
+    Anything else without its own LIMIT/OFFSET: ``LIMIT n + 1 OFFSET o`` on
+    the statement.
+``wrap``
+    Statements that already have a LIMIT/OFFSET/FETCH are wrapped in a
+    subquery so the caller's cap still applies.
+
+Every page fetches one row more than it returns to report ``has_more``. The
+cursor token is base64 JSON bound to the statement's text; it carries the
+offset or the last key, never the SQL itself.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlglot import exp
+
+from .columnar import ColumnarResult
+from .statement import parse_statement, render_sql
+
+# Key types whose coerced values bind back to an exact comparison.
+KEYSET_TYPES = frozenset({"integer", "float", "boolean", "text", "timestamp", "date", "time", "uuid", "null"})
+
+_KEY_BIND = "_vast_k{}"
+_PAGE_ALIAS = "_vast_page"
+
+
+@dataclass(frozen=True)
+class PageKey:
+    column: exp.Column
+    output: str
+    desc: bool
+    nulls_first: bool
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    digest: str
+    offset: int = 0
+    keys: Optional[List[Any]] = None
+    ties: int = 0
+
+
+def sql_digest(sql: str) -> str:
+    text = (sql or "").strip().rstrip(";").rstrip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(cursor: PageCursor) -> str:
+    body: Dict[str, Any] = {"v": 1, "d": cursor.digest, "o": cursor.offset}
+    if cursor.keys is not None:
+        body["k"] = cursor.keys
+        body["t"] = cursor.ties
+    raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sql: str) -> PageCursor:
+    """Decode ``token`` and check it was issued for ``sql``."""
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        body = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor = PageCursor(
+            digest=str(body["d"]),
+            offset=int(body.get("o", 0)),
+            keys=body.get("k"),
+            ties=int(body.get("t", 0)),
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError) as exc:
+        raise ValueError("Invalid page cursor.") from exc
+    if body.get("v") != 1 or cursor.offset < 0 or cursor.ties < 0:
+        raise ValueError("Invalid page cursor.")
+    if cursor.keys is not None and not isinstance(cursor.keys, list):
+        raise ValueError("Invalid page cursor.")
+    if cursor.digest != sql_digest(sql):
+        raise ValueError("Page cursor does not belong to this query.")
+    return cursor
+
+
+def _projection_outputs(select: exp.Select) -> Tuple[Dict[str, exp.Expression], List[Tuple[str, exp.Expression]]]:
+    aliases: Dict[str, exp.Expression] = {}
+    outputs: List[Tuple[str, exp.Expression]] = []
+    for projection in select.expressions:
+        if isinstance(projection, exp.Alias):
+            aliases[projection.alias] = projection.this
+            outputs.append((projection.alias, projection.this))
+        else:
+            outputs.append((projection.alias_or_name, projection))
+    return aliases, outputs
+
+
+def _same_column(left: exp.Column, right: exp.Expression) -> bool:
+    if not isinstance(right, exp.Column) or left.name != right.name:
+        return False
+    return not left.table or not right.table or left.table == right.table
+
+
+def _keyset_keys(select: exp.Select) -> Optional[Tuple[PageKey, ...]]:
+    order = select.args.get("order")
+    if order is None or not order.expressions:
+        return None
+    for arg in ("distinct", "group", "having", "qualify", "limit", "offset"):
+        if select.args.get(arg):
+            return None
+    if any(p.find(exp.Window, exp.AggFunc, exp.Star) for p in select.expressions):
+        return None
+
+    aliases, outputs = _projection_outputs(select)
+    names = [name for name, _ in outputs]
+    keys: List[PageKey] = []
+    for ordered in order.expressions:
+        column = ordered.this
+        if not isinstance(column, exp.Column):
+            return None
+        if not column.table and column.name in aliases:
+            column = aliases[column.name]
+            if not isinstance(column, exp.Column):
+                return None
+        matches = [name for name, expr in outputs if _same_column(column, expr)]
+        if len(matches) != 1 or names.count(matches[0]) != 1:
+            return None
+        keys.append(
+            PageKey(
+                column=column,
+                output=matches[0],
+                desc=bool(ordered.args.get("desc")),
+                nulls_first=bool(ordered.args.get("nulls_first")),
+            )
+        )
+    return tuple(keys)
+
+
+@dataclass(frozen=True)
+class PagePlan:
+    sql: str
+    mode: str
+    keys: Tuple[PageKey, ...] = ()
+
+    def page_sql(self, page_size: int, cursor: Optional[PageCursor] = None) -> Tuple[str, Dict[str, Any]]:
+        """SQL and extra binds for the page after ``cursor`` (first page if None)."""
+
+        fetch = int(page_size) + 1
+        tree = parse_statement(self.sql).ast.copy()
+        if self.mode == "wrap":
+            alias = exp.TableAlias(this=exp.to_identifier(_PAGE_ALIAS))
+            tree = exp.select("*").from_(exp.Subquery(this=tree, alias=alias))
+        params: Dict[str, Any] = {}
+        offset = cursor.offset if cursor else 0
+        if cursor and cursor.keys is not None and self.mode == "keyset":
+            predicate, params = self._after(cursor.keys)
+            if predicate is not None:
+                tree = tree.where(predicate, copy=False)
+            offset = cursor.ties
+        tree = tree.limit(fetch, copy=False)
+        if offset:
+            tree = tree.offset(offset, copy=False)
+        return render_sql(tree), params
+
+    def _after(self, values: List[Any]) -> Tuple[Optional[exp.Expression], Dict[str, Any]]:
+        # Rows at or after ``values`` in ORDER BY order, NULL placement included.
+        params: Dict[str, Any] = {}
+        equal: List[exp.Expression] = []
+        branches: List[exp.Expression] = []
+        for index, (key, value) in enumerate(zip(self.keys, values)):
+            column = key.column.copy()
+            if value is None:
+                after = exp.not_(column.is_(exp.null())) if key.nulls_first else None
+                same: exp.Expression = column.copy().is_(exp.null())
+            else:
+                name = _KEY_BIND.format(index)
+                params[name] = value
+                bind = exp.Placeholder(this=name)
+                compare = exp.LT if key.desc else exp.GT
+                after = compare(this=column, expression=bind)
+                if not key.nulls_first:
+                    after = exp.or_(after, column.copy().is_(exp.null()))
+                same = exp.EQ(this=column.copy(), expression=bind.copy())
+            if after is not None:
+                branches.append(exp.and_(*equal, after) if equal else after)
+            equal.append(same)
+        branches.append(exp.and_(*equal))
+        return exp.or_(*branches), params
+
+    def next_cursor(self, page: ColumnarResult, page_size: int, cursor: Optional[PageCursor] = None) -> str:
+        """Cursor for the page following ``page`` (the rows actually returned)."""
+
+        digest = sql_digest(self.sql)
+        offset = (cursor.offset if cursor else 0) + page_size
+        fallback = PageCursor(digest=digest, offset=offset)
+        if self.mode != "keyset" or not page.row_count:
+            return encode_cursor(fallback)
+
+        index = {name: i for i, name in enumerate(page.columns)}
+        positions = [index.get(key.output) for key in self.keys]
+        if any(pos is None or page.types[pos] not in KEYSET_TYPES for pos in positions):
+            return encode_cursor(fallback)
+        rows = list(zip(*(page.data[pos] for pos in positions)))
+        last = list(rows[-1])
+
+        ties = 0
+        for row in reversed(rows):
+            if list(row) != last:
+                break
+            ties += 1
+        if ties == len(rows):
+            # The whole page ties: rows before it may share the key as well.
+            if cursor is None:
+                pass
+            elif cursor.keys == last:
+                ties += cursor.ties
+            elif cursor.keys is None and cursor.offset:
+                return encode_cursor(fallback)
+        return encode_cursor(PageCursor(digest=digest, offset=offset, keys=last, ties=ties))
+
+
+def plan_page(sql: str) -> PagePlan:
+    statement = parse_statement((sql or "").strip().rstrip(";"))
+    if not statement.ok:
+        raise ValueError(statement.error)
+    if not statement.is_select:
+        raise ValueError("Pagination is only available for SELECT statements.")
+    tree = statement.ast
+    if tree.args.get("limit") or tree.args.get("offset"):
+        return PagePlan(sql=statement.sql, mode="wrap")
+    if isinstance(tree, exp.Select):
+        keys = _keyset_keys(tree)
+        if keys:
+            return PagePlan(sql=statement.sql, mode="keyset", keys=keys)
+    return PagePlan(sql=statement.sql, mode="offset")
+
+
+__all__ = [
+    "KEYSET_TYPES",
+    "PageCursor",
+    "PageKey",
+    "PagePlan",
+    "decode_cursor",
+    "encode_cursor",
+    "plan_page",
+    "sql_digest",
+]
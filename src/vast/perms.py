@@ -30,6 +30,111 @@ def _grant_statements(schema: str, ro_role: str, rw_role: str) -> List[str]:
     ]
 
 
+DDL_LOG_TABLE = "vast_ddl_log"
+DDL_NOTIFY_FUNCTION = "vast_notify_ddl"
+DDL_EVENT_TRIGGERS = {
+    "vast_ddl_command_end": "ddl_command_end",
+    "vast_ddl_sql_drop": "sql_drop",
+}
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _ddl_trigger_statements(schema: str, ro_role: str, channel: str) -> List[str]:
+    sch = _quote_ident(schema)
+    ro = _quote_ident(ro_role)
+    log = f"{sch}.{_quote_ident(DDL_LOG_TABLE)}"
+    fn = f"{sch}.{_quote_ident(DDL_NOTIFY_FUNCTION)}"
+
+    # Temp-schema objects never reach the catalog snapshot, so they are
+    # neither logged nor announced. The function runs as its owner so that
+    # any role allowed to run DDL can append to the log without being
+    # granted INSERT on it.
+    function_body = f"""
+CREATE OR REPLACE FUNCTION {fn}() RETURNS event_trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = pg_catalog, {sch}
+AS $vast$
+DECLARE
+  obj record;
+  logged integer := 0;
+BEGIN
+  IF TG_EVENT = 'sql_drop' THEN
+    FOR obj IN
+      SELECT object_type, schema_name, object_identity
+      FROM pg_event_trigger_dropped_objects()
+      WHERE schema_name IS NULL OR left(schema_name, 7) <> 'pg_temp'
+    LOOP
+      INSERT INTO {log} (event, command_tag, object_type, schema_name, object_identity)
+      VALUES (TG_EVENT, TG_TAG, obj.object_type, obj.schema_name, obj.object_identity);
+      logged := logged + 1;
+    END LOOP;
+  ELSE
+    FOR obj IN
+      SELECT object_type, schema_name, object_identity
+      FROM pg_event_trigger_ddl_commands()
+      WHERE schema_name IS NULL OR left(schema_name, 7) <> 'pg_temp'
+    LOOP
+      INSERT INTO {log} (event, command_tag, object_type, schema_name, object_identity)
+      VALUES (TG_EVENT, TG_TAG, obj.object_type, obj.schema_name, obj.object_identity);
+      logged := logged + 1;
+    END LOOP;
+  END IF;
+  IF logged > 0 THEN
+    PERFORM pg_notify({_quote_literal(channel)}, TG_TAG);
+  END IF;
+END
+$vast$
+""".strip()
+
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {log} ("
+        "id bigserial PRIMARY KEY, "
+        "occurred_at timestamptz NOT NULL DEFAULT now(), "
+        "event text NOT NULL, "
+        "command_tag text NOT NULL, "
+        "object_type text, "
+        "schema_name text, "
+        "object_identity text)",
+        function_body,
+        f"REVOKE ALL ON FUNCTION {fn}() FROM PUBLIC",
+    ]
+    for trigger, event in DDL_EVENT_TRIGGERS.items():
+        name = _quote_ident(trigger)
+        statements.append(f"DROP EVENT TRIGGER IF EXISTS {name}")
+        statements.append(f"CREATE EVENT TRIGGER {name} ON {event} EXECUTE FUNCTION {fn}()")
+    statements.append(f"GRANT SELECT ON TABLE {log} TO {ro}")
+    return statements
+
+
+def install_ddl_trigger(
+    engine_owner,
+    schema: str,
+    ro_role: str,
+    channel: str = "vast_schema",
+) -> Dict[str, Iterable[str]]:
+    """Install the DDL event trigger that logs schema changes and NOTIFYs ``channel``.
+
+    Event triggers require a superuser owner connection.
+    """
+
+    statements = _ddl_trigger_statements(schema, ro_role, channel)
+
+    with engine_owner.begin() as conn:
+        for stmt in statements:
+            conn.execute(text(stmt))
+
+    return {
+        "schema": schema,
+        "log_table": f"{schema}.{DDL_LOG_TABLE}",
+        "channel": channel,
+        "statements": statements,
+    }
+
+
 def bootstrap_perms(engine_owner, schema: str, ro_role: str, rw_role: str) -> Dict[str, Iterable[str]]:
     """Grant baseline privileges for Vast roles using the owner connection."""
 
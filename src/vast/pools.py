@@ -0,0 +1,254 @@
+"""Named connection pools, one per workload.
+
+Interactive queries, catalog/introspection builds, background maintenance
+and writes each get their own engine and pool, so a slow catalog rebuild
+cannot hold the connections an interactive query is waiting for. Each pool
+reads its size, overflow, statement timeout, ``pre_ping`` and recycle
+interval from ``VAST_POOL_<NAME>_*`` settings.
+
+Every pool records how long checkouts waited, how many timed out and how
+often a checkout had to open an overflow connection; ``pool_stats`` adds
+the live in-use/idle counts.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import read_url, settings, write_url
+
+POOL_NAMES = ("interactive", "catalog", "maintenance", "write")
+
+# Async engines share their workload's settings under their own stats entry.
+ASYNC_SUFFIX = "_async"
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    name: str
+    size: int
+    max_overflow: int
+    statement_timeout_ms: int
+    pre_ping: bool
+    recycle_s: int
+    timeout_s: float
+
+    @classmethod
+    def from_settings(cls, name: str) -> "PoolConfig":
+        if name not in POOL_NAMES:
+            raise ValueError(f"Unknown connection pool '{name}'. Expected one of: {', '.join(POOL_NAMES)}.")
+        prefix = f"VAST_POOL_{name.upper()}_"
+        timeout_ms = getattr(settings, prefix + "STATEMENT_TIMEOUT_MS")
+        return cls(
+            name=name,
+            size=max(int(getattr(settings, prefix + "SIZE")), 1),
+            max_overflow=max(int(getattr(settings, prefix + "MAX_OVERFLOW")), 0),
+            statement_timeout_ms=int(timeout_ms or settings.default_statement_timeout_ms),
+            pre_ping=bool(getattr(settings, prefix + "PRE_PING")),
+            recycle_s=int(getattr(settings, prefix + "RECYCLE_S")),
+            timeout_s=float(settings.VAST_POOL_TIMEOUT_S),
+        )
+
+    def connect_args(self) -> Dict[str, Any]:
+        return {
+            "application_name": f"vast_{self.name}",
+            "options": (
+                f"-c statement_timeout={self.statement_timeout_ms}"
+                f" -c idle_in_transaction_session_timeout={settings.idle_in_tx_timeout_ms}"
+            ),
+        }
+
+
+class PoolStats:
+    """Checkout counters for one named pool; survives pool re-creation."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record(self, wait_ms: float, *, overflowed: bool = False, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.overflow_checkouts += int(overflowed)
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_ms_total, 3),
+                "wait_ms_avg": round(self.wait_ms_total / waits, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+
+class _TimedPool:
+    # Set on the per-pool subclass: ``Pool.recreate`` rebuilds from ``self.__class__``.
+    vast_stats: PoolStats
+
+    def _do_get(self):
+        overflow_before = self.overflow()
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.vast_stats.record((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        overflowed = self.overflow() > max(overflow_before, 0)
+        self.vast_stats.record((time.perf_counter() - started) * 1000, overflowed=overflowed)
+        return conn
+
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+_STATS: Dict[str, PoolStats] = {}
+_CONFIGS: Dict[str, PoolConfig] = {}
+_ENGINES: Dict[str, Any] = {}
+_LOCK = threading.Lock()
+
+
+def _pool_class(base: type, key: str) -> type:
+    with _LOCK:
+        stats = _STATS.setdefault(key, PoolStats())
+    return type(base.__name__, (base,), {"vast_stats": stats})
+
+
+def pool_url(name: str) -> str:
+    return write_url() if name == "write" else read_url()
+
+
+def create_pool_engine(name: str, url: Optional[str] = None) -> Engine:
+    """A new engine on the named pool's settings, registered for ``pool_stats``."""
+
+    config = PoolConfig.from_settings(name)
+    engine = create_engine(
+        url or pool_url(name),
+        poolclass=_pool_class(TimedQueuePool, name),
+        pool_size=config.size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.timeout_s,
+        pool_pre_ping=config.pre_ping,
+        pool_recycle=config.recycle_s,
+        connect_args=config.connect_args(),
+    )
+    with _LOCK:
+        _CONFIGS[name] = config
+        _ENGINES[name] = engine
+    return engine
+
+
+def create_async_pool_engine(name: str, url: str, size: Optional[int] = None):
+    """Asyncio engine for ``name``'s workload, tracked as ``<name>_async``."""
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    config = PoolConfig.from_settings(name)
+    if size is not None:
+        config = replace(config, size=max(int(size), 1), max_overflow=0)
+    key = name + ASYNC_SUFFIX
+    engine = create_async_engine(
+        url,
+        poolclass=_pool_class(TimedAsyncQueuePool, key),
+        pool_size=config.size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.timeout_s,
+        pool_pre_ping=config.pre_ping,
+        pool_recycle=config.recycle_s,
+        connect_args={**config.connect_args(), "application_name": f"vast_{key}"},
+    )
+    with _LOCK:
+        _CONFIGS[key] = config
+        _ENGINES[key] = engine
+    return engine
+
+
+def _live_counts(engine) -> Dict[str, int]:
+    pool = getattr(getattr(engine, "sync_engine", engine), "pool", None)
+    try:
+        return {
+            "in_use": int(pool.checkedout()),
+            "idle": int(pool.checkedin()),
+            "overflow": max(int(pool.overflow()), 0),
+        }
+    except Exception:
+        return {"in_use": 0, "idle": 0, "overflow": 0}
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-pool configuration, live counts and checkout counters.
+
+    Pools that have not been used yet are listed with ``created: False``.
+    """
+    with _LOCK:
+        engines = dict(_ENGINES)
+        configs = dict(_CONFIGS)
+        stats = dict(_STATS)
+    out: Dict[str, Dict[str, Any]] = {}
+    for key in list(POOL_NAMES) + sorted(k for k in engines if k not in POOL_NAMES):
+        config = configs.get(key) or PoolConfig.from_settings(key)
+        entry: Dict[str, Any] = {
+            "created": key in engines,
+            "size": config.size,
+            "max_overflow": config.max_overflow,
+            "statement_timeout_ms": config.statement_timeout_ms,
+            "pre_ping": config.pre_ping,
+            "recycle_s": config.recycle_s,
+        }
+        entry.update(_live_counts(engines[key]) if key in engines else {"in_use": 0, "idle": 0, "overflow": 0})
+        entry.update((stats.get(key) or PoolStats()).snapshot())
+        out[key] = entry
+    return out
+
+
+def forget_engine(key: str) -> None:
+    with _LOCK:
+        _ENGINES.pop(key, None)
+
+
+def reset_pool_stats() -> None:
+    with _LOCK:
+        for stats in _STATS.values():
+            with stats._lock:
+                stats.reset()
+
+
+__all__ = [
+    "POOL_NAMES",
+    "PoolConfig",
+    "PoolStats",
+    "TimedAsyncQueuePool",
+    "TimedQueuePool",
+    "create_async_pool_engine",
+    "create_pool_engine",
+    "forget_engine",
+    "pool_stats",
+    "pool_url",
+    "reset_pool_stats",
+]
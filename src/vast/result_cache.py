@@ -0,0 +1,354 @@
+"""Opt-in cache of read results in front of ``db.safe_execute``.
+
+Enabled with ``VAST_RESULT_CACHE``. Entries are keyed by normalized SQL,
+params and the catalog fingerprint, so a schema change never serves an old
+shape. Each entry is tagged with the table names its statement reads; a
+write through ``safe_execute`` or ``apply_statements`` drops every entry
+tagged with a table it touches. Entries also expire after
+``VAST_RESULT_CACHE_TTL_MS`` and the cache evicts least recently used
+entries beyond ``VAST_RESULT_CACHE_MAX_BYTES``.
+
+Writes from other clients are invisible to tag invalidation. With
+``VAST_RESULT_CACHE_STAT_CHECK`` a hit first compares the tables'
+``pg_stat_user_tables`` modification counters with the ones recorded at
+store time. The counters are flushed lazily by PostgreSQL, so this narrows
+the staleness window rather than closing it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlglot import exp
+
+from .columnar import ColumnarResult
+from .config import settings
+from .statement import ParsedStatement
+
+logger = logging.getLogger(__name__)
+
+# Functions whose result changes between identical calls.
+VOLATILE_FUNCTIONS = frozenset(
+    {
+        "clock_timestamp",
+        "gen_random_uuid",
+        "nextval",
+        "now",
+        "pg_sleep",
+        "random",
+        "statement_timestamp",
+        "timeofday",
+        "transaction_timestamp",
+        "txid_current",
+    }
+)
+_VOLATILE_NODES = tuple(
+    node
+    for node in (
+        getattr(exp, "CurrentTimestamp", None),
+        getattr(exp, "CurrentDate", None),
+        getattr(exp, "CurrentTime", None),
+        getattr(exp, "Rand", None),
+    )
+    if node is not None
+)
+_SYSTEM_SCHEMAS = frozenset({"pg_catalog", "information_schema"})
+
+TABLE_VERSIONS_SQL = """
+SELECT relname, n_tup_ins + n_tup_upd + n_tup_del AS changes
+FROM pg_catalog.pg_stat_user_tables
+WHERE relname IN :names
+""".strip()
+
+CacheKey = Tuple[str, str, str]
+
+
+@dataclass
+class CacheEntry:
+    result: Optional[ColumnarResult]
+    row_count: int
+    tables: FrozenSet[str]
+    size: int
+    versions: Optional[Dict[str, int]] = None
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+_ENTRIES: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+_TAGS: Dict[str, Set[CacheKey]] = {}
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "invalidations": 0}
+_BYTES = 0
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "VAST_RESULT_CACHE", False))
+
+
+def cacheable(statement: ParsedStatement) -> bool:
+    """Only deterministic SELECTs over user tables are cached."""
+
+    if not statement.ok or not statement.is_select or not statement.tables:
+        return False
+    if any(schema in _SYSTEM_SCHEMAS for schema, _ in statement.tables):
+        return False
+    if any(name.lower().startswith("pg_") for _, name in statement.tables):
+        return False
+    tree = statement.ast
+    if _VOLATILE_NODES and tree.find(*_VOLATILE_NODES):
+        return False
+    for func in tree.find_all(exp.Func):
+        if func.sql_name().lower() in VOLATILE_FUNCTIONS or (
+            isinstance(func, exp.Anonymous) and str(func.this).lower() in VOLATILE_FUNCTIONS
+        ):
+            return False
+    return True
+
+
+def table_tags(statement: ParsedStatement) -> FrozenSet[str]:
+    # Bare names: a write to s.film must drop reads of "film" resolved via search_path.
+    return frozenset(name.lower() for _, name in statement.tables)
+
+
+def schema_fingerprint() -> Optional[str]:
+    from .catalog_snapshot import get_catalog_snapshot
+
+    try:
+        snapshot = get_catalog_snapshot()
+    except Exception as exc:  # pragma: no cover - no catalog, no caching
+        logger.debug("result cache: catalog fingerprint unavailable: %s", exc)
+        return None
+    return snapshot.fingerprint if snapshot.complete else None
+
+
+def cache_key(sql: str, params: Dict[str, Any] | None, fingerprint: str) -> CacheKey:
+    return (sql, json.dumps(params or {}, sort_keys=True, default=str), fingerprint)
+
+
+def estimate_bytes(result: Optional[ColumnarResult]) -> int:
+    """Rough in-memory size of a result; strings dominate real-world results."""
+
+    if result is None:
+        return 64
+    size = 64 + sum(len(name) + 64 for name in result.columns)
+    for values in result.data:
+        size += 8 * len(values)
+        for value in values:
+            if isinstance(value, str):
+                size += 49 + len(value)
+            elif value is not None:
+                size += 32
+    return size
+
+
+def _versions_statement():
+    return text(TABLE_VERSIONS_SQL).bindparams(bindparam("names", expanding=True))
+
+
+def _versions_from_rows(rows) -> Dict[str, int]:
+    versions: Dict[str, int] = {}
+    for relname, changes in rows:
+        # Same relname in several schemas: any change counts.
+        versions[str(relname).lower()] = versions.get(str(relname).lower(), 0) + int(changes or 0)
+    return versions
+
+
+def table_versions(engine, tables: Iterable[str]) -> Optional[Dict[str, int]]:
+    names = sorted(tables)
+    if not names:
+        return {}
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(_versions_statement(), {"names": names}).fetchall()
+    except Exception as exc:
+        logger.debug("result cache: pg_stat_user_tables unavailable: %s", exc)
+        return None
+    return _versions_from_rows(rows)
+
+
+async def table_versions_async(engine, tables: Iterable[str]) -> Optional[Dict[str, int]]:
+    names = sorted(tables)
+    if not names:
+        return {}
+    try:
+        async with engine.connect() as conn:
+            rows = (await conn.execute(_versions_statement(), {"names": names})).fetchall()
+    except Exception as exc:
+        logger.debug("result cache: pg_stat_user_tables unavailable: %s", exc)
+        return None
+    return _versions_from_rows(rows)
+
+
+def _ttl_seconds() -> float:
+    return max(float(getattr(settings, "VAST_RESULT_CACHE_TTL_MS", 60_000)), 0.0) / 1000.0
+
+
+def _drop(key: CacheKey) -> None:
+    global _BYTES
+    entry = _ENTRIES.pop(key, None)
+    if entry is None:
+        return
+    _BYTES -= entry.size
+    for tag in entry.tables:
+        keys = _TAGS.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del _TAGS[tag]
+
+
+def _get(key: CacheKey) -> Tuple[Optional[CacheEntry], str]:
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        if entry is not None and time.monotonic() - entry.stored_at > _ttl_seconds():
+            _drop(key)
+            _STATS["stale"] += 1
+            _STATS["misses"] += 1
+            return None, "stale"
+        if entry is None:
+            _STATS["misses"] += 1
+            return None, "miss"
+        _ENTRIES.move_to_end(key)
+        return entry, "hit"
+
+
+def _confirm(key: CacheKey, entry: CacheEntry, current: Optional[Dict[str, int]]) -> Tuple[Optional[CacheEntry], str]:
+    with _LOCK:
+        if entry.versions is not None and current != entry.versions:
+            if _ENTRIES.get(key) is entry:
+                _drop(key)
+            _STATS["stale"] += 1
+            _STATS["misses"] += 1
+            return None, "stale"
+        _STATS["hits"] += 1
+        return entry, "hit"
+
+
+def lookup(key: CacheKey, engine=None) -> Tuple[Optional[CacheEntry], str]:
+    """Return ``(entry, status)`` with status ``hit``, ``miss`` or ``stale``.
+
+    With ``engine``, entries stored with table versions are checked against
+    the current ``pg_stat_user_tables`` counters first.
+    """
+    entry, status = _get(key)
+    if entry is None:
+        return None, status
+    check = entry.versions is not None and engine is not None
+    return _confirm(key, entry, table_versions(engine, entry.tables) if check else entry.versions)
+
+
+async def lookup_async(key: CacheKey, engine=None) -> Tuple[Optional[CacheEntry], str]:
+    """``lookup`` with the counter check on an asyncio engine."""
+
+    entry, status = _get(key)
+    if entry is None:
+        return None, status
+    check = entry.versions is not None and engine is not None
+    return _confirm(key, entry, await table_versions_async(engine, entry.tables) if check else entry.versions)
+
+
+def contains(key: CacheKey) -> bool:
+    """Whether ``key`` has an unexpired entry; touches neither stats nor LRU order."""
+
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        return entry is not None and time.monotonic() - entry.stored_at <= _ttl_seconds()
+
+
+def store(
+    key: CacheKey,
+    result: Optional[ColumnarResult],
+    row_count: int,
+    tables: FrozenSet[str],
+    versions: Optional[Dict[str, int]] = None,
+) -> bool:
+    global _BYTES
+    limit = int(getattr(settings, "VAST_RESULT_CACHE_MAX_BYTES", 0))
+    size = estimate_bytes(result)
+    if size > limit:
+        return False
+    entry = CacheEntry(result=result, row_count=row_count, tables=tables, size=size, versions=versions)
+    with _LOCK:
+        _drop(key)
+        _ENTRIES[key] = entry
+        _BYTES += size
+        for tag in tables:
+            _TAGS.setdefault(tag, set()).add(key)
+        while _BYTES > limit and _ENTRIES:
+            oldest = next(iter(_ENTRIES))
+            _drop(oldest)
+            _STATS["evictions"] += 1
+    return True
+
+
+def invalidate_tables(tables: Iterable[str]) -> int:
+    """Drop entries tagged with any of ``tables``; returns how many."""
+
+    dropped = 0
+    with _LOCK:
+        for tag in {str(t).lower() for t in tables}:
+            for key in list(_TAGS.get(tag, ())):
+                _drop(key)
+                dropped += 1
+        _STATS["invalidations"] += dropped
+    return dropped
+
+
+def clear_entries() -> int:
+    """Drop every entry, counting them as invalidations; returns how many."""
+
+    global _BYTES
+    with _LOCK:
+        dropped = len(_ENTRIES)
+        _ENTRIES.clear()
+        _TAGS.clear()
+        _BYTES = 0
+        _STATS["invalidations"] += dropped
+    return dropped
+
+
+def clear_result_cache() -> None:
+    """Drop every entry and reset the counters."""
+
+    global _BYTES
+    with _LOCK:
+        _ENTRIES.clear()
+        _TAGS.clear()
+        _BYTES = 0
+        for name in _STATS:
+            _STATS[name] = 0
+
+
+def result_cache_stats() -> Dict[str, int]:
+    with _LOCK:
+        return {**_STATS, "entries": len(_ENTRIES), "bytes": _BYTES}
+
+
+__all__ = [
+    "CacheEntry",
+    "CacheKey",
+    "TABLE_VERSIONS_SQL",
+    "VOLATILE_FUNCTIONS",
+    "cache_key",
+    "cacheable",
+    "clear_entries",
+    "clear_result_cache",
+    "contains",
+    "enabled",
+    "estimate_bytes",
+    "invalidate_tables",
+    "lookup",
+    "lookup_async",
+    "result_cache_stats",
+    "schema_fingerprint",
+    "store",
+    "table_tags",
+    "table_versions",
+    "table_versions_async",
+]
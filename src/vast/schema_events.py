@@ -0,0 +1,167 @@
+"""Push-based schema change detection.
+
+``perms.install_ddl_trigger`` installs an event trigger that records DDL in
+``vast_ddl_log`` and issues ``NOTIFY vast_schema``. The listener here keeps one
+dedicated connection on that channel and drops the in-process schema caches
+only when a notification arrives. While it is connected the catalog snapshot
+stops expiring on its TTL; if the connection is lost the snapshot falls back
+to TTL expiry until the listener reconnects.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy.engine import make_url
+
+from .catalog_snapshot import set_push_invalidation
+from .config import read_url, settings
+
+logger = logging.getLogger(__name__)
+
+# (module, invalidation hook) pairs cleared on every schema change. The
+# knowledge store keys its snapshots by the catalog fingerprint, so dropping
+# the catalog snapshot is enough for it to capture a new one.
+_CACHE_HOOKS = (
+    ("catalog_snapshot", "invalidate_catalog_snapshot"),
+    ("identifier_guard", "invalidate_schema_cache"),
+    ("catalog_pg", "invalidate_cards_cache"),
+    ("agent", "invalidate_schema_state"),
+)
+
+
+def _loaded_modules(name: str) -> Iterator[object]:
+    # The package is importable as both ``src.vast`` and ``vast``; each import
+    # path holds its own module-level caches.
+    seen: set[int] = set()
+    for prefix in ("src.vast", "vast"):
+        module = sys.modules.get(f"{prefix}.{name}")
+        if module is not None and id(module) not in seen:
+            seen.add(id(module))
+            yield module
+
+
+def invalidate_schema_caches() -> None:
+    """Drop every in-process cache derived from the database schema."""
+
+    for module_name, hook in _CACHE_HOOKS:
+        for module in _loaded_modules(module_name):
+            func = getattr(module, hook, None)
+            if callable(func):
+                try:
+                    func()
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.warning("Failed to invalidate %s.%s: %s", module_name, hook, exc)
+
+
+def _libpq_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _default_connect(dsn: str):
+    import psycopg
+
+    return psycopg.connect(dsn, autocommit=True, application_name="vast_schema_listener")
+
+
+class SchemaChangeListener(threading.Thread):
+    """Background thread that LISTENs for schema change notifications."""
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        channel: Optional[str] = None,
+        *,
+        poll_interval: float = 1.0,
+        max_backoff: float = 30.0,
+        on_change: Callable[[], None] = invalidate_schema_caches,
+        connect: Callable[[str], object] = _default_connect,
+    ) -> None:
+        super().__init__(name="vast-schema-listener", daemon=True)
+        self.dsn = dsn or _libpq_dsn(read_url())
+        self.channel = channel or settings.VAST_SCHEMA_CHANNEL
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.notifications = 0
+        self.invalidations = 0
+        self._on_change = on_change
+        self._connect = connect
+        self._stop_event = threading.Event()
+        self.connected = threading.Event()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _invalidate(self) -> None:
+        self.invalidations += 1
+        self._on_change()
+
+    def run(self) -> None:
+        from psycopg import sql
+
+        backoff = 1.0
+        while not self.stopped:
+            try:
+                with self._connect(self.dsn) as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    set_push_invalidation(True)
+                    self.connected.set()
+                    # Changes made while we were not listening went unannounced.
+                    self._invalidate()
+                    backoff = 1.0
+                    while not self.stopped:
+                        # Drain a burst of DDL (e.g. a migration) into one invalidation.
+                        batch = list(conn.notifies(timeout=self.poll_interval))
+                        if batch:
+                            self.notifications += len(batch)
+                            self._invalidate()
+            except Exception as exc:
+                logger.warning("Schema listener on %s disconnected: %s", self.channel, exc)
+            finally:
+                self.connected.clear()
+                set_push_invalidation(False)
+            if self._stop_event.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+_LISTENER: SchemaChangeListener | None = None
+_LISTENER_LOCK = threading.Lock()
+
+
+def start_schema_listener(force: bool = False) -> SchemaChangeListener | None:
+    """Start the shared listener when ``VAST_SCHEMA_LISTEN`` is enabled (or ``force``)."""
+
+    global _LISTENER
+    if not (force or settings.VAST_SCHEMA_LISTEN):
+        return None
+    with _LISTENER_LOCK:
+        if _LISTENER is None or not _LISTENER.is_alive():
+            _LISTENER = SchemaChangeListener()
+            _LISTENER.start()
+        return _LISTENER
+
+
+def stop_schema_listener(timeout: Optional[float] = 5.0) -> None:
+    global _LISTENER
+    with _LISTENER_LOCK:
+        listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        listener.stop(timeout)
+
+
+__all__ = [
+    "SchemaChangeListener",
+    "invalidate_schema_caches",
+    "start_schema_listener",
+    "stop_schema_listener",
+]
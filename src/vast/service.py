@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import itertools
 import json
 import logging
 import re
@@ -11,7 +12,9 @@ from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Set, Tuple
 from contextlib import contextmanager
+from functools import partial
 
+import anyio
 from sqlalchemy import text
 
 from .agent import (
@@ -23,8 +26,17 @@ from .agent import (
     resolver_shortcut,
 )
 from .config import settings
-from .db import get_engine, get_ro_engine, is_select, analyze_sql, StatementType
+from .db import get_engine, get_ro_engine, get_async_ro_engine, is_select, add_limit, analyze_sql, StatementType
+from .db import invalidate_result_cache, read_cache_key
+from .pools import pool_stats as _pool_stats
+from . import result_cache
+from .statement import parse_statement
+from .coerce import coerce_value
+from .columnar import ColumnarResult
+from .pagination import decode_cursor, plan_page
 from .catalog_pg import load_card
+from .catalog_snapshot import invalidate_catalog_snapshot
+from .schema_events import start_schema_listener as _start_schema_listener, stop_schema_listener as _stop_schema_listener
 from .introspect import list_tables, table_columns
 from .identifier_guard import extract_requested_identifiers
 from .sql_params import ensure_limit_param, hydrate_readonly_params, normalize_limit_literal, stmt_kind
@@ -37,6 +49,8 @@ from .actions import (
     apply_sql_file,
 )
 from .knowledge import get_knowledge_store
+from .session_store import get_session_backend
+from .trace import stage_trace
 from .repo import list_files as repo_list_files, read_file as repo_read_file, write_file as repo_write_file, RepoAccessError
 
 # Ensure test patch points exist at import time for pytest dotted-path monkeypatch.
@@ -166,20 +180,7 @@ def _breadcrumbs_from_meta(meta: Dict[str, Any] | None, deterministic_hint: bool
 
 
 def _coerce_cell(value: Any) -> Any:
-    if value is None:
-        return None
-    if isinstance(value, (str, int, float, bool)):
-        return value
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    if isinstance(value, Decimal):
-        if value == int(value):
-            return int(value)
-        return float(value)
-    try:
-        return json.loads(json.dumps(value))
-    except Exception:  # pragma: no cover - defensive
-        return str(value)
+    return coerce_value(value, exact_decimals=True, default=str)
 
 
 def _rows_to_table(rows: List[Any]) -> Tuple[List[str], List[List[Any]]]:
@@ -212,17 +213,43 @@ def _attach_read_result(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not sql_text or not execution:
         return payload
 
-    rows = execution.get("rows") or []
-    columns, table_rows = _rows_to_table(rows)
+    preview = max(int(settings.VAST_PAGE_SIZE), 1)
+    columnar_result = execution.get("result")
+    if isinstance(columnar_result, ColumnarResult):
+        columns, table_rows = columnar_result.columns, columnar_result.table(limit=preview)
+        rows_seen = columnar_result.row_count
+    else:
+        rows = execution.get("rows") or []
+        columns, table_rows = _rows_to_table(rows[:preview])
+        rows_seen = len(rows)
 
     row_count = execution.get("row_count")
     if row_count is None:
-        row_count = len(rows)
+        row_count = rows_seen
 
+    if "has_more" in execution:
+        # Fetched as a page (``_execute_read``): the cursor is already built.
+        has_more, next_cursor = bool(execution["has_more"]), execution.get("next_cursor")
+    else:
+        # Rows produced elsewhere (resolver shortcuts): show the first page.
+        has_more, next_cursor = rows_seen > preview, None
+        if has_more:
+            shown = (
+                columnar_result.head(preview)
+                if isinstance(columnar_result, ColumnarResult)
+                else ColumnarResult.from_rows(columns, [tuple(row) for row in table_rows])
+            )
+            try:
+                next_cursor = plan_page(sql_text).next_cursor(shown, preview)
+            except ValueError:
+                next_cursor = None
     payload["result"] = {
         "columns": columns,
-        "rows": table_rows[:50],
+        "rows": table_rows,
         "row_count": row_count,
+        "has_more": has_more,
+        # Resume with /sql/run {"sql": payload["sql"], "cursor": ...}.
+        "next_cursor": next_cursor,
     }
 
     metrics: Dict[str, Any] = {}
@@ -330,14 +357,26 @@ def check_reference_privileges(engine, tables: Iterable[str]) -> List[Dict[str,
 
 
 # Exported name that tests patch: src.vast.service.safe_execute
-def safe_execute(sql, params=None, allow_writes=False, force_write=False):
+def safe_execute(sql, params=None, allow_writes=False, force_write=False, estimated_rows=None, columnar=False):
     """
     Proxy to conversation.safe_execute so tests can patch via
     'src.vast.service.safe_execute' without importing conversation first.
     Local import avoids potential import cycles.
     """
     from .conversation import safe_execute as _conv_safe_execute
-    return _conv_safe_execute(sql, params=params, allow_writes=allow_writes, force_write=force_write)
+    extra: Dict[str, Any] = {"estimated_rows": estimated_rows} if estimated_rows is not None else {}
+    if columnar:
+        extra["columnar"] = True
+    return _conv_safe_execute(sql, params=params, allow_writes=allow_writes, force_write=force_write, **extra)
+
+
+async def safe_execute_async(sql, params=None, allow_writes=False, force_write=False, estimated_rows=None, columnar=False):
+    """Async counterpart of the ``safe_execute`` proxy; tests patch it the same way."""
+    from .db import safe_execute_async as _db_safe_execute_async
+    extra: Dict[str, Any] = {"estimated_rows": estimated_rows} if estimated_rows is not None else {}
+    if columnar:
+        extra["columnar"] = True
+    return await _db_safe_execute_async(sql, params=params, allow_writes=allow_writes, force_write=force_write, **extra)
 
 
 # Keep __all__ explicit
@@ -345,7 +384,7 @@ try:
     __all__
 except NameError:
     __all__ = []
-for _name in ("ensure_valid_identifiers", "safe_execute", "preflight_statements", "apply_statements", "looks_like_sql", "infer_limit_from_text"):
+for _name in ("ensure_valid_identifiers", "safe_execute", "safe_execute_async", "preflight_statements", "apply_statements", "looks_like_sql", "infer_limit_from_text"):
     if _name not in __all__:
         __all__.append(_name)
 
@@ -370,6 +409,16 @@ def refresh_schema_summary() -> Dict[str, Any]:
     return _agent_refresh_schema_summary()
 
 
+def start_schema_listener(force: bool = False):
+    """Start the background LISTEN thread that drops schema caches after DDL."""
+
+    return _start_schema_listener(force=force)
+
+
+def stop_schema_listener() -> None:
+    _stop_schema_listener()
+
+
 def _assert_privileges():
     """Privilege self-check: fail fast if RW is over-privileged or RO isn't read-only"""
     # RO must NOT be able to create temp table
@@ -396,6 +445,11 @@ def environment_status() -> Dict[str, Any]:
     }
 
 
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-workload connection pool configuration, usage and checkout waits."""
+    return _pool_stats()
+
+
 def tables() -> List[Dict[str, str]]:
     return list_tables()
 
@@ -427,8 +481,83 @@ def execute_sql(
     params: Dict[str, Any] | None = None,
     allow_writes: bool = False,
     force_write: bool = False,
+    *,
+    validated: bool = False,
+    estimated_rows: int | None = None,
+    columnar: bool = False,
+) -> Dict[str, Any]:
+    """Run SQL with guardrails and return structured output.
+
+    ``validated`` skips the identifier guard for SQL the caller has already
+    validated; ``estimated_rows`` is a write estimate from that validation,
+    reported with the result. It does not replace the write gate's own
+    EXPLAIN, which runs in the transaction that executes the write.
+    ``columnar`` returns the rows as a ``ColumnarResult`` under ``result``
+    (see ``render_result``) instead of row dicts under ``rows``.
+    """
+    normalized_sql, hydrated_params, sql_kind, is_write = _prepare_execution(sql, params, allow_writes)
+    summary = load_or_build_schema_summary()
+    engine_ms = 0
+    if not allow_writes:
+        engine_start = time.perf_counter()
+        get_ro_engine()
+        engine_ms = int((time.perf_counter() - engine_start) * 1000)
+    if not (validated or _validated_by_cache(normalized_sql, hydrated_params, is_write)):
+        estimated_rows = _validate_execution(normalized_sql, hydrated_params, summary, estimated_rows)
+    exec_start = time.perf_counter()
+    execution = safe_execute(
+        normalized_sql,
+        params=hydrated_params or {},
+        allow_writes=allow_writes,
+        force_write=force_write,
+        **_execution_options(columnar),
+    )
+    exec_ms = int((time.perf_counter() - exec_start) * 1000)
+    return _execution_result(execution, sql_kind, engine_ms, exec_ms, is_write, estimated_rows, columnar)
+
+
+async def execute_sql_async(
+    sql: str,
+    params: Dict[str, Any] | None = None,
+    allow_writes: bool = False,
+    force_write: bool = False,
+    *,
+    validated: bool = False,
+    estimated_rows: int | None = None,
+    columnar: bool = False,
 ) -> Dict[str, Any]:
-    """Run SQL with guardrails and return structured output."""
+    """``execute_sql`` with the statement run on the asyncio engines.
+
+    The identifier guard is still synchronous and runs in a worker thread,
+    only for statements it has not validated before.
+    """
+    normalized_sql, hydrated_params, sql_kind, is_write = _prepare_execution(sql, params, allow_writes)
+    engine_ms = 0
+    if not allow_writes:
+        engine_start = time.perf_counter()
+        get_async_ro_engine()
+        engine_ms = int((time.perf_counter() - engine_start) * 1000)
+    if not (validated or _validated_by_cache(normalized_sql, hydrated_params, is_write)):
+        estimated_rows = await anyio.to_thread.run_sync(
+            _validate_execution, normalized_sql, hydrated_params, None, estimated_rows
+        )
+    exec_start = time.perf_counter()
+    execution = await safe_execute_async(
+        normalized_sql,
+        params=hydrated_params or {},
+        allow_writes=allow_writes,
+        force_write=force_write,
+        **_execution_options(columnar),
+    )
+    exec_ms = int((time.perf_counter() - exec_start) * 1000)
+    return _execution_result(execution, sql_kind, engine_ms, exec_ms, is_write, estimated_rows, columnar)
+
+
+def _prepare_execution(
+    sql: str,
+    params: Dict[str, Any] | None,
+    allow_writes: bool,
+) -> Tuple[str, Dict[str, Any], str, bool]:
     params_with_hint = _apply_limit_hint(sql, sql, params)
     normalized_sql = normalize_limit_literal(sql, params_with_hint)
     # If this is an EXPLAIN, prefer JSON format for primitive results
@@ -444,29 +573,63 @@ def execute_sql(
     if _LIMIT_BIND_RE.search(sql or "") and "limit" not in (hydrated_params or {}):
         hydrated_params = dict(hydrated_params or {})
         hydrated_params["limit"] = infer_limit_from_text(sql, _default_limit())
-    summary = load_or_build_schema_summary()
-    engine_ms = 0
-    if not allow_writes:
-        engine_start = time.perf_counter()
-        get_ro_engine()
-        engine_ms = int((time.perf_counter() - engine_start) * 1000)
-    engine = get_engine(readonly=True)
-    requested = extract_requested_identifiers(normalized_sql)
+    return normalized_sql, hydrated_params, sql_kind, sql_kind not in {"SELECT", "EXPLAIN"}
+
+
+def _validated_by_cache(normalized_sql: str, hydrated_params: Dict[str, Any] | None, is_write: bool) -> bool:
+    # A cached read was validated when it was stored, against the same catalog.
+    if is_write:
+        return False
+    cache_key, _ = read_cache_key(normalized_sql, hydrated_params or {})
+    return cache_key is not None and result_cache.contains(cache_key)
+
+
+def _validate_execution(
+    normalized_sql: str,
+    hydrated_params: Dict[str, Any] | None,
+    summary: Any,
+    estimated_rows: int | None,
+) -> int | None:
+    """Run the identifier guard; returns the write estimate it planned, if any."""
+
+    if summary is None:
+        summary = load_or_build_schema_summary()
+    outcome: Dict[str, Any] = {}
     _ensure_valid_identifiers(
         normalized_sql,
-        engine=engine,
+        engine=get_engine(readonly=True),
         schema_summary=summary,
         params=hydrated_params,
-        requested=requested,
-    )
-    exec_start = time.perf_counter()
-    execution = safe_execute(
-        normalized_sql,
-        params=hydrated_params or {},
-        allow_writes=allow_writes,
-        force_write=force_write,
+        requested=extract_requested_identifiers(normalized_sql),
+        outcome=outcome,
     )
-    exec_ms = int((time.perf_counter() - exec_start) * 1000)
+    return outcome.get("plan_rows") if estimated_rows is None else estimated_rows
+
+
+def _execution_options(columnar: bool) -> Dict[str, Any]:
+    # Only non-default options are passed: test doubles take the plain signature.
+    # The guard's estimate is not forwarded: it was planned on the RO engine,
+    # outside the write's transaction, so safe_execute plans the write again.
+    extra: Dict[str, Any] = {}
+    if columnar:
+        extra["columnar"] = True
+    return extra
+
+
+def _execution_result(
+    execution: Any,
+    sql_kind: str,
+    engine_ms: int,
+    exec_ms: int,
+    is_write: bool,
+    estimated_rows: int | None,
+    columnar: bool,
+) -> Dict[str, Any]:
+    if columnar:
+        result = dict(execution)
+        if result.get("dry_run"):
+            result["row_count"] = 0
+        return _finish_execution(result, sql_kind, engine_ms, exec_ms, is_write, estimated_rows)
     rows = execution.get("rows", []) if isinstance(execution, dict) else []
     serialised, dry_run = _serialize_rows(rows)
     # Optional polish: normalize EXPLAIN text into a single JSON 'plan' column
@@ -491,18 +654,204 @@ def execute_sql(
         result["row_count"] = 0
     else:
         result["row_count"] = result.get("row_count", len(serialised))
+    return _finish_execution(result, sql_kind, engine_ms, exec_ms, is_write, estimated_rows)
+
+
+def _finish_execution(
+    result: Dict[str, Any],
+    sql_kind: str,
+    engine_ms: int,
+    exec_ms: int,
+    is_write: bool,
+    estimated_rows: int | None,
+) -> Dict[str, Any]:
     result.setdefault("columns", [])
     result.setdefault("stmt_kind", sql_kind)
     result.setdefault("write", sql_kind not in {"SELECT", "EXPLAIN"})
     result["exec_ms"] = exec_ms
     result["engine_ms"] = engine_ms
+    cache = (result.get("meta") or {}).get("cache")
     result["meta"] = {
         "engine_ms": engine_ms,
         "exec_ms": exec_ms,
     }
+    if cache is not None:
+        result["meta"]["cache"] = cache
+    if is_write and estimated_rows is not None:
+        result["estimated_rows"] = estimated_rows
     return result
 
 
+def render_result(result: Dict[str, Any], columnar: bool = False) -> Dict[str, Any]:
+    """JSON-ready body for an ``execute_sql(..., columnar=True)`` result.
+
+    By default the rows are rendered as row dicts, matching the non-columnar
+    payload; ``columnar`` keeps them as ``{"columns", "types", "data"}``.
+    """
+    columnar_result: ColumnarResult = result["result"]
+    body = {key: value for key, value in result.items() if key != "result"}
+    if columnar:
+        body["result"] = columnar_result.to_dict()
+    else:
+        body["rows"] = columnar_result.records()
+    return body
+
+
+def execute_page(
+    sql: str,
+    params: Dict[str, Any] | None = None,
+    *,
+    page_size: int | None = None,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    """Run one page of a read query; see ``vast.pagination``.
+
+    Fetches ``page_size + 1`` rows to set ``has_more``; ``next_cursor``
+    resumes after the last returned row. The result is columnar, as with
+    ``execute_sql(..., columnar=True)``.
+    """
+    size, plan, state, page_sql, page_params = _page_request(sql, params, page_size, cursor)
+    result = execute_sql(page_sql, params=page_params, columnar=True)
+    return _page_result(result, size, plan, state)
+
+
+async def execute_page_async(
+    sql: str,
+    params: Dict[str, Any] | None = None,
+    *,
+    page_size: int | None = None,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    """``execute_page`` on the asyncio engines."""
+
+    size, plan, state, page_sql, page_params = _page_request(sql, params, page_size, cursor)
+    result = await execute_sql_async(page_sql, params=page_params, columnar=True)
+    return _page_result(result, size, plan, state)
+
+
+def _page_request(sql: str, params: Dict[str, Any] | None, page_size: int | None, cursor: str | None):
+    size = max(int(page_size or settings.VAST_PAGE_SIZE), 1)
+    plan = plan_page(sql)
+    state = decode_cursor(cursor, sql) if cursor else None
+    page_sql, page_params = plan.page_sql(size, state)
+    return size, plan, state, page_sql, {**(params or {}), **page_params}
+
+
+def _page_result(result: Dict[str, Any], size: int, plan, state) -> Dict[str, Any]:
+    page: ColumnarResult = result["result"]
+    has_more = page.row_count > size
+    if has_more:
+        page = page.head(size)
+    result["result"] = page
+    result["row_count"] = page.row_count
+    result["has_more"] = has_more
+    result["next_cursor"] = plan.next_cursor(page, size, state) if has_more else None
+    result["page"] = {"size": size, "mode": plan.mode}
+    return result
+
+
+def _first_page(sql: str, params: Dict[str, Any] | None):
+    # ``(plan, size, page_sql, page_params)`` for a SELECT; None for anything else.
+    try:
+        plan = plan_page(sql)
+    except ValueError:
+        return None
+    size = max(int(settings.VAST_PAGE_SIZE), 1)
+    page_sql, page_params = plan.page_sql(size)
+    return plan, size, page_sql, {**(params or {}), **page_params}
+
+
+def _execute_read(sql: str, params: Dict[str, Any] | None = None, **kwargs: Any) -> Dict[str, Any]:
+    """``execute_sql`` that fetches only the first page (``VAST_PAGE_SIZE + 1`` rows) of a SELECT."""
+
+    page = _first_page(sql, params)
+    if page is None:
+        return execute_sql(sql, params=params, **kwargs)
+    plan, size, page_sql, page_params = page
+    result = execute_sql(page_sql, params=page_params, columnar=True, **kwargs)
+    if isinstance(result, dict) and isinstance(result.get("result"), ColumnarResult):
+        return _page_result(result, size, plan, None)
+    return result
+
+
+async def _execute_read_async(sql: str, params: Dict[str, Any] | None = None, **kwargs: Any) -> Dict[str, Any]:
+    page = _first_page(sql, params)
+    if page is None:
+        return await execute_sql_async(sql, params=params, **kwargs)
+    plan, size, page_sql, page_params = page
+    result = await execute_sql_async(page_sql, params=page_params, columnar=True, **kwargs)
+    if isinstance(result, dict) and isinstance(result.get("result"), ColumnarResult):
+        return _page_result(result, size, plan, None)
+    return result
+
+
+def stream_sql(
+    sql: str,
+    params: Dict[str, Any] | None = None,
+    *,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+):
+    """Validate a read query and return a ``StreamingResult`` over its rows."""
+    from .db import stream_execute
+
+    params_with_hint = _apply_limit_hint(sql, sql, params)
+    normalized_sql = normalize_limit_literal(sql, params_with_hint)
+    hydrated_params = hydrate_readonly_params(normalized_sql, params_with_hint)
+    if stmt_kind(normalized_sql) not in {"SELECT", "EXPLAIN"}:
+        keyword = normalized_sql.lstrip().split(None, 1)[0].upper() if (normalized_sql or "").strip() else ""
+        raise ValueError(
+            f"Streaming mode: expected a SELECT statement but received {keyword or 'non-SELECT SQL'}."
+        )
+    _ensure_valid_identifiers(
+        normalized_sql,
+        engine=get_engine(readonly=True),
+        params=hydrated_params,
+        requested=extract_requested_identifiers(normalized_sql),
+    )
+    return stream_execute(
+        normalized_sql,
+        params=hydrated_params or {},
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+    )
+
+
+def bulk_load(
+    sql: str,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    allow_writes: bool = False,
+    force_write: bool = False,
+    chunk_size: int | None = None,
+) -> Dict[str, Any]:
+    """Validate a bulk INSERT/UPSERT once, then apply it to every row (see ``bulk``)."""
+    from .bulk import bulk_execute, parse_bulk_statement
+
+    if not allow_writes:
+        raise ValueError("Write queries are disabled. Use --write to permit writes.")
+    statement = parse_bulk_statement(sql)
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is not None:
+        # The guard checks identifiers and binds against one representative row.
+        _ensure_valid_identifiers(
+            statement.sql,
+            engine=get_engine(readonly=True),
+            schema_summary=load_or_build_schema_summary(),
+            params={name: first.get(name) for name in statement.binds},
+            requested=extract_requested_identifiers(statement.sql),
+        )
+        rows = itertools.chain([first], rows)
+    return bulk_execute(
+        statement,
+        rows,
+        allow_writes=allow_writes,
+        force_write=force_write,
+        chunk_size=chunk_size,
+    )
+
+
 def plan_and_execute(
     nl_request: str,
     params: Dict[str, Any] | None = None,
@@ -513,8 +862,145 @@ def plan_and_execute(
     max_retries: int = 2,
     debug: bool = False,
 ) -> Dict[str, Any]:
-    """Plan SQL using the agent and execute it, returning SQL and results."""
+    """Plan SQL using the agent and execute it, returning SQL and results.
+
+    Every database round trip is recorded in ``meta["trace"]``.
+    """
+
+    with stage_trace() as trace:
+        outcome = _plan_and_execute(
+            nl_request,
+            params=params,
+            allow_writes=allow_writes,
+            force_write=force_write,
+            refresh_schema=refresh_schema,
+            retry=retry,
+            max_retries=max_retries,
+            debug=debug,
+        )
+    if isinstance(outcome, dict) and isinstance(outcome.get("meta"), dict):
+        outcome["meta"]["trace"] = trace.as_list()
+    return outcome
+
+
+def _validate_passthrough(sql: str, param_hints: Dict[str, Any]) -> Dict[str, Any]:
+    summary = load_or_build_schema_summary()
+    engine = get_engine(readonly=True)
+    validation: Dict[str, Any] = {}
+    ensure_valid_identifiers(
+        sql,
+        engine=engine,
+        schema_summary=summary,
+        params=param_hints,
+        outcome=validation,
+    )
+    return validation
+
+
+def _passthrough_outcome(
+    nl_request: str,
+    execution: Any,
+    total_start: float,
+    debug: bool,
+) -> Dict[str, Any]:
+    total_ms = int((time.perf_counter() - total_start) * 1000)
+    exec_meta = execution.get("meta", {}) if isinstance(execution, dict) else {}
+    engine_ms = exec_meta.get("engine_ms", 0)
+    exec_ms = exec_meta.get("exec_ms", 0)
+    meta = {
+        "intent": "sql",
+        "catalog_ms": 0,
+        "catalog_ms_slim": 0,
+        "plan_ms": 0,
+        "engine_ms": engine_ms,
+        "exec_ms": exec_ms,
+        "llm_ms": 0,
+        "total_ms": total_ms,
+        "handoff": False,
+        "handoff_reason": None,
+        "regenerated": False,
+        "allowed_tables": None,
+    }
+    intent = _intent_from_sql(nl_request) or "write"
+    breadcrumbs = _breadcrumbs_from_meta(meta, deterministic_hint=False)
+    if debug:
+        _print_debug_timings(meta)
+    if isinstance(execution, dict):
+        execution = dict(execution)
+        existing_meta = dict(execution.get("meta") or {})
+        existing_meta.setdefault("engine_ms", engine_ms)
+        existing_meta.setdefault("exec_ms", exec_ms)
+        execution["meta"] = existing_meta
+    outcome = {
+        "sql": nl_request,
+        "execution": execution,
+        "passthrough": True,
+        "meta": meta,
+        "intent": intent,
+    }
+    if breadcrumbs:
+        outcome["breadcrumbs"] = breadcrumbs
+    return _attach_read_result(outcome)
 
+
+async def plan_and_execute_async(
+    nl_request: str,
+    params: Dict[str, Any] | None = None,
+    allow_writes: bool = False,
+    force_write: bool = False,
+    refresh_schema: bool = False,
+    retry: bool = True,
+    max_retries: int = 2,
+    debug: bool = False,
+) -> Dict[str, Any]:
+    """``plan_and_execute`` for callers on an event loop.
+
+    SQL passthrough executes on the asyncio engines. Natural-language requests
+    plan through the synchronous LLM client, so they run whole in a worker
+    thread.
+    """
+    if not looks_like_sql(nl_request):
+        return await anyio.to_thread.run_sync(
+            partial(
+                plan_and_execute,
+                nl_request,
+                params=params,
+                allow_writes=allow_writes,
+                force_write=force_write,
+                refresh_schema=refresh_schema,
+                retry=retry,
+                max_retries=max_retries,
+                debug=debug,
+            )
+        )
+    with stage_trace() as trace:
+        total_start = time.perf_counter()
+        param_hints = _apply_limit_hint(nl_request, nl_request, dict(params or {}))
+        validation = await anyio.to_thread.run_sync(_validate_passthrough, nl_request, param_hints)
+        execution = await _execute_read_async(
+            nl_request,
+            params=param_hints,
+            allow_writes=allow_writes,
+            force_write=force_write,
+            validated=True,
+            estimated_rows=validation.get("plan_rows"),
+        )
+        outcome = _passthrough_outcome(nl_request, execution, total_start, debug)
+    if isinstance(outcome, dict) and isinstance(outcome.get("meta"), dict):
+        outcome["meta"]["trace"] = trace.as_list()
+    return outcome
+
+
+def _plan_and_execute(
+    nl_request: str,
+    params: Dict[str, Any] | None,
+    allow_writes: bool,
+    force_write: bool,
+    refresh_schema: bool,
+    retry: bool,
+    max_retries: int,
+    debug: bool,
+) -> Dict[str, Any]:
     total_start = time.perf_counter()
     param_hints = dict(params or {})
     is_sql = looks_like_sql(nl_request)
@@ -525,58 +1011,16 @@ def plan_and_execute(
 
     if is_sql:
         param_hints = _apply_limit_hint(nl_request, nl_request, param_hints)
-        summary = load_or_build_schema_summary()
-        engine = get_engine(readonly=True)
-        ensure_valid_identifiers(
-            nl_request,
-            engine=engine,
-            schema_summary=summary,
-            params=param_hints,
-        )
-        execution = execute_sql(
+        validation = _validate_passthrough(nl_request, param_hints)
+        execution = _execute_read(
             nl_request,
             params=param_hints,
             allow_writes=allow_writes,
             force_write=force_write,
+            validated=True,
+            estimated_rows=validation.get("plan_rows"),
         )
-        total_ms = int((time.perf_counter() - total_start) * 1000)
-        exec_meta = execution.get("meta", {}) if isinstance(execution, dict) else {}
-        engine_ms = exec_meta.get("engine_ms", 0)
-        exec_ms = exec_meta.get("exec_ms", 0)
-        meta = {
-            "intent": "sql",
-            "catalog_ms": 0,
-            "catalog_ms_slim": 0,
-            "plan_ms": 0,
-            "engine_ms": engine_ms,
-            "exec_ms": exec_ms,
-            "llm_ms": 0,
-            "total_ms": total_ms,
-            "handoff": False,
-            "handoff_reason": None,
-            "regenerated": False,
-            "allowed_tables": None,
-        }
-        intent = _intent_from_sql(nl_request) or "write"
-        breadcrumbs = _breadcrumbs_from_meta(meta, deterministic_hint=False)
-        if debug:
-            _print_debug_timings(meta)
-        if isinstance(execution, dict):
-            execution = dict(execution)
-            existing_meta = dict(execution.get("meta") or {})
-            existing_meta.setdefault("engine_ms", engine_ms)
-            existing_meta.setdefault("exec_ms", exec_ms)
-            execution["meta"] = existing_meta
-        outcome = {
-            "sql": nl_request,
-            "execution": execution,
-            "passthrough": True,
-            "meta": meta,
-            "intent": intent,
-        }
-        if breadcrumbs:
-            outcome["breadcrumbs"] = breadcrumbs
-        return _attach_read_result(outcome)
+        return _passthrough_outcome(nl_request, execution, total_start, debug)
 
     try:
         resolution, shortcut = resolver_shortcut(nl_request)
@@ -704,6 +1148,7 @@ def plan_and_execute(
         return outcome
 
     llm_start = time.perf_counter()
+    validator = _ExecuteOnceValidator(nl_request)
     if retry:
         plan_result = plan_sql_with_retry(
             nl_request,
@@ -711,7 +1156,7 @@ def plan_and_execute(
             force_refresh_schema=refresh_schema,
             param_hints=param_hints,
             max_retries=max_retries,
-            validator=_validation_executor,
+            validator=validator,
             focus_cards=focus_cards,
         )
     else:
@@ -760,7 +1205,21 @@ def plan_and_execute(
             print(f"debug allowed_tables={plan_result.allowed_tables}")
 
     param_hints = _apply_limit_hint(sql, nl_request, param_hints)
-    execution = execute_sql(sql, params=param_hints, allow_writes=allow_writes, force_write=force_write)
+    validated = validator.result_for(sql)
+    if validated is None:
+        execution = _execute_read(sql, params=param_hints, allow_writes=allow_writes, force_write=force_write)
+    elif validated.get("write") and force_write:
+        # The validator only dry-ran the write; run it for real.
+        execution = execute_sql(
+            sql,
+            params=param_hints,
+            allow_writes=allow_writes,
+            force_write=True,
+            validated=True,
+            estimated_rows=validated.get("estimated_rows"),
+        )
+    else:
+        execution = validated
     total_ms = int((time.perf_counter() - total_start) * 1000)
 
     execution_meta = execution.get("meta", {}) if isinstance(execution, dict) else {}
@@ -810,36 +1269,49 @@ def plan_and_execute(
     return _attach_read_result(outcome)
 
 
-def _validation_executor(sql: str, params: Dict[str, Any], allow_writes: bool) -> None:
-    """Validate generated SQL without forcing writes to run."""
-    params = _apply_limit_hint(sql, sql, params)
-    normalized_sql = normalize_limit_literal(sql, params)
-    hydrated_params = hydrate_readonly_params(normalized_sql, params)
-    hydrated_params = ensure_limit_param(normalized_sql, hydrated_params)
-    sql_kind = stmt_kind(normalized_sql)
-    if not allow_writes and sql_kind != "SELECT":
-        keyword = normalized_sql.lstrip().split(None, 1)[0].upper() if (normalized_sql or "").strip() else ""
-        raise ValueError(
-            f"Read-only mode: expected a SELECT statement but received {keyword or 'non-SELECT SQL'}."
+class _ExecuteOnceValidator:
+    """Validator for ``plan_sql_with_retry`` that runs each candidate once.
+
+    Each candidate is validated and executed exactly as ``plan_and_execute``
+    would run it (LIMIT added, limit hint applied), so identifier and runtime
+    errors still drive the retry loop. The accepted statement's result is then
+    reused instead of validating and executing it a second time. Writes are
+    only dry-run here.
+    """
+
+    def __init__(self, nl_request: str) -> None:
+        self.nl_request = nl_request
+        self._key: str | None = None
+        self._execution: Dict[str, Any] | None = None
+
+    @staticmethod
+    def _statement_key(sql: str | None) -> str:
+        return (sql or "").strip().rstrip(";").strip()
+
+    def __call__(self, sql: str, params: Dict[str, Any], allow_writes: bool) -> str:
+        self._key = self._execution = None
+        sql_kind = stmt_kind(sql)
+        if not allow_writes and sql_kind != "SELECT":
+            keyword = sql.lstrip().split(None, 1)[0].upper() if (sql or "").strip() else ""
+            raise ValueError(
+                f"Read-only mode: expected a SELECT statement but received {keyword or 'non-SELECT SQL'}."
+            )
+        final_sql = add_limit(sql, 100) if is_select(sql) else sql
+        final_sql = final_sql.rstrip()
+        execution = _execute_read(
+            final_sql,
+            params=_apply_limit_hint(final_sql, self.nl_request, params),
+            allow_writes=allow_writes,
+            force_write=False,
         )
-    if _LIMIT_BIND_RE.search(sql or "") and "limit" not in (hydrated_params or {}):
-        hydrated_params = dict(hydrated_params or {})
-        hydrated_params["limit"] = infer_limit_from_text(sql, _default_limit())
-    summary = load_or_build_schema_summary()
-    engine = get_engine(readonly=True)
-    requested = extract_requested_identifiers(normalized_sql)
-    _ensure_valid_identifiers(
-        normalized_sql,
-        engine=engine,
-        schema_summary=summary,
-        params=hydrated_params,
-        requested=requested,
-    )
-    if allow_writes:
-        safe_execute(normalized_sql, params=hydrated_params, allow_writes=True, force_write=False)
-    else:
-        safe_execute(normalized_sql, params=hydrated_params, allow_writes=False, force_write=False)
-    return normalized_sql
+        self._key = self._statement_key(final_sql)
+        self._execution = execution
+        return final_sql
+
+    def result_for(self, sql: str | None) -> Dict[str, Any] | None:
+        if self._execution is None or self._statement_key(sql) != self._key:
+            return None
+        return self._execution
 
 
 def _normalize_statement(sql: str | None) -> str:
@@ -1026,6 +1498,8 @@ def apply_statements(
     if not statements:
         return
 
+    touched: Set[Tuple[Any, str]] = set()
+    touched_unknown = False
     with _writer_conn() as conn:
         trans = conn.begin()
         try:
@@ -1036,6 +1510,11 @@ def apply_statements(
                 if not statement:
                     continue
                 _exec_on(conn, statement)
+                parsed = parse_statement(statement)
+                if parsed.ok and parsed.tables and parsed.statement_type is not StatementType.DDL:
+                    touched.update(parsed.tables)
+                else:
+                    touched_unknown = True
 
             # Apply grants using the same connection/transaction (no second BEGIN)
             ro_role = getattr(settings, "read_role", "vast_ro")
@@ -1065,6 +1544,11 @@ def apply_statements(
             trans.rollback()
             raise
 
+    # Applied statements may include DDL; make the next reader re-query the catalog.
+    invalidate_catalog_snapshot()
+    if touched or touched_unknown:
+        invalidate_result_cache(set() if touched_unknown else touched)
+
 
 # --- Operations helpers ---------------------------------------------------
 
@@ -1107,10 +1591,16 @@ except Exception:
 
 
 def load_conversation(session_name: str) -> Dict[str, Any] | None:
-    path = Path(".vast/conversations") / f"{session_name}.json"
-    if not path.exists():
+    state = get_session_backend().load(session_name)
+    if state is None:
         return None
-    return json.loads(path.read_text())
+    return {
+        "session_name": session_name,
+        "messages": state.messages,
+        "context": state.context,
+        "last_updated": state.updated_at,
+        "version": state.version,
+    }
 
 
 # --- Knowledge helpers --------------------------------------------------
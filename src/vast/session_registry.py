@@ -0,0 +1,233 @@
+"""Bounded registry of live conversations for the API.
+
+Each resident session holds an OpenAI client, a ``SystemOperations`` and its
+whole message history, so the registry caps them: a session idle for
+``VAST_SESSION_IDLE_S`` is evicted, and beyond ``VAST_SESSION_MAX_RESIDENT``
+sessions or ``VAST_SESSION_MEMORY_BUDGET_MB`` of estimated history the least
+recently used go first. An evicted session is saved before it is dropped
+and reloaded from disk on its next request; the save runs outside the
+registry lock, and a request for the session meanwhile keeps it resident.
+Sessions in use are never evicted, and neither is the most recently used
+one (except when idle).
+
+``session(name)`` hands out a conversation under its own lock, so
+concurrent turns for one session run one after another while different
+sessions run in parallel. A resident conversation is first brought up to
+date with whatever other workers saved to its session (``sync_session``).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough fixed cost of a resident session beyond its messages (client, ops, context).
+SESSION_OVERHEAD_BYTES = 64 * 1024
+
+EVICTION_REASONS = ("idle", "lru", "memory")
+
+
+@dataclass
+class _Entry:
+    conversation: Any = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+    users: int = 0
+    bytes: int = 0
+    counted: int = 0
+    evicting: bool = False
+
+
+def _message_bytes(message: Any) -> int:
+    return len(getattr(message, "content", "") or "") + len(str(getattr(message, "metadata", "") or ""))
+
+
+class SessionRegistry:
+    """Conversations by session name, created by ``factory(name)`` on first use."""
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        *,
+        max_sessions: Optional[int] = None,
+        idle_s: Optional[float] = None,
+        memory_budget_bytes: Optional[int] = None,
+    ) -> None:
+        self._factory = factory
+        self.max_sessions = max(int(max_sessions or settings.VAST_SESSION_MAX_RESIDENT), 1)
+        self.idle_s = settings.VAST_SESSION_IDLE_S if idle_s is None else idle_s
+        if memory_budget_bytes is None:
+            memory_budget_bytes = settings.VAST_SESSION_MEMORY_BUDGET_MB * 1024 * 1024
+        self.memory_budget_bytes = max(int(memory_budget_bytes), 0)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._stats: Dict[str, int] = {"hits": 0, "loads": 0, "persist_errors": 0, "sync_errors": 0}
+        self._evictions = dict.fromkeys(EVICTION_REASONS, 0)
+
+    @contextmanager
+    def session(self, name: str) -> Iterator[Any]:
+        """The conversation for ``name``, held exclusively until the block exits."""
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._entries[name] = _Entry()
+            else:
+                self._entries.move_to_end(name)
+                self._stats["hits"] += 1
+                entry.evicting = False  # a pending eviction gives way to the new turn
+            entry.users += 1
+        try:
+            with entry.lock:
+                if entry.conversation is None:
+                    entry.conversation = self._factory(name)
+                    with self._lock:
+                        self._stats["loads"] += 1
+                else:
+                    self._sync(name, entry.conversation)
+                try:
+                    yield entry.conversation
+                finally:
+                    self._measure(entry)
+                    entry.last_used = time.monotonic()
+        finally:
+            with self._lock:
+                entry.users -= 1
+                if entry.conversation is None and entry.users == 0 and self._entries.get(name) is entry:
+                    del self._entries[name]  # the factory failed; let the next request retry
+        self.evict()
+
+    def _sync(self, name: str, conversation: Any) -> None:
+        # Other workers may have appended to this session since our last turn.
+        sync = getattr(conversation, "sync_session", None)
+        if sync is None:
+            return
+        try:
+            sync()
+        except Exception as exc:
+            with self._lock:
+                self._stats["sync_errors"] += 1
+            logger.warning("Could not refresh session '%s' from the session store: %s", name, exc)
+
+    def _measure(self, entry: _Entry) -> None:
+        # Caller holds ``entry.lock``. Histories only grow, so count new messages.
+        messages = getattr(entry.conversation, "messages", None) or []
+        if len(messages) < entry.counted:
+            entry.bytes, entry.counted = 0, 0
+        entry.bytes += sum(_message_bytes(m) for m in messages[entry.counted:])
+        entry.counted = len(messages)
+
+    def _total_bytes(self) -> int:
+        return sum(SESSION_OVERHEAD_BYTES + e.bytes for e in self._entries.values() if e.conversation is not None)
+
+    def evict(self, now: Optional[float] = None) -> List[str]:
+        """Save and drop idle, excess and over-budget sessions; returns their names."""
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            victims = self._choose_victims(now)
+        return self._release(victims)
+
+    def _choose_victims(self, now: float) -> List[Tuple[str, _Entry, Optional[str]]]:
+        # Caller holds ``_lock``. Victims are only marked here; they are saved
+        # and dropped by ``_release`` without holding the registry lock.
+        victims: List[Tuple[str, _Entry, Optional[str]]] = []
+        remaining = [e for e in self._entries.values() if not e.evicting]
+        count = len(remaining)
+        total = sum(SESSION_OVERHEAD_BYTES + e.bytes for e in remaining if e.conversation is not None)
+
+        def mark(name: str, entry: _Entry, reason: str) -> None:
+            nonlocal count, total
+            if self._mark(entry):
+                victims.append((name, entry, reason))
+                count -= 1
+                total -= SESSION_OVERHEAD_BYTES + entry.bytes
+
+        if self.idle_s:
+            for name, entry in list(self._entries.items()):
+                if now - entry.last_used >= self.idle_s:
+                    mark(name, entry, "idle")
+        # LRU order; the most recently used session stays resident.
+        for name in list(self._entries)[:-1]:
+            if count > self.max_sessions:
+                reason = "lru"
+            elif self.memory_budget_bytes and total > self.memory_budget_bytes:
+                reason = "memory"
+            else:
+                break
+            mark(name, self._entries[name], reason)
+        return victims
+
+    @staticmethod
+    def _mark(entry: _Entry) -> bool:
+        # An entry in use, still loading or already being evicted stays put.
+        if entry.users or entry.conversation is None or entry.evicting:
+            return False
+        entry.evicting = True
+        return True
+
+    def _release(self, victims: List[Tuple[str, _Entry, Optional[str]]]) -> List[str]:
+        evicted: List[str] = []
+        for name, entry, reason in victims:
+            with entry.lock:
+                saved = entry.evicting and self._persist(name, entry)
+            with self._lock:
+                if saved and entry.evicting and not entry.users and self._entries.get(name) is entry:
+                    del self._entries[name]
+                    if reason is not None:
+                        self._evictions[reason] += 1
+                    evicted.append(name)
+                else:
+                    entry.evicting = False
+        return evicted
+
+    def _persist(self, name: str, entry: _Entry) -> bool:
+        # Caller holds ``entry.lock`` but not ``_lock``.
+        try:
+            entry.conversation._save_session()
+        except Exception as exc:
+            with self._lock:
+                self._stats["persist_errors"] += 1
+            logger.warning("Could not save session '%s'; keeping it resident: %s", name, exc)
+            return False
+        return True
+
+    def close(self) -> None:
+        """Save every resident session and drop them all."""
+
+        with self._lock:
+            victims = [(name, entry, None) for name, entry in list(self._entries.items()) if self._mark(entry)]
+        self._release(victims)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "resident": sum(1 for e in self._entries.values() if e.conversation is not None),
+                "busy": sum(1 for e in self._entries.values() if e.users),
+                "max_sessions": self.max_sessions,
+                "idle_s": self.idle_s,
+                "bytes": self._total_bytes(),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "evictions": dict(self._evictions),
+                **self._stats,
+            }
+
+
+__all__ = [
+    "EVICTION_REASONS",
+    "SESSION_OVERHEAD_BYTES",
+    "SessionRegistry",
+]
@@ -0,0 +1,686 @@
+"""Conversation session storage.
+
+Sessions live behind a ``SessionBackend`` picked by ``VAST_SESSION_BACKEND``:
+
+``file``
+    ``<name>.json`` snapshot plus an append-only ``<name>.journal.jsonl``
+    under ``.vast/conversations`` (the default; one host).
+``sqlite``
+    One SQLite file (``VAST_SESSION_SQLITE_PATH``) shared by every worker on
+    a host.
+``postgres``
+    Two tables in their own schema (``VAST_SESSION_PG_SCHEMA``) of the write
+    database, or of ``VAST_SESSION_DATABASE_URL``, so replicas on different
+    hosts serve the same sessions.
+
+A session's version counts the records appended to it. Every append names
+the version its writer last saw and fails with ``SessionConflict`` if the
+session has moved on (optimistic concurrency). ``SessionJournal`` is one
+conversation's view of its session: it appends only what changed, and after
+a conflict ``rebase`` splices in what other workers appended ahead of the
+local, unsaved messages so the save can be retried.
+
+File backend: journal records are numbered with the version and the
+snapshot stores the last one it includes, so a crash between rewriting the
+snapshot and dropping the journal replays nothing twice; an unreadable
+(torn) record is skipped and forces a compaction. Every
+``VAST_SESSION_COMPACT_EVERY`` records the snapshot is rewritten with
+everything. The snapshot keeps the old whole-file layout, so a session saved
+before journaling loads as a snapshot with an empty journal and is rewritten
+in the new format on its first save.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from .audit_index import tail_jsonl
+from .config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: file locks only cover this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 2
+SESSION_BACKENDS = ("file", "sqlite", "postgres")
+SESSION_DIR = Path(".vast") / "conversations"
+
+CUSTOM_ENCODERS = {
+    datetime: lambda x: x.isoformat(),
+    date: lambda x: x.isoformat(),
+    Decimal: float,
+    uuid.UUID: str,
+    Path: str,
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_HEAD_FORMAT = re.compile(rb'"format":\s*(\d+)')
+_HEAD_SEQ = re.compile(rb'"journal_seq":\s*(\d+)')
+
+
+class SessionConflict(RuntimeError):
+    """The session changed since this writer last read it."""
+
+
+@dataclass
+class SessionState:
+    version: int
+    messages: List[Dict[str, Any]]
+    # With ``full=False`` only what came after the requested version:
+    # ``context`` is then None unless it changed.
+    context: Optional[Dict[str, Any]]
+    full: bool = True
+    updated_at: Optional[str] = None
+
+
+def _jsonable(value: Any) -> Any:
+    return jsonable_encoder(value, custom_encoder=CUSTOM_ENCODERS)
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+# -- file format -----------------------------------------------------------
+
+
+def journal_path(snapshot: Path) -> Path:
+    return snapshot.with_name(f"{snapshot.stem}.journal.jsonl")
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    """Write a file atomically to avoid partial/corrupt JSON on crashes."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+def _records(path: Path) -> Iterator[Optional[Dict[str, Any]]]:
+    """Journal records in order; ``None`` for a line that does not decode."""
+
+    try:
+        fh = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping unreadable session journal record in %s", path)
+                yield None
+                continue
+            yield record if isinstance(record, dict) else None
+
+
+def _replay(path: Path) -> Tuple[Dict[str, Any], bool]:
+    """Snapshot plus journal as one dict, and whether any record was unreadable."""
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    messages: List[Dict[str, Any]] = list(data.get("messages") or [])
+    context = data.get("context")
+    last_updated = data.get("last_updated")
+    seq = int(data.get("journal_seq") or 0)
+    damaged = False
+    for record in _records(journal_path(path)):
+        if record is None:
+            damaged = True
+            continue
+        n = int(record.get("n") or 0)
+        if n <= seq:
+            continue
+        seq = n
+        if record.get("op") == "message":
+            messages.append(record["message"])
+        elif record.get("op") == "context":
+            context = record["context"]
+        last_updated = record.get("ts", last_updated)
+    data.update(messages=messages, context=context, last_updated=last_updated, journal_seq=seq)
+    return data, damaged
+
+
+def read_session(path: Path) -> Optional[Dict[str, Any]]:
+    """The session saved at ``path`` with its journal replayed, or None if there is none."""
+
+    path = Path(path)
+    if not path.exists():
+        return None
+    return _replay(path)[0]
+
+
+# -- backends ----------------------------------------------------------------
+
+
+class SessionBackend(ABC):
+    """Where sessions are stored. Versions start at 0 for a session not yet saved."""
+
+    @abstractmethod
+    def version(self, name: str) -> Optional[int]:
+        """Current version, or None if the session does not exist."""
+
+    @abstractmethod
+    def load(self, name: str, after: Optional[int] = None) -> Optional[SessionState]:
+        """The whole session, or only what was appended after version ``after`` when still available."""
+
+    @abstractmethod
+    def append(
+        self,
+        name: str,
+        messages: Sequence[Dict[str, Any]],
+        context: Optional[Dict[str, Any]],
+        *,
+        expected_version: int,
+    ) -> int:
+        """Add ``messages`` (and ``context`` unless None) if the session is at ``expected_version``."""
+
+    @abstractmethod
+    def replace(
+        self,
+        name: str,
+        messages: Sequence[Dict[str, Any]],
+        context: Dict[str, Any],
+        *,
+        expected_version: int,
+    ) -> int:
+        """Overwrite the session if it is at ``expected_version``; readers of older versions reload in full."""
+
+    @abstractmethod
+    def quarantine(self, name: str) -> Optional[str]:
+        """Move an unreadable session aside; returns where it went."""
+
+    def close(self) -> None:
+        pass
+
+    def _conflict(self, name: str, current: Optional[int], expected: int) -> SessionConflict:
+        return SessionConflict(
+            f"Session '{name}' is at version {current or 0}, not {expected}; reload and retry."
+        )
+
+
+class FileSessionBackend(SessionBackend):
+    """Snapshot + journal files, one pair per session; appends hold an flock."""
+
+    def __init__(self, directory: Path = SESSION_DIR, *, compact_every: Optional[int] = None) -> None:
+        self.directory = Path(directory)
+        self.compact_every = max(int(compact_every or settings.VAST_SESSION_COMPACT_EVERY), 1)
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._damaged: set = set()
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    @contextmanager
+    def _locked(self, name: str) -> Iterator[None]:
+        with self._guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / f"{name}.lock", "a+b") as fh:
+                if fcntl is not None:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _snapshot_head(path: Path) -> Tuple[int, bool]:
+        """``(journal_seq, current format)`` without decoding the whole snapshot."""
+
+        with open(path, "rb") as fh:
+            head = fh.read(256)
+        fmt, seq = _HEAD_FORMAT.search(head), _HEAD_SEQ.search(head)
+        if fmt and seq:
+            return int(seq.group(1)), int(fmt.group(1)) == SNAPSHOT_FORMAT
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return int(data.get("journal_seq") or 0), data.get("format") == SNAPSHOT_FORMAT
+
+    def _version_locked(self, name: str) -> Optional[int]:
+        path = self.path(name)
+        if not path.exists():
+            return None
+        seq = self._snapshot_head(path)[0]
+        # A journal left over from a crash mid-compaction can trail the snapshot.
+        for _, line in tail_jsonl(journal_path(path)):
+            try:
+                return max(seq, int(json.loads(line)["n"]))
+            except (ValueError, KeyError, TypeError):
+                self._damaged.add(name)
+        return seq
+
+    def version(self, name: str) -> Optional[int]:
+        with self._locked(name):
+            return self._version_locked(name)
+
+    def load(self, name: str, after: Optional[int] = None) -> Optional[SessionState]:
+        with self._locked(name):
+            path = self.path(name)
+            if not path.exists():
+                return None
+            if after is not None and self._snapshot_head(path)[0] <= after:
+                messages: List[Dict[str, Any]] = []
+                context = updated = None
+                version = after
+                for record in _records(journal_path(path)):
+                    if record is None:
+                        self._damaged.add(name)
+                        continue
+                    n = int(record.get("n") or 0)
+                    if n <= after:
+                        continue
+                    version = n
+                    if record.get("op") == "message":
+                        messages.append(record["message"])
+                    elif record.get("op") == "context":
+                        context = record["context"]
+                    updated = record.get("ts", updated)
+                if version >= after and self._version_locked(name) == version:
+                    return SessionState(version, messages, context, full=False, updated_at=updated)
+            data, damaged = _replay(path)
+            if damaged:
+                self._damaged.add(name)
+            return SessionState(
+                version=data["journal_seq"],
+                messages=data["messages"],
+                context=data["context"],
+                updated_at=data.get("last_updated"),
+            )
+
+    def append(self, name, messages, context, *, expected_version):
+        with self._locked(name):
+            current = self._version_locked(name)
+            if (current or 0) != expected_version:
+                raise self._conflict(name, current, expected_version)
+            now = _now()
+            n = expected_version
+            records: List[Dict[str, Any]] = []
+            for message in messages:
+                n += 1
+                records.append({"n": n, "op": "message", "ts": now, "message": message})
+            if context is not None:
+                n += 1
+                records.append({"n": n, "op": "context", "ts": now, "context": context})
+            path = self.path(name)
+            seq, current_format = self._snapshot_head(path) if current is not None else (0, False)
+            if current is None or not current_format or name in self._damaged or n - seq >= self.compact_every:
+                base = _replay(path)[0] if current is not None else {"messages": [], "context": None}
+                base["messages"].extend(r["message"] for r in records if r["op"] == "message")
+                self._write_snapshot(name, base["messages"], context or base["context"], n)
+            else:
+                with open(journal_path(path), "a", encoding="utf-8") as fh:
+                    fh.write("".join(json.dumps(record) + "\n" for record in records))
+            return n
+
+    def replace(self, name, messages, context, *, expected_version):
+        with self._locked(name):
+            current = self._version_locked(name)
+            if (current or 0) != expected_version:
+                raise self._conflict(name, current, expected_version)
+            self._write_snapshot(name, list(messages), context, expected_version + 1)
+            return expected_version + 1
+
+    def _write_snapshot(self, name: str, messages: List[Dict[str, Any]], context: Any, seq: int) -> None:
+        # Caller holds the session lock. ``format``/``journal_seq`` lead so
+        # ``_snapshot_head`` finds them in the first bytes.
+        path = self.path(name)
+        data = {
+            "format": SNAPSHOT_FORMAT,
+            "journal_seq": seq,
+            "session_name": name,
+            "messages": messages,
+            "context": context,
+            "last_updated": _now(),
+        }
+        _atomic_write(path, json.dumps(data))
+        journal_path(path).unlink(missing_ok=True)
+        self._damaged.discard(name)
+
+    def quarantine(self, name: str) -> Optional[str]:
+        with self._locked(name):
+            path = self.path(name)
+            if not path.exists():
+                return None
+            backup = path.with_suffix(path.suffix + ".corrupt")
+            path.rename(backup)
+            journal = journal_path(path)
+            if journal.exists():
+                journal.rename(journal.with_suffix(journal.suffix + ".corrupt"))
+            self._damaged.discard(name)
+            return str(backup)
+
+
+class SQLSessionBackend(SessionBackend):
+    """Sessions in ``vast_sessions`` (version, context) and ``vast_session_messages``.
+
+    Appends are a compare-and-set on ``vast_sessions.version`` in the same
+    transaction as the message inserts.
+    """
+
+    def __init__(self, engine: Engine, schema: Optional[str] = None) -> None:
+        if schema is not None and not _IDENTIFIER.match(schema):
+            raise ValueError(f"Invalid session schema name '{schema}'.")
+        self.engine = engine
+        self.schema = schema
+        prefix = f'"{schema}".' if schema else ""
+        self._sessions = f"{prefix}vast_sessions"
+        self._messages = f"{prefix}vast_session_messages"
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _ensure_tables(self) -> None:
+        if self._ready:
+            return
+        with self._ready_lock:
+            if self._ready:
+                return
+            with self.engine.begin() as conn:
+                if self.schema:
+                    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{self.schema}"'))
+                # ``base`` is the version of the last replace: older readers reload in full.
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self._sessions} ("
+                    "name TEXT PRIMARY KEY, version BIGINT NOT NULL, base BIGINT NOT NULL, "
+                    "context TEXT, context_version BIGINT NOT NULL, updated_at TEXT NOT NULL)"
+                ))
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self._messages} ("
+                    "name TEXT NOT NULL, n BIGINT NOT NULL, body TEXT NOT NULL, PRIMARY KEY (name, n))"
+                ))
+            self._ready = True
+
+    def version(self, name: str) -> Optional[int]:
+        self._ensure_tables()
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(f"SELECT version FROM {self._sessions} WHERE name = :name"), {"name": name}
+            ).scalar()
+
+    def load(self, name: str, after: Optional[int] = None) -> Optional[SessionState]:
+        self._ensure_tables()
+        with self.engine.connect() as conn:
+            while True:
+                row = conn.execute(
+                    text(
+                        f"SELECT version, base, context, context_version, updated_at "
+                        f"FROM {self._sessions} WHERE name = :name"
+                    ),
+                    {"name": name},
+                ).first()
+                if row is None:
+                    return None
+                version, base, context, context_version, updated_at = row
+                full = after is None or after < base or after > version
+                since = -(2 ** 62) if full else after
+                # Appends committed after the first read are numbered past ``version``.
+                bodies = conn.execute(
+                    text(
+                        f"SELECT body FROM {self._messages} "
+                        "WHERE name = :name AND n > :since AND n <= :version ORDER BY n"
+                    ),
+                    {"name": name, "since": since, "version": version},
+                ).scalars().all()
+                # A replace in between renumbered the messages; read again.
+                current_base = conn.execute(
+                    text(f"SELECT base FROM {self._sessions} WHERE name = :name"), {"name": name}
+                ).scalar()
+                if current_base == base:
+                    break
+        if not full and context_version <= after:
+            context = None
+        return SessionState(
+            version=version,
+            messages=[json.loads(body) for body in bodies],
+            context=json.loads(context) if context is not None else None,
+            full=full,
+            updated_at=updated_at,
+        )
+
+    def _bump(self, conn, name: str, expected: int, new: int, context: Optional[Dict[str, Any]], base: bool) -> None:
+        sets = ["version = :new", "updated_at = :now"]
+        if context is not None:
+            sets += ["context = :context", "context_version = :new"]
+        if base:
+            sets.append("base = :new")
+        result = conn.execute(
+            text(f"UPDATE {self._sessions} SET {', '.join(sets)} WHERE name = :name AND version = :expected"),
+            {
+                "name": name,
+                "expected": expected,
+                "new": new,
+                "now": _now(),
+                "context": json.dumps(context) if context is not None else None,
+            },
+        )
+        if result.rowcount != 1:
+            current = conn.execute(
+                text(f"SELECT version FROM {self._sessions} WHERE name = :name"), {"name": name}
+            ).scalar()
+            raise self._conflict(name, current, expected)
+
+    def append(self, name, messages, context, *, expected_version):
+        self._ensure_tables()
+        new = expected_version + len(messages) + (1 if context is not None else 0)
+        with self.engine.begin() as conn:
+            if expected_version == 0:
+                conn.execute(
+                    text(
+                        f"INSERT INTO {self._sessions} (name, version, base, context, context_version, updated_at) "
+                        "VALUES (:name, 0, 0, NULL, 0, :now) ON CONFLICT (name) DO NOTHING"
+                    ),
+                    {"name": name, "now": _now()},
+                )
+            self._bump(conn, name, expected_version, new, context, base=False)
+            if messages:
+                conn.execute(
+                    text(f"INSERT INTO {self._messages} (name, n, body) VALUES (:name, :n, :body)"),
+                    [
+                        {"name": name, "n": expected_version + i + 1, "body": json.dumps(message)}
+                        for i, message in enumerate(messages)
+                    ],
+                )
+        return new
+
+    def replace(self, name, messages, context, *, expected_version):
+        self._ensure_tables()
+        new = expected_version + 1
+        with self.engine.begin() as conn:
+            self._bump(conn, name, expected_version, new, context, base=True)
+            conn.execute(text(f"DELETE FROM {self._messages} WHERE name = :name"), {"name": name})
+            if messages:
+                # Numbered up to ``new`` so later appends (``new + 1`` on) sort after them.
+                conn.execute(
+                    text(f"INSERT INTO {self._messages} (name, n, body) VALUES (:name, :n, :body)"),
+                    [
+                        {"name": name, "n": new - len(messages) + i + 1, "body": json.dumps(message)}
+                        for i, message in enumerate(messages)
+                    ],
+                )
+        return new
+
+    def quarantine(self, name: str) -> Optional[str]:
+        self._ensure_tables()
+        backup = f"{name}.corrupt.{int(time.time())}"
+        with self.engine.begin() as conn:
+            moved = conn.execute(
+                text(f"UPDATE {self._sessions} SET name = :backup WHERE name = :name"),
+                {"name": name, "backup": backup},
+            ).rowcount
+            conn.execute(
+                text(f"UPDATE {self._messages} SET name = :backup WHERE name = :name"),
+                {"name": name, "backup": backup},
+            )
+        return backup if moved else None
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+class SQLiteSessionBackend(SQLSessionBackend):
+    def __init__(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(create_engine(f"sqlite:///{path}", connect_args={"timeout": 30}))
+
+
+class PostgresSessionBackend(SQLSessionBackend):
+    def __init__(self, engine: Optional[Engine] = None, schema: Optional[str] = None) -> None:
+        if engine is None:
+            if settings.VAST_SESSION_DATABASE_URL:
+                engine = create_engine(settings.VAST_SESSION_DATABASE_URL, pool_pre_ping=True)
+            else:
+                from .db import get_pool_engine
+
+                engine = get_pool_engine("write")
+        super().__init__(engine, schema or settings.VAST_SESSION_PG_SCHEMA)
+
+    def close(self) -> None:
+        # The shared write pool belongs to ``vast.db``.
+        if settings.VAST_SESSION_DATABASE_URL:
+            super().close()
+
+
+_BACKEND: Optional[SessionBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def create_session_backend(kind: Optional[str] = None) -> SessionBackend:
+    kind = kind or settings.VAST_SESSION_BACKEND
+    if kind == "file":
+        return FileSessionBackend()
+    if kind == "sqlite":
+        return SQLiteSessionBackend(Path(settings.VAST_SESSION_SQLITE_PATH))
+    if kind == "postgres":
+        return PostgresSessionBackend()
+    raise ValueError(f"Unknown session backend '{kind}'. Expected one of: {', '.join(SESSION_BACKENDS)}.")
+
+
+def get_session_backend() -> SessionBackend:
+    global _BACKEND
+    if _BACKEND is None:
+        with _BACKEND_LOCK:
+            if _BACKEND is None:
+                _BACKEND = create_session_backend()
+    return _BACKEND
+
+
+# -- per-conversation view ------------------------------------------------
+
+
+class SessionJournal:
+    """One conversation's session: what is saved, at which version."""
+
+    def __init__(self, session_name: str, backend: Optional[SessionBackend] = None) -> None:
+        self.session_name = session_name
+        self.backend = backend or get_session_backend()
+        self.version = 0
+        self._persisted = 0
+        self._context: Optional[Dict[str, Any]] = None
+
+    def exists(self) -> bool:
+        return self.backend.version(self.session_name) is not None
+
+    def load(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Message and context dicts as last saved; raises if the session is unreadable."""
+
+        state = self.backend.load(self.session_name)
+        if state is None:
+            raise LookupError(f"No saved session '{self.session_name}'.")
+        self.version = state.version
+        self._persisted = len(state.messages)
+        self._context = state.context
+        return state.messages, state.context
+
+    def quarantine(self) -> Optional[str]:
+        backup = self.backend.quarantine(self.session_name)
+        self.version, self._persisted, self._context = 0, 0, None
+        return backup
+
+    def save(self, messages: Sequence[Any], context: Any) -> None:
+        """Store what changed since the last load/save.
+
+        Raises ``SessionConflict`` if another writer saved first; ``rebase``
+        and retry.
+        """
+        ctx = _jsonable(context.to_dict())
+        if len(messages) < self._persisted:
+            encoded = [_jsonable(m.to_dict()) for m in messages]
+            self.version = self.backend.replace(self.session_name, encoded, ctx, expected_version=self.version)
+        else:
+            new = [_jsonable(m.to_dict()) for m in messages[self._persisted:]]
+            changed = ctx if ctx != self._context else None
+            if not new and changed is None:
+                return
+            self.version = self.backend.append(self.session_name, new, changed, expected_version=self.version)
+        self._persisted = len(messages)
+        self._context = ctx
+
+    def rebase(
+        self,
+        messages: List[Any],
+        context: Any,
+        decode: Callable[[Dict[str, Any]], Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Splice in what others saved since our version, ahead of our unsaved messages.
+
+        ``messages`` is updated in place. Returns the stored context when it
+        changed elsewhere and ours has no unsaved change, else None.
+        """
+        name = self.session_name
+        if self.backend.version(name) == self.version:
+            return None
+        dirty = context is not None and _jsonable(context.to_dict()) != self._context
+        state = self.backend.load(name, after=self.version)
+        if state is None:
+            # Gone from the store: everything local is unsaved again.
+            self.version, self._persisted, self._context = 0, 0, None
+            return None
+        start = 0 if state.full else self._persisted
+        messages[start:self._persisted] = [decode(m) for m in state.messages]
+        self._persisted = start + len(state.messages)
+        self.version = state.version
+        if state.context is None or state.context == self._context:
+            return None
+        self._context = state.context
+        return None if dirty else state.context
+
+
+__all__ = [
+    "FileSessionBackend",
+    "PostgresSessionBackend",
+    "SESSION_BACKENDS",
+    "SNAPSHOT_FORMAT",
+    "SQLSessionBackend",
+    "SQLiteSessionBackend",
+    "SessionBackend",
+    "SessionConflict",
+    "SessionJournal",
+    "SessionState",
+    "create_session_backend",
+    "get_session_backend",
+    "journal_path",
+    "read_session",
+]
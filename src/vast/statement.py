@@ -0,0 +1,309 @@
+"""Parse-once SQL statements.
+
+``parse_statement`` turns SQL text into a ``ParsedStatement`` (AST, statement
+type, tables, columns, bind names, LIMIT presence) and keeps it in a bounded
+LRU, so the guard, the executor and the planner share one sqlglot parse per
+distinct statement. With ``VAST_PARSE_WORKERS`` > 0, large statements are
+parsed in a process pool so the parse does not hold the GIL of the API
+threadpool.
+
+The AST is shared between callers: treat it as read-only (sqlglot's
+``transform`` and ``copy`` leave the original untouched).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from sqlglot import exp, parse
+from sqlglot.dialects.postgres import Postgres
+from sqlglot.errors import ParseError
+
+from .config import settings
+
+
+class StatementType(Enum):
+    READ = auto()
+    WRITE = auto()
+    DDL = auto()
+
+
+# Compatibility tuple for sqlglot set operations across versions
+# Some versions expose a common SetOperation base; others only provide
+# concrete nodes like Union/Except/Intersect.
+SET_OPERATION_TYPES = tuple(
+    t
+    for t in (
+        getattr(exp, "Union", None),
+        getattr(exp, "Except", None),
+        getattr(exp, "Intersect", None),
+        getattr(exp, "SetOperation", None),
+    )
+    if t is not None
+)
+
+
+class BindPostgres(Postgres):
+    """Postgres dialect that renders named binds as ``:name``.
+
+    The stock dialect renders them as ``%(name)s``, which ``sqlalchemy.text``
+    escapes instead of binding.
+    """
+
+    class Generator(Postgres.Generator):
+        def placeholder_sql(self, expression: exp.Placeholder) -> str:
+            return f":{expression.name}" if expression.this else "?"
+
+
+BIND_DIALECT = BindPostgres()
+
+
+def render_sql(tree: exp.Expression) -> str:
+    """Render an AST as PostgreSQL that ``sqlalchemy.text`` can bind."""
+
+    return tree.sql(dialect=BIND_DIALECT)
+
+
+def _unwrap_with(node: exp.Expression) -> exp.Expression:
+    while isinstance(node, exp.With):
+        node = node.this
+    return node
+
+
+def _command_name(command: exp.Command) -> str:
+    name = command.name or ""
+    return name.upper()
+
+
+def _classify_statement(expr: exp.Expression) -> StatementType:
+    expr = _unwrap_with(expr)
+
+    # DDL nodes across sqlglot versions (AlterTable -> Alter; TruncateTable -> Truncate)
+    ddl_create = getattr(exp, "Create", None)
+    ddl_alter = getattr(exp, "AlterTable", None) or getattr(exp, "Alter", None)
+    ddl_drop = getattr(exp, "Drop", None)
+    ddl_truncate = getattr(exp, "TruncateTable", None) or getattr(exp, "Truncate", None)
+    ddl_nodes = tuple(t for t in (ddl_create, ddl_alter, ddl_drop, ddl_truncate) if t is not None)
+    if isinstance(expr, ddl_nodes) or any(expr.find(node) for node in ddl_nodes):
+        return StatementType.DDL
+
+    if isinstance(expr, exp.Command):
+        command = _command_name(expr)
+        if command in {"EXPLAIN", "SHOW"}:
+            return StatementType.READ
+        if command in {"ANALYZE", "VACUUM"}:
+            return StatementType.WRITE
+        return StatementType.DDL
+
+    if isinstance(expr, (exp.Insert, exp.Update, exp.Delete, exp.Merge, exp.LoadData)):
+        return StatementType.WRITE
+
+    if isinstance(expr, exp.Select):
+        return StatementType.READ
+
+    # Fall back to scanning children
+    if expr.find(exp.Insert) or expr.find(exp.Update) or expr.find(exp.Delete) or expr.find(exp.Merge):
+        return StatementType.WRITE
+
+    if (
+        (ddl_create and expr.find(ddl_create))
+        or (ddl_drop and expr.find(ddl_drop))
+        or (ddl_alter and expr.find(ddl_alter))
+        or (ddl_truncate and expr.find(ddl_truncate))
+    ):
+        return StatementType.DDL
+
+    # Fail closed for unknown statements.
+    return StatementType.DDL
+
+
+def _alias_name(table_expr: exp.Table) -> Optional[str]:
+    # Alias compatibility across sqlglot versions: may be a string or an expression
+    alias_value = getattr(table_expr, "alias", None)
+    if isinstance(alias_value, str):
+        return alias_value or None
+    if alias_value is None:
+        return None
+    # Prefer direct .name if present; otherwise try .this.name
+    name_attr = getattr(alias_value, "name", None)
+    if isinstance(name_attr, str) and name_attr:
+        return name_attr
+    alias_this = getattr(alias_value, "this", None)
+    return getattr(alias_this, "name", None)
+
+
+@dataclass(frozen=True)
+class ParsedStatement:
+    """Everything the hot path needs to know about one SQL statement."""
+
+    sql: str
+    ast: Optional[exp.Expression]
+    error: Optional[str] = None
+    statement_type: Optional[StatementType] = None
+    normalized_sql: str = ""
+    tables: FrozenSet[Tuple[Optional[str], str]] = frozenset()
+    columns: FrozenSet[Tuple[Optional[str], Optional[str], str]] = frozenset()
+    binds: FrozenSet[str] = frozenset()
+    has_limit: bool = False
+    is_select: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _build_statement(sql: str) -> ParsedStatement:
+    try:
+        expressions = parse(sql, read="postgres")
+    except ParseError as exc:
+        return ParsedStatement(sql=sql, ast=None, error=f"Unable to parse SQL: {exc}")
+
+    if not expressions or expressions[0] is None:
+        return ParsedStatement(sql=sql, ast=None, error="No SQL statements provided")
+    if len(expressions) != 1:
+        return ParsedStatement(sql=sql, ast=None, error="Only single statements are allowed")
+
+    root = expressions[0]
+    alias_map: Dict[str, Tuple[Optional[str], str]] = {}
+    tables = set()
+    columns = set()
+
+    for table_expr in root.find_all(exp.Table):
+        table_name = table_expr.name
+        if not table_name:
+            continue
+        schema_name = table_expr.db or None
+        tables.add((schema_name, table_name))
+        tables.add((None, table_name))
+        alias_name = _alias_name(table_expr)
+        if alias_name:
+            alias_map[alias_name] = (schema_name, table_name)
+
+    for column_expr in root.find_all(exp.Column):
+        column_name = column_expr.name
+        if not column_name:
+            continue
+        table_ref = column_expr.table
+        schema_ref: Optional[str] = None
+        table_resolved: Optional[str] = None
+        if table_ref:
+            mapping = alias_map.get(table_ref)
+            if mapping:
+                schema_ref, table_resolved = mapping
+            else:
+                table_resolved = table_ref
+        columns.add((schema_ref, table_resolved, column_name))
+        if table_resolved:
+            columns.add((None, table_resolved, column_name))
+        else:
+            columns.add((None, None, column_name))
+
+    target = _unwrap_with(root)
+    return ParsedStatement(
+        sql=sql,
+        ast=root,
+        statement_type=_classify_statement(root),
+        normalized_sql=render_sql(root),
+        tables=frozenset(tables),
+        columns=frozenset(columns),
+        binds=frozenset(p.name for p in root.find_all(exp.Placeholder) if p.name),
+        has_limit=target.args.get("limit") is not None,
+        is_select=isinstance(target, (exp.Select, *SET_OPERATION_TYPES)),
+    )
+
+
+_CACHE: "OrderedDict[str, ParsedStatement]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "pooled": 0}
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _parse_pool() -> ProcessPoolExecutor | None:
+    global _POOL
+    workers = int(settings.VAST_PARSE_WORKERS or 0)
+    if workers <= 0:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+        return _POOL
+
+
+def shutdown_parse_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_uncached(sql: str) -> ParsedStatement:
+    if len(sql) >= settings.VAST_PARSE_POOL_MIN_CHARS:
+        pool = _parse_pool()
+        if pool is not None:
+            try:
+                # Waiting on the future releases the GIL for the other threads.
+                statement = pool.submit(_build_statement, sql).result()
+            except Exception:
+                shutdown_parse_pool()
+            else:
+                with _CACHE_LOCK:
+                    _STATS["pooled"] += 1
+                return statement
+    return _build_statement(sql)
+
+
+def parse_statement(sql: str) -> ParsedStatement:
+    """Parse ``sql`` once; later calls with the same text hit the LRU."""
+
+    sql = sql or ""
+    with _CACHE_LOCK:
+        cached = _CACHE.get(sql)
+        if cached is not None:
+            _CACHE.move_to_end(sql)
+            _STATS["hits"] += 1
+            return cached
+        _STATS["misses"] += 1
+
+    statement = _parse_uncached(sql)
+
+    with _CACHE_LOCK:
+        _CACHE[sql] = statement
+        _CACHE.move_to_end(sql)
+        while len(_CACHE) > max(int(settings.VAST_PARSE_CACHE_SIZE), 1):
+            _CACHE.popitem(last=False)
+    return statement
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    with _CACHE_LOCK:
+        return {**_STATS, "size": len(_CACHE)}
+
+
+def clear_parse_cache() -> None:
+    """Drop cached statements and reset the counters."""
+
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        for key in _STATS:
+            _STATS[key] = 0
+
+
+__all__ = [
+    "BIND_DIALECT",
+    "ParsedStatement",
+    "SET_OPERATION_TYPES",
+    "StatementType",
+    "clear_parse_cache",
+    "parse_cache_stats",
+    "parse_statement",
+    "render_sql",
+    "shutdown_parse_pool",
+]
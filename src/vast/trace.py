@@ -0,0 +1,81 @@
+"""Per-request stage trace.
+
+Code that talks to the database records each round trip with ``stage(...)``.
+Nothing is recorded unless a caller opened a trace with ``stage_trace()``;
+``plan_and_execute`` does so and returns the stages in ``meta["trace"]``.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StageTrace:
+    """Ordered list of ``{"stage", "ms", ...}`` entries for one request."""
+
+    def __init__(self) -> None:
+        self.stages: List[Dict[str, Any]] = []
+
+    def record(self, name: str, ms: float, **info: Any) -> None:
+        entry: Dict[str, Any] = {"stage": name, "ms": round(ms, 3)}
+        entry.update({key: value for key, value in info.items() if value is not None})
+        self.stages.append(entry)
+
+    def counts(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for entry in self.stages:
+            out[entry["stage"]] = out.get(entry["stage"], 0) + 1
+        return out
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        return [dict(entry) for entry in self.stages]
+
+
+_CURRENT: ContextVar[Optional[StageTrace]] = ContextVar("vast_stage_trace", default=None)
+
+
+def current_trace() -> Optional[StageTrace]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def stage_trace() -> Iterator[StageTrace]:
+    """Open a trace, or join the one already active in this context."""
+
+    existing = _CURRENT.get()
+    if existing is not None:
+        yield existing
+        return
+    trace = StageTrace()
+    token = _CURRENT.set(trace)
+    try:
+        yield trace
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def stage(name: str, **info: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block and record it on the active trace.
+
+    The yielded dict can be filled with extra details before the block ends.
+    Failed stages are recorded too, with ``error`` set.
+    """
+
+    details: Dict[str, Any] = dict(info)
+    trace = _CURRENT.get()
+    started = time.perf_counter()
+    try:
+        yield details
+    except BaseException as exc:
+        details.setdefault("error", type(exc).__name__)
+        raise
+    finally:
+        if trace is not None:
+            trace.record(name, (time.perf_counter() - started) * 1000, **details)
+
+
+__all__ = ["StageTrace", "current_trace", "stage", "stage_trace"]
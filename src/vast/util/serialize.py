@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import datetime as _dt
-import decimal as _dec
-import uuid as _uuid
 from typing import Any, Iterable, List
 
+from ..coerce import coerce_value
+
 try:  # SQLAlchemy optional typing imports
     from sqlalchemy.engine import Row, RowMapping  # type: ignore
 except Exception:  # pragma: no cover - environment without SA types
@@ -15,22 +14,7 @@ except Exception:  # pragma: no cover - environment without SA types
 def _cell(value: Any) -> Any:
     """Coerce a single value to a JSON-friendly primitive."""
 
-    if value is None or isinstance(value, (str, int, float, bool)):
-        return value
-    if isinstance(value, (_dt.datetime, _dt.date)):
-        return value.isoformat()
-    if isinstance(value, _dec.Decimal):
-        try:
-            return int(value) if value == int(value) else float(value)
-        except Exception:
-            return float(value)
-    if isinstance(value, _uuid.UUID):
-        return str(value)
-    try:
-        # Fallback best-effort
-        return str(value)
-    except Exception:  # pragma: no cover - defensive
-        return None
+    return coerce_value(value, exact_decimals=True, default=str)
 
 
 def mapping_to_primitive_dict(mapping: Any) -> dict:
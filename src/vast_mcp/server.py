@@ -3,9 +3,8 @@ from __future__ import annotations
 import argparse
 import json
 import logging
-from datetime import date, datetime
-from decimal import Decimal
-from pathlib import Path
+import sqlite3
+from datetime import datetime
 from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
 
 import anyio
@@ -16,12 +15,17 @@ from mcp.server.websocket import websocket_server
 from mcp.shared.exceptions import McpError
 from mcp.types import CallToolRequest, CallToolResult, TextContent, Tool
 
-from vast.audit import AUDIT_FILE
+from vast.audit import query_events
+from vast.cancellation import run_cancellable
+from vast.coerce import coerce_value
+from vast.columnar import ColumnarResult
+from vast.config import settings
+from vast.db import dispose_async_engines
 from vast.service import (
     columns as service_columns,
     environment_status,
-    execute_sql as service_execute_sql,
-    plan_and_execute as service_plan_and_execute,
+    execute_page_async as service_execute_page_async,
+    plan_and_execute_async as service_plan_and_execute_async,
     tables as service_tables,
 )
 
@@ -29,14 +33,7 @@ logger = logging.getLogger(__name__)
 
 
 def _json_default(value: Any) -> Any:
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    if isinstance(value, Decimal):
-        as_int = int(value)
-        return as_int if as_int == value else float(value)
-    if isinstance(value, Path):
-        return str(value)
-    return value
+    return coerce_value(value, exact_decimals=True)
 
 
 def _json_dumps(payload: Any) -> str:
@@ -47,6 +44,16 @@ async def _run_sync(func, *args, **kwargs):
     return await anyio.to_thread.run_sync(func, *args, **kwargs)
 
 
+async def _run_request(label: str, func, *args, **kwargs):
+    # An aborted tool call cancels the task; run_cancellable turns that into
+    # a cancelled statement / abandoned LLM call.
+    return await run_cancellable(
+        lambda: func(*args, **kwargs),
+        label=label,
+        timeout_s=settings.VAST_REQUEST_TIMEOUT_S,
+    )
+
+
 def _ensure_dict(obj: Any, label: str) -> Dict[str, Any]:
     if obj is None:
         return {}
@@ -57,14 +64,25 @@ def _ensure_dict(obj: Any, label: str) -> Dict[str, Any]:
 
 def _format_sql_result(result: Dict[str, Any]) -> Dict[str, Any]:
     meta = _ensure_dict(result.get("meta"), "meta")
-    return {
-        "rows": result.get("rows", []),
+    columnar = result.get("result")
+    if isinstance(columnar, ColumnarResult):
+        rows, types = columnar.records(), columnar.types
+    else:
+        rows, types = result.get("rows", []), None
+    formatted = {
+        "rows": rows,
         "columns": result.get("columns", []),
-        "row_count": result.get("row_count", len(result.get("rows", []) or [])),
+        "row_count": result.get("row_count", len(rows or [])),
         "stmt_kind": result.get("stmt_kind"),
         "exec_ms": result.get("exec_ms", meta.get("exec_ms")),
         "engine_ms": result.get("engine_ms", meta.get("engine_ms")),
     }
+    if types is not None:
+        formatted["types"] = types
+    if "has_more" in result:
+        formatted["has_more"] = result["has_more"]
+        formatted["next_cursor"] = result.get("next_cursor")
+    return formatted
 
 
 def _format_plan_result(result: Dict[str, Any]) -> Dict[str, Any]:
@@ -93,30 +111,20 @@ def _format_plan_result(result: Dict[str, Any]) -> Dict[str, Any]:
 def _load_breadcrumb_events(limit: int) -> list[dict[str, Any]]:
     if limit <= 0:
         return []
-    if not AUDIT_FILE.exists():
-        return []
     try:
-        lines = AUDIT_FILE.read_text(encoding="utf-8").splitlines()
-    except OSError as exc:  # pragma: no cover - defensive
+        page = query_events(limit=limit, breadcrumbs=True)
+    except (OSError, sqlite3.Error) as exc:  # pragma: no cover - defensive
         logger.debug("Failed to read audit log: %s", exc)
         return []
-    events: list[dict[str, Any]] = []
-    for raw in lines[-limit:]:
-        try:
-            parsed = json.loads(raw)
-        except json.JSONDecodeError:
-            continue
-        crumbs = parsed.get("breadcrumbs")
-        if crumbs:
-            events.append(
-                {
-                    "ts": parsed.get("ts"),
-                    "breadcrumbs": crumbs,
-                    "meta": parsed.get("meta"),
-                    "sql": parsed.get("sql"),
-                }
-            )
-    return events
+    return [
+        {
+            "ts": parsed.get("ts"),
+            "breadcrumbs": parsed.get("breadcrumbs"),
+            "meta": parsed.get("meta"),
+            "sql": parsed.get("sql"),
+        }
+        for parsed in page["events"]
+    ]
 
 
 def _normalize_table_arguments(arguments: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
@@ -141,6 +149,16 @@ def _normalize_query_arguments(arguments: Dict[str, Any]) -> Tuple[str, Dict[str
     return sql, params
 
 
+def _normalize_page_arguments(arguments: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+    page_size = arguments.get("page_size")
+    if page_size is not None and (not isinstance(page_size, int) or isinstance(page_size, bool) or page_size < 1):
+        raise McpError("'page_size' must be a positive integer if provided")
+    cursor = arguments.get("cursor")
+    if cursor is not None and not isinstance(cursor, str):
+        raise McpError("'cursor' must be a string if provided")
+    return page_size, cursor or None
+
+
 def _normalize_resolver_arguments(arguments: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
     prompt = arguments.get("prompt") or arguments.get("question")
     if not isinstance(prompt, str) or not prompt.strip():
@@ -208,6 +226,15 @@ class VastMCPServer:
                             "type": "object",
                             "description": "Optional SQL parameters (e.g., {\"limit\": 10}).",
                         },
+                        "page_size": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Rows per page (defaults to VAST_PAGE_SIZE).",
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor from the previous page of the same SQL.",
+                        },
                     },
                 },
             ),
@@ -288,12 +315,9 @@ class VastMCPServer:
 
             if name == "query.read":
                 sql, params = _normalize_query_arguments(arguments)
-                result = await _run_sync(
-                    service_execute_sql,
-                    sql,
-                    params,
-                    False,
-                    False,
+                page_size, cursor = _normalize_page_arguments(arguments)
+                result = await _run_request(
+                    name, service_execute_page_async, sql, params, page_size=page_size, cursor=cursor
                 )
                 payload = _format_sql_result(result)
                 result = _tool_response(payload)
@@ -301,13 +325,7 @@ class VastMCPServer:
 
             if name == "resolver.run":
                 prompt, params = _normalize_resolver_arguments(arguments)
-                result = await _run_sync(
-                    service_plan_and_execute,
-                    prompt,
-                    params,
-                    False,
-                    False,
-                )
+                result = await _run_request(name, service_plan_and_execute_async, prompt, params, False, False)
                 payload = _format_plan_result(result)
                 result = _tool_response(payload)
                 return result.content, result.structuredContent or {}
@@ -323,8 +341,11 @@ class VastMCPServer:
             raise McpError(f"Unknown tool: {name}")
 
     async def _run_stdio(self) -> None:
-        async with stdio_server() as (read_stream, write_stream):
-            await self._app.run(read_stream, write_stream, self._init_options)
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self._app.run(read_stream, write_stream, self._init_options)
+        finally:
+            await dispose_async_engines()
 
     async def _run_websocket(self, host: str, port: int) -> None:
         from starlette.applications import Starlette
@@ -341,7 +362,10 @@ class VastMCPServer:
 
         config = uvicorn.Config(app, host=host, port=port, log_level="info")
         server = uvicorn.Server(config)
-        await server.serve()
+        try:
+            await server.serve()
+        finally:
+            await dispose_async_engines()
 
     def run_stdio(self) -> None:
         logger.info("Starting vast-mcp on stdio transport")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+
+from src.vast import db, service
+from src.vast.db import _async_url
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def async_service(monkeypatch):
+    calls = {"validated": 0, "executed": []}
+
+    async def fake_safe_execute_async(sql, params=None, allow_writes=False, force_write=False, **kwargs):
+        calls["executed"].append((sql, params, kwargs))
+        return {
+            "rows": [{"film_id": 1, "title": "Alien"}],
+            "columns": ["film_id", "title"],
+            "row_count": 1,
+            "meta": {"engine_ms": 0, "exec_ms": 0},
+        }
+
+    def fake_guard(*args, **kwargs):
+        calls["validated"] += 1
+
+    monkeypatch.setattr(service, "safe_execute_async", fake_safe_execute_async)
+    monkeypatch.setattr(service, "_ensure_valid_identifiers", fake_guard)
+    monkeypatch.setattr(service, "ensure_valid_identifiers", fake_guard)
+    monkeypatch.setattr(service, "load_or_build_schema_summary", lambda *a, **k: "summary")
+    monkeypatch.setattr(service, "get_async_ro_engine", lambda: None)
+    monkeypatch.setattr(service, "get_engine", lambda readonly=True: None)
+    return calls
+
+
+def test_async_url_uses_psycopg3():
+    assert _async_url("postgresql://u:p@h/db") == "postgresql+psycopg://u:p@h/db"
+    assert _async_url("postgresql+psycopg2://u@h/db") == "postgresql+psycopg://u@h/db"
+    assert _async_url("postgresql+psycopg://u@h/db") == "postgresql+psycopg://u@h/db"
+
+
+@pytest.mark.anyio
+async def test_execute_sql_async_validates_then_executes(async_service):
+    result = await service.execute_sql_async("SELECT film_id, title FROM film")
+
+    assert async_service["validated"] == 1
+    sql, _, kwargs = async_service["executed"][0]
+    assert sql.startswith("SELECT film_id, title FROM film") and kwargs == {}
+    assert result["rows"] == [{"film_id": 1, "title": "Alien"}]
+    assert result["row_count"] == 1 and result["stmt_kind"] == "SELECT"
+
+
+@pytest.mark.anyio
+async def test_execute_sql_async_rejects_writes_in_read_mode(async_service):
+    with pytest.raises(ValueError, match="Read-only mode"):
+        await service.execute_sql_async("DELETE FROM film")
+    assert not async_service["executed"]
+
+
+@pytest.mark.anyio
+async def test_plan_and_execute_async_passthrough(async_service):
+    outcome = await service.plan_and_execute_async("SELECT film_id, title FROM film")
+
+    assert outcome["passthrough"] and outcome["intent"] == "read"
+    assert outcome["execution"]["row_count"] == 1
+    assert async_service["validated"] == 1
+    assert "trace" in outcome["meta"]
+
+
+@pytest.mark.anyio
+async def test_safe_execute_async_on_sqlite(monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import StaticPool
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE film (film_id INTEGER, title TEXT)"))
+        await conn.execute(text("INSERT INTO film VALUES (1, 'Alien'), (2, 'Brazil')"))
+    monkeypatch.setattr(db, "get_async_ro_engine", lambda: engine)
+    monkeypatch.setattr(db, "get_async_engine", lambda readonly=True: engine)
+
+    read = await db.safe_execute_async("SELECT film_id, title FROM film ORDER BY film_id", columnar=True)
+    dry = await db.safe_execute_async("DELETE FROM film", allow_writes=True, estimated_rows=2)
+
+    assert read["result"].table() == [[1, "Alien"], [2, "Brazil"]]
+    assert dry["dry_run"] and dry["rows"][0]["_estimated_rows"] == 2
+    await engine.dispose()
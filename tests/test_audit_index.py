@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.vast import audit, audit_index, db
+from src.vast.config import settings
+from src.vast.audit import AuditWriter
+from src.vast.audit_index import AuditFilter, AuditIndex, normalize_ts, tail_events, tail_jsonl
+
+
+def _event(i, **extra):
+    return {"ts": f"2024-05-01T12:00:{i:02d}Z", "i": i, **extra}
+
+
+def _history(n=30):
+    events = []
+    for i in range(n):
+        if i % 3 == 0:
+            events.append(_event(i, phase="pre", stmt_type="WRITE" if i % 2 else "READ"))
+        else:
+            events.append(_event(i, phase="post", success=i % 5 != 0))
+    return events
+
+
+@pytest.fixture
+def audit_log(tmp_path, monkeypatch):
+    """A fresh writer+index in ``tmp_path`` installed as the module singleton."""
+
+    def install(events, *, indexed=True):
+        path = tmp_path / "events.jsonl"
+        writer = AuditWriter(path, mode="sync")
+        index = AuditIndex(tmp_path / "index.sqlite3") if indexed else None
+        if index is not None:
+            writer.add_sink(index.add)
+        monkeypatch.setattr(audit, "AUDIT_FILE", path)
+        monkeypatch.setattr(audit, "_WRITER", writer)
+        monkeypatch.setattr(audit, "_INDEX", index)
+        for event in events:
+            writer.submit(json.dumps(event) + "\n")
+        return writer, index
+
+    return install
+
+
+def test_tail_reader_walks_back_across_blocks(tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [json.dumps({"i": i, "pad": "x" * (i % 7)}) for i in range(200)]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    got = list(tail_jsonl(path, block_size=37))
+    assert [line for _, line in got] == lines[::-1]
+    data = path.read_bytes()
+    assert all(data[offset:].startswith(line.encode()) for offset, line in got)
+    assert list(tail_jsonl(tmp_path / "missing.jsonl")) == []
+
+
+def test_tail_events_pages_with_offsets(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text("".join(json.dumps(e) + "\n" for e in _history()) + "not json\n", encoding="utf-8")
+    flt = AuditFilter(phase="post")
+
+    seen, before = [], None
+    while True:
+        page, before = tail_events(path, flt, limit=4, before=before)
+        seen.extend(e["i"] for e in page)
+        if before is None:
+            break
+    assert seen == [e["i"] for e in reversed(_history()) if e["phase"] == "post"]
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_query_events_filters_and_paginates(audit_log, indexed):
+    history = _history()
+    audit_log(history, indexed=indexed)
+
+    first = audit.query_events(limit=3, phase="post")
+    assert first["source"] == ("index" if indexed else "file")
+    assert [e["i"] for e in first["events"]] == [26, 28, 29]
+
+    collected = list(first["events"])
+    page = first
+    while page["next_cursor"]:
+        page = audit.query_events(limit=3, phase="post", cursor=page["next_cursor"])
+        collected = page["events"] + collected
+    assert collected == [e for e in history if e["phase"] == "post"]
+
+    failed = audit.query_events(success=False)["events"]
+    assert [e["i"] for e in failed] == [5, 10, 20, 25]
+    window = audit.query_events(since="2024-05-01T12:00:10Z", until="2024-05-01T12:00:13", stmt_type="read")
+    assert [e["i"] for e in window["events"]] == [12]
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_outcome_events_match_statement_type_filters(audit_log, indexed, monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER)"))
+    monkeypatch.setattr(db, "get_engine", lambda readonly=True: engine)
+    monkeypatch.setattr(db, "get_ro_engine", lambda: engine)
+    monkeypatch.setattr(settings, "VAST_RESULT_CACHE", False)
+    audit_log([], indexed=indexed)
+
+    db.safe_execute("SELECT film_id FROM film")
+    with pytest.raises(ValueError):
+        db.safe_execute("DELETE FROM film")
+    list(db.stream_execute("SELECT film_id FROM film"))
+
+    failed_writes = audit.query_events(stmt_type="write", success=False)["events"]
+    assert [(e["phase"], e["error"]) for e in failed_writes] == [
+        ("post", "Write queries are disabled. Use --write to permit writes.")
+    ]
+    reads = audit.query_events(stmt_type="read", phase="post", success=True)["events"]
+    assert [e.get("stream", False) for e in reads] == [False, True]
+
+
+def test_index_backfills_once_and_prunes(tmp_path):
+    log = tmp_path / "events.jsonl"
+    log.write_text("".join(json.dumps(e) + "\n" for e in _history(10)), encoding="utf-8")
+    index = AuditIndex(tmp_path / "index.sqlite3", max_rows=15, prune_every=1)
+
+    assert index.backfill(log) == 10
+    assert index.backfill(log) == 0
+    index.add([json.dumps(_event(50 + i, phase="pre")) + "\n" for i in range(10)])
+    assert index.count() == 15
+    events, next_id = index.query(AuditFilter(), limit=20)
+    assert next_id is None and events[0]["i"] == 59 and events[-1]["i"] == 5
+
+
+def test_index_keeps_one_connection_across_threads(tmp_path, monkeypatch):
+    opened = []
+    real_connect = audit_index.sqlite3.connect
+    monkeypatch.setattr(audit_index.sqlite3, "connect", lambda *a, **k: opened.append(a) or real_connect(*a, **k))
+    index = AuditIndex(tmp_path / "index.sqlite3")
+    assert index.count() == 0 and not index.exists()
+
+    def add(start):
+        for i in range(start, start + 20):
+            index.add([json.dumps(_event(i % 60)) + "\n"])
+            index.query(AuditFilter(), limit=5)
+
+    threads = [threading.Thread(target=add, args=(n * 20,)) for n in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert index.count() == 60 and len(opened) == 1
+    index.close()
+    assert index.count() == 60 and len(opened) == 2
+    index.close()
+
+
+def test_breadcrumb_filter_and_bad_input(audit_log):
+    audit_log([_event(1, phase="post"), _event(2, breadcrumbs={"llm_ms": 3}), _event(3, phase="post")])
+
+    assert [e["i"] for e in audit.query_events(breadcrumbs=True)["events"]] == [2]
+    with pytest.raises(ValueError, match="Invalid audit cursor"):
+        audit.query_events(cursor="nope")
+    with pytest.raises(ValueError, match="Invalid timestamp"):
+        audit.query_events(since="yesterday")
+    assert normalize_ts("2024-05-01T14:00:00+02:00") == "2024-05-01T12:00:00Z"
+    assert audit_index.decode_cursor(audit_index.encode_cursor(offset=12)) == (None, 12)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from src.vast import audit
+from src.vast.audit import AuditWriter
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_async_writer_batches_and_flushes(tmp_path):
+    writer = AuditWriter(tmp_path / "events.jsonl", batch_size=50, flush_ms=10_000)
+    for i in range(120):
+        writer.submit(json.dumps({"i": i}) + "\n")
+
+    assert writer.flush(timeout=5)
+    assert [e["i"] for e in _lines(writer.path)] == list(range(120))
+    stats = writer.stats()
+    assert stats["written"] == 120 and stats["batches"] <= 4 and stats["queued"] == 0
+    writer.close()
+    writer.submit('{"after": true}\n')  # a closed writer falls back to writing inline
+    assert _lines(writer.path)[-1] == {"after": True}
+
+
+def test_size_rotation_gzips_and_prunes(tmp_path):
+    writer = AuditWriter(tmp_path / "events.jsonl", mode="sync", rotate_bytes=100, gzip_rotated=True, backups=2)
+    for i in range(12):
+        writer.submit(json.dumps({"i": i, "pad": "x" * 30}) + "\n")
+
+    rotated = writer.rotated_files()
+    assert len(rotated) == 2 and all(p.name.endswith(".jsonl.gz") for p in rotated)
+    assert writer.stats()["rotations"] >= 4
+    with gzip.open(rotated[-1], "rt", encoding="utf-8") as fh:
+        archived = [json.loads(line)["i"] for line in fh]
+    current = [e["i"] for e in _lines(writer.path)]
+    assert archived and current and archived[-1] + 1 == current[0] and current[-1] == 11
+    writer.close()
+
+
+def test_interval_rotation(tmp_path, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(audit.time, "time", lambda: clock[0])
+    writer = AuditWriter(tmp_path / "events.jsonl", mode="sync", rotate_interval_s=60)
+    writer.submit('{"n": 1}\n')
+    clock[0] += 61
+    writer.submit('{"n": 2}\n')
+
+    assert len(writer.rotated_files()) == 1
+    assert _lines(writer.path) == [{"n": 2}]
+    writer.close()
+
+
+def test_writers_sharing_a_file_lose_nothing_across_rotation(tmp_path):
+    # Separate writers take separate flocks, as separate processes would.
+    path = tmp_path / "events.jsonl"
+    writers = [AuditWriter(path, mode="sync", rotate_bytes=500, backups=1000) for _ in range(2)]
+
+    def produce(w, writer):
+        for i in range(150):
+            writer.submit(json.dumps({"w": w, "i": i}) + "\n")
+
+    threads = [threading.Thread(target=produce, args=(w, writer)) for w, writer in enumerate(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    events = [e for f in writers[0].rotated_files() + [path] for e in _lines(f)]
+    for w in range(2):
+        assert [e["i"] for e in events if e["w"] == w] == list(range(150))
+    assert sum(writer.stats()["rotations"] for writer in writers) == len(writers[0].rotated_files()) > 2
+    for writer in writers:
+        writer.close()
+
+
+def test_fsync_mode_syncs_each_write(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(audit.os, "fsync", lambda fd: synced.append(fd))
+    writer = AuditWriter(tmp_path / "events.jsonl", mode="fsync")
+    writer.submit('{"a": 1}\n')
+    writer.submit('{"a": 2}\n')
+
+    assert len(synced) == 2
+    assert _lines(writer.path) == [{"a": 1}, {"a": 2}]
+    writer.close()
+
+
+def test_full_queue_drops_and_counts(tmp_path, monkeypatch):
+    writer = AuditWriter(tmp_path / "events.jsonl", queue_size=1, flush_ms=1)
+    stalled, release = threading.Event(), threading.Event()
+    real_write = writer._write
+
+    def stalled_write(lines):
+        stalled.set()
+        release.wait(5)
+        real_write(lines)
+
+    monkeypatch.setattr(writer, "_write", stalled_write)
+    writer.submit('{"i": 0}\n')
+    assert stalled.wait(5)
+    started = time.monotonic()
+    for i in range(1, 6):
+        writer.submit(json.dumps({"i": i}) + "\n")
+    assert time.monotonic() - started < 0.5  # a full queue never blocks the caller
+    release.set()
+
+    assert writer.flush(timeout=5)
+    stats = writer.stats()
+    assert stats["dropped"] == 4 and stats["written"] == 2
+    writer.close()
+
+
+def test_audit_event_stamps_and_serialises(tmp_path, monkeypatch):
+    writer = AuditWriter(tmp_path / "events.jsonl")
+    monkeypatch.setattr(audit, "_WRITER", writer)
+    params = {"id": 1}
+    event = {"phase": "pre", "params": params}
+
+    audit.audit_event(event)
+    params["id"] = 2
+    assert audit.flush_audit()
+
+    (logged,) = _lines(writer.path)
+    assert logged["params"] == {"id": 1} and logged["ts"] == event["ts"]
+    writer.close()
+
+
+def test_unknown_mode_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown audit mode"):
+        AuditWriter(tmp_path / "events.jsonl", mode="later")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.vast import db, service
+from src.vast.bulk import bulk_execute, parse_bulk_statement, read_rows
+from src.vast.config import settings
+
+INSERT = "INSERT INTO film (film_id, title) VALUES (:film_id, :title)"
+
+
+@pytest.fixture
+def film_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER PRIMARY KEY, title TEXT)"))
+    monkeypatch.setattr(db, "get_engine", lambda readonly=True: engine)
+    monkeypatch.setattr(settings, "VAST_RESULT_CACHE", False)
+
+    def titles():
+        with engine.connect() as conn:
+            return [tuple(r) for r in conn.execute(text("SELECT film_id, title FROM film ORDER BY film_id"))]
+
+    return titles
+
+
+def _rows(n):
+    return ({"film_id": i, "title": f"Film {i}"} for i in range(1, n + 1))
+
+
+def test_statement_shape_is_checked_once():
+    plain = parse_bulk_statement(INSERT)
+    upsert = parse_bulk_statement(
+        "INSERT INTO film (film_id, title) VALUES (:film_id, :title) "
+        "ON CONFLICT (film_id) DO UPDATE SET title = EXCLUDED.title"
+    )
+
+    assert plain.copy_sql == "COPY film (film_id, title) FROM STDIN"
+    assert plain.binds == ("film_id", "title")
+    assert upsert.copy_sql is None and upsert.binds == ("film_id", "title")
+    assert parse_bulk_statement("INSERT INTO film (title) VALUES (upper(:title))").copy_sql is None
+    for bad in ("UPDATE film SET title = :t", "INSERT INTO film SELECT * FROM other", "INSERT INTO film VALUES (1, 'x')"):
+        with pytest.raises(ValueError):
+            parse_bulk_statement(bad)
+
+
+def test_read_rows_jsonl_and_csv():
+    jsonl = io.StringIO('{"film_id": 1, "title": "Alien"}\n\n{"film_id": 2, "title": null}\n')
+    csv_rows = io.StringIO("film_id,title\n1,Alien\n2,\n")
+
+    assert list(read_rows(jsonl)) == [{"film_id": 1, "title": "Alien"}, {"film_id": 2, "title": None}]
+    assert list(read_rows(csv_rows, "csv")) == [{"film_id": "1", "title": "Alien"}, {"film_id": "2", "title": None}]
+    with pytest.raises(ValueError, match="Line 1"):
+        list(read_rows(io.StringIO("[1, 2]\n")))
+
+
+def test_load_runs_in_chunks_with_throughput(film_db):
+    result = bulk_execute(INSERT, _rows(25), allow_writes=True, force_write=True, chunk_size=10)
+
+    assert result["method"] == "executemany"
+    assert result["row_count"] == 25 and result["chunks"] == 3
+    assert "rows_per_s" in result and not result["dry_run"]
+    assert len(film_db()) == 25
+
+
+def test_dry_run_counts_and_previews_without_writing(film_db):
+    result = bulk_execute(INSERT, _rows(7), allow_writes=True)
+
+    assert result["dry_run"] and result["row_count"] == 7
+    assert result["preview"][0] == {"film_id": 1, "title": "Film 1"} and len(result["preview"]) == 5
+    assert film_db() == []
+
+
+def test_batch_over_max_write_rows_rolls_back(film_db, monkeypatch):
+    monkeypatch.setattr(settings, "max_write_rows", 15)
+
+    with pytest.raises(ValueError, match="more than 15 rows"):
+        bulk_execute(INSERT, _rows(20), allow_writes=True, force_write=True, chunk_size=10)
+    assert film_db() == []
+    with pytest.raises(ValueError, match="missing parameter"):
+        bulk_execute(INSERT, [{"film_id": 1}], allow_writes=True, force_write=True)
+    with pytest.raises(ValueError, match="Write queries are disabled"):
+        bulk_execute(INSERT, _rows(1))
+
+
+def test_service_validates_first_row_only(film_db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "_ensure_valid_identifiers", lambda sql, **kw: calls.append(kw["params"]))
+    monkeypatch.setattr(service, "load_or_build_schema_summary", lambda *a, **k: "summary")
+
+    result = service.bulk_load(
+        "INSERT INTO film (film_id, title) VALUES (:film_id, :title) "
+        "ON CONFLICT (film_id) DO UPDATE SET title = EXCLUDED.title",
+        read_rows(io.StringIO("film_id,title\n1,Alien\n2,Brazil\n1,Alien 2\n"), "csv"),
+        allow_writes=True,
+        force_write=True,
+    )
+
+    assert calls == [{"film_id": "1", "title": "Alien"}]
+    assert result["row_count"] == 3
+    assert film_db() == [(1, "Alien 2"), (2, "Brazil")]
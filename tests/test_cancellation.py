@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import anyio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from src.vast import agent, db
+from src.vast.cancellation import (
+    RequestCancelled,
+    RequestTimedOut,
+    active_requests,
+    call_cancellable,
+    cancel_hook,
+    cancel_request,
+    check_cancelled,
+    request_scope,
+    run_cancellable,
+)
+
+SLOW_SQL = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) "
+    "SELECT max(i) AS top FROM n"
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _cancel_when(predicate, request_id):
+    def _run():
+        deadline = time.time() + 5
+        while not predicate() and time.time() < deadline:
+            time.sleep(0.01)
+        cancel_request(request_id)
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_cancel_runs_hooks_and_unregisters():
+    fired = []
+    with request_scope("req-1", label="test") as ctx:
+        assert [r["request_id"] for r in active_requests()] == ["req-1"]
+        with pytest.raises(ValueError, match="already in use"):
+            with request_scope("req-1"):
+                pass
+        with cancel_hook(lambda: fired.append("a")):
+            pass
+        with cancel_hook(lambda: fired.append("b")):
+            assert cancel_request("req-1")
+        assert ctx.cancelled and fired == ["b"]
+        with pytest.raises(RequestCancelled):
+            check_cancelled()
+        # Registering after cancellation fires immediately.
+        with cancel_hook(lambda: fired.append("c")):
+            pass
+    assert fired == ["b", "c"]
+    assert not cancel_request("req-1")
+    assert active_requests() == []
+
+
+def test_helpers_are_noops_outside_a_request():
+    check_cancelled()
+    with cancel_hook(lambda: pytest.fail("hook should not run")):
+        pass
+    assert call_cancellable(lambda x: x * 2, 21) == 42
+
+
+def test_cancel_interrupts_running_statement(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    monkeypatch.setattr(db, "get_ro_engine", lambda: engine)
+    monkeypatch.setattr(db.settings, "VAST_RESULT_CACHE", False)
+
+    with request_scope("slow-read") as ctx:
+        watcher = _cancel_when(lambda: bool(ctx._hooks), "slow-read")
+        started = time.perf_counter()
+        with pytest.raises(RequestCancelled):
+            db.safe_execute(SLOW_SQL)
+        watcher.join()
+    assert time.perf_counter() - started < 5
+    assert db.safe_execute("SELECT 1 AS one")["rows"] == [{"one": 1}]
+
+
+def test_cancel_abandons_llm_call():
+    release = threading.Event()
+    closed = []
+
+    class SlowCompletions:
+        def create(self, **kwargs):
+            release.wait(5)
+            return "late"
+
+    class SlowClient:
+        chat = type("Chat", (), {"completions": SlowCompletions()})()
+
+        def close(self):
+            closed.append(True)
+
+    with request_scope("slow-llm") as ctx:
+        watcher = _cancel_when(lambda: bool(ctx._hooks), "slow-llm")
+        with pytest.raises(RequestCancelled):
+            agent._create_completion(SlowClient(), model="m", messages=[])
+        watcher.join()
+    release.set()
+    assert closed == [True]
+
+
+def test_llm_errors_are_still_wrapped():
+    class Failing:
+        class chat:
+            class completions:
+                @staticmethod
+                def create(**kwargs):
+                    raise ConnectionError("boom")
+
+    with request_scope():
+        with pytest.raises(RuntimeError, match="LLM call failed: boom"):
+            agent._create_completion(Failing())
+
+
+@pytest.mark.anyio
+async def test_run_cancellable_cancels_on_disconnect_and_timeout():
+    async def slow_call():
+        released = anyio.Event()
+        # Hooks run in a worker thread, as they would for a blocking driver cancel.
+        with cancel_hook(lambda: anyio.from_thread.run_sync(released.set)):
+            with anyio.fail_after(5):
+                await released.wait()
+        check_cancelled()
+
+    messages = [{"type": "http.request"}, {"type": "http.disconnect"}]
+
+    async def receive():
+        await anyio.sleep(0.01)
+        return messages.pop(0)
+
+    with pytest.raises(RequestCancelled):
+        await run_cancellable(slow_call, receive=receive, label="disconnect")
+    with pytest.raises(RequestCancelled):
+        await run_cancellable(slow_call, timeout_s=0.05)
+    assert await run_cancellable(lambda: anyio.sleep(0), timeout_s=5) is None
+    assert active_requests() == []
+
+
+@pytest.mark.anyio
+async def test_timeout_is_reported_apart_from_disconnect():
+    async def wait_for_cancel():
+        await anyio.to_thread.run_sync(lambda: call_cancellable(time.sleep, 5))
+
+    with pytest.raises(RequestTimedOut, match="timed out"):
+        await run_cancellable(wait_for_cancel, timeout_s=0.05)
+
+    async def receive():
+        await anyio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    with pytest.raises(RequestCancelled) as info:
+        await run_cancellable(wait_for_cancel, receive=receive)
+    assert not isinstance(info.value, RequestTimedOut)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+
+from src.vast import card_store
+from src.vast.card_store import CardStore, LazyCards
+
+
+def _card(schema, table, columns=("id",)):
+    return {
+        "schema": schema,
+        "table": table,
+        "aliases": [table],
+        "columns": [{"name": name, "type": "INTEGER"} for name in columns],
+    }
+
+
+def _cards(*cards):
+    return {f"{c['schema']}.{c['table']}": c for c in cards}
+
+
+def test_index_and_lazy_cards_decode_on_access(tmp_path):
+    store = CardStore(tmp_path / "cards.db")
+    store.replace_all(
+        _cards(_card("public", "film"), _card("public", "actor")),
+        "fp-1",
+        {"public.film": "h1", "public.actor": "h2"},
+        {"fingerprint": "fp-1", "tables": []},
+    )
+
+    index = store.read_index()
+    assert index["fingerprint"] == "fp-1"
+    assert [(e["schema"], e["table"], e["hash"]) for e in index["tables"]] == [
+        ("public", "actor", "h2"),
+        ("public", "film", "h1"),
+    ]
+
+    cards = LazyCards(store, index["tables"])
+    assert len(cards) == 2 and "public.film" in cards
+    assert store.stats()["cached"] == 0
+
+    assert cards["public.film"]["table"] == "film"
+    assert cards["public.film"] is cards["public.film"]
+    assert store.stats() == {"hits": 2, "misses": 1, "cached": 1}
+
+
+def test_cache_is_dropped_when_file_changes(tmp_path):
+    path = tmp_path / "cards.db"
+    reader = CardStore(path)
+    writer = CardStore(path)
+    writer.replace_all(_cards(_card("public", "film")), "fp-1", None, {"tables": []})
+    assert [c["name"] for c in reader.get("public", "film")["columns"]] == ["id"]
+
+    writer.apply_changes(
+        _cards(_card("public", "film", ("id", "title"))),
+        [],
+        "fp-2",
+        {},
+        {"tables": []},
+    )
+    # Make the mtime move even on coarse-grained filesystems.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert reader.fingerprint() == "fp-2"
+    assert [c["name"] for c in reader.get("public", "film")["columns"]] == ["id", "title"]
+
+
+def test_apply_changes_deletes_and_lru_is_bounded(tmp_path):
+    store = CardStore(tmp_path / "cards.db", cache_size=2)
+    store.replace_all(
+        _cards(*(_card("public", f"t{i}") for i in range(4))),
+        "fp",
+        None,
+        {"tables": []},
+    )
+    for i in range(4):
+        store.get("public", f"t{i}")
+    assert store.stats()["cached"] == 2
+
+    store.apply_changes({}, ["public.t0"], "fp", {}, {"tables": []})
+    assert store.get("public", "t0") is None
+    assert [e["table"] for e in store.read_index()["tables"]] == ["t1", "t2", "t3"]
+
+
+def test_store_keeps_one_connection_until_the_file_is_replaced(tmp_path, monkeypatch):
+    opened = []
+    real_connect = card_store.sqlite3.connect
+    monkeypatch.setattr(card_store.sqlite3, "connect", lambda *a, **k: opened.append(a) or real_connect(*a, **k))
+    path = tmp_path / "cards.db"
+    store = CardStore(path, cache_size=1)
+    store.replace_all(_cards(_card("public", "film"), _card("public", "actor")), "fp-1", None, {"tables": []})
+    for _ in range(3):
+        assert store.read_index()["fingerprint"] == "fp-1"
+        store.get("public", "film"), store.get("public", "actor")  # LRU of one: every get misses
+    assert len(opened) == 1 and store.stats()["misses"] == 6
+
+    path.unlink()  # rebuilt by another process while this connection is open
+    CardStore(path).replace_all(_cards(_card("public", "film", ("id", "title"))), "fp-2", None, {"tables": []})
+    assert store.fingerprint() == "fp-2"
+    assert [c["name"] for c in store.get("public", "film")["columns"]] == ["id", "title"]
+    store.close()
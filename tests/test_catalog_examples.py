@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from src.vast import catalog_pg
+
+
+def test_examples_from_stats_limits_and_prefers_first_row():
+    rows = [
+        {"schemaname": "public", "tablename": "film", "attname": "rating", "mcv": ["PG", "R", None, "G", "NC-17", "PG-13", "X"]},
+        {"schemaname": "public", "tablename": "film", "attname": "rating", "mcv": ["ignored"]},
+        {"schemaname": "public", "tablename": "film", "attname": "title", "mcv": []},
+    ]
+
+    out = catalog_pg._examples_from_stats(rows)
+
+    assert out == {("public", "film"): {"rating": ["PG", "R", "G", "NC-17", "PG-13"]}}
+
+
+def test_sample_percent_skips_small_tables():
+    assert catalog_pg._sample_percent(None) is None
+    assert catalog_pg._sample_percent(catalog_pg.EXAMPLE_SAMPLE_ROWS) is None
+    assert catalog_pg._sample_percent(catalog_pg.EXAMPLE_SAMPLE_ROWS * 10) == 10.0
+    assert catalog_pg._sample_percent(10**12) == 0.01
+
+
+def _columns(*specs):
+    return [{"name": name, "type": col_type} for name, col_type in specs]
+
+
+def test_collect_catalog_examples_uses_stats_then_samples_missing(monkeypatch):
+    monkeypatch.setattr(
+        catalog_pg,
+        "_stats_examples",
+        lambda engine, schemas: {("public", "film"): {"rating": ["PG"]}},
+    )
+    sampled = []
+
+    def fake_sample(engine, schema, table, names, row_estimate, deadline):
+        sampled.append((schema, table, list(names), row_estimate))
+        return {name: [f"{name}-example"] for name in names}
+
+    monkeypatch.setattr(catalog_pg, "_sample_examples", fake_sample)
+
+    columns_by_table = {
+        ("public", "film"): _columns(("film_id", "INTEGER"), ("rating", "VARCHAR(5)"), ("title", "TEXT")),
+        ("public", "actor"): _columns(("actor_id", "INTEGER")),
+    }
+    out = catalog_pg._collect_catalog_examples(object(), columns_by_table, {("public", "film"): 1000})
+
+    assert out[("public", "film")] == {"rating": ["PG"], "title": ["title-example"]}
+    assert out[("public", "actor")] == {}
+    assert sampled == [("public", "film", ["title"], 1000)]
+
+
+def test_collect_catalog_examples_respects_global_budget(monkeypatch):
+    monkeypatch.setattr(catalog_pg, "_stats_examples", lambda engine, schemas: {})
+    monkeypatch.setattr(catalog_pg, "EXAMPLE_BUDGET_SECONDS", 0.2)
+    monkeypatch.setattr(catalog_pg, "EXAMPLE_WORKERS", 1)
+    release = threading.Event()
+
+    def fake_sample(engine, schema, table, names, row_estimate, deadline):
+        if table == "slow":
+            release.wait(2.0)
+        return {name: ["x"] for name in names}
+
+    monkeypatch.setattr(catalog_pg, "_sample_examples", fake_sample)
+
+    columns_by_table = {
+        ("public", "slow"): _columns(("name", "TEXT")),
+        ("public", "queued"): _columns(("name", "TEXT")),
+    }
+    started = time.monotonic()
+    out = catalog_pg._collect_catalog_examples(object(), columns_by_table, {})
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 1.0
+    assert out == {("public", "slow"): {}, ("public", "queued"): {}}
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from src.vast import catalog_pg
+from src.vast.catalog_snapshot import CatalogSnapshot
+
+
+def _snapshot(tables):
+    rows = []
+    for (schema, table), columns in tables.items():
+        for name, data_type in columns:
+            rows.append(
+                {
+                    "table_schema": schema,
+                    "table_name": table,
+                    "column_name": name,
+                    "data_type": data_type,
+                    "not_null": False,
+                    "column_default": None,
+                }
+            )
+    return CatalogSnapshot.from_rows(rows)
+
+
+@pytest.fixture
+def catalog_env(monkeypatch, tmp_path):
+    monkeypatch.setattr(catalog_pg, "CARD_STORE_PATH", tmp_path / "schema_cards.db")
+
+    state = {"snapshot": None, "built": []}
+
+    monkeypatch.setattr(catalog_pg, "get_catalog_snapshot", lambda force_refresh=False: state["snapshot"])
+
+    def fake_build(snapshot=None, only=None):
+        snapshot = snapshot or state["snapshot"]
+        keys = [f"{s}.{t}" for s, t in snapshot.tables]
+        if only is not None:
+            keys = [k for k in keys if k in set(only)]
+        state["built"].append(sorted(keys))
+        cards = {}
+        for key in keys:
+            schema, table = key.split(".")
+            cards[key] = {
+                "schema": schema,
+                "table": table,
+                "columns": [
+                    {"name": c["column_name"], "type": c["data_type"]}
+                    for c in snapshot.table_columns(schema, table)
+                ],
+                "aliases": [table],
+            }
+        return cards
+
+    monkeypatch.setattr(catalog_pg, "build_schema_cards", fake_build)
+    return state
+
+
+def test_fingerprint_mismatch_rebuilds_only_changed_tables(catalog_env):
+    catalog_env["snapshot"] = _snapshot(
+        {
+            ("public", "actor"): [("actor_id", "integer")],
+            ("public", "film"): [("film_id", "integer")],
+            ("public", "old"): [("id", "integer")],
+        }
+    )
+    first = catalog_pg.load_schema_cards()
+    assert catalog_env["built"] == [["public.actor", "public.film", "public.old"]]
+
+    catalog_env["snapshot"] = _snapshot(
+        {
+            ("public", "actor"): [("actor_id", "integer")],
+            ("public", "film"): [("film_id", "integer"), ("title", "text")],
+            ("public", "new"): [("id", "integer")],
+        }
+    )
+    second = catalog_pg.load_schema_cards()
+
+    assert catalog_env["built"][-1] == ["public.film", "public.new"]
+    assert second["fingerprint"] == catalog_env["snapshot"].fingerprint != first["fingerprint"]
+    assert sorted(second["cards"]) == ["public.actor", "public.film", "public.new"]
+    assert [c["name"] for c in second["cards"]["public.film"]["columns"]] == ["film_id", "title"]
+    with pytest.raises(FileNotFoundError):
+        catalog_pg.load_card("public", "old")
+
+    store = catalog_pg._store()
+    index = store.read_index()
+    hashes = {f"{e['schema']}.{e['table']}": e["hash"] for e in index["tables"]}
+    assert hashes == catalog_env["snapshot"].table_hashes()
+
+    slim = store.read_slim()
+    assert slim["fingerprint"] == second["fingerprint"]
+    assert [t["key"] for t in slim["tables"]] == ["public.actor", "public.film", "public.new"]
+    assert slim == catalog_pg.build_schema_index_slim(second["cards"], fingerprint=second["fingerprint"])
+    assert catalog_pg.load_schema_index_slim() == slim
+
+
+def test_index_without_hashes_falls_back_to_full_rebuild(catalog_env):
+    catalog_env["snapshot"] = _snapshot({("public", "film"): [("film_id", "integer")]})
+    cards = catalog_pg.load_schema_cards()["cards"]
+
+    # An index written without per-table hashes cannot be patched.
+    catalog_pg.save_schema_cards(dict(cards), fingerprint="legacy")
+
+    catalog_pg.load_schema_cards()
+    assert catalog_env["built"] == [["public.film"], ["public.film"]]
+    index = catalog_pg._store().read_index()
+    assert index["tables"][0]["hash"] == catalog_env["snapshot"].table_hashes()["public.film"]
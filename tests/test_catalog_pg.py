@@ -50,3 +50,24 @@ def test_unused_indexes_typed():
         assert isinstance(row["index"], str)
         assert isinstance(row["index_bytes"], int)
         assert isinstance(row["idx_scan"], int)
+
+
+def test_bulk_reflection_matches_per_table_reflection():
+    import json
+
+    from sqlalchemy import inspect
+
+    from src.vast.catalog_pg import _reflect_schema, _reflect_table
+    from src.vast.db import get_ro_engine
+    from src.vast.introspect import list_tables
+
+    engine = get_ro_engine()
+    by_schema = {}
+    for entry in list_tables():
+        by_schema.setdefault(entry["table_schema"], []).append(entry["table_name"])
+
+    insp = inspect(engine)
+    for schema, tables in by_schema.items():
+        bulk = _reflect_schema(engine, schema, tables)
+        single = {table: _reflect_table(insp, schema, table) for table in tables}
+        assert json.dumps(bulk, default=str, sort_keys=True) == json.dumps(single, default=str, sort_keys=True)
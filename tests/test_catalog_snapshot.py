@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.vast import catalog_snapshot
+from src.vast.catalog_snapshot import CatalogSnapshot
+from src.vast.introspect import fingerprint_from_columns
+
+
+ROWS = [
+    {"table_schema": "public", "table_name": "film", "column_name": "film_id", "data_type": "integer", "not_null": True, "column_default": "nextval('film_film_id_seq'::regclass)"},
+    {"table_schema": "public", "table_name": "film", "column_name": "title", "data_type": "text", "not_null": True, "column_default": None},
+    {"table_schema": "public", "table_name": "actor", "column_name": "actor_id", "data_type": "integer", "not_null": True, "column_default": None},
+    {"table_schema": "public", "table_name": "actor", "column_name": "nickname", "data_type": "text", "not_null": False, "column_default": None},
+    {"table_schema": "public", "table_name": "empty", "column_name": None, "data_type": None, "not_null": None, "column_default": None},
+]
+
+
+def test_from_rows_groups_columns_per_table():
+    snapshot = CatalogSnapshot.from_rows(ROWS)
+
+    assert snapshot.list_tables() == [
+        {"table_schema": "public", "table_name": "actor"},
+        {"table_schema": "public", "table_name": "empty"},
+        {"table_schema": "public", "table_name": "film"},
+    ]
+    assert [c["column_name"] for c in snapshot.table_columns("public", "film")] == ["film_id", "title"]
+    assert snapshot.table_columns("public", "actor")[1]["is_nullable"] == "YES"
+    assert snapshot.table_columns("public", "empty") == []
+    assert snapshot.schema_map() == {
+        "public": {
+            "actor": {"actor_id", "nickname"},
+            "empty": set(),
+            "film": {"film_id", "title"},
+        }
+    }
+
+
+def test_fingerprint_matches_column_spec_fingerprint():
+    snapshot = CatalogSnapshot.from_rows(ROWS)
+
+    expected = fingerprint_from_columns(
+        [
+            ("public", "actor", [("actor_id", "integer"), ("nickname", "text")]),
+            ("public", "empty", []),
+            ("public", "film", [("film_id", "integer"), ("title", "text")]),
+        ]
+    )
+    assert snapshot.fingerprint == expected
+
+
+def test_detailed_fingerprint_ignores_row_order_but_tracks_nullability():
+    forward = CatalogSnapshot.from_rows(ROWS)
+    backward = CatalogSnapshot.from_rows(list(reversed(ROWS)))
+    assert forward.detailed_fingerprint == backward.detailed_fingerprint
+
+    changed = [dict(row) for row in ROWS]
+    changed[1]["not_null"] = False
+    assert CatalogSnapshot.from_rows(changed).detailed_fingerprint != forward.detailed_fingerprint
+
+
+def test_get_catalog_snapshot_reuses_within_ttl(monkeypatch):
+    calls = {"count": 0}
+
+    def fake_capture(engine=None, schemas=None):
+        calls["count"] += 1
+        return CatalogSnapshot.from_rows(ROWS)
+
+    monkeypatch.setattr(catalog_snapshot, "capture_catalog_snapshot", fake_capture)
+    monkeypatch.setattr(catalog_snapshot, "_snapshot_ttl_seconds", lambda: 60.0)
+    catalog_snapshot.invalidate_catalog_snapshot()
+
+    first = catalog_snapshot.get_catalog_snapshot()
+    second = catalog_snapshot.get_catalog_snapshot()
+    assert first is second
+    assert calls["count"] == 1
+
+    catalog_snapshot.invalidate_catalog_snapshot()
+    catalog_snapshot.get_catalog_snapshot()
+    assert calls["count"] == 2
+
+    catalog_snapshot.get_catalog_snapshot(force_refresh=True)
+    assert calls["count"] == 3
+    catalog_snapshot.invalidate_catalog_snapshot()
+
+
+def test_capture_excludes_ddl_log_only_in_its_schema(monkeypatch):
+    seen = {}
+
+    class Conn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, stmt, params):
+            seen.update(sql=str(stmt), params=params)
+            return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: ROWS))
+
+    engine = SimpleNamespace(connect=Conn)
+    monkeypatch.setattr(catalog_snapshot, "eligible_schemas", lambda engine, schemas: list(schemas))
+    monkeypatch.setattr(catalog_snapshot.settings, "VAST_DDL_LOG_SCHEMA", "ops")
+
+    snapshot = catalog_snapshot.capture_catalog_snapshot(engine, ["public", "ops"])
+    assert "NOT (n.nspname = :ddl_schema AND c.relname = 'vast_ddl_log')" in seen["sql"]
+    assert seen["params"] == {"schemas": ["public", "ops"], "ddl_schema": "ops"}
+    assert ("public", "film") in snapshot.tables
+
+
+def test_explicit_engine_gets_its_own_snapshot(monkeypatch):
+    from src.vast import identifier_guard
+
+    engines = []
+
+    def fake_capture(engine=None, schemas=None):
+        engines.append(engine)
+        rows = ROWS if engine is None else ROWS[:2]
+        return CatalogSnapshot.from_rows(rows)
+
+    class Engine:
+        pass
+
+    monkeypatch.setattr(catalog_snapshot, "capture_catalog_snapshot", fake_capture)
+    monkeypatch.setattr(catalog_snapshot, "_snapshot_ttl_seconds", lambda: 60.0)
+    catalog_snapshot.invalidate_catalog_snapshot()
+    identifier_guard.invalidate_schema_cache()
+    other = Engine()
+
+    schema_map, _ = identifier_guard.load_schema_cache(other)
+    assert set(schema_map["public"]) == {"film"}
+    identifier_guard.load_schema_cache(other)
+    schema_map, _ = identifier_guard.load_schema_cache()
+    assert set(schema_map["public"]) == {"film", "actor", "empty"}
+    assert engines == [other, None]
+    catalog_snapshot.invalidate_catalog_snapshot()
+    identifier_guard.invalidate_schema_cache()
+
+
+def test_failed_privilege_check_is_not_cached(monkeypatch):
+    class Down:
+        def connect(self):
+            raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(catalog_snapshot, "get_pool_engine", lambda name: Down())
+    monkeypatch.setattr(catalog_snapshot, "_PUSH_INVALIDATION", True)
+    catalog_snapshot.invalidate_catalog_snapshot()
+
+    with pytest.raises(RuntimeError, match="connection refused"):
+        catalog_snapshot.eligible_schemas(Down(), ["public"])
+    snapshot = catalog_snapshot.get_catalog_snapshot()
+    assert not snapshot.complete and snapshot.tables == []
+    assert catalog_snapshot._SNAPSHOT is None
+
+    monkeypatch.setattr(catalog_snapshot, "capture_catalog_snapshot", lambda engine=None: CatalogSnapshot.from_rows(ROWS))
+    assert catalog_snapshot.get_catalog_snapshot().complete
+    assert catalog_snapshot._SNAPSHOT is not None
+    catalog_snapshot.invalidate_catalog_snapshot()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from src.vast.coerce import (
+    coerce_column,
+    coerce_row,
+    coerce_value,
+    converter_for,
+    description_types,
+    row_converters,
+)
+from src.vast.columnar import ColumnarResult
+
+
+def test_description_types_map_postgres_oids():
+    description = [("id", 23), ("title", 25), ("rate", 1700), ("at", 1184), ("doc", 3802), ("tags", 1009)]
+
+    assert description_types(description) == ["integer", "text", "numeric", "timestamp", "json", None]
+
+
+def test_native_columns_pass_through_unchanged():
+    values = [1, 2, None]
+    assert converter_for("integer") is None
+    assert coerce_column(values, "integer") is values
+
+
+def test_coerce_column_converts_and_falls_back_on_mismatch():
+    assert coerce_column([datetime(2024, 1, 2, 3, 4), None], "timestamp") == ["2024-01-02T03:04:00", None]
+    assert coerce_column([Decimal("2.00"), Decimal("2.50")], "numeric", exact_decimals=True) == [2, 2.5]
+    # SQLite hands back text for a column declared as a timestamp.
+    assert coerce_column(["2024-01-02", datetime(2024, 1, 2)], "timestamp") == ["2024-01-02", "2024-01-02T00:00:00"]
+
+
+def test_coerce_value_recurses_and_uses_default():
+    value = {"when": date(2024, 1, 2), "ids": (uuid.UUID(int=1),), "gap": timedelta(seconds=90)}
+
+    assert coerce_value(value) == {
+        "when": "2024-01-02",
+        "ids": ["00000000-0000-0000-0000-000000000001"],
+        "gap": "0:01:30",
+    }
+    assert coerce_value(object(), default=lambda _v: "fallback") == "fallback"
+
+
+def test_coerce_row_uses_per_column_converters():
+    converters = row_converters(["integer", "numeric", "date"])
+
+    assert coerce_row((1, Decimal("1.5"), date(2024, 1, 2)), converters) == [1, 1.5, "2024-01-02"]
+
+
+def test_columnar_prefers_cursor_types_over_inference():
+    result = ColumnarResult.from_rows(["doc", "n"], [({"a": 1}, None)], ["json", None])
+
+    assert result.types == ["json", "null"]
+    assert result.data == [[{"a": 1}], [None]]
+
+
+def test_bytea_becomes_postgres_hex_text():
+    assert description_types([("blob", 17)]) == ["bytes"]
+    assert coerce_column([b"\x00\xff", memoryview(b"ab"), None], "bytes") == ["\\x00ff", "\\x6162", None]
+    assert coerce_row((bytearray(b"\x01"),), row_converters(["bytes"])) == ["\\x01"]
+    assert coerce_value({"raw": [b"\x0a"]}) == {"raw": ["\\x0a"]}
+
+    result = ColumnarResult.from_rows(["blob"], [(b"\xde\xad",)])
+    assert result.types == ["bytes"] and result.data == [["\\xdead"]]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from typer.testing import CliRunner
+
+import cli
+from src.vast import db, service
+from src.vast.columnar import ColumnarResult
+
+
+@pytest.fixture
+def sqlite_ro(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER, title TEXT, rental_rate NUMERIC)"))
+        conn.execute(
+            text("INSERT INTO film VALUES (:id, :title, :rate)"),
+            [{"id": i, "title": f"Film {i}", "rate": 0.99} for i in range(1, 4)],
+        )
+    monkeypatch.setattr(db, "get_ro_engine", lambda: engine)
+    monkeypatch.setattr(service, "_ensure_valid_identifiers", lambda *a, **k: None)
+    monkeypatch.setattr(service, "load_or_build_schema_summary", lambda *a, **k: "summary")
+    return engine
+
+
+def test_from_rows_builds_typed_columns():
+    result = ColumnarResult.from_rows(
+        ["id", "rate", "day", "tags"],
+        [(1, Decimal("1.50"), date(2024, 1, 2), ["a"]), (2, None, None, None)],
+    )
+
+    assert result.types == ["integer", "numeric", "date", "array"]
+    assert result.data == [[1, 2], [1.5, None], ["2024-01-02", None], [["a"], None]]
+    assert result.records()[0] == {"id": 1, "rate": 1.5, "day": "2024-01-02", "tags": ["a"]}
+    assert result.table(limit=1) == [[1, 1.5, "2024-01-02", ["a"]]]
+    assert len(result) == 2
+
+
+def test_safe_execute_columnar_keeps_one_representation(sqlite_ro):
+    sql = "SELECT film_id, title FROM film ORDER BY film_id"
+
+    columnar = db.safe_execute(sql, columnar=True)
+    rows = db.safe_execute(sql)
+
+    assert "rows" not in columnar and columnar["row_count"] == 3
+    assert columnar["result"].data == [[1, 2, 3], ["Film 1", "Film 2", "Film 3"]]
+    assert rows["rows"] == columnar["result"].records()
+
+
+def test_execute_sql_columnar_renders_both_json_shapes(sqlite_ro):
+    result = service.execute_sql("SELECT film_id, title FROM film ORDER BY film_id LIMIT 2", columnar=True)
+
+    rows = service.render_result(result)
+    columnar = service.render_result(result, columnar=True)
+
+    assert rows["rows"] == [{"film_id": 1, "title": "Film 1"}, {"film_id": 2, "title": "Film 2"}]
+    assert columnar["result"] == {
+        "columns": ["film_id", "title"],
+        "types": ["integer", "text"],
+        "data": [[1, 2], ["Film 1", "Film 2"]],
+        "row_count": 2,
+    }
+    json.dumps(columnar)
+
+
+def test_arrow_ipc_round_trip(sqlite_ro):
+    pa = pytest.importorskip("pyarrow")
+    result = db.safe_execute("SELECT film_id, title FROM film ORDER BY film_id", columnar=True)["result"]
+
+    table = pa.ipc.open_stream(result.to_arrow_ipc()).read_all()
+
+    assert table.column_names == ["film_id", "title"]
+    assert table.column("film_id").to_pylist() == [1, 2, 3]
+
+
+def test_arrow_without_pyarrow_raises(monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_pyarrow(name, *args, **kwargs):
+        if name == "pyarrow":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        ColumnarResult.from_rows(["x"], [(1,)]).to_arrow_ipc()
+
+
+def test_cli_run_columnar_format(sqlite_ro, monkeypatch):
+    monkeypatch.setattr(cli, "service", service, raising=False)
+
+    result = CliRunner().invoke(cli.app, ["run", "SELECT title FROM film ORDER BY film_id", "--format", "columnar"])
+
+    assert result.exit_code == 0, result.output
+    body = json.loads(result.output)
+    assert body["result"]["data"] == [["Film 1", "Film 2", "Film 3"]]
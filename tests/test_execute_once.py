@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.vast import agent, identifier_guard, service
+from src.vast.agent import PlanResult
+from src.vast.catalog_snapshot import CatalogSnapshot
+from src.vast.columnar import ColumnarResult
+from src.vast.trace import stage
+
+
+def _snapshot():
+    rows = [
+        {
+            "table_schema": "public",
+            "table_name": "film",
+            "column_name": name,
+            "data_type": data_type,
+            "not_null": False,
+            "column_default": None,
+        }
+        for name, data_type in (("film_id", "integer"), ("title", "text"))
+    ]
+    return CatalogSnapshot.from_rows(rows)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    snapshot = _snapshot()
+    monkeypatch.setattr(identifier_guard, "get_catalog_snapshot", lambda force_refresh=False, engine=None: snapshot)
+    identifier_guard.invalidate_schema_cache()
+
+    monkeypatch.setattr(service, "resolver_shortcut", lambda *_a, **_k: (None, None))
+    monkeypatch.setattr(service, "load_or_build_schema_summary", lambda *a, **k: "summary")
+    monkeypatch.setattr(service, "get_engine", lambda readonly=True: SimpleNamespace())
+    monkeypatch.setattr(service, "get_ro_engine", lambda: SimpleNamespace())
+    monkeypatch.setattr(agent, "get_schema_state", lambda *a, **k: {"schema_fingerprint": "fp"})
+
+    calls = []
+
+    def fake_safe_execute(sql, params=None, allow_writes=False, force_write=False, estimated_rows=None, columnar=False):
+        calls.append({"sql": sql, "force_write": force_write, "estimated_rows": estimated_rows})
+        write = not sql.lstrip().upper().startswith("SELECT")
+        if write and not force_write:
+            notice = {"_notice": "DRY RUN — not executed", "_estimated_rows": estimated_rows}
+            return {"rows": [notice], "columns": list(notice), "row_count": 0, "dry_run": True, "write": True}
+        with stage("execute", write=write):
+            if columnar:
+                result = ColumnarResult.from_rows(["title"], [("A Film",)])
+                return {"result": result, "columns": ["title"], "row_count": 1, "write": write}
+            return {"rows": [{"title": "A Film"}], "columns": ["title"], "row_count": 1, "write": write}
+
+    monkeypatch.setattr(service, "safe_execute", fake_safe_execute)
+    yield calls
+    identifier_guard.invalidate_schema_cache()
+
+
+def test_llm_read_is_validated_and_executed_once(pipeline, monkeypatch):
+    monkeypatch.setattr(agent, "plan_sql", lambda *a, **k: PlanResult(sql="SELECT title FROM public.film"))
+
+    outcome = service.plan_and_execute("show me film titles")
+
+    stages = [entry["stage"] for entry in outcome["meta"]["trace"]]
+    assert stages == ["validate", "execute"]
+    assert outcome["meta"]["trace"][0]["validator"] == "ast"
+    # Only the first page (VAST_PAGE_SIZE + 1 rows) of the capped query is fetched.
+    assert [c["sql"] for c in pipeline] == [
+        "SELECT * FROM (SELECT title FROM public.film LIMIT 100) AS _vast_page LIMIT 51"
+    ]
+    assert outcome["sql"] == "SELECT title FROM public.film LIMIT 100;"
+    assert outcome["result"]["rows"] == [["A Film"]]
+    assert outcome["result"]["has_more"] is False and outcome["result"]["next_cursor"] is None
+
+
+def test_forced_write_is_gated_in_its_own_transaction(pipeline, monkeypatch):
+    sql = "UPDATE public.film SET title = 'New' WHERE film_id = 1"
+    monkeypatch.setattr(agent, "plan_sql", lambda *a, **k: PlanResult(sql=sql))
+
+    def fake_extract(sql, engine=None, params=None):
+        with stage("guard_explain"):
+            return {"relations": {"public.film"}, "columns": {"public.film": {"title", "film_id"}}, "plan_rows": 1}
+
+    monkeypatch.setattr(identifier_guard, "extract_identifiers", fake_extract)
+
+    outcome = service.plan_and_execute("rename film 1", allow_writes=True, force_write=True)
+
+    # Stages are recorded when they finish, so the nested guard EXPLAIN comes first.
+    assert [entry["stage"] for entry in outcome["meta"]["trace"]] == ["guard_explain", "validate", "execute"]
+    # The guard's RO estimate is only reported; safe_execute plans the write in its transaction.
+    assert pipeline == [
+        {"sql": sql, "force_write": False, "estimated_rows": None},
+        {"sql": sql + ";", "force_write": True, "estimated_rows": None},
+    ]
+    assert outcome["execution"]["estimated_rows"] == 1
+
+
+def test_passthrough_skips_second_validation(pipeline):
+    outcome = service.plan_and_execute("SELECT title FROM public.film LIMIT 1")
+
+    assert [entry["stage"] for entry in outcome["meta"]["trace"]] == ["validate", "execute"]
+    assert len(pipeline) == 1
@@ -24,8 +24,11 @@ def test_dry_run_when_not_forced():
     assert out["rows"][0]["_notice"].startswith("DRY RUN")
 
 def test_row_estimate_gate(monkeypatch):
-    # Simulate a huge estimate by monkeypatching _estimate_write_rows
+    # Simulate a huge estimate by monkeypatching _explain_write; the estimate
+    # now runs on the write connection, so give it one.
     import src.vast.db as db
-    monkeypatch.setattr(db, "_estimate_write_rows", lambda *_: settings.max_write_rows + 1)
+    from sqlalchemy import create_engine
+    monkeypatch.setattr(db, "get_engine", lambda readonly=True: create_engine("sqlite://"))
+    monkeypatch.setattr(db, "_explain_write", lambda *_: (settings.max_write_rows + 1, None))
     with pytest.raises(ValueError):
         safe_execute("UPDATE actor SET first_name='test'", allow_writes=True, force_write=True)
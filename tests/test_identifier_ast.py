@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from src.vast import identifier_guard
+from src.vast.identifier_guard import _validate_with_ast, validate_identifiers
+
+SCHEMA = {
+    "public": {
+        "film": {"film_id", "title", "rating"},
+        "actor": {"actor_id", "first_name"},
+        "film_actor": {"film_id", "actor_id"},
+    }
+}
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT f.title, a.first_name FROM film f JOIN film_actor fa ON fa.film_id = f.film_id "
+        "JOIN actor a USING (actor_id) ORDER BY 1",
+        "WITH x AS (SELECT film_id, title AS t FROM public.film) SELECT x.t, count(*) AS n FROM x GROUP BY x.t ORDER BY n",
+        "SELECT f.title FROM film f WHERE EXISTS (SELECT 1 FROM film_actor fa WHERE fa.film_id = f.film_id)",
+        "SELECT title FROM film WHERE film_id IN (SELECT film_id FROM film_actor WHERE actor_id = :id)",
+        "SELECT * FROM (SELECT * FROM film) d WHERE d.rating = 'PG'",
+        "SELECT title FROM film UNION ALL SELECT first_name FROM actor",
+        "SELECT relname FROM pg_catalog.pg_class",
+    ],
+)
+def test_ast_resolves_valid_reads(sql):
+    details = _validate_with_ast(sql, SCHEMA)
+    assert details is not None
+    assert details["validator"] == "ast"
+    assert details["unknown_relations"] == [] and details["unknown_columns"] == {}
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT nope FROM film",
+        "SELECT * FROM missing",
+        "SELECT film_id FROM film f JOIN film_actor fa ON true",
+        "SELECT * FROM generate_series(1, 3) g",
+        "SELECT 1 FROM film JOIN film_actor USING (nope)",
+        "UPDATE film SET title = 'x'",
+        "SELECT FROM WHERE",
+    ],
+)
+def test_ast_defers_unknown_or_ambiguous(sql):
+    assert _validate_with_ast(sql, SCHEMA) is None
+
+
+def test_validate_identifiers_skips_explain_when_ast_resolves(monkeypatch):
+    def boom(*args, **kwargs):
+        raise AssertionError("EXPLAIN should not run")
+
+    monkeypatch.setattr(identifier_guard, "extract_identifiers", boom)
+    monkeypatch.setattr(identifier_guard, "get_engine", boom)
+
+    ok, details = validate_identifiers("SELECT title FROM film", None, SCHEMA)
+
+    assert ok is True
+    assert details["relations"] == ["public.film"]
+
+
+def test_validate_identifiers_falls_back_to_explain(monkeypatch):
+    calls = []
+
+    def fake_extract(sql, engine=None, params=None):
+        calls.append(sql)
+        return {"relations": {"public.film"}, "columns": {"public.film": {"nope"}}}
+
+    monkeypatch.setattr(identifier_guard, "extract_identifiers", fake_extract)
+
+    ok, details = validate_identifiers("SELECT nope FROM film", object(), SCHEMA)
+
+    assert calls == ["SELECT nope FROM film"]
+    assert ok is False
+    assert details["validator"] == "explain"
+    assert details["unknown_columns"] == {"public.film": ["nope"]}
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.vast import db, service
+from src.vast.db import add_limit
+from src.vast.pagination import decode_cursor, plan_page
+
+
+@pytest.fixture
+def sqlite_ro(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER, title TEXT, rating TEXT)"))
+        conn.execute(
+            text("INSERT INTO film VALUES (:id, :title, :rating)"),
+            # Titles repeat so pages have to split runs of equal sort keys.
+            [{"id": i, "title": f"Film {i // 3:02d}", "rating": "G" if i % 2 else "R"} for i in range(1, 24)],
+        )
+    executed = []
+    real_safe_execute = service.safe_execute
+
+    def recording_safe_execute(sql, *args, **kwargs):
+        executed.append(sql)
+        return real_safe_execute(sql, *args, **kwargs)
+
+    monkeypatch.setattr(db, "get_ro_engine", lambda: engine)
+    monkeypatch.setattr(service, "safe_execute", recording_safe_execute)
+    monkeypatch.setattr(service, "_ensure_valid_identifiers", lambda *a, **k: None)
+    monkeypatch.setattr(service, "load_or_build_schema_summary", lambda *a, **k: "summary")
+    return executed
+
+
+def _all_pages(sql, page_size, params=None):
+    pages, cursor = [], None
+    while True:
+        result = service.execute_page(sql, params, page_size=page_size, cursor=cursor)
+        pages.append(result)
+        cursor = result["next_cursor"]
+        if not result["has_more"]:
+            return pages
+
+
+def test_add_limit_ignores_subquery_limits():
+    assert add_limit("SELECT a FROM t WHERE a IN (SELECT b FROM u LIMIT 1);", 100) == (
+        "SELECT a FROM t WHERE a IN (SELECT b FROM u LIMIT 1) LIMIT 100;"
+    )
+    assert add_limit("SELECT a FROM t LIMIT 5", 100) == "SELECT a FROM t LIMIT 5"
+    assert add_limit("UPDATE t SET a = 1", 100) == "UPDATE t SET a = 1"
+
+
+def test_plan_page_modes():
+    assert plan_page("SELECT title, film_id FROM film ORDER BY title, film_id").mode == "keyset"
+    assert plan_page("SELECT title FROM film").mode == "offset"
+    assert plan_page("SELECT rating, count(*) AS n FROM film GROUP BY rating ORDER BY n").mode == "offset"
+    assert plan_page("SELECT title FROM film ORDER BY title LIMIT :limit").mode == "wrap"
+    with pytest.raises(ValueError, match="SELECT"):
+        plan_page("DELETE FROM film")
+
+
+def test_keyset_predicate_handles_nulls():
+    plan = plan_page("SELECT title FROM film ORDER BY title")
+    sql, params = plan.page_sql(10, decode_cursor(_cursor_for(plan, ["Film 01"]), plan.sql))
+
+    assert "(title > :_vast_k0 OR title IS NULL) OR title = :_vast_k0" in sql
+    assert params == {"_vast_k0": "Film 01"}
+    assert sql.endswith("LIMIT 11 OFFSET 2")
+
+
+def _cursor_for(plan, keys):
+    from src.vast.pagination import PageCursor, encode_cursor, sql_digest
+
+    return encode_cursor(PageCursor(digest=sql_digest(plan.sql), offset=10, keys=keys, ties=2))
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT title, film_id FROM film WHERE rating <> :skip ORDER BY title, film_id",
+        "SELECT title, film_id FROM film WHERE rating <> :skip ORDER BY title DESC",
+        "SELECT film_id FROM film WHERE rating <> :skip",
+        "SELECT film_id FROM film WHERE rating <> :skip ORDER BY film_id LIMIT 20",
+    ],
+)
+def test_pages_cover_the_result_exactly_once(sqlite_ro, sql):
+    params = {"skip": "X"}
+    full = service.execute_sql(sql, params, columnar=True)["result"].table()
+
+    pages = _all_pages(sql, 4, params)
+    paged = [row for page in pages for row in page["result"].table()]
+
+    assert paged == full if "ORDER BY" in sql else sorted(paged) == sorted(full)
+    assert all(page["row_count"] <= 4 for page in pages)
+    assert pages[-1]["next_cursor"] is None
+
+
+def test_keyset_pages_resume_after_the_last_key(sqlite_ro):
+    sql = "SELECT title, film_id FROM film ORDER BY title, film_id"
+    first = service.execute_page(sql, page_size=5)
+    sqlite_ro.clear()
+
+    second = service.execute_page(sql, page_size=5, cursor=first["next_cursor"])
+
+    assert first["page"]["mode"] == "keyset" and first["has_more"]
+    # Only the row tying with the last key is skipped, not the rows before it.
+    assert ":_vast_k0" in sqlite_ro[0] and sqlite_ro[0].endswith("LIMIT 6 OFFSET 1")
+    assert second["result"].table()[0] == ["Film 02", 6]
+
+
+def test_cursor_is_bound_to_its_query(sqlite_ro):
+    first = service.execute_page("SELECT film_id FROM film", page_size=2)
+
+    with pytest.raises(ValueError, match="does not belong"):
+        service.execute_page("SELECT title FROM film", page_size=2, cursor=first["next_cursor"])
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        service.execute_page("SELECT film_id FROM film", page_size=2, cursor="not-a-cursor")
+
+
+def test_read_preview_reports_has_more(monkeypatch):
+    monkeypatch.setattr(service.settings, "VAST_PAGE_SIZE", 2)
+    payload = {
+        "intent": "read",
+        "sql": "SELECT film_id FROM film LIMIT 100;",
+        "execution": {"rows": [{"film_id": i} for i in range(3)], "row_count": 3},
+    }
+
+    result = service._attach_read_result(payload)["result"]
+
+    assert result["rows"] == [[0], [1]] and result["has_more"]
+    assert decode_cursor(result["next_cursor"], "SELECT film_id FROM film LIMIT 100").offset == 2
+
+
+def test_ask_read_fetches_one_page_and_continues_with_keyset(sqlite_ro, monkeypatch):
+    monkeypatch.setattr(service.settings, "VAST_PAGE_SIZE", 5)
+    monkeypatch.setattr(service, "_validate_passthrough", lambda sql, params: {})
+    sql = "SELECT film_id, title FROM film ORDER BY title, film_id"
+
+    outcome = service.plan_and_execute(sql)
+
+    assert sqlite_ro == [f"{sql} LIMIT 6"]
+    result = outcome["result"]
+    assert [row[0] for row in result["rows"]] == [1, 2, 3, 4, 5] and result["has_more"]
+    assert decode_cursor(result["next_cursor"], sql).keys == ["Film 01", 5]
+    following = service.execute_page(sql, page_size=5, cursor=result["next_cursor"])
+    assert [row["film_id"] for row in following["result"].records()][:2] == [6, 7]
@@ -126,3 +126,25 @@ def test_cli_perms_bootstrap_smoke(monkeypatch):
 
     result = runner.invoke(cli.app, ["perms:bootstrap", "--schema", "public", "--yes"])
     assert result.exit_code == 0
+
+
+def test_install_ddl_trigger_executes_expected_statements():
+    engine = RecordingEngine()
+    result = perms.install_ddl_trigger(engine, "public", "vast_ro", channel="vast_schema")
+
+    assert engine.statements == result["statements"]
+    assert result["log_table"] == "public.vast_ddl_log"
+    assert result["statements"][0].startswith('CREATE TABLE IF NOT EXISTS "public"."vast_ddl_log"')
+    function_sql = result["statements"][1]
+    assert 'CREATE OR REPLACE FUNCTION "public"."vast_notify_ddl"()' in function_sql
+    assert "pg_notify('vast_schema', TG_TAG)" in function_sql
+    assert "SECURITY DEFINER" in function_sql
+    assert 'SET search_path = pg_catalog, "public"' in function_sql
+    assert result["statements"][2:] == [
+        'REVOKE ALL ON FUNCTION "public"."vast_notify_ddl"() FROM PUBLIC',
+        'DROP EVENT TRIGGER IF EXISTS "vast_ddl_command_end"',
+        'CREATE EVENT TRIGGER "vast_ddl_command_end" ON ddl_command_end EXECUTE FUNCTION "public"."vast_notify_ddl"()',
+        'DROP EVENT TRIGGER IF EXISTS "vast_ddl_sql_drop"',
+        'CREATE EVENT TRIGGER "vast_ddl_sql_drop" ON sql_drop EXECUTE FUNCTION "public"."vast_notify_ddl"()',
+        'GRANT SELECT ON TABLE "public"."vast_ddl_log" TO "vast_ro"',
+    ]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from sqlalchemy import exc as sa_exc
+
+from src.vast import db, pools
+from src.vast.config import settings
+
+
+def _sqlite_pool(key, size=1, max_overflow=1):
+    pool_class = pools._pool_class(pools.TimedQueuePool, key)
+    return pool_class(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=size,
+        max_overflow=max_overflow,
+        timeout=0.05,
+    )
+
+
+def test_pool_config_reads_settings(monkeypatch):
+    monkeypatch.setattr(settings, "VAST_POOL_CATALOG_SIZE", 4)
+    monkeypatch.setattr(settings, "VAST_POOL_CATALOG_STATEMENT_TIMEOUT_MS", 120_000)
+    monkeypatch.setattr(settings, "VAST_POOL_WRITE_STATEMENT_TIMEOUT_MS", None)
+
+    catalog = pools.PoolConfig.from_settings("catalog")
+    write = pools.PoolConfig.from_settings("write")
+
+    assert catalog.size == 4 and catalog.statement_timeout_ms == 120_000
+    assert "statement_timeout=120000" in catalog.connect_args()["options"]
+    assert catalog.connect_args()["application_name"] == "vast_catalog"
+    assert write.statement_timeout_ms == settings.default_statement_timeout_ms
+    with pytest.raises(ValueError, match="Unknown connection pool"):
+        pools.PoolConfig.from_settings("reports")
+
+
+def test_checkouts_overflow_and_timeouts_are_counted():
+    pool = _sqlite_pool("test_counts")
+    first = pool.connect()
+    second = pool.connect()
+    with pytest.raises(sa_exc.TimeoutError):
+        pool.connect()
+
+    stats = pool.vast_stats.snapshot()
+    assert stats["checkouts"] == 2
+    assert stats["overflow_checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 40
+    assert pool.checkedout() == 2
+    first.close()
+    second.close()
+
+
+def test_stats_survive_pool_recreation():
+    pool = _sqlite_pool("test_recreate")
+    pool.connect().close()
+    recreated = pool.recreate()
+    recreated.connect().close()
+
+    assert recreated.vast_stats is pool.vast_stats
+    assert recreated.vast_stats.snapshot()["checkouts"] == 2
+
+
+def test_pool_stats_lists_every_workload():
+    stats = pools.pool_stats()
+
+    assert set(pools.POOL_NAMES) <= set(stats)
+    assert {"created", "size", "in_use", "idle", "checkouts", "wait_ms_avg", "timeouts"} <= set(stats["catalog"])
+
+
+def test_named_pools_get_separate_engines(monkeypatch):
+    created = []
+    monkeypatch.setattr(db, "create_pool_engine", lambda name, url=None: created.append(name) or object())
+    monkeypatch.setattr(db, "_pool_engines", {})
+    monkeypatch.setattr(db, "_engine_ro", None)
+
+    catalog = db.get_pool_engine("catalog")
+
+    assert db.get_pool_engine("catalog") is catalog
+    assert db.get_pool_engine("interactive") is db.get_ro_engine()
+    assert db.get_pool_engine("maintenance") is not catalog
+    assert created == ["catalog", "interactive", "maintenance"]
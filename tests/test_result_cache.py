@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.vast import db, result_cache, service
+from src.vast.columnar import ColumnarResult
+from src.vast.statement import parse_statement
+
+
+@pytest.fixture
+def cached_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER, title TEXT)"))
+        conn.execute(text("INSERT INTO film VALUES (1, 'Alien'), (2, 'Brazil')"))
+        conn.execute(text("CREATE TABLE actor (actor_id INTEGER)"))
+    executed = []
+    real_execute = engine.connect
+
+    def counting_connect(*args, **kwargs):
+        executed.append(1)
+        return real_execute(*args, **kwargs)
+
+    monkeypatch.setattr(engine, "connect", counting_connect)
+    monkeypatch.setattr(db, "get_ro_engine", lambda: engine)
+    monkeypatch.setattr(db, "get_engine", lambda readonly=True: engine)
+    monkeypatch.setattr(service.settings, "VAST_RESULT_CACHE", True)
+    monkeypatch.setattr(result_cache, "schema_fingerprint", lambda: "fp-1")
+    monkeypatch.setattr(db, "_explain_write", lambda *a, **k: (1, None))
+    result_cache.clear_result_cache()
+    yield executed
+    result_cache.clear_result_cache()
+
+
+def test_second_read_is_served_from_cache(cached_db):
+    first = db.safe_execute("SELECT film_id, title FROM film ORDER BY film_id")
+    calls = len(cached_db)
+    second = db.safe_execute("SELECT film_id, title FROM film ORDER BY film_id")
+
+    assert first["meta"]["cache"]["status"] == "miss"
+    assert second["meta"]["cache"]["status"] == "hit"
+    assert second["rows"] == first["rows"] == [{"film_id": 1, "title": "Alien"}, {"film_id": 2, "title": "Brazil"}]
+    assert len(cached_db) == calls
+    assert second["meta"]["cache"]["hits"] == 1 and second["meta"]["cache"]["entries"] == 1
+
+
+def test_key_includes_params_and_schema_fingerprint(cached_db, monkeypatch):
+    sql = "SELECT title FROM film WHERE film_id = :id"
+    assert db.safe_execute(sql, {"id": 1})["rows"] == [{"title": "Alien"}]
+    assert db.safe_execute(sql, {"id": 2})["rows"] == [{"title": "Brazil"}]
+
+    monkeypatch.setattr(result_cache, "schema_fingerprint", lambda: "fp-2")
+    assert db.safe_execute(sql, {"id": 1})["meta"]["cache"]["status"] == "miss"
+
+
+def test_write_invalidates_only_tagged_tables(cached_db):
+    db.safe_execute("SELECT title FROM film")
+    db.safe_execute("SELECT actor_id FROM actor")
+
+    db.safe_execute("UPDATE film SET title = 'Cube' WHERE film_id = 1", allow_writes=True, force_write=True)
+
+    film = db.safe_execute("SELECT title FROM film")
+    assert film["meta"]["cache"]["status"] == "miss"
+    assert {"title": "Cube"} in film["rows"]
+    assert db.safe_execute("SELECT actor_id FROM actor")["meta"]["cache"]["status"] == "hit"
+
+
+def test_dry_run_write_keeps_cache(cached_db):
+    db.safe_execute("SELECT title FROM film")
+    db.safe_execute("DELETE FROM film", allow_writes=True)
+
+    assert db.safe_execute("SELECT title FROM film")["meta"]["cache"]["status"] == "hit"
+
+
+def test_ttl_expiry_reports_stale(cached_db, monkeypatch):
+    monkeypatch.setattr(service.settings, "VAST_RESULT_CACHE_TTL_MS", 0)
+    db.safe_execute("SELECT title FROM film")
+    payload = db.safe_execute("SELECT title FROM film")
+
+    assert payload["meta"]["cache"]["status"] == "stale"
+    assert payload["meta"]["cache"]["stale"] == 1
+
+
+def test_lru_evicts_beyond_byte_budget(monkeypatch):
+    result_cache.clear_result_cache()
+    row = ColumnarResult.from_rows(["v"], [("x" * 100,)])
+    monkeypatch.setattr(service.settings, "VAST_RESULT_CACHE_MAX_BYTES", result_cache.estimate_bytes(row) * 2)
+    for name in ("a", "b", "c"):
+        result_cache.store((name, "{}", "fp"), row, 1, frozenset({name}))
+
+    stats = result_cache.result_cache_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert not result_cache.contains(("a", "{}", "fp"))
+    result_cache.clear_result_cache()
+
+
+def test_volatile_and_catalog_reads_are_not_cached():
+    assert result_cache.cacheable(parse_statement("SELECT title FROM film WHERE film_id > 1"))
+    assert not result_cache.cacheable(parse_statement("SELECT now(), title FROM film"))
+    assert not result_cache.cacheable(parse_statement("SELECT random() FROM film"))
+    assert not result_cache.cacheable(parse_statement("SELECT relname FROM pg_catalog.pg_class"))
+    assert not result_cache.cacheable(parse_statement("SELECT 1"))
+
+
+def test_execute_sql_skips_validation_for_cached_reads(cached_db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "_ensure_valid_identifiers", lambda *a, **k: calls.append(a))
+    monkeypatch.setattr(service, "load_or_build_schema_summary", lambda *a, **k: "summary")
+
+    service.execute_sql("SELECT title FROM film")
+    result = service.execute_sql("SELECT title FROM film")
+
+    assert len(calls) == 1
+    assert result["meta"]["cache"]["status"] == "hit"
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+
+from src.vast import agent, catalog_pg, catalog_snapshot, identifier_guard, schema_events
+from src.vast.catalog_snapshot import CatalogSnapshot
+
+
+def test_invalidate_schema_caches_clears_module_state(monkeypatch):
+    monkeypatch.setattr(identifier_guard, "_SCHEMA_CACHE", {"public": {"film": {"title"}}})
+    monkeypatch.setattr(identifier_guard, "_SCHEMA_FINGERPRINT", "fp")
+    monkeypatch.setattr(catalog_pg, "_CARDS_CACHE", {"public.film": {}})
+    monkeypatch.setattr(catalog_pg, "_CARDS_FP", "fp")
+    monkeypatch.setattr(agent, "_SCHEMA_STATE", {"schema_summary": "S", "schema_fingerprint": "fp"})
+    monkeypatch.setattr(agent, "_SCHEMA_STALE", False)
+    monkeypatch.setattr(catalog_snapshot, "_SNAPSHOT", CatalogSnapshot(tables=[], columns={}))
+
+    schema_events.invalidate_schema_caches()
+
+    assert identifier_guard._SCHEMA_CACHE is None
+    assert identifier_guard._SCHEMA_FINGERPRINT is None
+    assert catalog_pg._CARDS_CACHE is None
+    assert catalog_snapshot._SNAPSHOT is None
+    assert agent._SCHEMA_STATE["schema_summary"] is None
+    assert agent._SCHEMA_STALE is True
+
+    monkeypatch.setattr(agent, "refresh_schema_summary", lambda: {"schema_summary": "NEW", "schema_fingerprint": "fp2"})
+    assert agent.get_schema_state()["schema_fingerprint"] == "fp2"
+    assert agent._SCHEMA_STALE is False
+
+
+class FakeListenConnection:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, stmt):
+        self.executed.append(stmt)
+
+    def notifies(self, timeout=None):
+        if self.batches:
+            return iter(self.batches.pop(0))
+        return iter(())
+
+
+def test_listener_invalidates_once_per_notification_batch(monkeypatch):
+    conn = FakeListenConnection([[], ["ALTER TABLE", "CREATE INDEX"], []])
+    changes = []
+    done = threading.Event()
+
+    def on_change():
+        changes.append(1)
+        if len(changes) == 2:
+            done.set()
+
+    push_states = []
+    monkeypatch.setattr(schema_events, "set_push_invalidation", push_states.append)
+
+    listener = schema_events.SchemaChangeListener(
+        dsn="postgresql://localhost/db",
+        channel="vast_schema",
+        poll_interval=0.01,
+        on_change=on_change,
+        connect=lambda dsn: conn,
+    )
+    listener.start()
+    assert done.wait(2.0)
+    listener.stop(timeout=2.0)
+
+    # One invalidation on connect, one for the batched notifications.
+    assert len(changes) == 2
+    assert listener.notifications == 2
+    assert push_states[0] is True and push_states[-1] is False
+    assert len(conn.executed) == 1
+
+
+def test_start_schema_listener_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(schema_events.settings, "VAST_SCHEMA_LISTEN", False, raising=False)
+    assert schema_events.start_schema_listener() is None
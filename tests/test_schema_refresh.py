@@ -6,6 +6,7 @@ import pytest
 
 from src.vast import agent
 from src.vast.agent import plan_sql_with_retry, plan_sql
+from src.vast.catalog_snapshot import CatalogSnapshot
 from src.vast.identifier_guard import IdentifierValidationError
 
 
@@ -229,16 +230,13 @@ def test_deterministic_fingerprint(monkeypatch, tmp_path):
 
     order_state = {"key": "first"}
 
-    def fake_list_tables():
-        if order_state["key"] == "first":
-            return list(tables)
-        return list(reversed(tables))
+    def fake_snapshot(force_refresh: bool = False):
+        ordered = tables if order_state["key"] == "first" else list(reversed(tables))
+        keys = [(t["table_schema"], t["table_name"]) for t in ordered]
+        columns = {key: list(column_variants[order_state["key"]][key]) for key in keys}
+        return CatalogSnapshot(tables=keys, columns=columns)
 
-    def fake_table_columns(schema: str, table: str):
-        return list(column_variants[order_state["key"]][(schema, table)])
-
-    monkeypatch.setattr(agent, "list_tables", fake_list_tables)
-    monkeypatch.setattr(agent, "table_columns", fake_table_columns)
+    monkeypatch.setattr(agent, "get_catalog_snapshot", fake_snapshot)
     monkeypatch.setattr(agent, "schema_summary", lambda *a, **k: "SUMMARY")
 
     first_fp = agent.refresh_schema_summary()["schema_fingerprint"]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.vast import session_store
+from src.vast.conversation import ConversationContext, Message, MessageRole, VastConversation
+from src.vast.session_store import (
+    FileSessionBackend,
+    PostgresSessionBackend,
+    SessionBackend,
+    SessionConflict,
+    SessionJournal,
+    SQLiteSessionBackend,
+    create_session_backend,
+)
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "file":
+        yield FileSessionBackend(tmp_path, compact_every=4)
+    else:
+        store = SQLiteSessionBackend(tmp_path / "sessions.sqlite3")
+        yield store
+        store.close()
+
+
+def _msg(text):
+    return {"role": "user", "content": text, "timestamp": "2024-05-01T12:00:00", "metadata": {}}
+
+
+def _conversation(name, backend):
+    conv = VastConversation.__new__(VastConversation)
+    conv.session_name = name
+    conv.messages = []
+    conv.context = ConversationContext(database_url="postgresql://test", schema_summary="schema")
+    conv._journal = SessionJournal(name, backend)
+    return conv
+
+
+def _say(conv, text):
+    conv.messages.append(Message(role=MessageRole.USER, content=text))
+    conv._save_session()
+
+
+def test_append_is_compare_and_set(backend):
+    assert backend.version("s") is None and backend.load("s") is None
+    v1 = backend.append("s", [_msg("a"), _msg("b")], {"rules": []}, expected_version=0)
+    v2 = backend.append("s", [_msg("c")], None, expected_version=v1)
+
+    with pytest.raises(SessionConflict, match="reload and retry"):
+        backend.append("s", [_msg("late")], None, expected_version=v1)
+    assert backend.version("s") == v2
+    full = backend.load("s")
+    assert full.full and [m["content"] for m in full.messages] == ["a", "b", "c"]
+    assert full.context == {"rules": []}
+    delta = backend.load("s", after=v1)
+    assert not delta.full and [m["content"] for m in delta.messages] == ["c"] and delta.context is None
+
+
+def test_workers_sharing_a_session_rebase_on_conflict(backend):
+    a, b = _conversation("shared", backend), _conversation("shared", backend)
+    _say(a, "a1")
+    b.sync_session()
+    _say(a, "a2")
+    _say(b, "b1")  # conflicts with a2, rebases onto it and retries
+    a.context.business_rules.append("no hard deletes")
+    a._save_session()
+    _say(b, "b2")
+
+    assert [m.content for m in b.messages] == ["a1", "a2", "b1", "b2"]
+    assert b.context.business_rules == ["no hard deletes"]
+    a.sync_session()
+    assert [m.content for m in a.messages] == ["a1", "a2", "b1", "b2"]
+    stored = backend.load("shared")
+    assert [m["content"] for m in stored.messages] == ["a1", "a2", "b1", "b2"]
+
+
+def test_replace_forces_other_readers_to_reload(backend):
+    a, b = _conversation("r", backend), _conversation("r", backend)
+    for text in ("1", "2", "3"):
+        _say(a, text)
+    b.sync_session()
+    del a.messages[1:]
+    a._save_session()
+    _say(a, "4")
+
+    b.sync_session()
+    assert [m.content for m in b.messages] == ["1", "4"]
+    assert [m["content"] for m in backend.load("r").messages] == ["1", "4"]
+
+
+class _Interleaving:
+    """Engine whose connections run ``between`` before the second statement of a ``load``."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.between = None
+
+    def __getattr__(self, attr):
+        return getattr(self._engine, attr)
+
+    @contextmanager
+    def connect(self):
+        with self._engine.connect() as conn:
+            yield SimpleNamespace(execute=lambda *a: self._execute(conn, *a))
+
+    def _execute(self, conn, stmt, params=None):
+        if self.between is not None and "vast_session_messages" in str(stmt):
+            between, self.between = self.between, None
+            between()
+        return conn.execute(stmt, params)
+
+
+@pytest.mark.parametrize("interleave", ["append", "replace"])
+def test_sql_load_is_consistent_with_concurrent_writes(tmp_path, interleave):
+    backend = SQLiteSessionBackend(tmp_path / "sessions.sqlite3")
+    a, b = _conversation("s", backend), _conversation("s", backend)
+    _say(a, "a1")
+    b.sync_session()
+    _say(a, "a2")
+
+    def write():
+        if interleave == "append":
+            _say(a, "a3")
+        else:
+            del a.messages[0]
+            a._save_session()
+
+    backend.engine = _Interleaving(backend.engine)
+    backend.engine.between = write
+    b.sync_session()
+    backend.engine = backend.engine._engine
+    b.sync_session()
+
+    expected = ["a1", "a2", "a3"] if interleave == "append" else ["a2"]
+    assert [m.content for m in b.messages] == expected
+    assert [m["content"] for m in backend.load("s").messages] == expected
+    backend.close()
+
+
+def test_quarantine_and_backend_selection(backend, tmp_path, monkeypatch):
+    backend.append("bad", [_msg("x")], {"rules": []}, expected_version=0)
+    assert backend.quarantine("bad") is not None
+    assert backend.version("bad") is None and backend.quarantine("bad") is None
+
+    monkeypatch.setattr(session_store.settings, "VAST_SESSION_SQLITE_PATH", str(tmp_path / "x.sqlite3"))
+    assert isinstance(create_session_backend("sqlite"), SQLiteSessionBackend)
+    with pytest.raises(ValueError, match="Unknown session backend"):
+        create_session_backend("redis")
+    with pytest.raises(ValueError, match="Invalid session schema"):
+        PostgresSessionBackend(engine=object(), schema="vast; drop")
+
+
+def test_incomplete_backend_cannot_be_constructed():
+    class Partial(SessionBackend):
+        def version(self, name):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        Partial()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+
+from src.vast import service, session_store
+from src.vast.conversation import ConversationContext, Message, MessageRole, VastConversation
+from src.vast.session_store import SNAPSHOT_FORMAT, FileSessionBackend, SessionJournal, journal_path, read_session
+
+
+def _context(**kw):
+    return ConversationContext(database_url="postgresql://test", schema_summary="schema", **kw)
+
+
+def _messages(n, start=0):
+    return [Message(role=MessageRole.USER, content=f"m{i}", metadata={"i": i}) for i in range(start, start + n)]
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _journal(tmp_path, name="s", compact_every=100):
+    return SessionJournal(name, FileSessionBackend(tmp_path, compact_every=compact_every))
+
+
+def test_saves_append_only_new_messages(tmp_path):
+    path = tmp_path / "s.json"
+    store = _journal(tmp_path)
+    messages, context = _messages(3), _context()
+    store.save(messages, context)
+    snapshot = path.read_text(encoding="utf-8")
+    assert not journal_path(path).exists() and store.version == 4
+
+    messages += _messages(2, start=3)
+    store.save(messages, context)
+    store.save(messages, context)
+    context.business_rules.append("soft deletes only")
+    store.save(messages, context)
+
+    assert path.read_text(encoding="utf-8") == snapshot
+    assert [(r["n"], r["op"]) for r in _lines(journal_path(path))] == [(5, "message"), (6, "message"), (7, "context")]
+    loaded, ctx = _journal(tmp_path).load()
+    assert [m["content"] for m in loaded] == ["m0", "m1", "m2", "m3", "m4"]
+    assert ctx["business_rules"] == ["soft deletes only"]
+
+
+def test_compacts_periodically(tmp_path):
+    path = tmp_path / "s.json"
+    store = _journal(tmp_path, compact_every=3)
+    messages, context = _messages(1), _context()
+    store.save(messages, context)
+    for i in range(1, 4):
+        messages.append(_messages(1, start=i)[0])
+        store.save(messages, context)
+
+    assert not journal_path(path).exists()
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["format"] == SNAPSHOT_FORMAT and data["journal_seq"] == 5 and len(data["messages"]) == 4
+
+
+def test_legacy_file_migrates_on_first_save(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.json"
+    legacy = {
+        "session_name": "legacy",
+        "messages": [m.to_dict() for m in _messages(2)],
+        "context": _context().to_dict(),
+        "last_updated": "2024-01-01T00:00:00",
+    }
+    path.write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+
+    conv = VastConversation.__new__(VastConversation)
+    conv.session_name = "legacy"
+    conv._journal = _journal(tmp_path, "legacy")
+    monkeypatch.setattr("src.vast.conversation.schema_fingerprint", lambda: None)
+    conv._load_session()
+    assert [m.content for m in conv.messages] == ["m0", "m1"]
+
+    conv.messages.append(_messages(1, start=2)[0])
+    conv._save_session()
+    assert json.loads(path.read_text(encoding="utf-8"))["format"] == SNAPSHOT_FORMAT
+    conv.messages.append(_messages(1, start=3)[0])
+    conv._save_session()
+    assert len(_lines(journal_path(path))) == 1
+
+    monkeypatch.setattr(session_store, "_BACKEND", FileSessionBackend(tmp_path))
+    assert [m["content"] for m in service.load_conversation("legacy")["messages"]] == ["m0", "m1", "m2", "m3"]
+
+
+def test_replay_skips_compacted_and_torn_records(tmp_path):
+    path = tmp_path / "s.json"
+    store = _journal(tmp_path, compact_every=3)
+    messages, context = _messages(2), _context()
+    store.save(messages, context)
+    for i in range(2, 4):
+        messages.append(_messages(1, start=i)[0])
+        store.save(messages, context)
+    stale = journal_path(path).read_text(encoding="utf-8")
+    messages.append(_messages(1, start=4)[0])
+    store.save(messages, context)
+    assert not journal_path(path).exists()
+    # Crash after the snapshot was rewritten but before the journal was dropped,
+    # then a torn write on top of it.
+    journal_path(path).write_text(stale + '{"n": 7, "op": "mess', encoding="utf-8")
+
+    reopened = _journal(tmp_path, compact_every=3)
+    loaded, _ = reopened.load()
+    assert [m["content"] for m in loaded] == ["m0", "m1", "m2", "m3", "m4"]
+    assert read_session(path)["journal_seq"] == 6
+    messages.append(_messages(1, start=5)[0])
+    reopened.save(messages, context)
+    assert not journal_path(path).exists()
+    assert len(read_session(path)["messages"]) == 6
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.vast.session_registry import SESSION_OVERHEAD_BYTES, SessionRegistry
+
+
+class FakeConversation:
+    def __init__(self, name, store):
+        self.session_name = name
+        self.messages = list(store.get(name, []))
+        self._store = store
+
+    def _save_session(self):
+        self._store[self.session_name] = list(self.messages)
+
+
+def _registry(store=None, **kw):
+    store = {} if store is None else store
+    kw.setdefault("idle_s", 0)
+    kw.setdefault("memory_budget_bytes", 0)
+    return SessionRegistry(lambda name: FakeConversation(name, store), **kw), store
+
+
+def _turn(registry, name, text="hi"):
+    with registry.session(name) as conv:
+        conv.messages.append(SimpleNamespace(content=text, metadata={}))
+
+
+def test_lru_eviction_persists_and_reloads():
+    registry, store = _registry(max_sessions=2)
+    _turn(registry, "a", "first")
+    _turn(registry, "b")
+    _turn(registry, "a")
+    _turn(registry, "c")
+
+    assert "b" not in registry and "a" in registry and "c" in registry
+    assert [m.content for m in store["b"]] == ["hi"]
+    _turn(registry, "b", "again")
+    stats = registry.stats()
+    assert stats["resident"] == 2 and stats["evictions"]["lru"] == 2
+    assert stats["loads"] == 4 and stats["hits"] == 1
+    with registry.session("b") as conv:
+        assert [m.content for m in conv.messages] == ["hi", "again"]
+
+
+def test_idle_and_memory_eviction():
+    registry, store = _registry(idle_s=60)
+    _turn(registry, "a")
+    _turn(registry, "b")
+    assert registry.evict(now=time.monotonic() + 61) == ["a", "b"]
+    assert registry.stats()["evictions"]["idle"] == 2 and set(store) == {"a", "b"}
+
+    registry, _ = _registry(memory_budget_bytes=2 * SESSION_OVERHEAD_BYTES + 100)
+    _turn(registry, "a", "x" * 60)
+    _turn(registry, "b", "y" * 60)
+    assert "a" not in registry and "b" in registry
+    assert registry.stats()["evictions"]["memory"] == 1
+    _turn(registry, "c", "z" * 10_000_000)  # the session in use is never evicted for size
+    assert "c" in registry
+
+
+def test_turns_for_one_session_are_serialised():
+    registry, _ = _registry()
+    active, overlaps = [0], []
+
+    def turn():
+        with registry.session("s") as conv:
+            active[0] += 1
+            overlaps.append(active[0])
+            time.sleep(0.01)
+            conv.messages.append(SimpleNamespace(content="t", metadata={}))
+            active[0] -= 1
+
+    threads = [threading.Thread(target=turn) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert max(overlaps) == 1
+    with registry.session("s") as conv:
+        assert len(conv.messages) == 8
+    assert registry.stats()["loads"] == 1
+
+
+def test_busy_sessions_stay_and_failed_loads_retry():
+    registry, store = _registry(max_sessions=1)
+    with registry.session("a"):
+        _turn(registry, "b")
+        assert "a" in registry
+    assert "a" not in registry and "a" in store
+
+    calls = []
+
+    def flaky(name):
+        calls.append(name)
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+        return FakeConversation(name, {})
+
+    registry = SessionRegistry(flaky, idle_s=0, memory_budget_bytes=0)
+    with pytest.raises(RuntimeError):
+        with registry.session("x"):
+            pass
+    assert "x" not in registry
+    with registry.session("x") as conv:
+        assert conv.session_name == "x"
+
+
+def test_slow_save_blocks_neither_other_sessions_nor_a_returning_one():
+    registry, store = _registry(max_sessions=2)
+    _turn(registry, "a")
+    _turn(registry, "b")
+    saving, release = threading.Event(), threading.Event()
+    with registry.session("a") as conv:
+        real_save = conv._save_session
+
+    def slow_save():
+        saving.set()
+        release.wait(5)
+        real_save()
+
+    conv._save_session = slow_save
+    _turn(registry, "b")
+    evictor = threading.Thread(target=_turn, args=(registry, "c"))  # evicts "a" on exit
+    evictor.start()
+    assert saving.wait(5)
+
+    started = time.monotonic()
+    _turn(registry, "b")
+    assert "c" in registry and time.monotonic() - started < 1
+    returning = threading.Thread(target=_turn, args=(registry, "a", "back"))
+    returning.start()
+    time.sleep(0.05)
+    release.set()
+    evictor.join(5)
+    returning.join(5)
+
+    assert "a" in registry and registry.stats()["evictions"]["lru"] >= 1
+    with registry.session("a") as conv:
+        assert [m.content for m in conv.messages] == ["hi", "back"]
+    assert [m.content for m in store["a"]] == ["hi"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from src.vast import statement as statement_mod
+from src.vast.db import analyze_sql, is_select
+from src.vast.statement import StatementType, parse_statement
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    statement_mod.clear_parse_cache()
+    yield
+    statement_mod.clear_parse_cache()
+    statement_mod.shutdown_parse_pool()
+
+
+def test_parse_statement_extracts_shape():
+    stmt = parse_statement("SELECT f.title FROM public.film f WHERE f.rating = :rating LIMIT :limit")
+
+    assert stmt.ok and stmt.is_select and stmt.has_limit
+    assert stmt.statement_type is StatementType.READ
+    assert stmt.binds == {"rating", "limit"}
+    assert ("public", "film") in stmt.tables
+    assert ("public", "film", "title") in stmt.columns
+
+
+def test_parse_statement_is_cached_and_shared_by_analyze_sql():
+    sql = "UPDATE public.film SET title = 'x' WHERE film_id = 1"
+    first = parse_statement(sql)
+
+    analysis = analyze_sql(sql)
+    assert parse_statement(sql) is first
+    assert analysis.statement_type is StatementType.WRITE
+    assert not is_select(first)
+    stats = statement_mod.parse_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] >= 2
+
+
+def test_parse_errors_are_cached_and_raised_by_analyze_sql():
+    stmt = parse_statement("SELECT 1; SELECT 2")
+    assert not stmt.ok and stmt.ast is None
+    with pytest.raises(ValueError, match="Only single statements"):
+        analyze_sql("SELECT 1; SELECT 2")
+
+
+def test_parse_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(statement_mod.settings, "VAST_PARSE_CACHE_SIZE", 2)
+    for value in range(3):
+        parse_statement(f"SELECT {value}")
+    assert statement_mod.parse_cache_stats()["size"] == 2
+
+
+def test_large_statements_parse_in_process_pool(monkeypatch):
+    monkeypatch.setattr(statement_mod.settings, "VAST_PARSE_WORKERS", 1)
+    monkeypatch.setattr(statement_mod.settings, "VAST_PARSE_POOL_MIN_CHARS", 10)
+
+    stmt = parse_statement("SELECT title FROM public.film")
+
+    assert stmt.is_select and ("public", "film") in stmt.tables
+    assert statement_mod.parse_cache_stats()["pooled"] == 1
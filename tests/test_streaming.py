@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from typer.testing import CliRunner
+
+import cli
+from src.vast import db, service
+from src.vast.cancellation import cancel_request, request_scope
+
+
+@pytest.fixture
+def sqlite_ro(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER, title TEXT)"))
+        conn.execute(
+            text("INSERT INTO film VALUES (:id, :title)"),
+            [{"id": i, "title": f"Film {i}"} for i in range(1, 51)],
+        )
+    monkeypatch.setattr(db, "get_ro_engine", lambda: engine)
+    return engine
+
+
+def test_stream_execute_yields_rows_and_respects_row_cap(sqlite_ro):
+    result = db.stream_execute("SELECT film_id, title FROM film ORDER BY film_id", max_rows=10, chunk_size=4)
+
+    rows = list(result)
+
+    assert result.columns == ["film_id", "title"]
+    assert rows[0] == {"film_id": 1, "title": "Film 1"} and len(rows) == 10
+    assert result.truncated and result.truncated_reason == "max_rows"
+
+
+def test_stream_execute_ndjson_byte_cap(sqlite_ro):
+    result = db.stream_execute("SELECT film_id, title FROM film ORDER BY film_id", max_bytes=50)
+
+    lines = [json.loads(line) for line in result.iter_ndjson()]
+
+    assert lines[0] == {"columns": ["film_id", "title"]}
+    assert lines[1:-1] == [[1, "Film 1"], [2, "Film 2"], [3, "Film 3"]]
+    assert lines[-1] == {"row_count": 3, "truncated": True, "truncated_reason": "max_bytes"}
+
+
+def test_stream_execute_full_result_is_not_truncated(sqlite_ro):
+    result = db.stream_execute("SELECT film_id FROM film")
+    trailer = json.loads(list(result.iter_ndjson())[-1])
+    assert trailer == {"row_count": 50, "truncated": False, "truncated_reason": None}
+
+
+def test_stream_post_event_records_failures(sqlite_ro, monkeypatch):
+    events = []
+    monkeypatch.setattr(db, "audit_event", events.append)
+    real_coerce = db.coerce_row
+
+    def flaky(raw, converters):
+        if raw[0] == 3:
+            raise RuntimeError("connection reset")
+        return real_coerce(raw, converters)
+
+    monkeypatch.setattr(db, "coerce_row", flaky)
+    lines = [json.loads(line) for line in db.stream_execute("SELECT film_id FROM film ORDER BY film_id").iter_ndjson()]
+    assert lines[-1] == {"error": "connection reset", "row_count": 2}
+    assert events[-1]["success"] is False and events[-1]["error"] == "connection reset"
+
+    monkeypatch.setattr(db, "coerce_row", real_coerce)
+    stream = db.stream_execute("SELECT film_id FROM film").iter_ndjson()
+    next(stream), next(stream)
+    stream.close()  # the client disconnected
+    assert events[-1]["success"] is False and events[-1]["rows"] == 1
+
+    list(db.stream_execute("SELECT film_id FROM film", max_rows=5))
+    assert events[-1]["success"] is True and "error" not in events[-1]
+
+
+def test_cancel_interrupts_fetch_while_streaming(sqlite_ro):
+    # The first rows come back at once; the last needs a long recursive scan (sqlite3
+    # steps one row ahead, so fetching row 1 already reads row 2).
+    slow = (
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) "
+        "SELECT i FROM n WHERE i <= 2 OR i = 1000000000"
+    )
+    with request_scope("slow-stream") as ctx:
+        result = db.stream_execute(slow, chunk_size=1)
+        assert len(ctx._hooks) == 1
+        rows = iter(result)
+        assert next(rows) == {"i": 1}
+        threading.Timer(0.1, cancel_request, ("slow-stream",)).start()
+        started = time.perf_counter()
+        with pytest.raises(Exception, match="interrupted"):
+            next(rows)
+    assert time.perf_counter() - started < 5
+
+    with request_scope() as ctx:
+        list(db.stream_execute("SELECT film_id FROM film"))
+        assert ctx._hooks == {}
+
+
+def test_stream_execute_rejects_writes(sqlite_ro):
+    with pytest.raises(ValueError, match="read-only"):
+        db.stream_execute("UPDATE film SET title = 'x'")
+
+
+def test_cli_run_stream_prints_ndjson(sqlite_ro, monkeypatch):
+    monkeypatch.setattr(cli, "service", service, raising=False)
+    monkeypatch.setattr(service, "_ensure_valid_identifiers", lambda *a, **k: None)
+
+    result = CliRunner().invoke(
+        cli.app, ["run", "SELECT title FROM film ORDER BY film_id", "--stream", "--max-rows", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert lines == [
+        {"columns": ["title"]},
+        ["Film 1"],
+        ["Film 2"],
+        {"row_count": 2, "truncated": True, "truncated_reason": "max_rows"},
+    ]
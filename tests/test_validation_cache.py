@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from src.vast import identifier_guard
+from src.vast.identifier_guard import sql_shape, validate_identifiers, validation_cache_stats
+
+SCHEMA = {"public": {"film": {"film_id", "title"}}}
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setattr(identifier_guard, "_SCHEMA_CACHE", SCHEMA)
+    monkeypatch.setattr(identifier_guard, "_SCHEMA_FINGERPRINT", "fp-1")
+    monkeypatch.setattr(identifier_guard, "_VALIDATION_STATS", {"hits": 0, "misses": 0})
+    identifier_guard.invalidate_validation_cache()
+    calls = []
+
+    def fake_extract(sql, engine=None, params=None):
+        calls.append(sql)
+        return {"relations": {"public.film"}, "columns": {"public.film": {"nope"}}, "explain_failed": True}
+
+    monkeypatch.setattr(identifier_guard, "extract_identifiers", fake_extract)
+    yield calls
+    identifier_guard.invalidate_validation_cache()
+
+
+def test_sql_shape_masks_literals_and_case():
+    assert sql_shape("select title from film where film_id = 1 limit 5") == sql_shape(
+        "SELECT title\n  FROM FILM WHERE film_id = 42 LIMIT 10"
+    )
+    assert sql_shape("SELECT title FROM film") != sql_shape("SELECT film_id FROM film")
+
+
+def test_outcomes_cached_per_shape_and_fingerprint(shared_cache):
+    ok, _ = validate_identifiers("SELECT title FROM film WHERE film_id = 1", object(), SCHEMA)
+    ok_again, details = validate_identifiers("SELECT title FROM film WHERE film_id = 2", object(), SCHEMA)
+    assert ok and ok_again and details["validator"] == "ast"
+
+    for _ in range(2):
+        ok, details = validate_identifiers("SELECT nope FROM film", object(), SCHEMA)
+        assert not ok and details["unknown_columns"] == {"public.film": ["nope"]}
+    assert shared_cache == ["SELECT nope FROM film"]
+    assert validation_cache_stats() == {"hits": 2, "misses": 2, "size": 2}
+
+    identifier_guard._SCHEMA_FINGERPRINT = "fp-2"
+    validate_identifiers("SELECT nope FROM film", object(), SCHEMA)
+    assert len(shared_cache) == 2
+
+
+def test_private_schema_map_and_planner_errors_are_not_cached(shared_cache, monkeypatch):
+    validate_identifiers("SELECT nope FROM film", object(), {"public": {"film": {"title"}}})
+    validate_identifiers("SELECT nope FROM film", object(), {"public": {"film": {"title"}}})
+    assert len(shared_cache) == 2
+
+    monkeypatch.setattr(
+        identifier_guard,
+        "extract_identifiers",
+        lambda sql, engine=None, params=None: {"explain_failed": True, "error_text": "timeout"},
+    )
+    validate_identifiers("SELECT nope FROM film WHERE 1 = 1", object(), SCHEMA)
+    assert validation_cache_stats()["size"] == 0
+
+
+def test_invalidate_schema_cache_drops_outcomes(shared_cache):
+    validate_identifiers("SELECT title FROM film", object(), SCHEMA)
+    assert validation_cache_stats()["size"] == 1
+    identifier_guard.invalidate_schema_cache()
+    assert validation_cache_stats()["size"] == 0
+
+
+def test_requested_identifiers_are_part_of_the_key(shared_cache):
+    sql = "SELECT nope FROM film"
+    mine = {"relations": {"public.film"}, "columns": {"public.film": {"nope"}}}
+    validate_identifiers(sql, object(), SCHEMA, requested=mine)
+    validate_identifiers(sql, object(), SCHEMA, requested={"relations": set(), "columns": {}})
+    validate_identifiers(sql, object(), SCHEMA)
+    assert len(shared_cache) == 3
+
+    same = {"columns": {"public.film": ["nope"]}, "relations": ["public.film"]}
+    ok, details = validate_identifiers(sql, object(), SCHEMA, requested=same)
+    assert not ok and details["cached"] and len(shared_cache) == 3
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.vast import db
+from src.vast.config import settings
+
+PLAN = {"Node Type": "ModifyTable", "Operation": "Update", "Plan Rows": 2}
+
+
+@pytest.fixture
+def rw_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE film (film_id INTEGER, title TEXT)"))
+        conn.execute(text("INSERT INTO film VALUES (1, 'Alien'), (2, 'Brazil'), (3, 'Cube')"))
+    connections = []
+    real_connect = engine.connect
+
+    def counting_connect(*args, **kwargs):
+        connections.append(1)
+        return real_connect(*args, **kwargs)
+
+    explained = []
+
+    def fake_explain(conn, sql, params):
+        # SQLite has no EXPLAIN (FORMAT JSON); check we were handed the open write transaction.
+        assert conn.in_transaction()
+        explained.append(sql)
+        return 2, PLAN
+
+    monkeypatch.setattr(engine, "connect", counting_connect)
+    monkeypatch.setattr(db, "get_engine", lambda readonly=True: engine)
+    monkeypatch.setattr(db, "get_ro_engine", lambda: pytest.fail("writes must not use the RO engine"))
+    monkeypatch.setattr(db, "_explain_write", fake_explain)
+    monkeypatch.setattr(settings, "VAST_RESULT_CACHE", False)
+
+    def titles():
+        with real_connect() as conn:
+            return [row[0] for row in conn.execute(text("SELECT title FROM film ORDER BY film_id"))]
+
+    return {"connections": connections, "explained": explained, "titles": titles}
+
+
+def test_estimate_and_write_share_one_connection(rw_db):
+    payload = db.safe_execute("UPDATE film SET title = 'X' WHERE film_id < 3", allow_writes=True, force_write=True)
+
+    assert payload["row_count"] == 2 and not payload["dry_run"]
+    assert len(rw_db["connections"]) == 1
+    assert len(rw_db["explained"]) == 1
+    assert rw_db["titles"]() == ["X", "X", "Cube"]
+
+
+def test_dry_run_previews_captured_plan_and_rolls_back(rw_db):
+    payload = db.safe_execute("UPDATE film SET title = 'X' WHERE film_id < 3", allow_writes=True)
+
+    notice = payload["rows"][0]
+    assert payload["dry_run"] and notice["_estimated_rows"] == 2
+    assert notice["_plan"] == PLAN
+    assert rw_db["titles"]() == ["Alien", "Brazil", "Cube"]
+
+
+def test_known_estimate_skips_explain_and_connection(rw_db):
+    payload = db.safe_execute("DELETE FROM film", allow_writes=True, estimated_rows=3)
+
+    assert payload["dry_run"]
+    assert rw_db["connections"] == [] and rw_db["explained"] == []
+
+
+def test_exact_count_rolls_back_oversized_write(rw_db, monkeypatch):
+    monkeypatch.setattr(settings, "VAST_WRITE_EXACT_COUNT", True)
+    monkeypatch.setattr(settings, "max_write_rows", 2)
+
+    with pytest.raises(ValueError, match="3 affected rows exceeds limit 2; rolled back"):
+        db.safe_execute("UPDATE film SET title = 'X'", allow_writes=True, force_write=True)
+    assert rw_db["titles"]() == ["Alien", "Brazil", "Cube"]
+    assert rw_db["explained"] == []
+
+    payload = db.safe_execute("DELETE FROM film WHERE film_id = 3", allow_writes=True, force_write=True)
+    assert payload["row_count"] == 1
+    assert rw_db["titles"]() == ["Alien", "Brazil"]